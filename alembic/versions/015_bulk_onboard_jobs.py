@@ -0,0 +1,99 @@
+"""015 – Add bulk_onboard_jobs
+
+Durable job rows for asynchronous bulk CSV onboarding
+(POST /users/onboard/bulk/jobs). Runners claim queued rows with
+SELECT … FOR UPDATE SKIP LOCKED, so the partial index on queued/running
+jobs keeps the claim query cheap as completed jobs accumulate.
+
+Revision ID: 015
+Revises:     014
+Create Date: 2026-10-16
+"""
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+revision = "015"
+down_revision = "014"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    conn = op.get_bind()
+    row = conn.execute(
+        sa.text("SELECT 1 FROM pg_type WHERE typname = 'bulk_onboard_job_status'")
+    ).scalar()
+    if not row:
+        conn.execute(
+            sa.text(
+                "CREATE TYPE bulk_onboard_job_status AS ENUM "
+                "('queued', 'running', 'completed', 'failed')"
+            )
+        )
+
+    op.create_table(
+        "bulk_onboard_jobs",
+        sa.Column("id", postgresql.UUID(as_uuid=True), primary_key=True),
+        sa.Column(
+            "tenant_id",
+            postgresql.UUID(as_uuid=True),
+            sa.ForeignKey("tenants.id", ondelete="CASCADE"),
+            nullable=False,
+            index=True,
+        ),
+        sa.Column(
+            "created_by",
+            postgresql.UUID(as_uuid=True),
+            sa.ForeignKey("users.id", ondelete="SET NULL"),
+            nullable=True,
+        ),
+        sa.Column(
+            "status",
+            postgresql.ENUM(
+                "queued", "running", "completed", "failed",
+                name="bulk_onboard_job_status",
+                create_type=False,   # type was created (or verified) above
+            ),
+            nullable=False,
+            server_default="queued",
+            index=True,
+        ),
+        sa.Column("filename", sa.String(255), nullable=True),
+        sa.Column("csv_data", sa.LargeBinary, nullable=True),
+        sa.Column("total_rows", sa.Integer, nullable=True),
+        sa.Column("processed_rows", sa.Integer, nullable=False, server_default="0"),
+        sa.Column("created_count", sa.Integer, nullable=False, server_default="0"),
+        sa.Column("skipped_count", sa.Integer, nullable=False, server_default="0"),
+        sa.Column("error_count", sa.Integer, nullable=False, server_default="0"),
+        sa.Column("results", postgresql.JSONB, nullable=True),
+        sa.Column("error", sa.Text, nullable=True),
+        sa.Column("started_at", sa.DateTime(timezone=True), nullable=True),
+        sa.Column("finished_at", sa.DateTime(timezone=True), nullable=True),
+        sa.Column(
+            "created_at",
+            sa.DateTime(timezone=True),
+            server_default=sa.func.now(),
+            nullable=False,
+        ),
+        sa.Column(
+            "updated_at",
+            sa.DateTime(timezone=True),
+            server_default=sa.func.now(),
+            nullable=False,
+        ),
+    )
+    op.execute(
+        """
+        CREATE INDEX IF NOT EXISTS ix_bulk_onboard_jobs_pending
+        ON bulk_onboard_jobs (created_at)
+        WHERE status IN ('queued', 'running')
+        """
+    )
+
+
+def downgrade() -> None:
+    op.execute("DROP INDEX IF EXISTS ix_bulk_onboard_jobs_pending")
+    op.drop_table("bulk_onboard_jobs")
+    op.execute("DROP TYPE IF EXISTS bulk_onboard_job_status")
@@ -0,0 +1,102 @@
+"""016 – Composite and trigram indexes for profile browse / search
+
+GET /profiles/ previously had only single-column tenant_id / user_id
+indexes, so every browse or search scanned the whole tenant.
+
+  * ix_profiles_browse_active   – member browse: active profiles of one
+                                  gender, newest first (partial, status='active')
+  * ix_profiles_caste_active    – same, for caste-locked tenants
+  * ix_profiles_tenant_created  – admin browse (any status), newest first
+  * ix_profiles_city_trgm       – city ILIKE '%…%'   (pg_trgm GIN)
+  * ix_users_full_name_trgm     – full_name ILIKE '%…%' (pg_trgm GIN)
+  * ix_shortlists_from_created / ix_shortlists_to_created
+                                – sent / received interest lists, newest first
+
+The (created_at DESC, id DESC) suffix matches the keyset pagination order in
+app.pagination. The partial predicate is written as status = 'active'; the
+member browse query uses the same inline literal so generic (prepared)
+plans can still match the index.
+
+Indexes are built CONCURRENTLY so existing tables stay writable.
+
+Revision ID: 016
+Revises:     015
+Create Date: 2026-10-16
+"""
+
+from alembic import op
+
+revision = "016"
+down_revision = "015"
+branch_labels = None
+depends_on = None
+
+# (name, CREATE statement) – also loaded by tests/test_profile_search_indexes.py
+INDEXES = [
+    (
+        "ix_profiles_browse_active",
+        """
+        CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_profiles_browse_active
+        ON profiles (tenant_id, gender, created_at DESC, id DESC)
+        WHERE status = 'active'
+        """,
+    ),
+    (
+        "ix_profiles_caste_active",
+        """
+        CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_profiles_caste_active
+        ON profiles (tenant_id, caste, gender, created_at DESC, id DESC)
+        WHERE status = 'active'
+        """,
+    ),
+    (
+        "ix_profiles_tenant_created",
+        """
+        CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_profiles_tenant_created
+        ON profiles (tenant_id, created_at DESC, id DESC)
+        """,
+    ),
+    (
+        "ix_profiles_city_trgm",
+        """
+        CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_profiles_city_trgm
+        ON profiles USING gin (city gin_trgm_ops)
+        """,
+    ),
+    (
+        "ix_users_full_name_trgm",
+        """
+        CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_users_full_name_trgm
+        ON users USING gin (full_name gin_trgm_ops)
+        """,
+    ),
+    (
+        "ix_shortlists_from_created",
+        """
+        CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_shortlists_from_created
+        ON shortlists (from_profile_id, created_at DESC, id DESC)
+        """,
+    ),
+    (
+        "ix_shortlists_to_created",
+        """
+        CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_shortlists_to_created
+        ON shortlists (to_profile_id, created_at DESC, id DESC)
+        """,
+    ),
+]
+
+
+def upgrade() -> None:
+    op.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+    # CREATE INDEX CONCURRENTLY cannot run inside a transaction block
+    with op.get_context().autocommit_block():
+        for _, ddl in INDEXES:
+            op.execute(ddl)
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        for name, _ in reversed(INDEXES):
+            op.execute(f"DROP INDEX CONCURRENTLY IF EXISTS {name}")
+    # pg_trgm is left installed; other objects may depend on it.
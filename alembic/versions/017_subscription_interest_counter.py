@@ -0,0 +1,49 @@
+"""017 – Add member_subscriptions.interests_sent
+
+Per-subscription counter of interest requests sent since starts_at, so
+POST /shortlists/ enforces the plan quota with one conditional UPDATE
+instead of counting the member's shortlists on every request. The
+counter is backfilled here from existing shortlists.
+
+Revision ID: 017
+Revises:     016
+Create Date: 2026-10-16
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+revision = "017"
+down_revision = "016"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.add_column(
+        "member_subscriptions",
+        sa.Column(
+            "interests_sent",
+            sa.Integer(),
+            nullable=False,
+            server_default="0",
+            comment="Interest requests sent since starts_at (quota counter)",
+        ),
+    )
+    op.execute(
+        """
+        UPDATE member_subscriptions ms
+        SET    interests_sent = (
+                   SELECT count(*)
+                   FROM   shortlists s
+                   JOIN   profiles p ON p.id = s.from_profile_id
+                   WHERE  p.user_id = ms.user_id
+                     AND  s.created_at >= ms.starts_at
+               )
+        WHERE  ms.status = 'active'
+        """
+    )
+
+
+def downgrade() -> None:
+    op.drop_column("member_subscriptions", "interests_sent")
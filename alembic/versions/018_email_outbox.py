@@ -0,0 +1,101 @@
+"""018 – Add email_outbox
+
+Transactional email outbox. Requests insert the message in the same
+transaction as the change that triggers it; EmailOutboxWorker claims due
+rows with SELECT … FOR UPDATE SKIP LOCKED. The partial index covers only
+undelivered rows, so the claim query stays cheap as sent mail accumulates.
+
+Revision ID: 018
+Revises:     017
+Create Date: 2026-10-16
+"""
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+revision = "018"
+down_revision = "017"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    conn = op.get_bind()
+    row = conn.execute(
+        sa.text("SELECT 1 FROM pg_type WHERE typname = 'email_outbox_status'")
+    ).scalar()
+    if not row:
+        conn.execute(
+            sa.text(
+                "CREATE TYPE email_outbox_status AS ENUM "
+                "('pending', 'sending', 'sent', 'dead')"
+            )
+        )
+
+    op.create_table(
+        "email_outbox",
+        sa.Column("id", postgresql.UUID(as_uuid=True), primary_key=True),
+        sa.Column(
+            "tenant_id",
+            postgresql.UUID(as_uuid=True),
+            sa.ForeignKey("tenants.id", ondelete="CASCADE"),
+            nullable=True,
+            index=True,
+        ),
+        sa.Column("kind", sa.String(50), nullable=False),
+        sa.Column("to_email", sa.String(255), nullable=False),
+        sa.Column("payload", postgresql.JSONB, nullable=True),
+        sa.Column(
+            "status",
+            postgresql.ENUM(
+                "pending", "sending", "sent", "dead",
+                name="email_outbox_status",
+                create_type=False,   # type was created (or verified) above
+            ),
+            nullable=False,
+            server_default="pending",
+        ),
+        sa.Column("attempts", sa.Integer, nullable=False, server_default="0"),
+        sa.Column(
+            "next_attempt_at",
+            sa.DateTime(timezone=True),
+            server_default=sa.func.now(),
+            nullable=False,
+        ),
+        sa.Column("last_error", sa.Text, nullable=True),
+        sa.Column("sent_at", sa.DateTime(timezone=True), nullable=True),
+        sa.Column(
+            "created_at",
+            sa.DateTime(timezone=True),
+            server_default=sa.func.now(),
+            nullable=False,
+        ),
+        sa.Column(
+            "updated_at",
+            sa.DateTime(timezone=True),
+            server_default=sa.func.now(),
+            nullable=False,
+        ),
+    )
+    op.execute(
+        """
+        CREATE INDEX IF NOT EXISTS ix_email_outbox_due
+        ON email_outbox (next_attempt_at)
+        WHERE status IN ('pending', 'sending')
+        """
+    )
+    op.execute(
+        """
+        CREATE INDEX IF NOT EXISTS ix_email_outbox_dead
+        ON email_outbox (tenant_id, updated_at)
+        WHERE status = 'dead'
+        """
+    )
+
+
+def downgrade() -> None:
+    op.execute("DROP INDEX IF EXISTS ix_email_outbox_dead")
+    op.execute("DROP INDEX IF EXISTS ix_email_outbox_due")
+    op.drop_table("email_outbox")
+    op.execute("DROP TYPE IF EXISTS email_outbox_status")
@@ -0,0 +1,40 @@
+"""019 – Add scheduled_job_runs
+
+Run history for the leader-elected scheduler. The latest started_at per
+job decides when the job is next due, so (job, started_at) is indexed.
+
+Revision ID: 019
+Revises:     018
+Create Date: 2026-10-16
+"""
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+revision = "019"
+down_revision = "018"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "scheduled_job_runs",
+        sa.Column("id", postgresql.UUID(as_uuid=True), primary_key=True),
+        sa.Column("job", sa.String(100), nullable=False),
+        sa.Column("trigger", sa.String(20), nullable=False),
+        sa.Column("status", sa.String(20), nullable=False),
+        sa.Column("affected", sa.Integer, nullable=True),
+        sa.Column("error", sa.Text, nullable=True),
+        sa.Column("started_at", sa.DateTime(timezone=True), nullable=False),
+        sa.Column("finished_at", sa.DateTime(timezone=True), nullable=False),
+    )
+    op.create_index(
+        "ix_scheduled_job_runs_job_started", "scheduled_job_runs", ["job", "started_at"]
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_scheduled_job_runs_job_started", table_name="scheduled_job_runs")
+    op.drop_table("scheduled_job_runs")
@@ -0,0 +1,53 @@
+"""020 – Add sweep_checkpoints and a keyset index for subscription sweeps
+
+The subscription sweeps now walk active subscriptions in (expires_at, id)
+order, one chunk per transaction, and keep their cursor in
+sweep_checkpoints so an interrupted sweep resumes where it stopped. The
+partial index covers only active subscriptions, which is all either sweep
+ever reads.
+
+Revision ID: 020
+Revises:     019
+Create Date: 2026-10-16
+"""
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+revision = "020"
+down_revision = "019"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "sweep_checkpoints",
+        sa.Column("job", sa.String(100), primary_key=True),
+        sa.Column("cutoff", sa.DateTime(timezone=True), nullable=False),
+        sa.Column("after_expires_at", sa.DateTime(timezone=True), nullable=True),
+        sa.Column("after_id", postgresql.UUID(as_uuid=True), nullable=True),
+        sa.Column("processed", sa.Integer, nullable=False, server_default="0"),
+        sa.Column("chunks", sa.Integer, nullable=False, server_default="0"),
+        sa.Column("started_at", sa.DateTime(timezone=True), nullable=False),
+        sa.Column("completed_at", sa.DateTime(timezone=True), nullable=True),
+        sa.Column(
+            "updated_at",
+            sa.DateTime(timezone=True),
+            server_default=sa.func.now(),
+            nullable=False,
+        ),
+    )
+    op.execute(
+        """
+        CREATE INDEX IF NOT EXISTS ix_member_subscriptions_active_expires
+        ON member_subscriptions (expires_at, id)
+        WHERE status = 'active'
+        """
+    )
+
+
+def downgrade() -> None:
+    op.execute("DROP INDEX IF EXISTS ix_member_subscriptions_active_expires")
+    op.drop_table("sweep_checkpoints")
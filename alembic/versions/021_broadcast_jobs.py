@@ -0,0 +1,119 @@
+"""021 – Add broadcast_jobs and broadcast_deliveries
+
+Tenant-wide push broadcasts become background jobs processed page by page
+by BroadcastJobRunner. Recipients are read in users.id keyset order per
+tenant; the partial index covers only members a broadcast can reach.
+
+Revision ID: 021
+Revises:     020
+Create Date: 2026-10-16
+"""
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+revision = "021"
+down_revision = "020"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    conn = op.get_bind()
+    row = conn.execute(
+        sa.text("SELECT 1 FROM pg_type WHERE typname = 'broadcast_job_status'")
+    ).scalar()
+    if not row:
+        conn.execute(
+            sa.text(
+                "CREATE TYPE broadcast_job_status AS ENUM "
+                "('queued', 'running', 'completed', 'failed')"
+            )
+        )
+
+    op.create_table(
+        "broadcast_jobs",
+        sa.Column("id", postgresql.UUID(as_uuid=True), primary_key=True),
+        sa.Column(
+            "tenant_id",
+            postgresql.UUID(as_uuid=True),
+            sa.ForeignKey("tenants.id", ondelete="CASCADE"),
+            nullable=False,
+            index=True,
+        ),
+        sa.Column(
+            "created_by",
+            postgresql.UUID(as_uuid=True),
+            sa.ForeignKey("users.id", ondelete="SET NULL"),
+            nullable=True,
+        ),
+        sa.Column(
+            "status",
+            postgresql.ENUM(
+                "queued", "running", "completed", "failed",
+                name="broadcast_job_status",
+                create_type=False,   # type was created (or verified) above
+            ),
+            nullable=False,
+            server_default="queued",
+            index=True,
+        ),
+        sa.Column("title", sa.String(200), nullable=False),
+        sa.Column("body", sa.String(500), nullable=False),
+        sa.Column("data", postgresql.JSONB, nullable=True),
+        sa.Column("after_user_id", postgresql.UUID(as_uuid=True), nullable=True),
+        sa.Column("total_recipients", sa.Integer, nullable=True),
+        sa.Column("processed_count", sa.Integer, nullable=False, server_default="0"),
+        sa.Column("sent_count", sa.Integer, nullable=False, server_default="0"),
+        sa.Column("failed_count", sa.Integer, nullable=False, server_default="0"),
+        sa.Column("error", sa.Text, nullable=True),
+        sa.Column("started_at", sa.DateTime(timezone=True), nullable=True),
+        sa.Column("finished_at", sa.DateTime(timezone=True), nullable=True),
+        sa.Column(
+            "created_at",
+            sa.DateTime(timezone=True),
+            server_default=sa.func.now(),
+            nullable=False,
+        ),
+        sa.Column(
+            "updated_at",
+            sa.DateTime(timezone=True),
+            server_default=sa.func.now(),
+            nullable=False,
+        ),
+    )
+    op.execute(
+        """
+        CREATE INDEX IF NOT EXISTS ix_broadcast_jobs_pending
+        ON broadcast_jobs (created_at)
+        WHERE status IN ('queued', 'running')
+        """
+    )
+
+    op.create_table(
+        "broadcast_deliveries",
+        sa.Column(
+            "job_id",
+            postgresql.UUID(as_uuid=True),
+            sa.ForeignKey("broadcast_jobs.id", ondelete="CASCADE"),
+            primary_key=True,
+        ),
+        sa.Column("user_id", postgresql.UUID(as_uuid=True), primary_key=True),
+    )
+
+    op.execute(
+        """
+        CREATE INDEX IF NOT EXISTS ix_users_broadcast_recipients
+        ON users (tenant_id, id)
+        WHERE is_active AND fcm_token IS NOT NULL
+        """
+    )
+
+
+def downgrade() -> None:
+    op.execute("DROP INDEX IF EXISTS ix_users_broadcast_recipients")
+    op.drop_table("broadcast_deliveries")
+    op.execute("DROP INDEX IF EXISTS ix_broadcast_jobs_pending")
+    op.drop_table("broadcast_jobs")
+    op.execute("DROP TYPE IF EXISTS broadcast_job_status")
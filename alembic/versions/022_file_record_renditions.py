@@ -0,0 +1,76 @@
+"""022 – Add thumbnail/medium rendition columns to file_records
+
+Registered profile photos get WebP renditions generated by the thumbnail
+runner (services/thumbnails.py), which claims pending rows with
+SELECT … FOR UPDATE SKIP LOCKED; the partial index covers only those rows.
+Existing rows keep rendition_status NULL and are served as before.
+
+Revision ID: 022
+Revises:     021
+Create Date: 2026-10-16
+"""
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+revision = "022"
+down_revision = "021"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    conn = op.get_bind()
+    row = conn.execute(
+        sa.text("SELECT 1 FROM pg_type WHERE typname = 'rendition_status'")
+    ).scalar()
+    if not row:
+        conn.execute(
+            sa.text(
+                "CREATE TYPE rendition_status AS ENUM "
+                "('pending', 'processing', 'ready', 'failed')"
+            )
+        )
+
+    op.add_column(
+        "file_records",
+        sa.Column(
+            "rendition_status",
+            postgresql.ENUM(
+                "pending", "processing", "ready", "failed",
+                name="rendition_status",
+                create_type=False,   # type was created (or verified) above
+            ),
+            nullable=True,
+        ),
+    )
+    op.add_column("file_records", sa.Column("thumbnail_key", sa.String(1024), nullable=True))
+    op.add_column("file_records", sa.Column("medium_key", sa.String(1024), nullable=True))
+    op.add_column("file_records", sa.Column("rendition_error", sa.Text, nullable=True))
+    op.add_column(
+        "file_records",
+        sa.Column(
+            "updated_at",
+            sa.DateTime(timezone=True),
+            server_default=sa.func.now(),
+            nullable=False,
+        ),
+    )
+    op.execute(
+        """
+        CREATE INDEX IF NOT EXISTS ix_file_records_renditions_pending
+        ON file_records (created_at)
+        WHERE rendition_status IN ('pending', 'processing')
+        """
+    )
+
+
+def downgrade() -> None:
+    op.execute("DROP INDEX IF EXISTS ix_file_records_renditions_pending")
+    op.drop_column("file_records", "updated_at")
+    op.drop_column("file_records", "rendition_error")
+    op.drop_column("file_records", "medium_key")
+    op.drop_column("file_records", "thumbnail_key")
+    op.drop_column("file_records", "rendition_status")
+    op.execute("DROP TYPE IF EXISTS rendition_status")
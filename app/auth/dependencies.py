@@ -2,14 +2,23 @@
 auth/dependencies.py – FastAPI dependencies for authentication & authorisation.
 
 Usage in routers:
-    @router.get("/me")
-    async def get_me(current_user: Annotated[User, Depends(get_current_user)]):
+    # Read-only access to the caller (id / tenant / role) – served from the
+    # principal cache when warm, no users query:
+    @router.get("/profiles/")
+    async def list_profiles(
+        current_user: Annotated[UserPrincipal, Depends(get_current_principal)]
+    ):
+        ...
+
+    # Handlers that modify the caller's own row need the ORM object:
+    @router.patch("/me")
+    async def update_me(current_user: Annotated[User, Depends(get_current_user)]):
         ...
 
     # Require admin or above:
     @router.post("/admins")
     async def create_admin(
-        _: Annotated[User, Depends(require_admin)]
+        _: Annotated[UserPrincipal, Depends(require_admin)]
     ):
         ...
 """
@@ -24,16 +33,43 @@ from jose import JWTError
 from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.auth.jwt import decode_token
+from app.auth.jwt import TokenPayload, decode_token
+from app.auth.principal import UserPrincipal, cache_principal, principal_cache
+from app.cache import MISSING
+from app.config import get_settings
 from app.database import get_db
 from app.models.user import User, UserRole
 
 log = structlog.get_logger(__name__)
+settings = get_settings()
 
 # OAuth2 bearer scheme – reads Authorization: Bearer <token>
 _bearer = HTTPBearer(auto_error=True)
 
 
+_credentials_exception = HTTPException(
+    status_code=status.HTTP_401_UNAUTHORIZED,
+    detail="Could not validate credentials.",
+    headers={"WWW-Authenticate": "Bearer"},
+)
+
+
+def _decode_access_token(credentials: HTTPAuthorizationCredentials) -> TokenPayload:
+    """Verify signature + expiry and reject refresh tokens."""
+    try:
+        payload = decode_token(credentials.credentials)
+    except JWTError as exc:
+        log.warning("jwt_decode_error", error=str(exc))
+        raise _credentials_exception
+
+    if payload.typ != "access":
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Invalid token type. Use an access token.",
+        )
+    return payload
+
+
 async def get_current_user(
     credentials: Annotated[HTTPAuthorizationCredentials, Depends(_bearer)],
     db: Annotated[AsyncSession, Depends(get_db)],
@@ -45,41 +81,61 @@ async def get_current_user(
       1. Decode token (verify signature + expiry).
       2. Confirm token type is 'access' (reject refresh tokens here).
       3. Load user from DB and confirm they are still active.
-    """
-    credentials_exception = HTTPException(
-        status_code=status.HTTP_401_UNAUTHORIZED,
-        detail="Could not validate credentials.",
-        headers={"WWW-Authenticate": "Bearer"},
-    )
-    try:
-        payload = decode_token(credentials.credentials)
-    except JWTError as exc:
-        log.warning("jwt_decode_error", error=str(exc))
-        raise credentials_exception
 
-    if payload.typ != "access":
-        raise HTTPException(
-            status_code=status.HTTP_401_UNAUTHORIZED,
-            detail="Invalid token type. Use an access token.",
-        )
+    Always hits the DB; use get_current_principal unless the handler needs
+    to modify the user row.
+    """
+    payload = _decode_access_token(credentials)
 
     # Load user from the DB (ensures account hasn't been deleted/deactivated)
     result = await db.execute(select(User).where(User.id == uuid.UUID(payload.sub)))
     user = result.scalar_one_or_none()
 
     if user is None or not user.is_active:
-        raise credentials_exception
+        raise _credentials_exception
 
+    cache_principal(user)  # refresh the fast path while we have the row
     return user
 
 
+async def get_current_principal(
+    credentials: Annotated[HTTPAuthorizationCredentials, Depends(_bearer)],
+    db: Annotated[AsyncSession, Depends(get_db)],
+) -> UserPrincipal:
+    """
+    Validate Bearer JWT and return a UserPrincipal for the caller.
+
+    Token-claims fast path: the `sub` claim keys the per-worker principal
+    cache; on a hit no query is issued. On a miss (or when
+    AUTH_PRINCIPAL_CACHE_ENABLED is False) the user row is loaded exactly
+    as get_current_user does and the resulting principal is cached.
+    """
+    payload = _decode_access_token(credentials)
+    user_id = uuid.UUID(payload.sub)
+
+    if settings.AUTH_PRINCIPAL_CACHE_ENABLED:
+        principal = principal_cache.get(user_id)
+        if principal is not MISSING:
+            if not principal.is_active:
+                raise _credentials_exception
+            return principal
+
+    result = await db.execute(select(User).where(User.id == user_id))
+    user = result.scalar_one_or_none()
+
+    if user is None or not user.is_active:
+        raise _credentials_exception
+
+    return cache_principal(user)
+
+
 # ── Role-based shortcuts ───────────────────────────────────────────────────────
 def _role_guard(*allowed_roles: UserRole):
     """Factory that returns a dependency ensuring the user has one of the given roles."""
 
     async def _check(
-        current_user: Annotated[User, Depends(get_current_user)],
-    ) -> User:
+        current_user: Annotated[UserPrincipal, Depends(get_current_principal)],
+    ) -> UserPrincipal:
         if current_user.role not in allowed_roles:
             raise HTTPException(
                 status_code=status.HTTP_403_FORBIDDEN,
@@ -0,0 +1,141 @@
+"""
+auth/passwords.py – bcrypt hashing and verification off the event loop.
+
+bcrypt at cost 12 takes ~250 ms of CPU. Called directly inside an async
+handler it blocks the whole Uvicorn worker, so a burst of /auth/login calls
+stalls every other request on that worker. All hashing goes through the
+module-level PasswordHasher instead:
+
+  - work runs in a dedicated, bounded ThreadPoolExecutor (bcrypt releases
+    the GIL while hashing, so threads give real parallelism);
+  - an asyncio.Semaphore caps in-flight operations; callers beyond the cap
+    wait on the loop, where cancellation (client gone) is still possible;
+  - queue time (call → thread start) and run time are recorded for
+    /admin/metrics;
+  - verify_and_update() reports a fresh hash when the stored one was made
+    with a different cost than PASSWORD_BCRYPT_ROUNDS, so login can upgrade
+    it transparently.
+
+Usage:
+    hashed = await hash_password("s3cret!")
+    ok, new_hash = await password_hasher.verify_and_update(plain, user.hashed_password)
+"""
+
+import asyncio
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, TypeVar
+
+import bcrypt as _bcrypt
+
+from app.config import get_settings
+
+settings = get_settings()
+
+T = TypeVar("T")
+
+
+def _cost_of(hashed: str) -> int | None:
+    """Extract the cost factor from a "$2b$12$..." hash, or None if malformed."""
+    parts = hashed.split("$")
+    try:
+        return int(parts[2])
+    except (IndexError, ValueError):
+        return None
+
+
+class PasswordHasher:
+    """Bounded executor + concurrency limit around bcrypt."""
+
+    def __init__(self, *, rounds: int, max_workers: int, max_concurrency: int) -> None:
+        self.rounds = rounds
+        self.max_workers = max_workers
+        self.max_concurrency = max_concurrency
+        self._executor = ThreadPoolExecutor(
+            max_workers=max_workers, thread_name_prefix="bcrypt"
+        )
+        self._semaphore = asyncio.Semaphore(max_concurrency)
+        # Counters
+        self.in_flight = 0
+        self.calls = 0
+        self.rehashes = 0
+        self.queue_ms_total = 0.0
+        self.queue_ms_max = 0.0
+        self.run_ms_total = 0.0
+
+    async def _run(self, fn: Callable[..., T], *args) -> T:
+        submitted = time.perf_counter()
+        started = 0.0
+
+        def _timed() -> T:
+            nonlocal started
+            started = time.perf_counter()
+            return fn(*args)
+
+        self.in_flight += 1
+        try:
+            async with self._semaphore:
+                loop = asyncio.get_running_loop()
+                result = await loop.run_in_executor(self._executor, _timed)
+        finally:
+            self.in_flight -= 1
+
+        queue_ms = (started - submitted) * 1000
+        self.calls += 1
+        self.queue_ms_total += queue_ms
+        self.queue_ms_max = max(self.queue_ms_max, queue_ms)
+        self.run_ms_total += (time.perf_counter() - started) * 1000
+        return result
+
+    # ── Public API ────────────────────────────────────────────────────────────
+    async def hash(self, plain: str) -> str:
+        hashed = await self._run(_bcrypt.hashpw, plain.encode(), _bcrypt.gensalt(self.rounds))
+        return hashed.decode()
+
+    async def verify(self, plain: str, hashed: str) -> bool:
+        return await self._run(_bcrypt.checkpw, plain.encode(), hashed.encode())
+
+    def needs_rehash(self, hashed: str) -> bool:
+        return _cost_of(hashed) != self.rounds
+
+    async def verify_and_update(self, plain: str, hashed: str) -> tuple[bool, str | None]:
+        """
+        Verify a password; on success also return a replacement hash if the
+        stored one used a different cost (otherwise None).
+        """
+        if not await self.verify(plain, hashed):
+            return False, None
+        if not self.needs_rehash(hashed):
+            return True, None
+        self.rehashes += 1
+        return True, await self.hash(plain)
+
+    def stats(self) -> dict:
+        """Counters for the /admin/metrics endpoint."""
+        return {
+            "rounds": self.rounds,
+            "max_workers": self.max_workers,
+            "max_concurrency": self.max_concurrency,
+            "in_flight": self.in_flight,
+            "calls": self.calls,
+            "rehashes": self.rehashes,
+            "avg_queue_ms": round(self.queue_ms_total / self.calls, 2) if self.calls else 0.0,
+            "max_queue_ms": round(self.queue_ms_max, 2),
+            "avg_run_ms": round(self.run_ms_total / self.calls, 2) if self.calls else 0.0,
+        }
+
+
+# One hasher (and thread pool) per worker process
+password_hasher = PasswordHasher(
+    rounds=settings.PASSWORD_BCRYPT_ROUNDS,
+    max_workers=settings.PASSWORD_HASH_WORKERS,
+    max_concurrency=settings.PASSWORD_HASH_MAX_CONCURRENCY,
+)
+
+
+async def hash_password(plain: str) -> str:
+    return await password_hasher.hash(plain)
+
+
+async def verify_password(plain: str, hashed: str) -> bool:
+    return await password_hasher.verify(plain, hashed)
@@ -0,0 +1,97 @@
+"""
+cache.py – Small in-process caches shared by the auth, tenant and media layers.
+
+Design notes:
+ 1. One TTLCache instance per concern (principals, tenants, …), created at
+    import time so every request handled by a worker process shares it.
+ 2. Bounded: once max_size entries are held the least-recently-used entry
+    is evicted, so memory stays flat regardless of traffic shape.
+ 3. Entries expire after ttl_seconds; expiry is checked lazily on read.
+ 4. Not shared across Gunicorn workers – each worker has its own copy, so
+    callers must treat the TTL as the upper bound on cross-worker staleness
+    and invalidate explicitly on writes they perform themselves.
+"""
+
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Hashable
+
+# Sentinel returned by get() on a miss so that None can be cached as a value
+# (used for negative caching, e.g. "this slug does not exist").
+MISSING: Any = object()
+
+
+class TTLCache:
+    """
+    Bounded LRU cache with a per-entry time-to-live.
+
+    Usage:
+        cache = TTLCache("principals", max_size=10_000, ttl_seconds=30)
+        value = cache.get(key)
+        if value is MISSING:
+            value = await load(key)
+            cache.set(key, value)
+    """
+
+    def __init__(self, name: str, *, max_size: int, ttl_seconds: float) -> None:
+        self.name = name
+        self.max_size = max_size
+        self.ttl_seconds = ttl_seconds
+        self._data: OrderedDict[Hashable, tuple[float, Any]] = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(self, key: Hashable) -> Any:
+        """Return the cached value, or MISSING if absent or expired."""
+        entry = self._data.get(key)
+        if entry is None:
+            self.misses += 1
+            return MISSING
+        expires_at, value = entry
+        if expires_at <= time.monotonic():
+            del self._data[key]
+            self.misses += 1
+            return MISSING
+        self._data.move_to_end(key)
+        self.hits += 1
+        return value
+
+    def set(self, key: Hashable, value: Any, ttl_seconds: float | None = None) -> None:
+        """Store value under key; evicts the least-recently-used entry when full."""
+        ttl = self.ttl_seconds if ttl_seconds is None else ttl_seconds
+        self._data[key] = (time.monotonic() + ttl, value)
+        self._data.move_to_end(key)
+        while len(self._data) > self.max_size:
+            self._data.popitem(last=False)
+            self.evictions += 1
+
+    def invalidate(self, key: Hashable) -> None:
+        """Drop a single entry (no-op if absent)."""
+        self._data.pop(key, None)
+
+    def invalidate_where(self, predicate: Callable[[Hashable, Any], bool]) -> int:
+        """Drop every entry for which predicate(key, value) is true; returns the count."""
+        doomed = [k for k, (_, v) in self._data.items() if predicate(k, v)]
+        for k in doomed:
+            del self._data[k]
+        return len(doomed)
+
+    def clear(self) -> None:
+        self._data.clear()
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def stats(self) -> dict:
+        """Counters for the /admin/metrics endpoint."""
+        lookups = self.hits + self.misses
+        return {
+            "size": len(self._data),
+            "max_size": self.max_size,
+            "ttl_seconds": self.ttl_seconds,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "hit_ratio": round(self.hits / lookups, 4) if lookups else 0.0,
+        }
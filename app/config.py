@@ -29,13 +29,115 @@ class Settings(BaseSettings):
     ACCESS_TOKEN_EXPIRE_MINUTES: int = 60
     REFRESH_TOKEN_EXPIRE_DAYS: int = 7
 
+    # ── Password hashing ──────────────────────────────────────────────────────
+    # bcrypt runs in a per-worker thread pool. Changing the rounds upgrades
+    # stored hashes on the user's next successful login.
+    PASSWORD_BCRYPT_ROUNDS: int = 12
+    PASSWORD_HASH_WORKERS: int = 4
+    PASSWORD_HASH_MAX_CONCURRENCY: int = 32
+
+    # ── Auth principal cache ──────────────────────────────────────────────────
+    # Per-worker cache of the authenticated user (id, tenant, role, is_active)
+    # so authenticated requests skip the users lookup. Writes that change a
+    # user invalidate locally; other workers converge within the TTL.
+    AUTH_PRINCIPAL_CACHE_ENABLED: bool = True
+    AUTH_PRINCIPAL_CACHE_TTL_SECONDS: int = 30
+    AUTH_PRINCIPAL_CACHE_MAX_SIZE: int = 10_000
+
+    # ── Tenant registry cache ─────────────────────────────────────────────────
+    # Tenant rows resolved by TenantMiddleware and read by routers. Unknown
+    # ids / slugs are cached for the (shorter) negative TTL.
+    TENANT_CACHE_TTL_SECONDS: int = 60
+    TENANT_CACHE_NEGATIVE_TTL_SECONDS: int = 10
+    TENANT_CACHE_MAX_SIZE: int = 2_000
+
+    # ── Viewer context cache ──────────────────────────────────────────────────
+    # Per-worker cache of a browsing member's profile id / gender / caste and
+    # the tenant's caste lock (see services/viewer_context.py).
+    VIEWER_CONTEXT_CACHE_TTL_SECONDS: int = 30
+    VIEWER_CONTEXT_CACHE_MAX_SIZE: int = 10_000
+    # Per-worker match index of active profiles (see services/match_index.py);
+    # the TTL bounds staleness for writes made by other workers.
+    MATCH_INDEX_TTL_SECONDS: int = 900
+    MATCH_INDEX_MAX_TENANTS: int = 200
+
+    # ── List pagination ───────────────────────────────────────────────────────
+    # ?count=cached on browse endpoints reuses a total computed within the TTL.
+    PAGE_TOTAL_CACHE_TTL_SECONDS: int = 60
+    PAGE_TOTAL_CACHE_MAX_SIZE: int = 5_000
+
+    # ── Interest quota ────────────────────────────────────────────────────────
+    # Plan interest limits (max_interests, name) cached per plan template;
+    # plan edits invalidate locally (see services/interest_quota.py).
+    PLAN_LIMIT_CACHE_TTL_SECONDS: int = 300
+    PLAN_LIMIT_CACHE_MAX_SIZE: int = 1_000
+
+    # ── Audit log writer ──────────────────────────────────────────────────────
+    # Rows are queued in-process and inserted in batches. Overflow policy:
+    # drop_newest | drop_oldest | block (waits AUDIT_BLOCK_TIMEOUT_MS, then drops)
+    AUDIT_BATCH_SIZE: int = 200
+    AUDIT_FLUSH_INTERVAL_MS: int = 250
+    AUDIT_QUEUE_MAX_SIZE: int = 10_000
+    AUDIT_OVERFLOW_POLICY: str = Field(
+        "drop_newest", pattern="^(drop_newest|drop_oldest|block)$"
+    )
+    AUDIT_BLOCK_TIMEOUT_MS: int = 100
+    AUDIT_DRAIN_TIMEOUT_SECONDS: int = 10
+
+    # ── Bulk member onboarding ────────────────────────────────────────────────
+    BULK_ONBOARD_CHUNK_SIZE: int = 500          # CSV rows per set-based batch
+    # Async job mode (POST /users/onboard/bulk/jobs): a running job whose
+    # heartbeat is older than the stale threshold is resumed by another runner.
+    BULK_ONBOARD_JOB_POLL_SECONDS: int = 5
+    BULK_ONBOARD_JOB_STALE_SECONDS: int = 300
+    BULK_ONBOARD_JOB_DRAIN_TIMEOUT_SECONDS: int = 30
+
+    # ── Scheduler ─────────────────────────────────────────────────────────────
+    # Periodic jobs run on one worker only – the holder of the Postgres
+    # advisory lock SCHEDULER_LOCK_KEY (see services/scheduler.py).
+    SCHEDULER_ENABLED: bool = True
+    SCHEDULER_TICK_SECONDS: int = 30
+    SCHEDULER_JITTER_SECONDS: int = 60
+    SCHEDULER_RUN_ON_START: bool = True       # run overdue jobs as soon as a leader is elected
+    SCHEDULER_LOCK_KEY: int = 7_310_001
+    SCHEDULER_DRAIN_TIMEOUT_SECONDS: int = 30
+    SUBSCRIPTION_EXPIRY_INTERVAL_SECONDS: int = 3600
+    SUBSCRIPTION_WARNING_INTERVAL_SECONDS: int = 86400
+    SUBSCRIPTION_SWEEP_CHUNK_SIZE: int = 500    # subscriptions per sweep transaction
+
     # ── AWS ───────────────────────────────────────────────────────────────────
     AWS_REGION: str = "ap-south-1"
     AWS_ACCESS_KEY_ID: str = ""
     AWS_SECRET_ACCESS_KEY: str = ""
     S3_BUCKET_NAME: str = "varanbook-media"
     S3_PRESIGNED_URL_EXPIRY: int = 3600  # seconds
+    # Display URLs (GET /files/presign-get) are reused per worker until
+    # S3_PRESIGN_CACHE_MARGIN_SECONDS before they expire.
+    S3_PRESIGNED_GET_EXPIRY: int = 900
+    S3_PRESIGN_CACHE_MARGIN_SECONDS: int = 120
+    S3_PRESIGN_CACHE_MAX_SIZE: int = 20_000
+    S3_PRESIGN_BATCH_MAX_KEYS: int = 100
+    # Profile photo renditions (services/thumbnails.py). MEDIA_STORAGE_BACKEND
+    # "local" keeps object bytes under MEDIA_LOCAL_ROOT instead of S3.
+    MEDIA_STORAGE_BACKEND: str = "s3"               # "s3" | "local"
+    MEDIA_LOCAL_ROOT: str = "./media"
+    MEDIA_THUMBNAIL_PX: int = 320                   # longest edge, browse cards
+    MEDIA_MEDIUM_PX: int = 1080                     # longest edge, profile page
+    MEDIA_WEBP_QUALITY: int = 80
+    MEDIA_RENDITION_PROCESSES: int = 2              # Pillow worker processes per app worker
+    MEDIA_RENDITION_POLL_SECONDS: int = 5
+    MEDIA_RENDITION_STALE_SECONDS: int = 300
+    MEDIA_RENDITION_DRAIN_TIMEOUT_SECONDS: int = 30
     SQS_NOTIFICATION_QUEUE_URL: str = ""
+    SQS_ENDPOINT_URL: str = ""                  # local SQS stand-in (ElasticMQ / LocalStack)
+    # Broadcast jobs (POST /notifications/broadcast): a running job whose
+    # heartbeat is older than the stale threshold is resumed by another runner.
+    NOTIFICATION_BROADCAST_PAGE_SIZE: int = 500       # recipients per committed page
+    NOTIFICATION_BROADCAST_CONCURRENCY: int = 8       # send_message_batch calls in flight
+    NOTIFICATION_BROADCAST_MAX_RETRIES: int = 3       # per Failed entry
+    NOTIFICATION_BROADCAST_JOB_POLL_SECONDS: int = 5
+    NOTIFICATION_BROADCAST_JOB_STALE_SECONDS: int = 300
+    NOTIFICATION_BROADCAST_JOB_DRAIN_TIMEOUT_SECONDS: int = 30
 
     # ── Tenant resolution ─────────────────────────────────────────────────────
     # Header or subdomain strategy; header is simpler for API-first.
@@ -53,7 +155,26 @@ class Settings(BaseSettings):
     SMTP_USERNAME: str = ""
     SMTP_PASSWORD: str = ""
     SMTP_FROM: str = "noreply@example.com"
+    SMTP_STARTTLS: bool = True
+    SMTP_TIMEOUT_SECONDS: int = 30
+    # Persistent sessions per worker (services/smtp_pool.py); sessions are
+    # recycled after the idle timeout or message cap.
+    SMTP_POOL_SIZE: int = 5
+    SMTP_POOL_IDLE_SECONDS: int = 60
+    SMTP_POOL_MAX_MESSAGES_PER_CONNECTION: int = 100
     APP_FRONTEND_URL: str = "http://localhost:5173"
+    # Outbox delivery (see services/email_outbox.py). Failed sends retry with
+    # exponential backoff and are dead-lettered after MAX_ATTEMPTS; the
+    # tenant rate limit applies per worker process.
+    EMAIL_OUTBOX_POLL_SECONDS: int = 5
+    EMAIL_OUTBOX_BATCH_SIZE: int = 50
+    EMAIL_OUTBOX_CONCURRENCY: int = 5           # parallel sends; match SMTP_POOL_SIZE
+    EMAIL_OUTBOX_LEASE_SECONDS: int = 300       # a claimed row is re-sent after this
+    EMAIL_OUTBOX_MAX_ATTEMPTS: int = 6
+    EMAIL_OUTBOX_BACKOFF_BASE_SECONDS: int = 30
+    EMAIL_OUTBOX_BACKOFF_MAX_SECONDS: int = 3600
+    EMAIL_OUTBOX_TENANT_RATE_PER_MINUTE: int = 60
+    EMAIL_OUTBOX_DRAIN_TIMEOUT_SECONDS: int = 20
 
     # ── Firebase Phone Auth (OTP verification) ────────────────────────────────
     # Set FIREBASE_OTP_ENABLED=true in production to enforce phone OTP.
@@ -4,13 +4,11 @@ main.py – FastAPI application factory and startup/shutdown lifecycle.
 Patterns used:
   - Lifespan context manager (replaces deprecated on_event handlers)
   - CORS middleware configured from settings
-  - TenantMiddleware for multi-tenant header/subdomain resolution
+  - Pure-ASGI middlewares for tenant resolution, audit and request context
   - Structured JSON logging with structlog
   - Global exception handler for clean error responses
 """
 
-import asyncio
-import time
 from contextlib import asynccontextmanager
 from typing import AsyncIterator
 
@@ -28,8 +26,9 @@ from app.config import get_settings
 from app.database import engine, Base
 from app.middleware.audit import AuditMiddleware
 from app.middleware.rate_limit import limiter
+from app.middleware.request_context import RequestContextMiddleware
 from app.middleware.tenant import TenantMiddleware
-from app.routers import files, notifications, profiles, tenant
+from app.routers import email_outbox, files, metrics, notifications, profiles, tenant
 from app.routers.users import auth_router, users_router
 from app.routers.shortlist import router as shortlist_router
 from app.routers.partner_preference import router as partner_pref_router
@@ -37,6 +36,13 @@ from app.routers.castes import router as castes_router
 from app.routers.membership_plans import admin_router as plan_admin_router
 from app.routers.membership_plans import router as membership_router
 from app.routers.public import router as public_router, self_reg_router
+from app.services.audit_writer import audit_writer
+from app.services.broadcast_jobs import broadcast_job_runner
+from app.services.email_outbox import email_outbox_worker
+from app.services.onboarding_jobs import onboarding_job_runner
+from app.services.thumbnails import thumbnail_runner
+from app.services.scheduler import scheduler
+from app.services.smtp_pool import close_smtp_pool
 
 # ── Configure structured logging ───────────────────────────────────────────────
 structlog.configure(
@@ -70,113 +76,29 @@ async def lifespan(app: FastAPI) -> AsyncIterator[None]:
         await conn.execute(text("SELECT 1"))
     log.info("db_connected")
 
-    # ── Background task: expire subscriptions hourly ───────────────────────────
-    async def _expiry_loop() -> None:
-        """
-        Every hour:
-          1. Flip status='expired' for overdue active subscriptions.
-          2. Send an expiry email to each affected member.
-        """
-        while True:
-            await asyncio.sleep(3600)
-            try:
-                async with engine.begin() as conn:
-                    # RETURNING gives us the user_id + plan for email dispatch
-                    rows = await conn.execute(
-                        text(
-                            """
-                            UPDATE member_subscriptions ms
-                            SET    status = 'expired'
-                            FROM   membership_plan_templates pt,
-                                   users u
-                            WHERE  ms.plan_template_id = pt.id
-                              AND  ms.user_id          = u.id
-                              AND  ms.status           = 'active'
-                              AND  ms.expires_at       < NOW()
-                            RETURNING u.email, u.full_name, pt.name AS plan_name
-                            """
-                        )
-                    )
-                expired = rows.fetchall()
-                if expired:
-                    log.info("subscriptions_expired", count=len(expired))
-                    from app.services.email import EmailService
-                    for row in expired:
-                        try:
-                            await EmailService.send_subscription_expired(
-                                to_email=row.email,
-                                full_name=row.full_name,
-                                plan_name=row.plan_name,
-                            )
-                        except Exception as mail_exc:
-                            log.warning(
-                                "expiry_email_failed",
-                                email=row.email,
-                                error=str(mail_exc),
-                            )
-            except Exception as exc:
-                log.warning("subscription_expiry_failed", error=str(exc))
-
-    # ── Background task: 3-day expiry warning (daily) ─────────────────────────
-    async def _warning_loop() -> None:
-        """
-        Every 24 hours: find active subscriptions expiring within 3 days
-        that haven't been warned yet, send a warning email, and flip the flag.
-        """
-        while True:
-            await asyncio.sleep(86400)
-            try:
-                async with engine.begin() as conn:
-                    rows = await conn.execute(
-                        text(
-                            """
-                            UPDATE member_subscriptions ms
-                            SET    expiry_warning_sent = TRUE
-                            FROM   membership_plan_templates pt,
-                                   users u
-                            WHERE  ms.plan_template_id    = pt.id
-                              AND  ms.user_id             = u.id
-                              AND  ms.status              = 'active'
-                              AND  ms.expiry_warning_sent = FALSE
-                              AND  ms.expires_at          BETWEEN NOW() AND NOW() + INTERVAL '3 days'
-                            RETURNING u.email, u.full_name, pt.name AS plan_name,
-                                      ms.expires_at
-                            """
-                        )
-                    )
-                warned = rows.fetchall()
-                if warned:
-                    log.info("expiry_warnings_sent", count=len(warned))
-                    from app.services.email import EmailService
-                    for row in warned:
-                        try:
-                            expires_on = row.expires_at.strftime("%d %b %Y")
-                            await EmailService.send_subscription_expiry_warning(
-                                to_email=row.email,
-                                full_name=row.full_name,
-                                plan_name=row.plan_name,
-                                expires_on=expires_on,
-                            )
-                        except Exception as mail_exc:
-                            log.warning(
-                                "warning_email_failed",
-                                email=row.email,
-                                error=str(mail_exc),
-                            )
-            except Exception as exc:
-                log.warning("subscription_warning_failed", error=str(exc))
-
-    expiry_task = asyncio.create_task(_expiry_loop())
-    warning_task = asyncio.create_task(_warning_loop())
+    # Batched audit-log writer (drained on shutdown)
+    audit_writer.start()
+    # DB-backed bulk onboarding jobs (resumes jobs left by a dead worker)
+    onboarding_job_runner.start()
+    # DB-backed push broadcasts (resumes broadcasts left by a dead worker)
+    broadcast_job_runner.start()
+    # Transactional email outbox (retries, dead-lettering, tenant rate limits)
+    email_outbox_worker.start()
+    # WebP renditions of newly registered profile photos (process pool)
+    thumbnail_runner.start()
+    # Periodic jobs (subscription expiry / warning sweeps) on the elected leader
+    if settings.SCHEDULER_ENABLED:
+        scheduler.start()
 
     yield  # ── application runs here ──────────────────────────────────────────
 
-    expiry_task.cancel()
-    warning_task.cancel()
-    try:
-        await asyncio.gather(expiry_task, warning_task, return_exceptions=True)
-    except asyncio.CancelledError:
-        pass
+    await scheduler.stop(timeout=settings.SCHEDULER_DRAIN_TIMEOUT_SECONDS)
+    await onboarding_job_runner.stop(timeout=settings.BULK_ONBOARD_JOB_DRAIN_TIMEOUT_SECONDS)
+    await broadcast_job_runner.stop(timeout=settings.NOTIFICATION_BROADCAST_JOB_DRAIN_TIMEOUT_SECONDS)
+    await email_outbox_worker.stop(timeout=settings.EMAIL_OUTBOX_DRAIN_TIMEOUT_SECONDS)
+    await thumbnail_runner.stop(timeout=settings.MEDIA_RENDITION_DRAIN_TIMEOUT_SECONDS)
+    await close_smtp_pool()
+    await audit_writer.stop(timeout=settings.AUDIT_DRAIN_TIMEOUT_SECONDS)
     await engine.dispose()
     log.info("shutdown", app=settings.APP_NAME)
 
@@ -223,23 +145,8 @@ def create_app() -> FastAPI:
     app.add_middleware(TenantMiddleware)
     # ── Audit logging ────────────────────────────────────────────────────
     app.add_middleware(AuditMiddleware)
-    # ── Request ID + timing middleware ─────────────────────────────────────────
-    @app.middleware("http")
-    async def request_context_middleware(request: Request, call_next):
-        import uuid as _uuid
-        request_id = str(_uuid.uuid4())
-        structlog.contextvars.clear_contextvars()
-        structlog.contextvars.bind_contextvars(
-            request_id=request_id,
-            path=request.url.path,
-            method=request.method,
-        )
-        start = time.perf_counter()
-        response = await call_next(request)
-        elapsed_ms = round((time.perf_counter() - start) * 1000, 2)
-        response.headers["X-Request-ID"] = request_id
-        log.info("request_complete", status=response.status_code, elapsed_ms=elapsed_ms)
-        return response
+    # ── Request ID + timing (outermost, so its log context covers the rest) ──
+    app.add_middleware(RequestContextMiddleware)
 
     # ── Global exception handler ───────────────────────────────────────────────
     @app.exception_handler(Exception)
@@ -279,6 +186,8 @@ def create_app() -> FastAPI:
     app.include_router(castes_router)
     app.include_router(public_router)
     app.include_router(self_reg_router)
+    app.include_router(metrics.router)
+    app.include_router(email_outbox.router)
     # ── Health check ──────────────────────────────────────────────────────────
     @app.get("/health", tags=["Health"], summary="Liveness probe")
     async def health() -> dict:
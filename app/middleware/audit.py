@@ -1,12 +1,13 @@
 """
 middleware/audit.py – Request-level audit logging middleware.
 
-Writes one AuditLog row per mutating request (POST, PUT, PATCH, DELETE).
+Records one AuditLog row per mutating request (POST, PUT, PATCH, DELETE).
 GET requests are not logged here; sensitive reads can call log_action() directly.
 
-The DB session is obtained directly via the engine (not via the FastAPI
-dependency graph) so that the audit row is committed even if the main
-handler raises an exception.
+Rows are handed to the batched audit writer (app.services.audit_writer),
+which inserts them outside the request path and independently of the
+request's own DB session. If the writer is not running (no lifespan, e.g.
+tests and scripts) the row is inserted inline instead.
 """
 
 from __future__ import annotations
@@ -16,78 +17,82 @@ import uuid
 from typing import Any
 
 import structlog
-from sqlalchemy import text
-from starlette.middleware.base import BaseHTTPMiddleware
-from starlette.requests import Request
-from starlette.responses import Response
-from starlette.types import ASGIApp
+from starlette.datastructures import Headers
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
 
-from app.database import AsyncSessionLocal
 from app.models.audit_log import AuditLog
+from app.services.audit_writer import audit_writer, insert_audit_rows
 
 logger = structlog.get_logger(__name__)
 
 _MUTATING_METHODS = {"POST", "PUT", "PATCH", "DELETE"}
 
 
-class AuditMiddleware(BaseHTTPMiddleware):
+class AuditMiddleware:
     """
     After each mutating HTTP request completes, persist an AuditLog row.
 
     Tenant + user context are harvested from request.state (populated by
     TenantMiddleware and auth dependencies respectively).
+
+    Pure ASGI: the status code is captured from the http.response.start
+    message and the row is queued once the response has been sent, so
+    the client never waits on the audit insert.
     """
 
     def __init__(self, app: ASGIApp) -> None:
-        super().__init__(app)
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http" or scope["method"] not in _MUTATING_METHODS:
+            await self.app(scope, receive, send)
+            return
 
-    async def dispatch(self, request: Request, call_next: Any) -> Response:
         start = time.monotonic()
-        response: Response = await call_next(request)
-        duration_ms = int((time.monotonic() - start) * 1000)
+        status_code = 500
 
-        if request.method not in _MUTATING_METHODS:
-            return response
+        async def send_wrapper(message: Message) -> None:
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+            await send(message)
+
+        await self.app(scope, receive, send_wrapper)
+        duration_ms = int((time.monotonic() - start) * 1000)
 
         # Best-effort – never fail the real response
         try:
-            await self._write_audit(request, response.status_code, duration_ms)
+            row = self._build_row(scope, status_code, duration_ms)
+            if audit_writer.running:
+                await audit_writer.submit(row)
+            else:
+                await insert_audit_rows([row])
         except Exception as exc:  # noqa: BLE001
             logger.warning("audit_write_failed", error=str(exc))
 
-        return response
-
-    async def _write_audit(
-        self,
-        request: Request,
-        status_code: int,
-        duration_ms: int,
-    ) -> None:
+    @staticmethod
+    def _build_row(scope: Scope, status_code: int, duration_ms: int) -> dict:
         tenant_id: uuid.UUID | None = None
         user_id: uuid.UUID | None = None
 
-        if hasattr(request.state, "tenant") and request.state.tenant:
-            tenant_id = request.state.tenant.id
-        if hasattr(request.state, "user") and request.state.user:
-            user_id = request.state.user.id
-
-        action = f"{request.method.lower()}:{request.url.path}"
-        ip = request.client.host if request.client else None
-        ua = request.headers.get("user-agent", "")[:512]
-
-        async with AsyncSessionLocal() as db:
-            db.add(
-                AuditLog(
-                    tenant_id=tenant_id,
-                    user_id=user_id,
-                    action=action,
-                    ip_address=ip,
-                    user_agent=ua,
-                    status_code=status_code,
-                    payload={"duration_ms": duration_ms},
-                )
-            )
-            await db.commit()
+        state = scope.get("state", {})
+        if state.get("tenant"):
+            tenant_id = state["tenant"].id
+        if state.get("user"):
+            user_id = state["user"].id
+
+        client = scope.get("client")
+        # Every row carries the same keys so a batch can be one multi-row INSERT
+        return {
+            "id": uuid.uuid4(),
+            "tenant_id": tenant_id,
+            "user_id": user_id,
+            "action": f"{scope['method'].lower()}:{scope['path']}",
+            "ip_address": client[0] if client else None,
+            "user_agent": Headers(scope=scope).get("user-agent", "")[:512],
+            "status_code": status_code,
+            "payload": {"duration_ms": duration_ms},
+        }
 
 
 async def log_action(
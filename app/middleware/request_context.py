@@ -0,0 +1,51 @@
+"""
+middleware/request_context.py – Request ID + timing middleware (pure ASGI).
+
+For every HTTP request:
+  - generates a UUID4 request id and binds request_id / path / method into
+    the structlog contextvars, so every log line emitted while handling the
+    request carries them;
+  - adds an X-Request-ID response header;
+  - logs "request_complete" with the status code and elapsed milliseconds
+    when the response headers are sent.
+
+Registered last in main.create_app so it is the outermost user middleware
+and its context covers the tenant and audit middlewares too.
+"""
+
+import time
+import uuid
+
+import structlog
+from starlette.datastructures import MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+log = structlog.get_logger(__name__)
+
+
+class RequestContextMiddleware:
+    def __init__(self, app: ASGIApp) -> None:
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        request_id = str(uuid.uuid4())
+        structlog.contextvars.clear_contextvars()
+        structlog.contextvars.bind_contextvars(
+            request_id=request_id,
+            path=scope["path"],
+            method=scope["method"],
+        )
+        start = time.perf_counter()
+
+        async def send_wrapper(message: Message) -> None:
+            if message["type"] == "http.response.start":
+                elapsed_ms = round((time.perf_counter() - start) * 1000, 2)
+                MutableHeaders(scope=message)["X-Request-ID"] = request_id
+                log.info("request_complete", status=message["status"], elapsed_ms=elapsed_ms)
+            await send(message)
+
+        await self.app(scope, receive, send_wrapper)
@@ -1,5 +1,5 @@
 """
-middleware/tenant.py – Starlette middleware that resolves the current tenant
+middleware/tenant.py – ASGI middleware that resolves the current tenant
 from the request and attaches it to request.state.
 
 Resolution strategy (in priority order):
@@ -7,23 +7,19 @@ Resolution strategy (in priority order):
   2. Host subdomain        (e.g. sharma.varanbook.in → slug "sharma")
   3. No tenant             (allowed for /health, /auth/*, super-admin routes)
 
-The resolved tenant record is stored in request.state.tenant so route
-handlers can access it without hitting the DB again.
+The resolved tenant is stored in request.state.tenant as a read-only
+TenantSnapshot (see app.services.tenant_registry). Lookups go through the
+shared tenant registry, so a warm worker resolves tenants without a query.
 """
 
 import uuid
-from typing import Callable
 
 import structlog
-from fastapi import Request, Response
-from sqlalchemy import select
-from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
-from starlette.middleware.base import BaseHTTPMiddleware
-from starlette.types import ASGIApp
+from starlette.datastructures import Headers
+from starlette.types import ASGIApp, Receive, Scope, Send
 
 from app.config import get_settings
-from app.database import AsyncSessionLocal
-from app.models.tenant import Tenant
+from app.services.tenant_registry import TenantSnapshot, get_tenant, get_tenant_by_slug
 
 log = structlog.get_logger(__name__)
 settings = get_settings()
@@ -40,7 +36,7 @@ _TENANT_FREE_PREFIXES = (
 )
 
 
-class TenantMiddleware(BaseHTTPMiddleware):
+class TenantMiddleware:
     """
     For every inbound request:
       - Skip tenant resolution for tenant-free paths.
@@ -49,33 +45,44 @@ class TenantMiddleware(BaseHTTPMiddleware):
 
     Does NOT short-circuit the request on missing tenant; routers that require
     a tenant should call the `get_tenant_from_request` dependency instead.
+
+    Implemented as plain ASGI (not BaseHTTPMiddleware): request.state is
+    backed by scope["state"], so writing there is visible to route handlers
+    without wrapping the response stream.
     """
 
     def __init__(self, app: ASGIApp) -> None:
-        super().__init__(app)
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
 
-    async def dispatch(self, request: Request, call_next: Callable) -> Response:
-        request.state.tenant = None  # default
+        state = scope.setdefault("state", {})
+        state["tenant"] = None  # default
+        path = scope["path"]
 
         # Skip resolution for public/super-admin paths
-        if any(request.url.path.startswith(p) for p in _TENANT_FREE_PREFIXES):
-            return await call_next(request)
+        if path.startswith(_TENANT_FREE_PREFIXES):
+            await self.app(scope, receive, send)
+            return
 
-        tenant = await self._resolve_tenant(request)
-        request.state.tenant = tenant
+        tenant = await self._resolve_tenant(Headers(scope=scope), path)
+        state["tenant"] = tenant
 
         if tenant:
-            log.info("tenant_resolved", slug=tenant.slug, path=request.url.path)
+            log.info("tenant_resolved", slug=tenant.slug, path=path)
         else:
-            log.debug("no_tenant_resolved", path=request.url.path)
+            log.debug("no_tenant_resolved", path=path)
 
-        return await call_next(request)
+        await self.app(scope, receive, send)
 
-    async def _resolve_tenant(self, request: Request) -> Tenant | None:
+    async def _resolve_tenant(self, headers: Headers, path: str) -> TenantSnapshot | None:
         """Try header first, then subdomain slug. Returns None on any error."""
         try:
             # 1. Header: X-Tenant-ID (UUID)
-            tenant_id_header = request.headers.get(settings.TENANT_ID_HEADER)
+            tenant_id_header = headers.get(settings.TENANT_ID_HEADER)
             if tenant_id_header:
                 try:
                     tid = uuid.UUID(tenant_id_header)
@@ -84,7 +91,7 @@ class TenantMiddleware(BaseHTTPMiddleware):
                 return await self._fetch_by_id(tid)
 
             # 2. Subdomain: <slug>.varanbook.in
-            host = request.headers.get("host", "")
+            host = headers.get("host", "")
             parts = host.split(".")
             if len(parts) >= 3:  # slug.domain.tld
                 slug = parts[0]
@@ -92,23 +99,13 @@ class TenantMiddleware(BaseHTTPMiddleware):
 
             return None
         except Exception as exc:
-            log.warning("tenant_resolve_error", path=request.url.path, error=str(exc))
+            log.warning("tenant_resolve_error", path=path, error=str(exc))
             return None
 
-    async def _fetch_by_id(self, tenant_id: uuid.UUID) -> Tenant | None:
-        async with AsyncSessionLocal() as session:
-            result = await session.execute(
-                select(Tenant).where(
-                    Tenant.id == tenant_id, Tenant.is_active == True  # noqa: E712
-                )
-            )
-            return result.scalar_one_or_none()
-
-    async def _fetch_by_slug(self, slug: str) -> Tenant | None:
-        async with AsyncSessionLocal() as session:
-            result = await session.execute(
-                select(Tenant).where(
-                    Tenant.slug == slug, Tenant.is_active == True  # noqa: E712
-                )
-            )
-            return result.scalar_one_or_none()
+    async def _fetch_by_id(self, tenant_id: uuid.UUID) -> TenantSnapshot | None:
+        tenant = await get_tenant(tenant_id)
+        return tenant if tenant and tenant.is_active else None
+
+    async def _fetch_by_slug(self, slug: str) -> TenantSnapshot | None:
+        tenant = await get_tenant_by_slug(slug)
+        return tenant if tenant and tenant.is_active else None
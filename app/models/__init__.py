@@ -14,7 +14,7 @@ from app.models.profile import (  # noqa: F401
 )
 from app.models.partner_preference import PartnerPreference  # noqa: F401
 from app.models.shortlist import Shortlist, ShortlistStatus  # noqa: F401
-from app.models.file_record import FileRecord, ScanStatus  # noqa: F401
+from app.models.file_record import FileRecord, RenditionStatus, ScanStatus  # noqa: F401
 from app.models.refresh_token import RefreshToken  # noqa: F401
 from app.models.password_reset import PasswordResetToken  # noqa: F401
 from app.models.audit_log import AuditLog  # noqa: F401
@@ -24,3 +24,8 @@ from app.models.membership_plan import (  # noqa: F401
     MemberSubscription,
     SubscriptionStatus,
 )
+from app.models.bulk_onboard_job import BulkOnboardJob, JobStatus  # noqa: F401
+from app.models.email_outbox import EmailOutbox, OutboxStatus  # noqa: F401
+from app.models.scheduled_job_run import ScheduledJobRun  # noqa: F401
+from app.models.sweep_checkpoint import SweepCheckpoint  # noqa: F401
+from app.models.broadcast_job import BroadcastDelivery, BroadcastJob  # noqa: F401
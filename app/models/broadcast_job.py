@@ -0,0 +1,93 @@
+"""
+models/broadcast_job.py – Durable state for tenant-wide push broadcasts.
+
+POST /notifications/broadcast records a BroadcastJob and returns at once;
+BroadcastJobRunner (services/broadcast_jobs.py) claims queued jobs and
+sends one page of recipients at a time. Each page's counters, keyset
+cursor (after_user_id) and delivery rows are committed together, so a job
+interrupted by a restart or a Lambda timeout resumes after the cursor.
+
+broadcast_deliveries holds one row per member SQS accepted for a running
+job. Pages skip members already recorded, so a member is not sent the same
+broadcast twice even if two runners overlap on a reclaimed job. The rows
+are deleted when the job finishes.
+"""
+
+import uuid
+from datetime import datetime
+
+from sqlalchemy import DateTime, Enum, ForeignKey, Integer, String, Text, func
+from sqlalchemy.dialects.postgresql import JSONB, UUID
+from sqlalchemy.orm import Mapped, mapped_column
+
+from app.database import Base
+from app.models.bulk_onboard_job import JobStatus
+
+
+class BroadcastJob(Base):
+    """One tenant-wide push notification and its delivery progress."""
+
+    __tablename__ = "broadcast_jobs"
+
+    id: Mapped[uuid.UUID] = mapped_column(
+        UUID(as_uuid=True), primary_key=True, default=uuid.uuid4
+    )
+    tenant_id: Mapped[uuid.UUID] = mapped_column(
+        UUID(as_uuid=True),
+        ForeignKey("tenants.id", ondelete="CASCADE"),
+        nullable=False,
+        index=True,
+    )
+    created_by: Mapped[uuid.UUID | None] = mapped_column(
+        UUID(as_uuid=True),
+        ForeignKey("users.id", ondelete="SET NULL"),
+        nullable=True,
+    )
+
+    status: Mapped[JobStatus] = mapped_column(
+        Enum(
+            JobStatus,
+            name="broadcast_job_status",
+            values_callable=lambda x: [e.value for e in x],
+            create_type=False,
+        ),
+        nullable=False,
+        default=JobStatus.QUEUED,
+        index=True,
+    )
+    title: Mapped[str] = mapped_column(String(200), nullable=False)
+    body: Mapped[str] = mapped_column(String(500), nullable=False)
+    data: Mapped[dict | None] = mapped_column(JSONB, nullable=True)
+
+    # ── Progress ──────────────────────────────────────────────────────────────
+    after_user_id: Mapped[uuid.UUID | None] = mapped_column(
+        UUID(as_uuid=True), nullable=True,
+        comment="Keyset cursor: recipients up to this user id have been handled",
+    )
+    total_recipients: Mapped[int | None] = mapped_column(Integer, nullable=True)
+    processed_count: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    sent_count: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    failed_count: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    error: Mapped[str | None] = mapped_column(Text, nullable=True)
+
+    started_at: Mapped[datetime | None] = mapped_column(DateTime(timezone=True), nullable=True)
+    finished_at: Mapped[datetime | None] = mapped_column(DateTime(timezone=True), nullable=True)
+    created_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True), server_default=func.now()
+    )
+    updated_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True), server_default=func.now(), onupdate=func.now()
+    )
+
+
+class BroadcastDelivery(Base):
+    """A member SQS accepted a running broadcast's message for."""
+
+    __tablename__ = "broadcast_deliveries"
+
+    job_id: Mapped[uuid.UUID] = mapped_column(
+        UUID(as_uuid=True),
+        ForeignKey("broadcast_jobs.id", ondelete="CASCADE"),
+        primary_key=True,
+    )
+    user_id: Mapped[uuid.UUID] = mapped_column(UUID(as_uuid=True), primary_key=True)
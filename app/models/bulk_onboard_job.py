@@ -0,0 +1,82 @@
+"""
+models/bulk_onboard_job.py – Durable state for asynchronous bulk CSV onboarding.
+
+POST /users/onboard/bulk/jobs stores the upload here and returns at once;
+OnboardingJobRunner (services/onboarding_jobs.py) claims queued rows and
+processes the CSV chunk by chunk. Each chunk's inserted users, progress
+counters and row results are committed in the same transaction, so a job
+interrupted by a restart resumes from processed_rows without duplicating
+work.
+"""
+
+import enum
+import uuid
+from datetime import datetime
+
+from sqlalchemy import DateTime, Enum, ForeignKey, Integer, LargeBinary, String, Text, func
+from sqlalchemy.dialects.postgresql import JSONB, UUID
+from sqlalchemy.orm import Mapped, mapped_column
+
+from app.database import Base
+
+
+class JobStatus(str, enum.Enum):
+    QUEUED = "queued"         # waiting for a runner
+    RUNNING = "running"       # claimed; heartbeat is updated_at
+    COMPLETED = "completed"   # every row processed
+    FAILED = "failed"         # aborted; see error
+
+
+class BulkOnboardJob(Base):
+    """One uploaded CSV and its processing progress."""
+
+    __tablename__ = "bulk_onboard_jobs"
+
+    id: Mapped[uuid.UUID] = mapped_column(
+        UUID(as_uuid=True), primary_key=True, default=uuid.uuid4
+    )
+    tenant_id: Mapped[uuid.UUID] = mapped_column(
+        UUID(as_uuid=True),
+        ForeignKey("tenants.id", ondelete="CASCADE"),
+        nullable=False,
+        index=True,
+    )
+    created_by: Mapped[uuid.UUID | None] = mapped_column(
+        UUID(as_uuid=True),
+        ForeignKey("users.id", ondelete="SET NULL"),
+        nullable=True,
+    )
+
+    status: Mapped[JobStatus] = mapped_column(
+        Enum(
+            JobStatus,
+            name="bulk_onboard_job_status",
+            values_callable=lambda x: [e.value for e in x],
+            create_type=False,
+        ),
+        nullable=False,
+        default=JobStatus.QUEUED,
+        index=True,
+    )
+    filename: Mapped[str | None] = mapped_column(String(255), nullable=True)
+    # Raw upload; cleared once the job finishes
+    csv_data: Mapped[bytes | None] = mapped_column(LargeBinary, nullable=True)
+
+    # ── Progress ──────────────────────────────────────────────────────────────
+    total_rows: Mapped[int | None] = mapped_column(Integer, nullable=True)
+    processed_rows: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    created_count: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    skipped_count: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    error_count: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    # List of BulkOnboardRow dicts in row order
+    results: Mapped[list | None] = mapped_column(JSONB, nullable=True)
+    error: Mapped[str | None] = mapped_column(Text, nullable=True)
+
+    started_at: Mapped[datetime | None] = mapped_column(DateTime(timezone=True), nullable=True)
+    finished_at: Mapped[datetime | None] = mapped_column(DateTime(timezone=True), nullable=True)
+    created_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True), server_default=func.now()
+    )
+    updated_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True), server_default=func.now(), onupdate=func.now()
+    )
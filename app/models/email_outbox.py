@@ -0,0 +1,74 @@
+"""
+models/email_outbox.py – Transactional email outbox.
+
+Every email the API sends is written here in the same transaction as the
+change that triggers it (a shortlist, an invite, a password reset token),
+so an email is queued if and only if that change commits. EmailOutboxWorker
+(services/email_outbox.py) delivers pending rows with retries and moves
+messages that keep failing to the dead state.
+"""
+
+import enum
+import uuid
+from datetime import datetime
+
+from sqlalchemy import DateTime, Enum, ForeignKey, Integer, String, Text, func
+from sqlalchemy.dialects.postgresql import JSONB, UUID
+from sqlalchemy.orm import Mapped, mapped_column
+
+from app.database import Base
+
+
+class OutboxStatus(str, enum.Enum):
+    PENDING = "pending"   # waiting for delivery (or for its next retry)
+    SENDING = "sending"   # claimed by a worker; lease ends at next_attempt_at
+    SENT = "sent"         # delivered; payload cleared
+    DEAD = "dead"         # gave up after EMAIL_OUTBOX_MAX_ATTEMPTS; see last_error
+
+
+class EmailOutbox(Base):
+    """One queued email: which template to render and its parameters."""
+
+    __tablename__ = "email_outbox"
+
+    id: Mapped[uuid.UUID] = mapped_column(
+        UUID(as_uuid=True), primary_key=True, default=uuid.uuid4
+    )
+    # NULL for platform-level mail (e.g. super-admin password reset)
+    tenant_id: Mapped[uuid.UUID | None] = mapped_column(
+        UUID(as_uuid=True),
+        ForeignKey("tenants.id", ondelete="CASCADE"),
+        nullable=True,
+        index=True,
+    )
+    # EmailService template, e.g. "member_invite" → send_member_invite
+    kind: Mapped[str] = mapped_column(String(50), nullable=False)
+    to_email: Mapped[str] = mapped_column(String(255), nullable=False)
+    # Template keyword arguments. May hold temporary passwords and reset
+    # tokens, so it is cleared once the message is sent and never returned
+    # by the admin API; dead messages keep it so they can be retried.
+    payload: Mapped[dict | None] = mapped_column(JSONB, nullable=True)
+
+    status: Mapped[OutboxStatus] = mapped_column(
+        Enum(
+            OutboxStatus,
+            name="email_outbox_status",
+            values_callable=lambda x: [e.value for e in x],
+            create_type=False,
+        ),
+        nullable=False,
+        default=OutboxStatus.PENDING,
+    )
+    attempts: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    next_attempt_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True), nullable=False, server_default=func.now()
+    )
+    last_error: Mapped[str | None] = mapped_column(Text, nullable=True)
+
+    sent_at: Mapped[datetime | None] = mapped_column(DateTime(timezone=True), nullable=True)
+    created_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True), server_default=func.now()
+    )
+    updated_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True), server_default=func.now(), onupdate=func.now()
+    )
@@ -6,13 +6,15 @@ but file_records provides a full audit trail including:
   - MIME type and size
   - Virus scan status
   - Upload timestamp and uploader
+  - WebP thumbnail/medium renditions of profile photos, generated off the
+    request path by services/thumbnails.py (rendition_status is the queue)
 """
 
 import enum
 import uuid
 from datetime import datetime
 
-from sqlalchemy import BigInteger, DateTime, Enum, ForeignKey, String, func
+from sqlalchemy import BigInteger, DateTime, Enum, ForeignKey, String, Text, func
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
@@ -26,6 +28,13 @@ class ScanStatus(str, enum.Enum):
     ERROR = "error"         # scan service error
 
 
+class RenditionStatus(str, enum.Enum):
+    PENDING = "pending"         # registered; waiting for a thumbnail runner
+    PROCESSING = "processing"   # claimed; updated_at is the runner's heartbeat
+    READY = "ready"             # thumbnail_key / medium_key are set
+    FAILED = "failed"           # not a decodable image; originals are served
+
+
 class FileRecord(Base):
     """
     One row per uploaded file.
@@ -66,7 +75,8 @@ class FileRecord(Base):
     )
     original_filename: Mapped[str] = mapped_column(String(255), nullable=False)
     mime_type: Mapped[str] = mapped_column(String(100), nullable=False)
-    # File size in bytes; BigInteger supports up to ~9 EB
+    # File size in bytes; BigInteger supports up to ~9 EB. Photos are
+    # registered with 0 and updated once the rendition runner has read them.
     size_bytes: Mapped[int] = mapped_column(BigInteger, nullable=False)
     purpose: Mapped[str] = mapped_column(
         String(50), nullable=False,
@@ -84,3 +94,24 @@ class FileRecord(Base):
     created_at: Mapped[datetime] = mapped_column(
         DateTime(timezone=True), server_default=func.now()
     )
+
+    # ── Renditions (profile photos only; NULL = none wanted) ──────────────────
+    rendition_status: Mapped[RenditionStatus | None] = mapped_column(
+        Enum(
+            RenditionStatus,
+            name="rendition_status",
+            values_callable=lambda x: [e.value for e in x],
+            create_type=False,
+        ),
+        nullable=True,
+    )
+    thumbnail_key: Mapped[str | None] = mapped_column(
+        String(1024), nullable=True, comment="WebP for browse cards",
+    )
+    medium_key: Mapped[str | None] = mapped_column(
+        String(1024), nullable=True, comment="WebP for the profile page",
+    )
+    rendition_error: Mapped[str | None] = mapped_column(Text, nullable=True)
+    updated_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True), server_default=func.now(), onupdate=func.now()
+    )
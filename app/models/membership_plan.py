@@ -206,6 +206,10 @@ class MemberSubscription(Base):
         Boolean, default=False, nullable=False,
         comment="True once the 3-day expiry warning email has been dispatched",
     )
+    interests_sent: Mapped[int] = mapped_column(
+        Integer, default=0, server_default="0", nullable=False,
+        comment="Interest requests sent since starts_at (quota counter, see services/interest_quota.py)",
+    )
     created_by_id: Mapped[uuid.UUID | None] = mapped_column(
         UUID(as_uuid=True),
         ForeignKey("users.id", ondelete="SET NULL"),
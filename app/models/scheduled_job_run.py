@@ -0,0 +1,35 @@
+"""
+models/scheduled_job_run.py – Run history of scheduler jobs.
+
+One row per run of a periodic job (services/scheduler.py), whether started
+by the elected leader or triggered by hand from the CLI. The scheduler
+reads the latest started_at per job to decide when a job is next due, so
+the cadence survives restarts and leader changes.
+"""
+
+import uuid
+from datetime import datetime
+
+from sqlalchemy import DateTime, Index, Integer, String, Text
+from sqlalchemy.dialects.postgresql import UUID
+from sqlalchemy.orm import Mapped, mapped_column
+
+from app.database import Base
+
+
+class ScheduledJobRun(Base):
+    """One execution of a scheduled job."""
+
+    __tablename__ = "scheduled_job_runs"
+    __table_args__ = (Index("ix_scheduled_job_runs_job_started", "job", "started_at"),)
+
+    id: Mapped[uuid.UUID] = mapped_column(
+        UUID(as_uuid=True), primary_key=True, default=uuid.uuid4
+    )
+    job: Mapped[str] = mapped_column(String(100), nullable=False)
+    trigger: Mapped[str] = mapped_column(String(20), nullable=False)   # schedule | manual
+    status: Mapped[str] = mapped_column(String(20), nullable=False)    # succeeded | failed
+    affected: Mapped[int | None] = mapped_column(Integer, nullable=True)
+    error: Mapped[str | None] = mapped_column(Text, nullable=True)
+    started_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), nullable=False)
+    finished_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), nullable=False)
@@ -0,0 +1,39 @@
+"""
+models/sweep_checkpoint.py – Progress of chunked subscription sweeps.
+
+The subscription sweeps (services/subscription_sweeps.py) commit one chunk
+at a time and advance this row in the same transaction. A sweep that is
+interrupted (deploy, leader change, crash) leaves completed_at unset; the
+next run resumes from the stored keyset cursor with the same cutoff
+instead of starting over.
+"""
+
+import uuid
+from datetime import datetime
+
+from sqlalchemy import DateTime, Integer, String, func
+from sqlalchemy.dialects.postgresql import UUID
+from sqlalchemy.orm import Mapped, mapped_column
+
+from app.database import Base
+
+
+class SweepCheckpoint(Base):
+    """Keyset cursor of the current (or last) run of one sweep."""
+
+    __tablename__ = "sweep_checkpoints"
+
+    job: Mapped[str] = mapped_column(String(100), primary_key=True)
+    cutoff: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True), nullable=False,
+        comment="Upper bound on expires_at, fixed for the whole run",
+    )
+    after_expires_at: Mapped[datetime | None] = mapped_column(DateTime(timezone=True), nullable=True)
+    after_id: Mapped[uuid.UUID | None] = mapped_column(UUID(as_uuid=True), nullable=True)
+    processed: Mapped[int] = mapped_column(Integer, default=0, server_default="0", nullable=False)
+    chunks: Mapped[int] = mapped_column(Integer, default=0, server_default="0", nullable=False)
+    started_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), nullable=False)
+    completed_at: Mapped[datetime | None] = mapped_column(DateTime(timezone=True), nullable=True)
+    updated_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True), server_default=func.now(), onupdate=func.now()
+    )
@@ -0,0 +1,105 @@
+"""
+pagination.py – Keyset (cursor) pagination and cached totals for list endpoints.
+
+OFFSET pagination makes the database walk and discard every row before the
+requested page, and the accompanying SELECT count(*) re-evaluates the whole
+filtered query on every request. Browse endpoints therefore offer an opt-in
+cursor mode:
+
+  - Rows are ordered by (created_at DESC, id DESC) and the next page is
+    selected with a row-value comparison (created_at, id) < (:c, :i), which an
+    index ending in (created_at, id) answers without scanning skipped rows.
+  - The cursor is an opaque url-safe token encoding the last row's
+    (created_at, id). Pass cursor= (empty) to request the first page.
+  - One extra row is fetched to decide whether next_cursor is returned.
+
+Totals are controlled separately with ?count=exact|cached|none. "cached"
+reuses a count computed within PAGE_TOTAL_CACHE_TTL_SECONDS for the same
+caller and filters (per worker, see app.cache), so it is approximate.
+"""
+
+import base64
+import uuid
+from datetime import datetime
+from typing import Any, Hashable, Literal
+
+from fastapi import HTTPException
+from sqlalchemy import Select, func, select, tuple_
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.cache import MISSING, TTLCache
+from app.config import get_settings
+
+settings = get_settings()
+
+CountMode = Literal["exact", "cached", "none"]
+
+# One cache per worker process
+page_total_cache = TTLCache(
+    "page_totals",
+    max_size=settings.PAGE_TOTAL_CACHE_MAX_SIZE,
+    ttl_seconds=settings.PAGE_TOTAL_CACHE_TTL_SECONDS,
+)
+
+
+def encode_cursor(created_at: datetime, row_id: uuid.UUID) -> str:
+    raw = f"{created_at.isoformat()}|{row_id}".encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> tuple[datetime, uuid.UUID]:
+    """Inverse of encode_cursor; raises HTTP 400 on a malformed token."""
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)).decode()
+        created_at, row_id = raw.split("|")
+        return datetime.fromisoformat(created_at), uuid.UUID(row_id)
+    except (ValueError, UnicodeDecodeError):
+        raise HTTPException(status_code=400, detail="Invalid pagination cursor.")
+
+
+async def keyset_page(
+    db: AsyncSession,
+    query: Select,
+    created_col: Any,
+    id_col: Any,
+    cursor: str,
+    size: int,
+) -> tuple[list, str | None]:
+    """
+    Fetch one page of query in (created_col, id_col) DESC order, starting
+    after cursor ("" for the first page). Returns (rows, next_cursor).
+    """
+    if cursor:
+        created_at, row_id = decode_cursor(cursor)
+        query = query.where(tuple_(created_col, id_col) < tuple_(created_at, row_id))
+
+    result = await db.execute(
+        query.order_by(created_col.desc(), id_col.desc()).limit(size + 1)
+    )
+    rows = list(result.scalars().all())
+    next_cursor = None
+    if len(rows) > size:
+        rows = rows[:size]
+        last = rows[-1]
+        next_cursor = encode_cursor(
+            getattr(last, created_col.key), getattr(last, id_col.key)
+        )
+    return rows, next_cursor
+
+
+async def count_total(
+    db: AsyncSession,
+    query: Select,
+    mode: CountMode,
+    cache_key: Hashable,
+) -> int | None:
+    """Row count of query per the requested mode (None for "none")."""
+    if mode == "none":
+        return None
+    if mode == "cached":
+        total = page_total_cache.get(cache_key)
+        if total is not MISSING:
+            return total
+    total = (await db.execute(select(func.count()).select_from(query.subquery()))).scalar_one()
+    page_total_cache.set(cache_key, total)
+    return total
@@ -11,10 +11,12 @@ from fastapi import APIRouter, Depends, HTTPException, status
 from pydantic import BaseModel
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.auth.dependencies import get_current_user, require_admin
+from app.auth.dependencies import get_current_principal, require_admin
+from app.auth.principal import UserPrincipal
 from app.database import get_db
 from app.models.tenant import Tenant
-from app.models.user import User
+from app.services.tenant_registry import get_tenant, invalidate_tenant
+from app.services.viewer_context import invalidate_tenant_viewers
 
 router = APIRouter(prefix="/castes", tags=["Caste Master"])
 
@@ -30,15 +32,15 @@ class CasteLockStatus(BaseModel):
 )
 async def list_castes(
     db: Annotated[AsyncSession, Depends(get_db)],
-    current_user: Annotated[User, Depends(get_current_user)],
+    current_user: Annotated[UserPrincipal, Depends(get_current_principal)],
 ) -> list[str]:
     """Return the caste list configured for the authenticated user's tenant."""
     if not current_user.tenant_id:
         return []
-    tenant = await db.get(Tenant, current_user.tenant_id)
+    tenant = await get_tenant(current_user.tenant_id, db)
     if not tenant:
         return []
-    return tenant.castes or []
+    return list(tenant.castes)
 
 
 @router.put(
@@ -49,7 +51,7 @@ async def list_castes(
 async def replace_castes(
     castes: list[str],
     db: Annotated[AsyncSession, Depends(get_db)],
-    current_user: Annotated[User, Depends(require_admin)],
+    current_user: Annotated[UserPrincipal, Depends(require_admin)],
 ) -> list[str]:
     """Overwrite the tenant's caste list. Duplicates are removed."""
     if not current_user.tenant_id:
@@ -67,6 +69,7 @@ async def replace_castes(
             unique.append(stripped)
     tenant.castes = unique
     await db.flush()
+    invalidate_tenant(tenant.id)
     await db.refresh(tenant)
     return tenant.castes or []
 
@@ -80,7 +83,7 @@ async def replace_castes(
 async def add_caste(
     caste: str,
     db: Annotated[AsyncSession, Depends(get_db)],
-    current_user: Annotated[User, Depends(require_admin)],
+    current_user: Annotated[UserPrincipal, Depends(require_admin)],
 ) -> list[str]:
     """Append a single caste to the tenant's list if not already present."""
     if not current_user.tenant_id:
@@ -97,6 +100,7 @@ async def add_caste(
     current.append(stripped)
     tenant.castes = current
     await db.flush()
+    invalidate_tenant(tenant.id)
     await db.refresh(tenant)
     return tenant.castes or []
 
@@ -109,7 +113,7 @@ async def add_caste(
 async def remove_caste(
     caste_name: str,
     db: Annotated[AsyncSession, Depends(get_db)],
-    current_user: Annotated[User, Depends(require_admin)],
+    current_user: Annotated[UserPrincipal, Depends(require_admin)],
 ) -> list[str]:
     """Remove a single caste from the tenant's list."""
     if not current_user.tenant_id:
@@ -123,6 +127,7 @@ async def remove_caste(
     current.remove(caste_name)
     tenant.castes = current
     await db.flush()
+    invalidate_tenant(tenant.id)
     await db.refresh(tenant)
     return tenant.castes or []
 
@@ -136,12 +141,12 @@ async def remove_caste(
 )
 async def get_lock_status(
     db: Annotated[AsyncSession, Depends(get_db)],
-    current_user: Annotated[User, Depends(get_current_user)],
+    current_user: Annotated[UserPrincipal, Depends(get_current_principal)],
 ) -> CasteLockStatus:
     """Return whether the tenant has caste-based profile filtering enabled."""
     if not current_user.tenant_id:
         return CasteLockStatus(caste_locked=False)
-    tenant = await db.get(Tenant, current_user.tenant_id)
+    tenant = await get_tenant(current_user.tenant_id, db)
     if not tenant:
         return CasteLockStatus(caste_locked=False)
     return CasteLockStatus(caste_locked=tenant.caste_locked)
@@ -155,7 +160,7 @@ async def get_lock_status(
 async def set_lock_status(
     body: CasteLockStatus,
     db: Annotated[AsyncSession, Depends(get_db)],
-    current_user: Annotated[User, Depends(require_admin)],
+    current_user: Annotated[UserPrincipal, Depends(require_admin)],
 ) -> CasteLockStatus:
     """Enable or disable caste-based profile filtering for the tenant."""
     if not current_user.tenant_id:
@@ -165,5 +170,7 @@ async def set_lock_status(
         raise HTTPException(status_code=404, detail="Tenant not found.")
     tenant.caste_locked = body.caste_locked
     await db.flush()
+    invalidate_tenant(tenant.id)
+    invalidate_tenant_viewers(tenant.id)
     await db.refresh(tenant)
     return CasteLockStatus(caste_locked=tenant.caste_locked)
@@ -0,0 +1,96 @@
+"""
+routers/email_outbox.py – Inspect and retry queued transactional email.
+
+Tenant admins see their own centre's messages; super-admins see every
+tenant's plus platform-level mail.
+
+Endpoints:
+  GET  /admin/email-outbox/             – pending / sending / dead messages (or ?status=…)
+  POST /admin/email-outbox/{id}/retry   – requeue a dead (or pending) message now
+"""
+
+import uuid
+from datetime import datetime, timezone
+from typing import Annotated
+
+from fastapi import APIRouter, BackgroundTasks, Depends, HTTPException, Query
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.auth.dependencies import require_admin
+from app.auth.principal import UserPrincipal
+from app.database import get_db
+from app.models.email_outbox import EmailOutbox, OutboxStatus
+from app.models.user import UserRole
+from app.schemas.email_outbox import EmailOutboxList, EmailOutboxRead
+from app.services.email_outbox import email_outbox_worker
+
+router = APIRouter(prefix="/admin/email-outbox", tags=["Operations"])
+
+_UNDELIVERED = (OutboxStatus.PENDING, OutboxStatus.SENDING, OutboxStatus.DEAD)
+
+
+def _scoped(query, current_user: UserPrincipal):
+    if current_user.role == UserRole.SUPER_ADMIN:
+        return query
+    return query.where(EmailOutbox.tenant_id == current_user.tenant_id)
+
+
+@router.get("/", response_model=EmailOutboxList, summary="Admin: queued and failed emails")
+async def list_outbox(
+    db: Annotated[AsyncSession, Depends(get_db)],
+    current_user: Annotated[UserPrincipal, Depends(require_admin)],
+    status: OutboxStatus | None = Query(None, description="Default: everything not yet sent"),
+    kind: str | None = None,
+    skip: int = Query(0, ge=0),
+    limit: int = Query(50, ge=1, le=200),
+) -> EmailOutboxList:
+    query = _scoped(select(EmailOutbox), current_user)
+    if status is None:
+        query = query.where(EmailOutbox.status.in_(_UNDELIVERED))
+    else:
+        query = query.where(EmailOutbox.status == status)
+    if kind:
+        query = query.where(EmailOutbox.kind == kind)
+
+    total = (await db.execute(select(func.count()).select_from(query.subquery()))).scalar_one()
+    items = (await db.scalars(
+        query.order_by(EmailOutbox.created_at.desc(), EmailOutbox.id).offset(skip).limit(limit)
+    )).all()
+    counts = (await db.execute(
+        _scoped(select(EmailOutbox.status, func.count()), current_user).group_by(EmailOutbox.status)
+    )).all()
+    return EmailOutboxList(
+        items=[EmailOutboxRead.model_validate(i) for i in items],
+        total=total,
+        counts={s.value: n for s, n in counts},
+    )
+
+
+@router.post(
+    "/{email_id}/retry",
+    response_model=EmailOutboxRead,
+    summary="Admin: requeue a dead-lettered email",
+)
+async def retry_email(
+    email_id: uuid.UUID,
+    db: Annotated[AsyncSession, Depends(get_db)],
+    current_user: Annotated[UserPrincipal, Depends(require_admin)],
+    background_tasks: BackgroundTasks,
+) -> EmailOutboxRead:
+    message = await db.get(EmailOutbox, email_id)
+    if not message or (
+        current_user.role != UserRole.SUPER_ADMIN and message.tenant_id != current_user.tenant_id
+    ):
+        raise HTTPException(status_code=404, detail="Email not found.")
+    if message.status not in (OutboxStatus.DEAD, OutboxStatus.PENDING):
+        raise HTTPException(status_code=409, detail=f"Email is already {message.status.value}.")
+
+    message.status = OutboxStatus.PENDING
+    message.attempts = 0
+    message.next_attempt_at = datetime.now(timezone.utc)
+    await db.flush()
+    await db.refresh(message)
+    # Runs after get_db has committed, so the worker can see the row
+    background_tasks.add_task(email_outbox_worker.notify)
+    return EmailOutboxRead.model_validate(message)
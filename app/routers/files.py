@@ -6,6 +6,8 @@ Flow (photos / horoscope):
   2. Server returns a pre-signed S3 PUT URL + object_key.
   3. Client PUTs the file bytes directly to S3.
   4. Client calls PATCH /profiles/{id}/media with object_key to register it.
+     Profile photos are then queued for WebP thumbnail/medium renditions
+     (app.services.thumbnails), which list pages display instead.
 
 Flow (avatar – user profile picture):
   1. Client calls POST /files/avatar/presign.
@@ -19,23 +21,34 @@ Flow (tenant logo):
 
 Viewing private objects:
   - GET /files/presign-get?key=<object_key> → short-lived GET URL for display.
+  - POST /files/presign-get {"keys": [...]}  → the same for many keys at once
+    (list pages). URLs are cached per worker until shortly before expiry.
 """
 
+import mimetypes
 import uuid
 from typing import Annotated, Literal
 
-from fastapi import APIRouter, Depends, HTTPException, Request, status
-from pydantic import BaseModel
+from fastapi import APIRouter, BackgroundTasks, Depends, HTTPException, Request, status
+from pydantic import BaseModel, Field
+from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.auth.dependencies import get_current_user, require_admin
+from app.auth.dependencies import get_current_principal, get_current_user, require_admin
+from app.auth.principal import UserPrincipal
+from app.config import get_settings
 from app.database import get_db
+from app.models.file_record import FileRecord, RenditionStatus
 from app.models.profile import Profile
 from app.models.tenant import Tenant
 from app.models.user import User
 from app.schemas.profile import FileUploadRequest, FileUploadResponse
 from app.services.s3 import S3Service
+from app.services.storage import get_storage
+from app.services.tenant_registry import TenantSnapshot, invalidate_tenant
+from app.services.thumbnails import thumbnail_runner
 
+settings = get_settings()
 router = APIRouter(prefix="/files", tags=["File Upload"])
 _s3 = S3Service()
 
@@ -45,6 +58,14 @@ class PresignedGetResponse(BaseModel):
     expires_in: int = 900
 
 
+class PresignedGetBatchRequest(BaseModel):
+    keys: list[str] = Field(..., min_length=1, max_length=settings.S3_PRESIGN_BATCH_MAX_KEYS)
+
+
+class PresignedGetBatchResponse(BaseModel):
+    urls: dict[str, PresignedGetResponse]   # object_key → URL
+
+
 class AvatarPresignRequest(BaseModel):
     file_name: str
     content_type: str
@@ -59,7 +80,7 @@ class AvatarPresignRequest(BaseModel):
 async def get_presigned_url(
     payload: FileUploadRequest,
     request: Request,
-    current_user: Annotated[User, Depends(get_current_user)],
+    current_user: Annotated[UserPrincipal, Depends(get_current_principal)],
 ) -> FileUploadResponse:
     """
     Generate a pre-signed S3 PUT URL.
@@ -69,7 +90,7 @@ async def get_presigned_url(
     - The caller must PUT the file to upload_url within the expiry window
       (default 3600 seconds).
     """
-    tenant: Tenant | None = request.state.tenant
+    tenant: TenantSnapshot | None = request.state.tenant
     if not tenant:
         raise HTTPException(status_code=400, detail="Tenant context required.")
 
@@ -95,13 +116,15 @@ async def register_media(
     profile_id: uuid.UUID,
     object_key: str,
     purpose: str,
+    background_tasks: BackgroundTasks,
     db: Annotated[AsyncSession, Depends(get_db)],
-    current_user: Annotated[User, Depends(get_current_user)],
+    current_user: Annotated[UserPrincipal, Depends(get_current_principal)],
 ) -> None:
     """
     After a successful S3 PUT, call this endpoint to persist the object_key.
 
-    - purpose = "profile_photo" → appended to photo_keys list
+    - purpose = "profile_photo" → appended to photo_keys list, and a
+                                  FileRecord is queued for renditions
     - purpose = "horoscope"     → stored in horoscope_key (overwrites)
     """
     profile = await db.get(Profile, profile_id)
@@ -120,6 +143,21 @@ async def register_media(
         keys = list(profile.photo_keys or [])
         keys.append(object_key)
         profile.photo_keys = keys
+        existing = await db.scalar(select(FileRecord.id).where(FileRecord.object_key == object_key))
+        if existing is None:
+            db.add(FileRecord(
+                tenant_id=profile.tenant_id,
+                profile_id=profile.id,
+                uploaded_by=current_user.id,
+                object_key=object_key,
+                original_filename=object_key.rsplit("/", 1)[-1],
+                mime_type=mimetypes.guess_type(object_key)[0] or "application/octet-stream",
+                size_bytes=0,   # filled in by the rendition runner
+                purpose=purpose,
+                rendition_status=RenditionStatus.PENDING,
+            ))
+            # Runs after get_db has committed, so the runner can see the row
+            background_tasks.add_task(thumbnail_runner.notify)
     elif purpose == "horoscope":
         profile.horoscope_key = object_key
     else:
@@ -138,7 +176,7 @@ async def register_media(
 async def get_avatar_presigned_url(
     payload: AvatarPresignRequest,
     request: Request,
-    current_user: Annotated[User, Depends(get_current_user)],
+    current_user: Annotated[UserPrincipal, Depends(get_current_principal)],
 ) -> FileUploadResponse:
     """
     Generate a presigned PUT URL for avatar (any user type) or tenant logo.
@@ -147,7 +185,7 @@ async def get_avatar_presigned_url(
     - purpose = "tenant_logo"  → for tenant branding logo (admin+ only)
     - purpose = "upi_qr"       → for tenant UPI QR code image (admin+ only)
     """
-    tenant: Tenant | None = request.state.tenant
+    tenant: TenantSnapshot | None = request.state.tenant
 
     if payload.purpose in ("tenant_logo", "upi_qr") and not tenant:
         raise HTTPException(status_code=400, detail="Tenant context required.")
@@ -194,18 +232,21 @@ async def register_tenant_logo(
     object_key: str,
     request: Request,
     db: Annotated[AsyncSession, Depends(get_db)],
-    current_user: Annotated[User, Depends(require_admin)],
+    current_user: Annotated[UserPrincipal, Depends(require_admin)],
 ) -> None:
     """
     After a successful S3 PUT, persist the logo object_key on the tenant.
     Requires admin role. Replaces any previously stored logo.
     """
-    tenant: Tenant | None = request.state.tenant
-    if not tenant:
+    resolved: TenantSnapshot | None = request.state.tenant
+    if not resolved:
         raise HTTPException(status_code=400, detail="Tenant context required.")
 
+    # request.state.tenant is a cached snapshot – write through the ORM row
+    tenant = await db.get(Tenant, resolved.id)
     tenant.logo_key = object_key
     await db.flush()
+    invalidate_tenant(tenant.id)
 
 
 @router.patch(
@@ -217,18 +258,21 @@ async def register_tenant_upi_qr(
     object_key: str,
     request: Request,
     db: Annotated[AsyncSession, Depends(get_db)],
-    current_user: Annotated[User, Depends(require_admin)],
+    current_user: Annotated[UserPrincipal, Depends(require_admin)],
 ) -> None:
     """
     After a successful S3 PUT, persist the UPI QR object_key on the tenant.
     Requires admin role. Replaces any previously stored UPI QR.
     """
-    tenant: Tenant | None = request.state.tenant
-    if not tenant:
+    resolved: TenantSnapshot | None = request.state.tenant
+    if not resolved:
         raise HTTPException(status_code=400, detail="Tenant context required.")
 
+    # request.state.tenant is a cached snapshot – write through the ORM row
+    tenant = await db.get(Tenant, resolved.id)
     tenant.upi_qr_key = object_key
     await db.flush()
+    invalidate_tenant(tenant.id)
 
 
 @router.get(
@@ -238,20 +282,47 @@ async def register_tenant_upi_qr(
 )
 async def get_presigned_view_url(
     key: str,
-    current_user: Annotated[User, Depends(get_current_user)],
+    current_user: Annotated[UserPrincipal, Depends(get_current_principal)],
 ) -> PresignedGetResponse:
     """
     Returns a time-limited (15 min) HTTPS URL the browser can use to display
     a private S3 object (photo, avatar, horoscope, logo).
 
+    A still-valid URL signed earlier for the same key is reused, so
+    expires_in may be shorter than the full lifetime.
+
     The caller must be authenticated; no further ownership check is performed
     here so that admins can preview any member's files.
     """
     try:
-        url = _s3.generate_presigned_get(key, expiry=900)
+        url, expires_in = _s3.presigned_get(key)
     except RuntimeError as exc:
         raise HTTPException(status_code=500, detail=str(exc))
-    return PresignedGetResponse(url=url, expires_in=900)
+    return PresignedGetResponse(url=url, expires_in=expires_in)
+
+
+@router.post(
+    "/presign-get",
+    response_model=PresignedGetBatchResponse,
+    summary="Get presigned GET URLs for many private S3 objects in one request",
+)
+async def get_presigned_view_urls(
+    payload: PresignedGetBatchRequest,
+    current_user: Annotated[UserPrincipal, Depends(get_current_principal)],
+) -> PresignedGetBatchResponse:
+    """
+    Batch form of GET /files/presign-get for list pages: one request signs
+    (or reuses cached URLs for) every photo/avatar key on the page.
+    Duplicate keys are answered once.
+    """
+    try:
+        signed = _s3.presigned_get_many(payload.keys)
+    except RuntimeError as exc:
+        raise HTTPException(status_code=500, detail=str(exc))
+    return PresignedGetBatchResponse(urls={
+        key: PresignedGetResponse(url=url, expires_in=expires_in)
+        for key, (url, expires_in) in signed.items()
+    })
 
 
 @router.delete(
@@ -263,7 +334,7 @@ async def delete_photo(
     profile_id: uuid.UUID,
     object_key: str,
     db: Annotated[AsyncSession, Depends(get_db)],
-    current_user: Annotated[User, Depends(get_current_user)],
+    current_user: Annotated[UserPrincipal, Depends(get_current_principal)],
 ) -> None:
     """Remove a single photo from the profile's photo_keys list and delete from S3."""
     profile = await db.get(Profile, profile_id)
@@ -282,10 +353,16 @@ async def delete_photo(
 
     keys.remove(object_key)
     profile.photo_keys = keys
+    record = await db.scalar(select(FileRecord).where(FileRecord.object_key == object_key))
+    renditions = [k for k in (record.thumbnail_key, record.medium_key) if k] if record else []
+    if record is not None:
+        await db.delete(record)
     await db.flush()
 
     # Best-effort S3 delete; don't fail the request if S3 deletion fails
     try:
         _s3.delete_object(object_key)
+        for key in renditions:
+            get_storage().delete(key)
     except RuntimeError:
         pass  # Log in production; S3 versioning allows recovery
@@ -22,7 +22,8 @@ from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import selectinload
 
-from app.auth.dependencies import get_current_user, require_admin, require_super_admin
+from app.auth.dependencies import get_current_principal, require_admin, require_super_admin
+from app.auth.principal import UserPrincipal
 from app.database import get_db
 from app.models.membership_plan import (
     MembershipPlanTemplate,
@@ -43,6 +44,8 @@ from app.schemas.membership_plan import (
     TenantPlanRead,
 )
 from app.schemas.tenant import TenantPaymentInfoRead, TenantUpdate
+from app.services.interest_quota import invalidate_plan_limit, reconcile_interest_counts
+from app.services.tenant_registry import get_tenant, invalidate_tenant
 
 # ── Routers ───────────────────────────────────────────────────────────────────
 # SuperAdmin-scoped endpoints live on a separate prefix so they don't clash
@@ -94,7 +97,7 @@ def _add_months(dt: datetime, months: int) -> datetime:
 )
 async def list_plan_templates(
     db: Annotated[AsyncSession, Depends(get_db)],
-    _: Annotated[User, Depends(require_super_admin)],
+    _: Annotated[UserPrincipal, Depends(require_super_admin)],
     include_inactive: bool = Query(False),
 ) -> list[PlanTemplateRead]:
     query = select(MembershipPlanTemplate).order_by(MembershipPlanTemplate.sort_order)
@@ -113,7 +116,7 @@ async def list_plan_templates(
 async def create_plan_template(
     payload: PlanTemplateCreate,
     db: Annotated[AsyncSession, Depends(get_db)],
-    _: Annotated[User, Depends(require_super_admin)],
+    _: Annotated[UserPrincipal, Depends(require_super_admin)],
 ) -> PlanTemplateRead:
     # Enforce unique duration to avoid accidental duplicates at the same tier
     existing = await db.execute(
@@ -146,7 +149,7 @@ async def update_plan_template(
     template_id: uuid.UUID,
     payload: PlanTemplateUpdate,
     db: Annotated[AsyncSession, Depends(get_db)],
-    _: Annotated[User, Depends(require_super_admin)],
+    _: Annotated[UserPrincipal, Depends(require_super_admin)],
 ) -> PlanTemplateRead:
     template = await db.get(MembershipPlanTemplate, template_id)
     if not template:
@@ -158,6 +161,7 @@ async def update_plan_template(
         setattr(template, field, value)
 
     await db.flush()
+    invalidate_plan_limit(template.id)
     await db.refresh(template)
     return PlanTemplateRead.model_validate(template)
 
@@ -171,7 +175,7 @@ async def update_plan_template(
 )
 async def list_effective_plans(
     db: Annotated[AsyncSession, Depends(get_db)],
-    current_user: Annotated[User, Depends(get_current_user)],
+    current_user: Annotated[UserPrincipal, Depends(get_current_principal)],
 ) -> list[TenantPlanRead]:
     """
     Returns all active platform plan templates, with the tenant's custom price
@@ -234,7 +238,7 @@ async def override_plan_price(
     template_id: uuid.UUID,
     payload: TenantPlanOverrideUpsert,
     db: Annotated[AsyncSession, Depends(get_db)],
-    current_user: Annotated[User, Depends(require_admin)],
+    current_user: Annotated[UserPrincipal, Depends(require_admin)],
 ) -> TenantPlanRead:
     """
     Allows a tenant admin to set a tenant-specific price for a platform plan.
@@ -245,7 +249,7 @@ async def override_plan_price(
     """
     # Verify permission — SuperAdmins bypass this check
     if current_user.role != UserRole.SUPER_ADMIN:
-        tenant = await db.get(Tenant, current_user.tenant_id)
+        tenant = await get_tenant(current_user.tenant_id, db)
         if not tenant or not tenant.can_override_plan_prices:
             raise HTTPException(
                 status_code=403,
@@ -306,7 +310,7 @@ async def override_plan_price(
 )
 async def get_tenant_payment_info(
     db: Annotated[AsyncSession, Depends(get_db)],
-    current_user: Annotated[User, Depends(get_current_user)],
+    current_user: Annotated[UserPrincipal, Depends(get_current_principal)],
 ) -> TenantPaymentInfoRead:
     """
     Returns the tenant's payment details (UPI name, UPI ID, QR key, WhatsApp).
@@ -315,7 +319,7 @@ async def get_tenant_payment_info(
     if not current_user.tenant_id:
         raise HTTPException(status_code=400, detail="No tenant context.")
 
-    tenant = await db.get(Tenant, current_user.tenant_id)
+    tenant = await get_tenant(current_user.tenant_id, db)
     if not tenant:
         raise HTTPException(status_code=404, detail="Tenant not found.")
 
@@ -336,7 +340,7 @@ async def get_tenant_payment_info(
 async def update_tenant_payment_info(
     payload: TenantUpdate,
     db: Annotated[AsyncSession, Depends(get_db)],
-    current_user: Annotated[User, Depends(require_admin)],
+    current_user: Annotated[UserPrincipal, Depends(require_admin)],
 ) -> TenantPaymentInfoRead:
     """
     Allows an admin to update their tenant's payment information.
@@ -356,6 +360,7 @@ async def update_tenant_payment_info(
             setattr(tenant, field, value)
 
     await db.flush()
+    invalidate_tenant(tenant.id)
     await db.refresh(tenant)
 
     return TenantPaymentInfoRead(
@@ -376,7 +381,7 @@ async def update_tenant_payment_info(
 )
 async def get_my_subscription(
     db: Annotated[AsyncSession, Depends(get_db)],
-    current_user: Annotated[User, Depends(get_current_user)],
+    current_user: Annotated[UserPrincipal, Depends(get_current_principal)],
 ) -> SubscriptionRead | None:
     """Returns the most recent active subscription for the authenticated member."""
     result = await db.execute(
@@ -412,7 +417,7 @@ async def get_my_subscription(
 )
 async def list_subscriptions(
     db: Annotated[AsyncSession, Depends(get_db)],
-    current_user: Annotated[User, Depends(require_admin)],
+    current_user: Annotated[UserPrincipal, Depends(require_admin)],
     status_filter: str | None = Query(None, alias="status"),
     user_id: uuid.UUID | None = Query(None),
     search: str | None = Query(None),
@@ -470,7 +475,7 @@ async def list_subscriptions(
 async def create_subscription(
     payload: SubscriptionCreate,
     db: Annotated[AsyncSession, Depends(get_db)],
-    current_user: Annotated[User, Depends(require_admin)],
+    current_user: Annotated[UserPrincipal, Depends(require_admin)],
 ) -> SubscriptionRead:
     """
     Assigns a plan to a member. Automatically computes expires_at from
@@ -543,6 +548,8 @@ async def create_subscription(
     )
     db.add(sub)
     await db.flush()
+    # starts_at may be backdated: count interests already sent in the period
+    await reconcile_interest_counts(db, sub.id)
 
     result = await db.execute(
         select(MemberSubscription)
@@ -561,7 +568,7 @@ async def update_subscription(
     subscription_id: uuid.UUID,
     payload: SubscriptionUpdate,
     db: Annotated[AsyncSession, Depends(get_db)],
-    current_user: Annotated[User, Depends(require_admin)],
+    current_user: Annotated[UserPrincipal, Depends(require_admin)],
 ) -> SubscriptionRead:
     result = await db.execute(
         select(MemberSubscription)
@@ -0,0 +1,55 @@
+"""
+routers/metrics.py – In-process runtime counters for operators.
+
+Each Gunicorn worker keeps its own caches and queues, so the numbers
+returned here describe the worker that served the request only.
+
+Endpoints:
+  GET /admin/metrics/ – cache hit/miss counters, queue depths (super-admin)
+"""
+
+from typing import Annotated
+
+from fastapi import APIRouter, Depends
+
+from app.auth.dependencies import require_super_admin
+from app.auth.passwords import password_hasher
+from app.auth.principal import UserPrincipal, principal_cache
+from app.pagination import page_total_cache
+from app.services.audit_writer import audit_writer
+from app.services.broadcast_jobs import broadcast_job_runner
+from app.services.email_outbox import email_outbox_worker
+from app.services.interest_quota import plan_limit_cache
+from app.services.match_index import match_index_cache
+from app.services.onboarding_jobs import onboarding_job_runner
+from app.services.s3 import presigned_get_cache
+from app.services.scheduler import scheduler
+from app.services.smtp_pool import get_smtp_pool
+from app.services.tenant_registry import tenant_cache
+from app.services.thumbnails import thumbnail_runner
+from app.services.viewer_context import viewer_cache
+
+router = APIRouter(prefix="/admin/metrics", tags=["Operations"])
+
+
+@router.get("/", response_model=dict, summary="Per-worker runtime counters (super-admin)")
+async def get_metrics(
+    _: Annotated[UserPrincipal, Depends(require_super_admin)],
+) -> dict:
+    return {
+        "principal_cache": principal_cache.stats(),
+        "tenant_cache": tenant_cache.stats(),
+        "page_total_cache": page_total_cache.stats(),
+        "viewer_context_cache": viewer_cache.stats(),
+        "match_index_cache": match_index_cache.stats(),
+        "plan_limit_cache": plan_limit_cache.stats(),
+        "presigned_get_cache": presigned_get_cache.stats(),
+        "audit_queue": audit_writer.stats(),
+        "password_hasher": password_hasher.stats(),
+        "onboarding_jobs": onboarding_job_runner.stats(),
+        "broadcast_jobs": broadcast_job_runner.stats(),
+        "email_outbox": email_outbox_worker.stats(),
+        "thumbnails": thumbnail_runner.stats(),
+        "smtp_pool": get_smtp_pool().stats(),
+        "scheduler": scheduler.stats(),
+    }
@@ -3,19 +3,23 @@ routers/notifications.py – Push notification enqueue endpoint.
 
 Admins can send targeted push notifications to any member in their tenant.
 The notification job is placed on SQS for async delivery via Lambda → FCM.
+Tenant-wide broadcasts are queued as background jobs
+(services/broadcast_jobs.py) with a progress endpoint.
 """
 
 import uuid
 from typing import Annotated
 
-from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy import select
+from fastapi import APIRouter, BackgroundTasks, Depends, HTTPException, Query, status
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.auth.dependencies import require_admin
+from app.auth.principal import UserPrincipal
 from app.database import get_db
-from app.models.user import User
-from app.schemas.profile import NotificationEnqueue
+from app.models.broadcast_job import BroadcastJob
+from app.models.user import User, UserRole
+from app.schemas.profile import BroadcastJobRead, NotificationEnqueue
+from app.services.broadcast_jobs import broadcast_job_runner
 from app.services.notification import NotificationService
 
 router = APIRouter(prefix="/notifications", tags=["Push Notifications"])
@@ -30,7 +34,7 @@ _notif_svc = NotificationService()
 async def enqueue_notification(
     payload: NotificationEnqueue,
     db: Annotated[AsyncSession, Depends(get_db)],
-    current_user: Annotated[User, Depends(require_admin)],
+    current_user: Annotated[UserPrincipal, Depends(require_admin)],
 ) -> dict:
     """
     Place a push notification on the SQS queue.
@@ -76,53 +80,61 @@ async def enqueue_notification(
 
 @router.post(
     "/broadcast",
+    response_model=BroadcastJobRead,
     status_code=status.HTTP_202_ACCEPTED,
     summary="Broadcast a push notification to all active members in the tenant",
 )
 async def broadcast_notification(
-    title: str,
-    body: str,
+    title: Annotated[str, Query(max_length=200)],
+    body: Annotated[str, Query(max_length=500)],
+    background_tasks: BackgroundTasks,
     db: Annotated[AsyncSession, Depends(get_db)],
-    current_user: Annotated[User, Depends(require_admin)],
-) -> dict:
+    current_user: Annotated[UserPrincipal, Depends(require_admin)],
+) -> BroadcastJobRead:
     """
-    Sends a push notification to EVERY active member of the current tenant
+    Queues a push notification to EVERY active member of the current tenant
     who has a registered FCM token.
 
-    Messages are batched in groups of 10 (SQS batch limit).
+    The broadcast is recorded as a job and sent in pages by the broadcast
+    runner (app.services.broadcast_jobs), so the request returns at once
+    and a broadcast survives worker restarts. Poll
+    GET /notifications/broadcast/{job_id} for progress.
     """
-    result = await db.execute(
-        select(User).where(
-            User.tenant_id == current_user.tenant_id,
-            User.is_active == True,  # noqa: E712
-            User.fcm_token.isnot(None),
+    if current_user.tenant_id is None:
+        raise HTTPException(status_code=400, detail="Super admins must specify a tenant.")
+    if not broadcast_job_runner.service.queue_url:
+        raise HTTPException(
+            status_code=503,
+            detail="SQS_NOTIFICATION_QUEUE_URL is not configured. Set it in .env or environment.",
         )
-    )
-    users = result.scalars().all()
-
-    if not users:
-        return {"status": "no_recipients", "count": 0}
-
-    # Build batch payloads
-    jobs = [
-        {
-            "user_id": u.id,
-            "fcm_token": u.fcm_token,
-            "title": title,
-            "body": body,
-        }
-        for u in users
-    ]
-
-    # Process in batches of 10
-    message_ids: list[str] = []
-    for i in range(0, len(jobs), 10):
-        batch = jobs[i : i + 10]
-        ids = _notif_svc.enqueue_bulk(batch)
-        message_ids.extend(ids)
 
-    return {
-        "status": "queued",
-        "recipient_count": len(users),
-        "sqs_message_ids": message_ids,
-    }
+    job = BroadcastJob(
+        tenant_id=current_user.tenant_id,
+        created_by=current_user.id,
+        title=title,
+        body=body,
+    )
+    db.add(job)
+    await db.flush()
+    await db.refresh(job)
+    # Runs after get_db has committed, so the runner can see the row
+    background_tasks.add_task(broadcast_job_runner.notify)
+    return BroadcastJobRead.model_validate(job)
+
+
+@router.get(
+    "/broadcast/{job_id}",
+    response_model=BroadcastJobRead,
+    summary="Broadcast status and delivery progress",
+)
+async def get_broadcast(
+    job_id: uuid.UUID,
+    db: Annotated[AsyncSession, Depends(get_db)],
+    current_user: Annotated[UserPrincipal, Depends(require_admin)],
+) -> BroadcastJobRead:
+    job = await db.get(BroadcastJob, job_id)
+    if not job or (
+        current_user.role != UserRole.SUPER_ADMIN and job.tenant_id != current_user.tenant_id
+    ):
+        raise HTTPException(status_code=404, detail="Broadcast not found.")
+    return BroadcastJobRead.model_validate(job)
@@ -13,19 +13,21 @@ from fastapi import APIRouter, Depends, HTTPException, status
 from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.auth.dependencies import get_current_user, require_member
+from app.auth.dependencies import get_current_principal, require_member
+from app.auth.principal import UserPrincipal
 from app.database import get_db
 from app.models.partner_preference import PartnerPreference
 from app.models.profile import Profile
-from app.models.user import User, UserRole
+from app.models.user import UserRole
 from app.schemas.partner_preference import PartnerPreferenceRead, PartnerPreferenceUpsert
+from app.services.match_index import refresh_preferences
 
 router = APIRouter(tags=["Partner Preferences"])
 
 
 async def _get_profile_authorised(
     profile_id: uuid.UUID,
-    current_user: User,
+    current_user: UserPrincipal,
     db: AsyncSession,
     *,
     write: bool = False,
@@ -51,7 +53,7 @@ async def upsert_preferences(
     profile_id: uuid.UUID,
     body: PartnerPreferenceUpsert,
     db: Annotated[AsyncSession, Depends(get_db)],
-    current_user: Annotated[User, Depends(require_member)],
+    current_user: Annotated[UserPrincipal, Depends(require_member)],
 ) -> PartnerPreferenceRead:
     profile = await _get_profile_authorised(profile_id, current_user, db, write=True)
 
@@ -70,6 +72,7 @@ async def upsert_preferences(
 
     await db.flush()
     await db.refresh(pref)
+    refresh_preferences(pref)
     return PartnerPreferenceRead.model_validate(pref)
 
 
@@ -81,7 +84,7 @@ async def upsert_preferences(
 async def get_preferences(
     profile_id: uuid.UUID,
     db: Annotated[AsyncSession, Depends(get_db)],
-    current_user: Annotated[User, Depends(get_current_user)],
+    current_user: Annotated[UserPrincipal, Depends(get_current_principal)],
 ) -> PartnerPreferenceRead | None:
     profile = await db.get(Profile, profile_id)
     if not profile or profile.tenant_id != current_user.tenant_id:
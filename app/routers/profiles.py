@@ -1,25 +1,42 @@
 """
-routers/profiles.py – Matrimonial profile CRUD endpoints.
+routers/profiles.py – Matrimonial profile CRUD endpoints and match feed.
 
 All endpoints require an authenticated user. Members can only access
 their own profile; Admins can access any profile within their tenant.
 """
 
 import uuid
-from typing import Annotated
+from typing import Annotated, Literal
 
 from fastapi import APIRouter, Depends, HTTPException, Query, status
-from sqlalchemy import func, or_, select
+from sqlalchemy import literal_column, select
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import selectinload
 
-from app.auth.dependencies import get_current_user, require_admin
+from app.auth.dependencies import get_current_principal, require_admin
+from app.auth.principal import UserPrincipal, invalidate_user
 from app.database import get_db
 from app.models.profile import Profile, ProfileStatus
-from app.models.shortlist import Shortlist, ShortlistStatus
-from app.models.tenant import Tenant
+from app.models.shortlist import ShortlistStatus
 from app.models.user import User, UserRole
-from app.schemas.profile import ProfileCreate, ProfileRead, ProfileStatusUpdate, ProfileUpdate
+from app.pagination import CountMode, count_total, keyset_page
+from app.models.partner_preference import PartnerPreference
+from app.schemas.profile import (
+    MatchFeed,
+    MatchRead,
+    PoruthamPage,
+    PoruthamRead,
+    ProfileCreate,
+    ProfileRead,
+    ProfileStatusUpdate,
+    ProfileUpdate,
+)
+from app.services.match_index import discard_profile, get_match_index, refresh_profile
+from app.services.matching import PreferenceScorer, features_from_row, rank
+from app.services.media_urls import attach_photo_urls
+from app.services.porutham import MAX_SCORE, is_bride, score_candidates, score_expression
+from app.services.shortlist_status import annotate_shortlist_status, shortlist_states
+from app.services.viewer_context import ViewerContext, get_viewer_context, invalidate_viewer
 
 
 def _profile_read(profile: Profile) -> ProfileRead:
@@ -33,8 +50,11 @@ def _profile_read(profile: Profile) -> ProfileRead:
 
 router = APIRouter(prefix="/profiles", tags=["Matrimonial Profiles"])
 
+# Rendered inline as status = 'active'; see list_profiles
+_ACTIVE_LITERAL = literal_column(f"'{ProfileStatus.ACTIVE.value}'")
+
 
-def _assert_profile_access(profile: Profile, current_user: User) -> None:
+def _assert_profile_access(profile: Profile, current_user: UserPrincipal) -> None:
     """
     Raises HTTP 403 if the user has no right to access this profile.
 
@@ -67,7 +87,7 @@ def _assert_profile_access(profile: Profile, current_user: User) -> None:
 async def create_profile(
     payload: ProfileCreate,
     db: Annotated[AsyncSession, Depends(get_db)],
-    current_user: Annotated[User, Depends(get_current_user)],
+    current_user: Annotated[UserPrincipal, Depends(get_current_principal)],
 ) -> ProfileRead:
     """
     Create a biodata profile.
@@ -94,12 +114,53 @@ async def create_profile(
     )
     db.add(profile)
     await db.flush()
+    invalidate_viewer(current_user.id)
+    await refresh_profile(db, profile)
     result_c = await db.execute(
         select(Profile).where(Profile.id == profile.id).options(selectinload(Profile.user))
     )
     return _profile_read(result_c.scalar_one())
 
 
+async def _porutham_subject(
+    db: AsyncSession,
+    current_user: UserPrincipal,
+    viewer: ViewerContext | None,
+    porutham_for: uuid.UUID | None,
+) -> ViewerContext | Profile:
+    """The profile whose star/rashi GET /profiles/ scores rows against."""
+    if current_user.role == UserRole.MEMBER:
+        if viewer is None or viewer.profile_id is None:
+            raise HTTPException(status_code=404, detail="Create your profile first.")
+        return viewer
+    if porutham_for is None:
+        raise HTTPException(status_code=400, detail="porutham_for is required for admins.")
+    subject = await db.get(Profile, porutham_for)
+    if not subject:
+        raise HTTPException(status_code=404, detail="Profile not found.")
+    _assert_profile_access(subject, current_user)
+    return subject
+
+
+def _viewer_profile_id(viewer: ViewerContext | None) -> uuid.UUID | None:
+    return viewer.profile_id if viewer is not None else None
+
+
+def _with_porutham(
+    profiles: list[Profile], subject: ViewerContext | Profile | None
+) -> list[ProfileRead]:
+    """Serialise a page, adding porutham_score when browsing by compatibility."""
+    items = [_profile_read(p) for p in profiles]
+    if subject is None:
+        return items
+    scores = score_candidates(subject, profiles)
+    return [
+        item.model_copy(update={"porutham_score": scores[item.id].score})
+        if scores[item.id] is not None else item
+        for item in items
+    ]
+
+
 @router.get(
     "/",
     response_model=dict,
@@ -107,7 +168,8 @@ async def create_profile(
 )
 async def list_profiles(
     db: Annotated[AsyncSession, Depends(get_db)],
-    current_user: Annotated[User, Depends(get_current_user)],
+    current_user: Annotated[UserPrincipal, Depends(get_current_principal)],
+    viewer: Annotated[ViewerContext | None, Depends(get_viewer_context)],
     gender: str | None = Query(None),
     city: str | None = Query(None),
     dhosam: str | None = Query(None),
@@ -115,6 +177,14 @@ async def list_profiles(
     search: str | None = Query(None),
     page: int = Query(1, ge=1),
     size: int = Query(20, ge=1, le=100),
+    cursor: str | None = Query(None, description="Keyset cursor; empty for the first page"),
+    count: CountMode | None = Query(None, description="exact | cached | none"),
+    min_porutham: int | None = Query(None, ge=0, le=MAX_SCORE),
+    sort: Literal["newest", "porutham"] = Query("newest"),
+    porutham_for: uuid.UUID | None = Query(
+        None, description="Admins: profile to score against (members use their own)"
+    ),
+    include_media_urls: bool = Query(False, description="Embed a signed URL for each first photo"),
 ) -> dict:
     """
     Browse profiles within the current tenant.
@@ -122,35 +192,42 @@ async def list_profiles(
     - MEMBER: sees only 'active' profiles (excluding their own), automatically
       filtered to the opposite gender.
     - ADMIN / SUPER_ADMIN: sees all profiles in their tenant.
+
+    Pagination (see app.pagination):
+    - default: page/size with OFFSET; total counted exactly.
+    - cursor mode (any cursor param, "" for the first page): returns
+      next_cursor instead of page/pages; total is omitted unless requested.
+
+    Horoscope compatibility (see app.services.porutham): min_porutham and
+    sort=porutham score rows in SQL against the member's own star/rashi (or
+    porutham_for, for admins); items then carry porutham_score.
+
+    include_media_urls=true fills photo_url on each item the viewer may see
+    the photo of (see app.services.media_urls) – the WebP thumbnail once it
+    has been generated – so the page renders without a presign request per
+    card.
     """
     query = select(Profile).where(Profile.tenant_id == current_user.tenant_id)
 
     # ── Caste-lock filtering (members only) ──────────────────────────────────
     caste_locked_empty = False  # True when member has no caste → 0 results
-    if current_user.role == UserRole.MEMBER and current_user.tenant_id:
-        tenant = await db.get(Tenant, current_user.tenant_id)
-        if tenant and tenant.caste_locked:
-            own_profile_caste_result = await db.execute(
-                select(Profile.caste).where(Profile.user_id == current_user.id)
-            )
-            member_caste = own_profile_caste_result.scalar_one_or_none()
-            if not member_caste:
-                # Member has no caste set → return empty results
-                caste_locked_empty = True
-            else:
-                query = query.where(Profile.caste == member_caste)
-
-    # Members only see active profiles and not their own
+    if viewer is not None and viewer.caste_locked:
+        if not viewer.caste:
+            # Member has no caste set → return empty results
+            caste_locked_empty = True
+        else:
+            query = query.where(Profile.caste == viewer.caste)
+
+    # Members only see active profiles and not their own. The status literal
+    # is inlined (not bound) so it matches the partial browse indexes
+    # (migration 016) even under generic prepared-statement plans.
     if current_user.role == UserRole.MEMBER:
         query = query.where(
-            Profile.status == "active",
+            Profile.status == _ACTIVE_LITERAL,
             Profile.user_id != current_user.id,
         )
         # Auto-filter to opposite gender based on member's own profile
-        own_profile_result = await db.execute(
-            select(Profile.gender).where(Profile.user_id == current_user.id)
-        )
-        own_gender = own_profile_result.scalar_one_or_none()
+        own_gender = viewer.gender if viewer is not None else None
         if own_gender == "male":
             query = query.where(Profile.gender == "female")
         elif own_gender == "female":
@@ -173,25 +250,66 @@ async def list_profiles(
             User.full_name.ilike(f"%{search}%")
         )
 
+    subject = None
+    porutham_expr = None
+    if min_porutham is not None or sort == "porutham":
+        subject = await _porutham_subject(db, current_user, viewer, porutham_for)
+        porutham_expr = score_expression(
+            subject.star, subject.rashi, as_bride=is_bride(subject.gender)
+        )
+        if porutham_expr is None:
+            raise HTTPException(
+                status_code=400, detail="Set a star on the profile to browse by compatibility."
+            )
+        if min_porutham is not None:
+            query = query.where(porutham_expr >= min_porutham)
+        if sort == "porutham" and cursor is not None:
+            raise HTTPException(
+                status_code=400, detail="sort=porutham is not supported with cursor pagination."
+            )
+
     # Short-circuit: member has no caste in a caste-locked tenant
     if caste_locked_empty:
         return {
             "items": [], "total": 0, "page": page, "size": size, "pages": 1,
-            "caste_locked": True, "caste_missing": True,
+            "next_cursor": None, "caste_locked": True, "caste_missing": True,
         }
 
-    total_result = await db.execute(select(func.count()).select_from(query.subquery()))
-    total = total_result.scalar_one()
+    count_mode = count or ("none" if cursor is not None else "exact")
+    total_key = (
+        "profiles", current_user.id, gender, city, dhosam, status, search,
+        min_porutham, porutham_for,
+    )
 
+    if cursor is not None:
+        rows, next_cursor = await keyset_page(
+            db, query.options(selectinload(Profile.user)),
+            Profile.created_at, Profile.id, cursor, size,
+        )
+        total = await count_total(db, query, count_mode, total_key)
+        items = _with_porutham(rows, subject)
+        items = await annotate_shortlist_status(db, _viewer_profile_id(viewer), items)
+        if include_media_urls:
+            items = await attach_photo_urls(db, items, current_user)
+        return {"items": items, "total": total, "size": size, "next_cursor": next_cursor}
+
+    total = await count_total(db, query, count_mode, total_key)
+
+    ordering = [Profile.created_at.desc(), Profile.id.desc()]
+    if sort == "porutham":
+        ordering.insert(0, porutham_expr.desc().nulls_last())
     items_result = await db.execute(
         query.options(selectinload(Profile.user))
-        .order_by(Profile.created_at.desc())
+        .order_by(*ordering)
         .offset((page - 1) * size)
         .limit(size)
     )
-    items = [_profile_read(p) for p in items_result.scalars().all()]
+    items = _with_porutham(items_result.scalars().all(), subject)
+    items = await annotate_shortlist_status(db, _viewer_profile_id(viewer), items)
+    if include_media_urls:
+        items = await attach_photo_urls(db, items, current_user)
 
-    pages = max(1, -(-total // size))  # ceiling division
+    pages = max(1, -(-total // size)) if total is not None else None  # ceiling division
     return {"items": items, "total": total, "page": page, "size": size, "pages": pages}
 
 
@@ -202,7 +320,7 @@ async def list_profiles(
 )
 async def get_my_profile(
     db: Annotated[AsyncSession, Depends(get_db)],
-    current_user: Annotated[User, Depends(get_current_user)],
+    current_user: Annotated[UserPrincipal, Depends(get_current_principal)],
 ) -> ProfileRead:
     result = await db.execute(
         select(Profile).where(Profile.user_id == current_user.id)
@@ -222,7 +340,7 @@ async def get_my_profile(
 async def update_my_profile(
     payload: ProfileUpdate,
     db: Annotated[AsyncSession, Depends(get_db)],
-    current_user: Annotated[User, Depends(get_current_user)],
+    current_user: Annotated[UserPrincipal, Depends(get_current_principal)],
 ) -> ProfileRead:
     """Members use this to update their own profile. No profile UUID needed."""
     result = await db.execute(
@@ -250,12 +368,83 @@ async def update_my_profile(
         profile.status = ProfileStatus.ACTIVE
 
     await db.flush()
+    invalidate_viewer(current_user.id)
+    await refresh_profile(db, profile)
     result2 = await db.execute(
         select(Profile).where(Profile.id == profile.id).options(selectinload(Profile.user))
     )
     return _profile_read(result2.scalar_one())
 
 
+@router.get(
+    "/matches",
+    response_model=MatchFeed,
+    summary="Ranked candidates for the current member's partner preferences",
+)
+async def list_matches(
+    db: Annotated[AsyncSession, Depends(get_db)],
+    viewer: Annotated[ViewerContext | None, Depends(get_viewer_context)],
+    limit: int = Query(20, ge=1, le=100),
+    reciprocal: bool = Query(False, description="Also score the viewer against each candidate's preferences"),
+    min_score: float = Query(0, ge=0, le=100),
+) -> MatchFeed:
+    """
+    Score every profile the member may browse against their partner
+    preferences and return the best `limit`, highest score first
+    (see app.services.matching). Candidates come from the per-tenant match
+    index (app.services.match_index). Same visibility rules as GET /profiles/.
+    """
+    if viewer is None:
+        raise HTTPException(status_code=403, detail="Match feed is available to members only.")
+    if viewer.profile_id is None:
+        raise HTTPException(status_code=404, detail="Create your profile first.")
+    if viewer.caste_locked and not viewer.caste:
+        return MatchFeed(items=[], reciprocal=reciprocal)
+
+    index = await get_match_index(db, viewer.tenant_id)
+    own = index.features.get(viewer.profile_id)
+    scorer = index.scorers.get(viewer.profile_id)
+    if own is None:
+        # Inactive profiles are not indexed; score from the viewer's own rows
+        own = features_from_row(await db.get(Profile, viewer.profile_id))
+        pref = await db.scalar(
+            select(PartnerPreference).where(PartnerPreference.profile_id == viewer.profile_id)
+        )
+        scorer = PreferenceScorer(pref) if pref is not None else None
+    matches = rank(
+        index.candidates(
+            viewer.profile_id,
+            viewer.gender,
+            viewer.caste if viewer.caste_locked else None,
+        ),
+        own,
+        scorer or PreferenceScorer(None),
+        limit,
+        reciprocal=reciprocal,
+        min_score=min_score,
+    )
+    if not matches:
+        return MatchFeed(items=[], reciprocal=reciprocal)
+
+    result = await db.execute(
+        select(Profile)
+        .where(Profile.id.in_([m.profile_id for m in matches]))
+        .options(selectinload(Profile.user))
+    )
+    profiles = {p.id: p for p in result.scalars().all()}
+    items = [
+        MatchRead(
+            profile=_profile_read(profiles[m.profile_id]),
+            score=m.score,
+            reciprocal_score=m.reciprocal_score,
+            matched=m.matched,
+        )
+        for m in matches
+        if m.profile_id in profiles
+    ]
+    return MatchFeed(items=items, reciprocal=reciprocal)
+
+
 @router.get(
     "/{profile_id}",
     response_model=ProfileRead,
@@ -264,7 +453,9 @@ async def update_my_profile(
 async def get_profile(
     profile_id: uuid.UUID,
     db: Annotated[AsyncSession, Depends(get_db)],
-    current_user: Annotated[User, Depends(get_current_user)],
+    current_user: Annotated[UserPrincipal, Depends(get_current_principal)],
+    viewer: Annotated[ViewerContext | None, Depends(get_viewer_context)],
+    include_media_urls: bool = Query(False, description="Embed a signed URL for the first photo"),
 ) -> ProfileRead:
     result = await db.execute(
         select(Profile).where(Profile.id == profile_id).options(selectinload(Profile.user))
@@ -278,24 +469,15 @@ async def get_profile(
     # restriction (e.g. DRAFT profiles created by an admin are still reachable by
     # the connected member).
     connection_status: str | None = None
+    shortlist_status: str | None = None
     is_accepted_connection = False
-    if current_user.role == UserRole.MEMBER and profile.user_id != current_user.id:
-        viewer_profile_result = await db.execute(
-            select(Profile.id).where(Profile.user_id == current_user.id)
-        )
-        viewer_profile_id = viewer_profile_result.scalar_one_or_none()
+    if viewer is not None and profile.user_id != current_user.id:
+        viewer_profile_id = viewer.profile_id
         if viewer_profile_id:
-            sl_result = await db.execute(
-                select(Shortlist.status).where(
-                    or_(
-                        (Shortlist.from_profile_id == viewer_profile_id) & (Shortlist.to_profile_id == profile_id),
-                        (Shortlist.from_profile_id == profile_id) & (Shortlist.to_profile_id == viewer_profile_id),
-                    )
-                ).where(Shortlist.status == ShortlistStatus.ACCEPTED).limit(1)
-            )
-            sl_status = sl_result.scalar_one_or_none()
-            if sl_status:
-                connection_status = sl_status.value
+            states = await shortlist_states(db, viewer_profile_id, [profile_id])
+            shortlist_status = states.get(profile_id)
+            if shortlist_status == "accepted":
+                connection_status = ShortlistStatus.ACCEPTED.value
                 is_accepted_connection = True
 
     if is_accepted_connection:
@@ -307,25 +489,65 @@ async def get_profile(
         _assert_profile_access(profile, current_user)
 
     # ── Caste-lock guard (members only; admins bypass) ───────────────────────
-    if (
-        current_user.role == UserRole.MEMBER
-        and profile.user_id != current_user.id
-        and current_user.tenant_id
-    ):
-        tenant = await db.get(Tenant, current_user.tenant_id)
-        if tenant and tenant.caste_locked:
-            viewer_caste_result = await db.execute(
-                select(Profile.caste).where(Profile.user_id == current_user.id)
-            )
-            viewer_caste = viewer_caste_result.scalar_one_or_none()
-            if not viewer_caste or viewer_caste != profile.caste:
+    if viewer is not None and profile.user_id != current_user.id:
+        if viewer.caste_locked:
+            if not viewer.caste or viewer.caste != profile.caste:
                 raise HTTPException(
                     status_code=403,
                     detail="Access restricted. You can only view profiles of your own caste.",
                 )
 
-    read = _profile_read(profile)
-    return read.model_copy(update={"connection_status": connection_status})
+    read = _profile_read(profile).model_copy(
+        update={"connection_status": connection_status, "shortlist_status": shortlist_status}
+    )
+    if include_media_urls:
+        [read] = await attach_photo_urls(db, [read], current_user, rendition="medium")
+    return read
+
+
+@router.get(
+    "/{profile_id}/porutham",
+    response_model=PoruthamPage,
+    summary="Horoscope compatibility of a profile with a page of candidates",
+)
+async def score_porutham(
+    profile_id: uuid.UUID,
+    db: Annotated[AsyncSession, Depends(get_db)],
+    current_user: Annotated[UserPrincipal, Depends(get_current_principal)],
+    candidate_ids: list[uuid.UUID] = Query(..., max_length=100),
+) -> PoruthamPage:
+    """
+    Score up to 100 candidates against one profile (see app.services.porutham)
+    with one query for the candidates' star/rashi and table lookups per pair.
+    Candidates outside the profile's tenant – or, for members, not active –
+    are omitted.
+    """
+    subject = await db.get(Profile, profile_id)
+    if not subject:
+        raise HTTPException(status_code=404, detail="Profile not found.")
+    _assert_profile_access(subject, current_user)
+
+    query = select(Profile.id, Profile.star, Profile.rashi, Profile.gender).where(
+        Profile.id.in_(candidate_ids), Profile.tenant_id == subject.tenant_id
+    )
+    if current_user.role == UserRole.MEMBER:
+        query = query.where(Profile.status == _ACTIVE_LITERAL)
+    rows = {row.id: row for row in (await db.execute(query)).all()}
+    scores = score_candidates(subject, rows.values())
+
+    items = []
+    for candidate_id in dict.fromkeys(candidate_ids):
+        if candidate_id not in rows:
+            continue
+        result = scores[candidate_id]
+        items.append(PoruthamRead(
+            profile_id=candidate_id,
+            score=result.score if result else None,
+            max_score=MAX_SCORE,
+            rajju=result.rajju if result else None,
+            matched=result.matched if result else [],
+        ))
+    return PoruthamPage(profile_id=profile_id, items=items)
 
 
 @router.patch(
@@ -337,7 +559,7 @@ async def update_profile_status(
     profile_id: uuid.UUID,
     payload: ProfileStatusUpdate,
     db: Annotated[AsyncSession, Depends(get_db)],
-    current_user: Annotated[User, Depends(require_admin)],
+    current_user: Annotated[UserPrincipal, Depends(require_admin)],
 ) -> ProfileRead:
     """Allow tenant admins to activate, suspend, or mark a member's profile as matched."""
     if payload.status not in (ProfileStatus.ACTIVE, ProfileStatus.SUSPENDED, ProfileStatus.MATCHED):
@@ -352,6 +574,7 @@ async def update_profile_status(
         raise HTTPException(status_code=403, detail="Access denied.")
     profile.status = payload.status
     await db.flush()
+    await refresh_profile(db, profile)
     result = await db.execute(
         select(Profile).where(Profile.id == profile.id).options(selectinload(Profile.user))
     )
@@ -367,7 +590,7 @@ async def update_profile(
     profile_id: uuid.UUID,
     payload: ProfileUpdate,
     db: Annotated[AsyncSession, Depends(get_db)],
-    current_user: Annotated[User, Depends(get_current_user)],
+    current_user: Annotated[UserPrincipal, Depends(get_current_principal)],
 ) -> ProfileRead:
     profile = await db.get(Profile, profile_id)
     if not profile:
@@ -380,6 +603,8 @@ async def update_profile(
             setattr(profile, field, value)
 
     await db.flush()
+    invalidate_viewer(profile.user_id)  # gender / caste may have changed
+    await refresh_profile(db, profile)
     result_u = await db.execute(
         select(Profile).where(Profile.id == profile.id).options(selectinload(Profile.user))
     )
@@ -394,7 +619,7 @@ async def update_profile(
 async def delete_profile(
     profile_id: uuid.UUID,
     db: Annotated[AsyncSession, Depends(get_db)],
-    current_user: Annotated[User, Depends(require_admin)],
+    current_user: Annotated[UserPrincipal, Depends(require_admin)],
 ) -> None:
     """Only admins or super-admins can permanently delete a profile and its user account."""
     profile = await db.get(Profile, profile_id)
@@ -410,3 +635,6 @@ async def delete_profile(
     else:
         await db.delete(profile)
     await db.flush()
+    invalidate_user(profile.user_id)
+    invalidate_viewer(profile.user_id)
+    discard_profile(profile.tenant_id, profile.id)
@@ -13,14 +13,14 @@ import logging
 from datetime import datetime, timezone
 from typing import Annotated
 
-import bcrypt as _bcrypt
 from fastapi import APIRouter, Depends, HTTPException, status
 from pydantic import BaseModel
-from sqlalchemy import select
 from sqlalchemy.exc import IntegrityError
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.auth.dependencies import require_admin
+from app.auth.passwords import hash_password
+from app.auth.principal import UserPrincipal
 from app.config import get_settings
 from app.database import get_db
 from app.models.profile import Profile, ProfileStatus
@@ -28,6 +28,12 @@ from app.models.tenant import Tenant
 from app.models.user import User, UserRole
 from app.schemas.tenant import SelfRegisterRequest, TenantPublicInfo
 from app.schemas.user import UserRead
+from app.services.tenant_registry import (
+    TenantSnapshot,
+    get_tenant,
+    get_tenant_by_slug,
+    invalidate_tenant,
+)
 
 logger = logging.getLogger(__name__)
 
@@ -35,19 +41,12 @@ router = APIRouter(prefix="/public", tags=["Public"])
 self_reg_router = APIRouter(prefix="/self-registration", tags=["Self-Registration"])
 
 
-def _hash_password(plain: str) -> str:
-    return _bcrypt.hashpw(plain.encode(), _bcrypt.gensalt(12)).decode()
-
-
 async def _get_tenant_by_slug(
     slug: str, db: AsyncSession
-) -> Tenant:
-    """Fetch an active tenant by slug or raise 404."""
-    result = await db.execute(
-        select(Tenant).where(Tenant.slug == slug.lower(), Tenant.is_active.is_(True))
-    )
-    tenant = result.scalar_one_or_none()
-    if not tenant:
+) -> TenantSnapshot:
+    """Fetch an active tenant by slug (via the tenant registry) or raise 404."""
+    tenant = await get_tenant_by_slug(slug, db)
+    if not tenant or not tenant.is_active:
         raise HTTPException(status_code=404, detail="Centre not found.")
     return tenant
 
@@ -114,7 +113,7 @@ async def self_register(
     user = User(
         tenant_id=tenant.id,
         email=payload.email.lower() if payload.email else None,
-        hashed_password=_hash_password(payload.password),
+        hashed_password=await hash_password(payload.password),
         full_name=payload.full_name,
         phone=payload.phone,
         role=UserRole.MEMBER,
@@ -163,11 +162,11 @@ class SelfRegistrationStatus(BaseModel):
 )
 async def get_self_registration_status(
     db: Annotated[AsyncSession, Depends(get_db)],
-    current_user: Annotated[User, Depends(require_admin)],
+    current_user: Annotated[UserPrincipal, Depends(require_admin)],
 ) -> SelfRegistrationStatus:
     if not current_user.tenant_id:
         raise HTTPException(status_code=400, detail="User has no tenant.")
-    tenant = await db.get(Tenant, current_user.tenant_id)
+    tenant = await get_tenant(current_user.tenant_id, db)
     if not tenant:
         raise HTTPException(status_code=404, detail="Tenant not found.")
     return SelfRegistrationStatus(
@@ -184,7 +183,7 @@ async def get_self_registration_status(
 async def set_self_registration_status(
     body: SelfRegistrationStatus,
     db: Annotated[AsyncSession, Depends(get_db)],
-    current_user: Annotated[User, Depends(require_admin)],
+    current_user: Annotated[UserPrincipal, Depends(require_admin)],
 ) -> SelfRegistrationStatus:
     if not current_user.tenant_id:
         raise HTTPException(status_code=400, detail="User has no tenant.")
@@ -193,6 +192,7 @@ async def set_self_registration_status(
         raise HTTPException(status_code=404, detail="Tenant not found.")
     tenant.self_registration_enabled = body.enabled
     await db.flush()
+    invalidate_tenant(tenant.id)
     await db.refresh(tenant)
     return SelfRegistrationStatus(
         enabled=tenant.self_registration_enabled,
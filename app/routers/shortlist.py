@@ -15,22 +15,28 @@ import uuid
 from typing import Annotated
 
 from fastapi import APIRouter, Depends, HTTPException, Query, Request, status
-from sqlalchemy import func, select
+from sqlalchemy import exists, func, insert, select
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import selectinload
 
-from app.auth.dependencies import get_current_user, require_admin, require_member
+from app.auth.dependencies import require_admin, require_member
+from app.auth.principal import UserPrincipal
 from app.database import get_db
-from app.models.membership_plan import MemberSubscription, MembershipPlanTemplate, SubscriptionStatus
 from app.models.profile import Profile
 from app.models.shortlist import Shortlist, ShortlistStatus
 from app.models.user import User
+from app.pagination import CountMode, count_total, keyset_page
 from app.schemas.profile import ProfileRead
 from app.schemas.shortlist import (
     ShortlistCreate, ShortlistList, ShortlistPairList, ShortlistPairRead,
     ProfileSummary, ShortlistRead, ShortlistStatusUpdate,
     InterestRead, InterestList,
 )
+from app.services.email_outbox import enqueue_email
+from app.services.interest_quota import InterestQuotaExceeded, release_interest, reserve_interest
+from app.services.media_urls import attach_photo_urls
+from app.services.shortlist_status import annotate_shortlist_status
+from app.services.viewer_context import ViewerContext, get_viewer_context
 
 
 def _read_profile(profile: Profile) -> ProfileRead:
@@ -45,7 +51,7 @@ router = APIRouter(prefix="/shortlists", tags=["Shortlist / Accept"])
 
 
 async def _get_caller_profile(
-    current_user: User,
+    current_user: UserPrincipal,
     db: "AsyncSession",
 ) -> Profile:
     """Resolve the Profile for the authenticated user."""
@@ -68,79 +74,65 @@ async def create_shortlist(
     body: ShortlistCreate,
     request: Request,
     db: Annotated["AsyncSession", Depends(get_db)],
-    current_user: Annotated[User, Depends(require_member)],
+    current_user: Annotated[UserPrincipal, Depends(require_member)],
+    viewer: Annotated[ViewerContext | None, Depends(get_viewer_context)],
 ) -> ShortlistRead:
-    caller = await _get_caller_profile(current_user, db)
+    # Caller's profile id comes from the (cached) viewer context
+    if viewer is None or viewer.profile_id is None:
+        raise HTTPException(status_code=404, detail="Create your profile first.")
+    caller_id = viewer.profile_id
 
-    if caller.id == body.to_profile_id:
+    if caller_id == body.to_profile_id:
         raise HTTPException(status_code=400, detail="Cannot shortlist yourself.")
 
-    # Verify target profile exists in this tenant
-    target = await db.get(Profile, body.to_profile_id)
-    if not target or target.tenant_id != current_user.tenant_id:
-        raise HTTPException(status_code=404, detail="Target profile not found.")
-
-    # Duplicate check
-    existing = await db.execute(
-        select(Shortlist).where(
-            Shortlist.from_profile_id == caller.id,
-            Shortlist.to_profile_id == body.to_profile_id,
+    # Target in this tenant + duplicate check in one query
+    target = (await db.execute(
+        select(
+            Profile.user_id,
+            exists().where(
+                Shortlist.from_profile_id == caller_id,
+                Shortlist.to_profile_id == body.to_profile_id,
+            ).label("duplicate"),
+        ).where(
+            Profile.id == body.to_profile_id,
+            Profile.tenant_id == current_user.tenant_id,
         )
-    )
-    if existing.scalar_one_or_none():
+    )).first()
+    if target is None:
+        raise HTTPException(status_code=404, detail="Target profile not found.")
+    if target.duplicate:
         raise HTTPException(status_code=409, detail="Already shortlisted this profile.")
 
     # Interest request limit – enforced per subscription period
-    sub_result = await db.execute(
-        select(MemberSubscription)
-        .where(
-            MemberSubscription.user_id == current_user.id,
-            MemberSubscription.tenant_id == current_user.tenant_id,
-            MemberSubscription.status == SubscriptionStatus.ACTIVE,
+    try:
+        await reserve_interest(db, current_user.id, current_user.tenant_id)
+    except InterestQuotaExceeded as exc:
+        raise HTTPException(
+            status_code=429,
+            detail=(
+                f"You have reached the {exc.limit.max_interests} interest request limit "
+                f"for your {exc.limit.plan_name} plan. Upgrade to send more."
+            ),
         )
-        .order_by(MemberSubscription.created_at.desc())
-        .limit(1)
-    )
-    active_sub = sub_result.scalar_one_or_none()
-    if active_sub:
-        plan = await db.get(MembershipPlanTemplate, active_sub.plan_template_id)
-        if plan and plan.max_interests is not None:
-            sent_count_result = await db.execute(
-                select(func.count()).select_from(Shortlist).where(
-                    Shortlist.from_profile_id == caller.id,
-                    Shortlist.created_at >= active_sub.starts_at,
-                )
-            )
-            sent_count = sent_count_result.scalar_one()
-            if sent_count >= plan.max_interests:
-                raise HTTPException(
-                    status_code=429,
-                    detail=(
-                        f"You have reached the {plan.max_interests} interest request limit "
-                        f"for your {plan.name} plan. Upgrade to send more."
-                    ),
-                )
-
-    entry = Shortlist(
-        tenant_id=current_user.tenant_id,
-        from_profile_id=caller.id,
-        to_profile_id=body.to_profile_id,
-        note=body.note,
-        status=ShortlistStatus.SHORTLISTED,
-    )
-    db.add(entry)
-    await db.flush()
-    await db.refresh(entry)
 
-    # Notify the recipient — fire-and-forget
-    try:
-        from app.services.email import EmailService
-        target_user = await db.get(User, target.user_id)
-        if target_user and target_user.email:
-            sender_name = current_user.full_name or "Someone"
-            await EmailService.send_shortlist_notification(target_user.email, sender_name)
-    except Exception:
-        pass
+    # INSERT … RETURNING loads server defaults without a refresh round trip
+    entry = (await db.scalars(
+        insert(Shortlist).returning(Shortlist),
+        [{
+            "tenant_id": current_user.tenant_id,
+            "from_profile_id": caller_id,
+            "to_profile_id": body.to_profile_id,
+            "note": body.note,
+            "status": ShortlistStatus.SHORTLISTED,
+        }],
+    )).one()
+
+    # Notify the recipient (outbox row commits with the shortlist)
+    target_email = await db.scalar(select(User.email).where(User.id == target.user_id))
+    enqueue_email(
+        db, "shortlist_notification", target_email, current_user.tenant_id,
+        from_name=current_user.full_name or "Someone",
+    )
 
     return ShortlistRead.model_validate(entry)
 
@@ -148,7 +140,7 @@ async def create_shortlist(
 @router.get("/sent", response_model=ShortlistList, summary="Shortlists sent by me")
 async def list_sent(
     db: Annotated["AsyncSession", Depends(get_db)],
-    current_user: Annotated[User, Depends(require_member)],
+    current_user: Annotated[UserPrincipal, Depends(require_member)],
     skip: int = 0,
     limit: int = 50,
 ) -> ShortlistList:
@@ -166,7 +158,7 @@ async def list_sent(
 @router.get("/received", response_model=ShortlistList, summary="Shortlists received by me")
 async def list_received(
     db: Annotated["AsyncSession", Depends(get_db)],
-    current_user: Annotated[User, Depends(require_member)],
+    current_user: Annotated[UserPrincipal, Depends(require_member)],
     skip: int = 0,
     limit: int = 50,
 ) -> ShortlistList:
@@ -188,7 +180,7 @@ async def list_received(
 )
 async def admin_list_pairs(
     db: Annotated["AsyncSession", Depends(get_db)],
-    current_user: Annotated[User, Depends(require_admin)],
+    current_user: Annotated[UserPrincipal, Depends(require_admin)],
     status_filter: str | None = Query(None, alias="status"),
     page: int = Query(1, ge=1),
     size: int = Query(20, ge=1, le=100),
@@ -247,17 +239,28 @@ async def admin_list_pairs(
 )
 async def list_shortlisted_profiles(
     db: Annotated["AsyncSession", Depends(get_db)],
-    current_user: Annotated[User, Depends(require_member)],
+    current_user: Annotated[UserPrincipal, Depends(require_member)],
     page: int = Query(1, ge=1),
     size: int = Query(20, ge=1, le=100),
+    cursor: str | None = Query(None, description="Keyset cursor; empty for the first page"),
+    count: CountMode | None = Query(None, description="exact | cached | none"),
 ) -> dict:
     caller = await _get_caller_profile(current_user, db)
 
     subq = select(Shortlist.to_profile_id).where(Shortlist.from_profile_id == caller.id)
     query = select(Profile).where(Profile.id.in_(subq))
 
-    total_result = await db.execute(select(func.count()).select_from(query.subquery()))
-    total = total_result.scalar_one()
+    count_mode = count or ("none" if cursor is not None else "exact")
+    total_key = ("shortlisted-profiles", caller.id)
+    total = await count_total(db, query, count_mode, total_key)
+
+    if cursor is not None:
+        rows, next_cursor = await keyset_page(
+            db, query.options(selectinload(Profile.user)),
+            Profile.created_at, Profile.id, cursor, size,
+        )
+        items = await annotate_shortlist_status(db, caller.id, [_read_profile(p) for p in rows])
+        return {"items": items, "total": total, "size": size, "next_cursor": next_cursor}
 
     items_result = await db.execute(
         query.options(selectinload(Profile.user))
@@ -265,8 +268,10 @@ async def list_shortlisted_profiles(
         .offset((page - 1) * size)
         .limit(size)
     )
-    items = [_read_profile(p) for p in items_result.scalars().all()]
-    pages = max(1, -(-total // size))
+    items = await annotate_shortlist_status(
+        db, caller.id, [_read_profile(p) for p in items_result.scalars().all()]
+    )
+    pages = max(1, -(-total // size)) if total is not None else None
     return {"items": items, "total": total, "page": page, "size": size, "pages": pages}
 
 
@@ -278,7 +283,7 @@ async def list_shortlisted_profiles(
 async def delete_shortlist_by_profile(
     to_profile_id: uuid.UUID,
     db: Annotated["AsyncSession", Depends(get_db)],
-    current_user: Annotated[User, Depends(require_member)],
+    current_user: Annotated[UserPrincipal, Depends(require_member)],
 ) -> None:
     caller = await _get_caller_profile(current_user, db)
     result = await db.execute(
@@ -291,6 +296,7 @@ async def delete_shortlist_by_profile(
     if not entry:
         raise HTTPException(status_code=404, detail="Shortlist entry not found.")
     await db.delete(entry)
+    await release_interest(db, current_user.id, current_user.tenant_id, entry.created_at)
     await db.flush()
 
 
@@ -301,9 +307,12 @@ async def delete_shortlist_by_profile(
 )
 async def list_sent_interests(
     db: Annotated["AsyncSession", Depends(get_db)],
-    current_user: Annotated[User, Depends(require_member)],
+    current_user: Annotated[UserPrincipal, Depends(require_member)],
     page: int = Query(1, ge=1),
     size: int = Query(20, ge=1, le=100),
+    cursor: str | None = Query(None, description="Keyset cursor; empty for the first page"),
+    count: CountMode | None = Query(None, description="exact | cached | none"),
+    include_media_urls: bool = Query(False, description="Embed a signed URL for each first photo"),
 ) -> InterestList:
     caller = await _get_caller_profile(current_user, db)
 
@@ -311,23 +320,35 @@ async def list_sent_interests(
         select(Shortlist)
         .where(Shortlist.from_profile_id == caller.id)
         .options(selectinload(Shortlist.to_profile).selectinload(Profile.user))
-        .order_by(Shortlist.created_at.desc())
     )
-    total_result = await db.execute(select(func.count()).select_from(query.subquery()))
-    total = total_result.scalar_one()
+    count_mode = count or ("none" if cursor is not None else "exact")
+    total = await count_total(db, query, count_mode, ("sent-interests", caller.id))
 
-    rows = (await db.execute(query.offset((page - 1) * size).limit(size))).scalars().all()
+    next_cursor = None
+    if cursor is not None:
+        rows, next_cursor = await keyset_page(
+            db, query, Shortlist.created_at, Shortlist.id, cursor, size
+        )
+    else:
+        rows = (await db.execute(
+            query.order_by(Shortlist.created_at.desc()).offset((page - 1) * size).limit(size)
+        )).scalars().all()
+    profiles = [_read_profile(r.to_profile) for r in rows]
+    if include_media_urls:
+        profiles = await attach_photo_urls(db, profiles, current_user)
     items = [
         InterestRead(
             shortlist_id=r.id,
             status=r.status,
             note=r.note,
             created_at=r.created_at,
-            profile=_read_profile(r.to_profile),
+            profile=profile,
         )
-        for r in rows
+        for r, profile in zip(rows, profiles)
     ]
-    pages = max(1, -(-total // size))
+    if cursor is not None:
+        return InterestList(items=items, total=total, size=size, next_cursor=next_cursor)
+    pages = max(1, -(-total // size)) if total is not None else None
     return InterestList(items=items, total=total, page=page, size=size, pages=pages)
 
 
@@ -338,10 +359,13 @@ async def list_sent_interests(
 )
 async def list_received_interests(
     db: Annotated["AsyncSession", Depends(get_db)],
-    current_user: Annotated[User, Depends(require_member)],
+    current_user: Annotated[UserPrincipal, Depends(require_member)],
     status_filter: str | None = Query(None, alias="status"),
     page: int = Query(1, ge=1),
     size: int = Query(20, ge=1, le=100),
+    cursor: str | None = Query(None, description="Keyset cursor; empty for the first page"),
+    count: CountMode | None = Query(None, description="exact | cached | none"),
+    include_media_urls: bool = Query(False, description="Embed a signed URL for each first photo"),
 ) -> InterestList:
     caller = await _get_caller_profile(current_user, db)
 
@@ -349,26 +373,38 @@ async def list_received_interests(
         select(Shortlist)
         .where(Shortlist.to_profile_id == caller.id)
         .options(selectinload(Shortlist.from_profile).selectinload(Profile.user))
-        .order_by(Shortlist.created_at.desc())
     )
     if status_filter:
         query = query.where(Shortlist.status == status_filter)
 
-    total_result = await db.execute(select(func.count()).select_from(query.subquery()))
-    total = total_result.scalar_one()
+    count_mode = count or ("none" if cursor is not None else "exact")
+    total = await count_total(db, query, count_mode, ("received-interests", caller.id, status_filter))
 
-    rows = (await db.execute(query.offset((page - 1) * size).limit(size))).scalars().all()
+    next_cursor = None
+    if cursor is not None:
+        rows, next_cursor = await keyset_page(
+            db, query, Shortlist.created_at, Shortlist.id, cursor, size
+        )
+    else:
+        rows = (await db.execute(
+            query.order_by(Shortlist.created_at.desc()).offset((page - 1) * size).limit(size)
+        )).scalars().all()
+    profiles = [_read_profile(r.from_profile) for r in rows]
+    if include_media_urls:
+        profiles = await attach_photo_urls(db, profiles, current_user)
     items = [
         InterestRead(
             shortlist_id=r.id,
             status=r.status,
             note=r.note,
             created_at=r.created_at,
-            profile=_read_profile(r.from_profile),
+            profile=profile,
         )
-        for r in rows
+        for r, profile in zip(rows, profiles)
     ]
-    pages = max(1, -(-total // size))
+    if cursor is not None:
+        return InterestList(items=items, total=total, size=size, next_cursor=next_cursor)
+    pages = max(1, -(-total // size)) if total is not None else None
     return InterestList(items=items, total=total, page=page, size=size, pages=pages)
 
 
@@ -377,7 +413,7 @@ async def update_shortlist_status(
     shortlist_id: uuid.UUID,
     body: ShortlistStatusUpdate,
     db: Annotated["AsyncSession", Depends(get_db)],
-    current_user: Annotated[User, Depends(require_member)],
+    current_user: Annotated[UserPrincipal, Depends(require_member)],
 ) -> ShortlistRead:
     entry = await db.get(Shortlist, shortlist_id)
     if not entry or entry.tenant_id != current_user.tenant_id:
@@ -396,18 +432,17 @@ async def update_shortlist_status(
     await db.flush()
     await db.refresh(entry)
 
-    # Notify the original sender when their interest is accepted — fire-and-forget
+    # Notify the original sender when their interest is accepted
     if body.status == ShortlistStatus.ACCEPTED:
-        try:
-            from app.services.email import EmailService
-            from_profile = await db.get(Profile, entry.from_profile_id)
-            if from_profile:
-                sender_user = await db.get(User, from_profile.user_id)
-                if sender_user and sender_user.email:
-                    acceptor_name = current_user.full_name or "Someone"
-                    await EmailService.send_accept_notification(sender_user.email, acceptor_name)
-        except Exception:
-            pass
+        sender_email = await db.scalar(
+            select(User.email)
+            .join(Profile, Profile.user_id == User.id)
+            .where(Profile.id == entry.from_profile_id)
+        )
+        enqueue_email(
+            db, "accept_notification", sender_email, entry.tenant_id,
+            from_name=current_user.full_name or "Someone",
+        )
 
     return ShortlistRead.model_validate(entry)
 
@@ -416,7 +451,7 @@ async def update_shortlist_status(
 async def delete_shortlist(
     shortlist_id: uuid.UUID,
     db: Annotated["AsyncSession", Depends(get_db)],
-    current_user: Annotated[User, Depends(require_member)],
+    current_user: Annotated[UserPrincipal, Depends(require_member)],
 ) -> None:
     entry = await db.get(Shortlist, shortlist_id)
     if not entry or entry.tenant_id != current_user.tenant_id:
@@ -427,4 +462,5 @@ async def delete_shortlist(
         raise HTTPException(status_code=403, detail="Only the sender can withdraw.")
 
     await db.delete(entry)
+    await release_interest(db, current_user.id, current_user.tenant_id, entry.created_at)
     await db.flush()
@@ -9,17 +9,21 @@ import secrets
 import uuid
 from typing import Annotated
 
-import bcrypt as _bcrypt
 from fastapi import APIRouter, Depends, HTTPException, Query, status
 from sqlalchemy import func, select
 from sqlalchemy.exc import IntegrityError
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.auth.dependencies import require_super_admin
+from app.auth.passwords import hash_password
+from app.auth.principal import UserPrincipal, invalidate_tenant_users
 from app.database import get_db
 from app.models.tenant import Tenant
 from app.models.user import User, UserRole
 from app.schemas.tenant import TenantCreate, TenantList, TenantRead, TenantUpdate
+from app.services.email_outbox import enqueue_email
+from app.services.tenant_registry import invalidate_tenant
+from app.services.viewer_context import invalidate_tenant_viewers
 
 router = APIRouter(prefix="/admin/tenants", tags=["Tenant Management"])
 
@@ -33,7 +37,7 @@ router = APIRouter(prefix="/admin/tenants", tags=["Tenant Management"])
 async def create_tenant(
     payload: TenantCreate,
     db: Annotated[AsyncSession, Depends(get_db)],
-    _: Annotated[User, Depends(require_super_admin)],
+    _: Annotated[UserPrincipal, Depends(require_super_admin)],
 ) -> TenantRead:
     """
     Create a new tenant/matrimonial centre.
@@ -55,13 +59,15 @@ async def create_tenant(
             detail=f"Tenant with slug '{payload.slug}' already exists.",
         )
     await db.refresh(tenant)
+    # The slug may have been negatively cached by an earlier lookup
+    invalidate_tenant(tenant.id, tenant.slug)
 
     temp_password: str | None = None
 
     if payload.admin_email:
         admin_name = payload.admin_name or payload.contact_person
         temp_password = secrets.token_urlsafe(12)
-        hashed = _bcrypt.hashpw(temp_password.encode(), _bcrypt.gensalt(12)).decode()
+        hashed = await hash_password(temp_password)
         admin_user = User(
             tenant_id=tenant.id,
             email=payload.admin_email,
@@ -80,15 +86,10 @@ async def create_tenant(
                 detail=f"Admin email '{payload.admin_email}' is already registered.",
             )
 
-        try:
-            from app.services.email import EmailService
-            await EmailService.send_member_invite(
-                to_email=payload.admin_email,
-                temp_password=temp_password,
-                full_name=admin_name,
-            )
-        except Exception:
-            pass  # never fail the request for email errors
+        enqueue_email(
+            db, "member_invite", payload.admin_email, tenant.id,
+            temp_password=temp_password, full_name=admin_name,
+        )
 
     result = TenantRead.model_validate(tenant)
     result.temp_password = temp_password
@@ -102,7 +103,7 @@ async def create_tenant(
 )
 async def list_tenants(
     db: Annotated[AsyncSession, Depends(get_db)],
-    _: Annotated[User, Depends(require_super_admin)],
+    _: Annotated[UserPrincipal, Depends(require_super_admin)],
     page: int = Query(1, ge=1),
     page_size: int = Query(20, ge=1, le=100),
     is_active: bool | None = Query(None),
@@ -152,7 +153,7 @@ async def list_tenants(
 async def get_tenant(
     tenant_id: uuid.UUID,
     db: Annotated[AsyncSession, Depends(get_db)],
-    _: Annotated[User, Depends(require_super_admin)],
+    _: Annotated[UserPrincipal, Depends(require_super_admin)],
 ) -> TenantRead:
     tenant = await db.get(Tenant, tenant_id)
     if not tenant:
@@ -169,17 +170,22 @@ async def update_tenant(
     tenant_id: uuid.UUID,
     payload: TenantUpdate,
     db: Annotated[AsyncSession, Depends(get_db)],
-    _: Annotated[User, Depends(require_super_admin)],
+    _: Annotated[UserPrincipal, Depends(require_super_admin)],
 ) -> TenantRead:
     tenant = await db.get(Tenant, tenant_id)
     if not tenant:
         raise HTTPException(status_code=404, detail="Tenant not found.")
 
     # Apply only the provided fields (partial update)
+    previous_slug = tenant.slug
     for field, value in payload.model_dump(exclude_none=True).items():
         setattr(tenant, field, value)
 
     await db.flush()
+    invalidate_tenant(tenant_id, previous_slug, tenant.slug)
+    # is_active / caste_locked may have flipped – drop cached principals and viewer contexts
+    invalidate_tenant_users(tenant_id)
+    invalidate_tenant_viewers(tenant_id)
     await db.refresh(tenant)
     return TenantRead.model_validate(tenant)
 
@@ -192,10 +198,12 @@ async def update_tenant(
 async def deactivate_tenant(
     tenant_id: uuid.UUID,
     db: Annotated[AsyncSession, Depends(get_db)],
-    _: Annotated[User, Depends(require_super_admin)],
+    _: Annotated[UserPrincipal, Depends(require_super_admin)],
 ) -> None:
     tenant = await db.get(Tenant, tenant_id)
     if not tenant:
         raise HTTPException(status_code=404, detail="Tenant not found.")
     tenant.is_active = False
     await db.flush()
+    invalidate_tenant(tenant_id, tenant.slug)
+    invalidate_tenant_users(tenant_id)
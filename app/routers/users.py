@@ -10,7 +10,10 @@ Endpoints:
   POST /auth/change-password  – change password (authenticated)
   POST /users/                – member self-registration
   POST /users/admin           – admin onboarding  POST /users/onboard         – admin: single member onboard (minimal info)
-  POST /users/onboard/bulk    – admin: bulk member onboard via CSV upload  GET  /users/members         – list members of the current tenant (admin+)
+  POST /users/onboard/bulk    – admin: bulk member onboard via CSV upload
+  POST /users/onboard/bulk/jobs           – admin: queue bulk onboard as a background job
+  GET  /users/onboard/bulk/jobs/{id}      – admin: job status / progress (+ /rows, /report)
+  GET  /users/members         – list members of the current tenant (admin+)
   GET  /users/me              – current user profile
   PATCH /users/me             – partial update
 """
@@ -23,8 +26,18 @@ import uuid
 from datetime import datetime, timedelta, timezone
 from typing import Annotated
 
-import bcrypt as _bcrypt
-from fastapi import APIRouter, Depends, File, HTTPException, Query, Request, UploadFile, status
+from fastapi import (
+    APIRouter,
+    BackgroundTasks,
+    Depends,
+    File,
+    HTTPException,
+    Query,
+    Request,
+    Response,
+    UploadFile,
+    status,
+)
 from jose import JWTError
 from sqlalchemy import func, or_, select
 from sqlalchemy.exc import IntegrityError
@@ -36,10 +49,12 @@ from app.auth.jwt import (
     create_refresh_token,
     decode_token,
 )
+from app.auth.passwords import hash_password, password_hasher, verify_password
+from app.auth.principal import UserPrincipal, invalidate_user
 from app.config import get_settings
 from app.database import get_db
+from app.models.bulk_onboard_job import BulkOnboardJob
 from app.models.profile import Profile, ProfileStatus
-from app.models.tenant import Tenant
 from app.models.user import User, UserRole
 from app.models.refresh_token import RefreshToken
 from app.models.password_reset import PasswordResetToken
@@ -47,8 +62,9 @@ from app.schemas.user import (
     AdminCreate,
     AdminOnboardRequest,
     AdminOnboardResponse,
+    BulkOnboardJobRead,
+    BulkOnboardJobRows,
     BulkOnboardResponse,
-    BulkOnboardRow,
     ForgotPasswordPhoneRequest,
     ForgotPasswordPhoneResponse,
     LoginRequest,
@@ -66,18 +82,19 @@ from app.schemas.user import (
     UserRead,
     UserUpdate,
 )
+from app.services.bulk_onboarding import (
+    BulkOnboardPipeline,
+    iter_record_chunks,
+    phone_variants,
+)
+from app.services.email_outbox import enqueue_email
+from app.services.match_index import invalidate_tenant_index
+from app.services.onboarding_jobs import onboarding_job_runner
+from app.services.tenant_registry import TenantSnapshot, get_tenant
 
 settings = get_settings()
 
-# ── Password hashing ───────────────────────────────────────────────────────────
-
-
-def hash_password(plain: str) -> str:
-    return _bcrypt.hashpw(plain.encode(), _bcrypt.gensalt(12)).decode()
-
-
-def verify_password(plain: str, hashed: str) -> bool:
-    return _bcrypt.checkpw(plain.encode(), hashed.encode())
+# ── Helpers ────────────────────────────────────────────────────────────────────
 
 
 def _sha256(value: str) -> str:
@@ -85,15 +102,6 @@ def _sha256(value: str) -> str:
     return hashlib.sha256(value.encode()).hexdigest()
 
 
-def _phone_variants(phone: str) -> list[str]:
-    """Return both +E.164 and bare-digit forms so the DB lookup is format-agnostic.
-
-    Firebase always returns +E.164; admins may have stored numbers without the +.
-    """
-    stripped = phone.lstrip('+')
-    return [phone, stripped] if phone.startswith('+') else [phone, f"+{phone}"]
-
-
 # ── Routers ────────────────────────────────────────────────────────────────────
 auth_router = APIRouter(prefix="/auth", tags=["Authentication"])
 users_router = APIRouter(prefix="/users", tags=["User Management"])
@@ -119,11 +127,20 @@ async def login(
         )
     user = result.scalar_one_or_none()
 
-    if not user or not verify_password(payload.password, user.hashed_password):
+    if not user:
+        raise HTTPException(status_code=401, detail="Incorrect credentials.")
+    valid, upgraded_hash = await password_hasher.verify_and_update(
+        payload.password, user.hashed_password
+    )
+    if not valid:
         raise HTTPException(status_code=401, detail="Incorrect credentials.")
     if not user.is_active:
         raise HTTPException(status_code=403, detail="Account is deactivated.")
 
+    if upgraded_hash:
+        # Stored hash used an older bcrypt cost – upgrade it transparently
+        user.hashed_password = upgraded_hash
+
     user.last_login_at = datetime.now(tz=timezone.utc)
 
     access = create_access_token(user.id, user.tenant_id, user.role.value)
@@ -178,7 +195,7 @@ async def login_otp(
     except ValueError as exc:
         raise HTTPException(status_code=422, detail=str(exc))
 
-    variants = _phone_variants(verified_phone)
+    variants = phone_variants(verified_phone)
     profile_user_ids = select(Profile.user_id).where(Profile.mobile.in_(variants))
     result = await db.execute(
         select(User).where(
@@ -321,12 +338,7 @@ async def forgot_password(
             )
         )
         await db.flush()
-        # Import here to avoid circular deps; email service enqueues async send
-        try:
-            from app.services.email import EmailService
-            await EmailService.send_password_reset(user.email, raw_token)
-        except Exception:
-            pass  # never surface email errors to caller
+        enqueue_email(db, "password_reset", user.email, user.tenant_id, raw_token=raw_token)
 
     # Deliberate: always 204 (no content)
 
@@ -358,7 +370,7 @@ async def forgot_password_phone(
         raise HTTPException(status_code=422, detail=str(exc))
 
     # Step 2 — look up user by verified phone (format-agnostic: +E.164 or bare digits)
-    variants = _phone_variants(verified_phone)
+    variants = phone_variants(verified_phone)
     profile_user_ids = select(Profile.user_id).where(Profile.mobile.in_(variants))
     result = await db.execute(
         select(User).where(
@@ -413,10 +425,11 @@ async def reset_password(
     if not user:
         raise HTTPException(status_code=404, detail="User not found.")
 
-    user.hashed_password = hash_password(body.new_password)
+    user.hashed_password = await hash_password(body.new_password)
     record.is_used = True
     record.used_at = datetime.now(tz=timezone.utc)
     await db.flush()
+    invalidate_user(user.id)
 
 
 @auth_router.post("/change-password", status_code=204, summary="Change own password")
@@ -425,10 +438,11 @@ async def change_password(
     db: Annotated[AsyncSession, Depends(get_db)],
     current_user: Annotated[User, Depends(get_current_user)],
 ) -> None:
-    if not verify_password(body.current_password, current_user.hashed_password):
+    if not await verify_password(body.current_password, current_user.hashed_password):
         raise HTTPException(status_code=400, detail="Current password is incorrect.")
-    current_user.hashed_password = hash_password(body.new_password)
+    current_user.hashed_password = await hash_password(body.new_password)
     await db.flush()
+    invalidate_user(current_user.id)
 
 
 # ────────────────────────────────────────────────────────────────────────────────
@@ -445,7 +459,7 @@ async def register_member(
     request: Request,
     db: Annotated[AsyncSession, Depends(get_db)],
 ) -> UserRead:
-    tenant: Tenant | None = getattr(request.state, "tenant", None)
+    tenant: TenantSnapshot | None = getattr(request.state, "tenant", None)
 
     # Fallback: resolve tenant directly from the header using the injected DB
     # session. The middleware uses its own session (production DB); in tests the
@@ -454,13 +468,11 @@ async def register_member(
         hdr = request.headers.get(settings.TENANT_ID_HEADER)
         if hdr:
             try:
-                tid = uuid.UUID(hdr)
-                result = await db.execute(
-                    select(Tenant).where(Tenant.id == tid, Tenant.is_active.is_(True))
-                )
-                tenant = result.scalar_one_or_none()
+                tenant = await get_tenant(uuid.UUID(hdr), db)
             except ValueError:
                 pass
+            if tenant and not tenant.is_active:
+                tenant = None
 
     if not tenant:
         raise HTTPException(status_code=400, detail="Tenant context is required.")
@@ -468,7 +480,7 @@ async def register_member(
     user = User(
         tenant_id=tenant.id,
         email=payload.email,
-        hashed_password=hash_password(payload.password),
+        hashed_password=await hash_password(payload.password),
         full_name=payload.full_name,
         phone=payload.phone,
         role=UserRole.MEMBER,
@@ -493,7 +505,7 @@ async def register_member(
 async def onboard_admin(
     payload: AdminOnboardRequest,
     db: Annotated[AsyncSession, Depends(get_db)],
-    current_user: Annotated[User, Depends(require_admin)],
+    current_user: Annotated[UserPrincipal, Depends(require_admin)],
 ) -> AdminOnboardResponse:
     """
     Create a new ADMIN user for a tenant.
@@ -507,7 +519,7 @@ async def onboard_admin(
     ):
         raise HTTPException(status_code=403, detail="Cannot create admins for other tenants.")
 
-    tenant = await db.get(Tenant, payload.tenant_id)
+    tenant = await get_tenant(payload.tenant_id, db)
     if not tenant or not tenant.is_active:
         raise HTTPException(status_code=404, detail="Tenant not found or inactive.")
 
@@ -515,7 +527,7 @@ async def onboard_admin(
     user = User(
         tenant_id=payload.tenant_id,
         email=payload.email,
-        hashed_password=hash_password(temp_password),
+        hashed_password=await hash_password(temp_password),
         full_name=payload.full_name,
         phone=payload.phone,
         role=UserRole.ADMIN,
@@ -530,14 +542,10 @@ async def onboard_admin(
 
     await db.refresh(user)
 
-    try:
-        from app.services.email import EmailService
-        await EmailService.send_member_invite(user.email, temp_password, user.full_name)
-    except Exception as exc:
-        import logging
-        logging.getLogger(__name__).error(
-            "onboard_admin_email_failed", extra={"email": user.email, "error": str(exc)}
-        )
+    enqueue_email(
+        db, "member_invite", user.email, user.tenant_id,
+        temp_password=temp_password, full_name=user.full_name or "",
+    )
 
     return AdminOnboardResponse(
         user=UserRead.model_validate(user),
@@ -558,7 +566,7 @@ async def onboard_admin(
 async def onboard_member(
     payload: MemberOnboardRequest,
     db: Annotated[AsyncSession, Depends(get_db)],
-    current_user: Annotated[User, Depends(require_admin)],
+    current_user: Annotated[UserPrincipal, Depends(require_admin)],
 ) -> MemberOnboardResponse:
     """
     Tenant admin creates a member account with minimal info (name + email + optional phone).
@@ -580,7 +588,7 @@ async def onboard_member(
 
     # Pre-check for duplicate phone (User.phone and Profile.mobile, both format variants)
     if payload.phone:
-        phone_vars = _phone_variants(payload.phone)
+        phone_vars = phone_variants(payload.phone)
         existing = await db.scalar(select(User.id).where(User.phone.in_(phone_vars)))
         if not existing:
             existing = await db.scalar(
@@ -596,7 +604,7 @@ async def onboard_member(
     user = User(
         tenant_id=current_user.tenant_id,
         email=payload.email,
-        hashed_password=hash_password(temp_password),
+        hashed_password=await hash_password(temp_password),
         full_name=payload.full_name,
         phone=payload.phone,
         role=UserRole.MEMBER,
@@ -626,16 +634,11 @@ async def onboard_member(
     except Exception:
         pass  # profile creation should not block the user record
 
-    # Send invite email only when an email address is available.
-    if user.email:
-        try:
-            from app.services.email import EmailService
-            await EmailService.send_member_invite(user.email, temp_password, user.full_name)
-        except Exception as exc:
-            import logging
-            logging.getLogger(__name__).error(
-                "onboard_member_email_failed", extra={"email": user.email, "error": str(exc)}
-            )
+    # Invite email only when an email address is available (enqueue skips None)
+    enqueue_email(
+        db, "member_invite", user.email, user.tenant_id,
+        temp_password=temp_password, full_name=user.full_name or "",
+    )
     return MemberOnboardResponse(
         user=UserRead.model_validate(user),
         temp_password=temp_password,
@@ -649,7 +652,7 @@ async def onboard_member(
 )
 async def onboard_members_bulk(
     db: Annotated[AsyncSession, Depends(get_db)],
-    current_user: Annotated[User, Depends(require_admin)],
+    current_user: Annotated[UserPrincipal, Depends(require_admin)],
     file: UploadFile = File(..., description="CSV file with columns: full_name, email, phone (optional)"),
 ) -> BulkOnboardResponse:
     """
@@ -658,125 +661,132 @@ async def onboard_members_bulk(
     Required CSV columns:
         full_name, email
     Optional columns:
-        phone
+        phone, gender
 
-    Each row is processed individually using savepoints so that one duplicate
-    email does not abort the entire batch. A per-row status report is returned:
+    Rows are streamed and processed in chunks (see
+    app.services.bulk_onboarding): duplicates are detected with set-based
+    queries and users/profiles are inserted with multi-row INSERTs, so one
+    duplicate email does not abort the batch. A per-row status report is returned:
         created  – user account created successfully (invite email queued)
-        skipped  – email already exists in the system
+        skipped  – email or mobile number already exists in the system
         error    – row was malformed (missing required fields)
+
+    Invite emails go through the email outbox and are delivered once the
+    transaction commits.
     """
     if current_user.tenant_id is None:
         raise HTTPException(status_code=400, detail="Super admins must specify a tenant.")
 
-    raw = await file.read()
-    try:
-        decoded = raw.decode("utf-8-sig")  # handles BOM from Excel exports
-    except UnicodeDecodeError:
-        decoded = raw.decode("latin-1")
-
-    reader = csv.DictReader(io.StringIO(decoded))
-
-    rows: list[BulkOnboardRow] = []
-    created = skipped = errors = 0
-
-    for row_num, record in enumerate(reader, start=1):
-        email = (record.get("email") or "").strip().lower()
-        full_name = (record.get("full_name") or "").strip()
-        phone = (record.get("phone") or "").strip() or None
-        gender_raw = (record.get("gender") or "").strip().lower() or None
-        # Validate gender value; ignore unrecognised values gracefully
-        from app.models.profile import Gender as _Gender
-        gender = gender_raw if gender_raw in {g.value for g in _Gender} else None
-
-        if not email or not full_name:
-            errors += 1
-            rows.append(
-                BulkOnboardRow(
-                    row=row_num,
-                    email=email or "—",
-                    status="error",
-                    detail="Missing required field: full_name and/or email",
-                )
-            )
-            continue
+    pipeline = BulkOnboardPipeline(db, current_user.tenant_id)
+    for chunk in iter_record_chunks(file.file, settings.BULK_ONBOARD_CHUNK_SIZE):
+        await pipeline.process_chunk(chunk)
+    invalidate_tenant_index(current_user.tenant_id)
+    return pipeline.response()
 
-        # Pre-check email duplicate (explicit — faster than relying on IntegrityError)
-        if await db.scalar(select(User.id).where(User.email == email)):
-            skipped += 1
-            rows.append(BulkOnboardRow(row=row_num, email=email, status="skipped",
-                                       detail="Email already registered"))
-            continue
 
-        # Pre-check phone duplicate (no DB unique constraint on phone)
-        if phone:
-            phone_vars = _phone_variants(phone)
-            phone_exists = await db.scalar(select(User.id).where(User.phone.in_(phone_vars)))
-            if not phone_exists:
-                phone_exists = await db.scalar(
-                    select(Profile.user_id).where(Profile.mobile.in_(phone_vars))
-                )
-            if phone_exists:
-                skipped += 1
-                rows.append(BulkOnboardRow(row=row_num, email=email, status="skipped",
-                                           detail="Mobile number already registered"))
-                continue
-
-        temp_password = secrets.token_urlsafe(12)
-        user = User(
-            tenant_id=current_user.tenant_id,
-            email=email,
-            hashed_password=hash_password(temp_password),
-            full_name=full_name,
-            phone=phone,
-            role=UserRole.MEMBER,
-            is_active=True,
-        )
+async def _get_onboard_job(
+    db: AsyncSession, job_id: uuid.UUID, current_user: UserPrincipal
+) -> BulkOnboardJob:
+    job = await db.get(BulkOnboardJob, job_id)
+    if not job or (
+        current_user.role != UserRole.SUPER_ADMIN and job.tenant_id != current_user.tenant_id
+    ):
+        raise HTTPException(status_code=404, detail="Onboarding job not found.")
+    return job
 
-        # Use a savepoint so one IntegrityError doesn't abort the whole batch
-        try:
-            async with db.begin_nested():
-                db.add(user)
-                await db.flush()
-                await db.refresh(user)
-                # Pre-create profile with gender and mobile locked from onboarding
-                profile = Profile(
-                    user_id=user.id,
-                    tenant_id=current_user.tenant_id,
-                    gender=gender,
-                    mobile=phone,
-                    status=ProfileStatus.ACTIVE,
-                )
-                db.add(profile)
-                await db.flush()
-
-            created += 1
-            rows.append(BulkOnboardRow(row=row_num, email=email, status="created"))
-
-            # Send invite email — fire-and-forget
-            try:
-                from app.services.email import EmailService
-                await EmailService.send_member_invite(email, temp_password, full_name)
-            except Exception:
-                pass
 
-        except IntegrityError:
-            skipped += 1
-            rows.append(
-                BulkOnboardRow(
-                    row=row_num,
-                    email=email,
-                    status="skipped",
-                    detail="Email already registered",
-                )
-            )
+@users_router.post(
+    "/onboard/bulk/jobs",
+    response_model=BulkOnboardJobRead,
+    status_code=status.HTTP_202_ACCEPTED,
+    summary="Admin: queue a bulk CSV onboard as a background job",
+)
+async def create_onboard_job(
+    db: Annotated[AsyncSession, Depends(get_db)],
+    current_user: Annotated[UserPrincipal, Depends(require_admin)],
+    background_tasks: BackgroundTasks,
+    file: UploadFile = File(..., description="CSV file with columns: full_name, email, phone (optional)"),
+) -> BulkOnboardJobRead:
+    """
+    Same CSV format and per-row semantics as POST /users/onboard/bulk, but
+    the upload is stored and processed by the job runner
+    (app.services.onboarding_jobs) so the request returns immediately.
+
+    Poll GET /users/onboard/bulk/jobs/{job_id} for progress, page through
+    results with …/rows, and download the final report from …/report.
+    """
+    if current_user.tenant_id is None:
+        raise HTTPException(status_code=400, detail="Super admins must specify a tenant.")
+
+    job = BulkOnboardJob(
+        tenant_id=current_user.tenant_id,
+        created_by=current_user.id,
+        filename=file.filename,
+        csv_data=await file.read(),
+    )
+    db.add(job)
+    await db.flush()
+    await db.refresh(job)
+    # Runs after get_db has committed, so the runner can see the row
+    background_tasks.add_task(onboarding_job_runner.notify)
+    return BulkOnboardJobRead.model_validate(job)
+
 
-    return BulkOnboardResponse(
-        total=len(rows),
-        created=created,
-        skipped=skipped,
-        errors=errors,
-        rows=rows,
+@users_router.get(
+    "/onboard/bulk/jobs/{job_id}",
+    response_model=BulkOnboardJobRead,
+    summary="Admin: bulk onboard job status and progress",
+)
+async def get_onboard_job(
+    job_id: uuid.UUID,
+    db: Annotated[AsyncSession, Depends(get_db)],
+    current_user: Annotated[UserPrincipal, Depends(require_admin)],
+) -> BulkOnboardJobRead:
+    return BulkOnboardJobRead.model_validate(await _get_onboard_job(db, job_id, current_user))
+
+
+@users_router.get(
+    "/onboard/bulk/jobs/{job_id}/rows",
+    response_model=BulkOnboardJobRows,
+    summary="Admin: per-row results of a bulk onboard job (partial while running)",
+)
+async def get_onboard_job_rows(
+    job_id: uuid.UUID,
+    db: Annotated[AsyncSession, Depends(get_db)],
+    current_user: Annotated[UserPrincipal, Depends(require_admin)],
+    offset: int = Query(0, ge=0),
+    limit: int = Query(100, ge=1, le=1000),
+) -> BulkOnboardJobRows:
+    job = await _get_onboard_job(db, job_id, current_user)
+    results = job.results or []
+    return BulkOnboardJobRows(
+        total=len(results),
+        offset=offset,
+        rows=results[offset:offset + limit],
+    )
+
+
+@users_router.get(
+    "/onboard/bulk/jobs/{job_id}/report",
+    summary="Admin: download the bulk onboard job report as CSV",
+)
+async def download_onboard_job_report(
+    job_id: uuid.UUID,
+    db: Annotated[AsyncSession, Depends(get_db)],
+    current_user: Annotated[UserPrincipal, Depends(require_admin)],
+) -> Response:
+    job = await _get_onboard_job(db, job_id, current_user)
+
+    buf = io.StringIO()
+    writer = csv.DictWriter(buf, fieldnames=["row", "email", "status", "detail"])
+    writer.writeheader()
+    writer.writerows(job.results or [])
+    return Response(
+        content=buf.getvalue(),
+        media_type="text/csv",
+        headers={
+            "Content-Disposition": f'attachment; filename="onboard-report-{job.id}.csv"',
+        },
     )
 
 
@@ -791,7 +801,7 @@ async def onboard_members_bulk(
 )
 async def list_members(
     db: Annotated[AsyncSession, Depends(get_db)],
-    current_user: Annotated[User, Depends(require_admin)],
+    current_user: Annotated[UserPrincipal, Depends(require_admin)],
     page: int = Query(1, ge=1),
     page_size: int = Query(20, ge=1, le=100),
     is_active: bool | None = Query(None),
@@ -849,5 +859,6 @@ async def update_me(
             continue
         setattr(current_user, field, value)
     await db.flush()
+    invalidate_user(current_user.id)  # is_active / full_name / phone may have changed
     await db.refresh(current_user)
     return UserRead.model_validate(current_user)
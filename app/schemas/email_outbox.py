@@ -0,0 +1,36 @@
+"""
+schemas/email_outbox.py – Pydantic schemas for the email outbox admin API.
+
+The message payload is never exposed: it may hold temporary passwords and
+password-reset tokens.
+"""
+
+import uuid
+from datetime import datetime
+
+from pydantic import BaseModel
+
+from app.models.email_outbox import OutboxStatus
+
+
+class EmailOutboxRead(BaseModel):
+    """One queued, sent or dead-lettered email."""
+
+    id: uuid.UUID
+    tenant_id: uuid.UUID | None
+    kind: str
+    to_email: str
+    status: OutboxStatus
+    attempts: int
+    next_attempt_at: datetime
+    last_error: str | None
+    sent_at: datetime | None
+    created_at: datetime
+
+    model_config = {"from_attributes": True}
+
+
+class EmailOutboxList(BaseModel):
+    items: list[EmailOutboxRead]
+    total: int
+    counts: dict[str, int]      # messages per status in the caller's scope
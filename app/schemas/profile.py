@@ -8,6 +8,7 @@ from typing import Annotated
 
 from pydantic import BaseModel, Field, field_validator, model_validator
 
+from app.models.bulk_onboard_job import JobStatus
 from app.models.profile import (
     Gender,
     MaritalStatus,
@@ -226,6 +227,14 @@ class ProfileRead(BaseModel):
     # Populated by the API when the viewer has an accepted shortlist with this profile.
     # "accepted" means both parties have confirmed the connection → full profile visible.
     connection_status: str | None = None
+    # Viewer's shortlist state on browse pages: accepted | sent | received | rejected.
+    shortlist_status: str | None = None
+    # Populated by GET /profiles/ when browsing by horoscope compatibility (0–10).
+    porutham_score: int | None = None
+    # Signed URL of the first photo (its WebP rendition once generated); only
+    # with ?include_media_urls=true and only when the viewer may see it (see
+    # app.services.media_urls).
+    photo_url: str | None = None
 
     model_config = {"from_attributes": True}
 
@@ -236,6 +245,35 @@ class ProfileRead(BaseModel):
         return self
 
 
+class MatchRead(BaseModel):
+    """One ranked candidate from GET /profiles/matches."""
+
+    profile: ProfileRead
+    score: float                        # 0–100; geometric mean when reciprocal
+    reciprocal_score: float | None = None   # candidate's preferences vs. viewer
+    matched: list[str]                  # preference criteria the candidate satisfies
+
+
+class MatchFeed(BaseModel):
+    items: list[MatchRead]
+    reciprocal: bool
+
+
+class PoruthamRead(BaseModel):
+    """Horoscope compatibility of one candidate with the subject profile."""
+
+    profile_id: uuid.UUID
+    score: int | None           # poruthams satisfied (0–10); None if a star is missing
+    max_score: int
+    rajju: bool | None          # False = rajju dosham
+    matched: list[str]
+
+
+class PoruthamPage(BaseModel):
+    profile_id: uuid.UUID
+    items: list[PoruthamRead]
+
+
 class FileUploadRequest(BaseModel):
     """Request for a pre-signed S3 URL."""
 
@@ -264,3 +302,22 @@ class NotificationEnqueue(BaseModel):
     title: str = Field(..., max_length=200)
     body: str = Field(..., max_length=500)
     data: dict | None = None  # extra key/value pairs passed to FCM
+
+
+class BroadcastJobRead(BaseModel):
+    """Status and delivery progress of a tenant-wide push broadcast."""
+
+    id: uuid.UUID
+    status: JobStatus
+    title: str
+    body: str
+    total_recipients: int | None   # None until the runner has counted recipients
+    processed_count: int
+    sent_count: int
+    failed_count: int
+    error: str | None
+    created_at: datetime
+    started_at: datetime | None
+    finished_at: datetime | None
+
+    model_config = {"from_attributes": True}
@@ -94,8 +94,11 @@ class InterestRead(BaseModel):
 
 
 class InterestList(BaseModel):
+    """Offset mode fills page/pages; cursor mode fills next_cursor instead.
+    total is None when the caller asked for count=none."""
     items: list[InterestRead]
-    total: int
-    page: int
+    total: int | None
+    page: int | None = None
     size: int
-    pages: int
+    pages: int | None = None
+    next_cursor: str | None = None
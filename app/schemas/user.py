@@ -15,6 +15,7 @@ from typing import Literal
 
 from pydantic import BaseModel, EmailStr, Field, field_validator, model_validator
 
+from app.models.bulk_onboard_job import JobStatus
 from app.models.profile import Gender
 from app.models.user import UserRole
 
@@ -295,3 +296,30 @@ class BulkOnboardResponse(BaseModel):
     skipped: int
     errors: int
     rows: list[BulkOnboardRow]
+
+
+class BulkOnboardJobRead(BaseModel):
+    """Status and progress counters of an asynchronous bulk onboard job."""
+
+    id: uuid.UUID
+    status: JobStatus
+    filename: str | None
+    total_rows: int | None      # None until the runner has counted the upload
+    processed_rows: int
+    created_count: int
+    skipped_count: int
+    error_count: int
+    error: str | None
+    created_at: datetime
+    started_at: datetime | None
+    finished_at: datetime | None
+
+    model_config = {"from_attributes": True}
+
+
+class BulkOnboardJobRows(BaseModel):
+    """A page of per-row results from a (possibly still running) job."""
+
+    total: int                  # rows processed so far
+    offset: int
+    rows: list[BulkOnboardRow]
@@ -0,0 +1,188 @@
+"""
+services/audit_writer.py – In-process queue that batches audit-log inserts.
+
+AuditMiddleware used to open a session and commit one AuditLog row after
+every mutating request. Rows now go onto a bounded asyncio.Queue and a
+background flusher writes them with a single multi-row INSERT, either every
+AUDIT_FLUSH_INTERVAL_MS or as soon as AUDIT_BATCH_SIZE rows are waiting.
+
+Overflow policy (AUDIT_OVERFLOW_POLICY), applied when the queue is full:
+  drop_newest – discard the incoming row (never slows a request down)
+  drop_oldest – discard the oldest queued row to make room
+  block       – wait up to AUDIT_BLOCK_TIMEOUT_MS for space, then drop
+
+Lifecycle:
+  main.lifespan calls start() on startup and stop() on shutdown; stop()
+  drains everything still queued before returning. When the writer is not
+  running (tests, scripts), AuditMiddleware writes rows inline instead.
+
+Audit logging is best-effort: a failed batch is logged and counted, never
+retried, and never surfaces to the client.
+"""
+
+import asyncio
+import time
+from typing import Awaitable, Callable
+
+import structlog
+from sqlalchemy import insert
+
+from app.config import get_settings
+from app.database import AsyncSessionLocal
+from app.models.audit_log import AuditLog
+
+log = structlog.get_logger(__name__)
+settings = get_settings()
+
+AuditRow = dict
+Sink = Callable[[list[AuditRow]], Awaitable[None]]
+
+
+async def insert_audit_rows(rows: list[AuditRow]) -> None:
+    """Write rows with one INSERT … VALUES (…), (…) statement."""
+    async with AsyncSessionLocal() as db:
+        await db.execute(insert(AuditLog).values(rows))
+        await db.commit()
+
+
+class AuditWriter:
+    """Bounded queue + background flusher for AuditLog rows."""
+
+    def __init__(
+        self,
+        *,
+        batch_size: int,
+        flush_interval_ms: int,
+        max_queue_size: int,
+        overflow_policy: str,
+        block_timeout_ms: int,
+        sink: Sink = insert_audit_rows,
+    ) -> None:
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval_ms / 1000
+        self.max_queue_size = max_queue_size
+        self.overflow_policy = overflow_policy
+        self.block_timeout = block_timeout_ms / 1000
+        self._sink = sink
+        self._queue: asyncio.Queue[AuditRow] | None = None
+        self._wakeup: asyncio.Event | None = None
+        self._task: asyncio.Task | None = None
+        self._stopping = False
+        # Counters
+        self.enqueued = 0
+        self.written = 0
+        self.dropped = 0
+        self.failed = 0
+        self.batches = 0
+        self.last_flush_ms = 0.0
+
+    @property
+    def running(self) -> bool:
+        return self._task is not None and not self._task.done()
+
+    # ── Lifecycle ─────────────────────────────────────────────────────────────
+    def start(self) -> None:
+        """Create the queue and spawn the flusher on the running event loop."""
+        if self.running:
+            return
+        self._queue = asyncio.Queue(maxsize=self.max_queue_size)
+        self._wakeup = asyncio.Event()
+        self._stopping = False
+        self._task = asyncio.create_task(self._run(), name="audit-writer")
+
+    async def stop(self, timeout: float | None = None) -> None:
+        """Flush everything still queued, then stop the flusher."""
+        if not self.running:
+            return
+        self._stopping = True
+        self._wakeup.set()
+        try:
+            await asyncio.wait_for(self._task, timeout)
+        except asyncio.TimeoutError:
+            log.warning("audit_drain_timeout", remaining=self._queue.qsize())
+            self._task.cancel()
+        self._task = None
+
+    # ── Producer side ─────────────────────────────────────────────────────────
+    async def submit(self, row: AuditRow) -> bool:
+        """Queue one row; returns False if it was dropped by the overflow policy."""
+        try:
+            self._queue.put_nowait(row)
+        except asyncio.QueueFull:
+            if not await self._handle_overflow(row):
+                self.dropped += 1
+                return False
+        self.enqueued += 1
+        if self._queue.qsize() >= self.batch_size:
+            self._wakeup.set()
+        return True
+
+    async def _handle_overflow(self, row: AuditRow) -> bool:
+        if self.overflow_policy == "drop_oldest":
+            self._queue.get_nowait()
+            self.dropped += 1
+            self._queue.put_nowait(row)
+            return True
+        if self.overflow_policy == "block":
+            try:
+                await asyncio.wait_for(self._queue.put(row), self.block_timeout)
+                return True
+            except asyncio.TimeoutError:
+                return False
+        return False  # drop_newest
+
+    # ── Flusher ───────────────────────────────────────────────────────────────
+    async def _run(self) -> None:
+        while True:
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), self.flush_interval)
+            except asyncio.TimeoutError:
+                pass
+            self._wakeup.clear()
+
+            while not self._queue.empty():
+                batch = [
+                    self._queue.get_nowait()
+                    for _ in range(min(self.batch_size, self._queue.qsize()))
+                ]
+                await self._flush(batch)
+
+            if self._stopping:
+                return
+
+    async def _flush(self, batch: list[AuditRow]) -> None:
+        start = time.perf_counter()
+        try:
+            await self._sink(batch)
+        except Exception as exc:  # noqa: BLE001
+            self.failed += len(batch)
+            log.warning("audit_batch_failed", rows=len(batch), error=str(exc))
+            return
+        self.written += len(batch)
+        self.batches += 1
+        self.last_flush_ms = round((time.perf_counter() - start) * 1000, 2)
+
+    def stats(self) -> dict:
+        """Counters for the /admin/metrics endpoint."""
+        return {
+            "running": self.running,
+            "queue_depth": self._queue.qsize() if self._queue else 0,
+            "max_queue_size": self.max_queue_size,
+            "overflow_policy": self.overflow_policy,
+            "enqueued": self.enqueued,
+            "written": self.written,
+            "dropped": self.dropped,
+            "failed": self.failed,
+            "batches": self.batches,
+            "last_flush_ms": self.last_flush_ms,
+        }
+
+
+# One writer per worker process
+audit_writer = AuditWriter(
+    batch_size=settings.AUDIT_BATCH_SIZE,
+    flush_interval_ms=settings.AUDIT_FLUSH_INTERVAL_MS,
+    max_queue_size=settings.AUDIT_QUEUE_MAX_SIZE,
+    overflow_policy=settings.AUDIT_OVERFLOW_POLICY,
+    block_timeout_ms=settings.AUDIT_BLOCK_TIMEOUT_MS,
+)
@@ -0,0 +1,298 @@
+"""
+services/broadcast_jobs.py – DB-backed runner for tenant-wide push broadcasts.
+
+POST /notifications/broadcast stores a BroadcastJob row and returns 202
+with the job id; admins poll GET /notifications/broadcast/{job_id} for
+progress. As with bulk onboarding, the job table is the queue:
+
+  - Each worker process runs one BroadcastJobRunner (started from
+    main.lifespan). It claims the oldest queued job with
+    SELECT … FOR UPDATE SKIP LOCKED and sends it one
+    NOTIFICATION_BROADCAST_PAGE_SIZE page of recipients at a time through
+    AsyncNotificationService.
+  - Recipients are read in users.id order after the job's cursor,
+    skipping members already in broadcast_deliveries for the job. Every
+    page commits its delivery rows, counters and cursor together.
+    updated_at doubles as a heartbeat: a running job whose heartbeat is
+    older than NOTIFICATION_BROADCAST_JOB_STALE_SECONDS (its worker died
+    or the Lambda timed out) is reclaimed and resumes after the cursor.
+  - On a FIFO queue every message carries a per-(job, member)
+    deduplication id, which covers the short window between SQS accepting
+    a page and its commit.
+
+The runner wakes on notify() from the endpoint or every
+NOTIFICATION_BROADCAST_JOB_POLL_SECONDS. Deployments without a long-lived
+app process (the Lambda handler runs with lifespan="off") can run a
+standalone runner:
+
+    python -m app.services.broadcast_jobs
+"""
+
+import asyncio
+import uuid
+from datetime import datetime, timedelta, timezone
+from typing import Callable
+
+import structlog
+from sqlalchemy import and_, delete, func, insert, or_, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.config import get_settings
+from app.database import AsyncSessionLocal
+from app.models.broadcast_job import BroadcastDelivery, BroadcastJob
+from app.models.bulk_onboard_job import JobStatus
+from app.models.user import User
+from app.services.notification import AsyncNotificationService
+
+log = structlog.get_logger(__name__)
+settings = get_settings()
+
+SessionFactory = Callable[[], AsyncSession]
+
+
+def _now() -> datetime:
+    return datetime.now(timezone.utc)
+
+
+def _recipients(tenant_id: uuid.UUID):
+    return (
+        User.tenant_id == tenant_id,
+        User.is_active == True,  # noqa: E712
+        User.fcm_token.isnot(None),
+    )
+
+
+async def process_job(
+    db: AsyncSession, job: BroadcastJob, page_size: int, service: AsyncNotificationService
+) -> None:
+    """
+    Send (or resume sending) one claimed broadcast, committing after every
+    page. Recipients up to job.after_user_id were handled by an earlier
+    attempt and are skipped.
+    """
+    if job.total_recipients is None:
+        job.total_recipients = await db.scalar(
+            select(func.count()).select_from(User).where(*_recipients(job.tenant_id))
+        )
+        await db.commit()
+
+    data = {**(job.data or {}), "broadcast_id": str(job.id)}
+    while True:
+        query = (
+            select(User.id, User.fcm_token)
+            .where(
+                *_recipients(job.tenant_id),
+                ~select(BroadcastDelivery.user_id)
+                .where(BroadcastDelivery.job_id == job.id, BroadcastDelivery.user_id == User.id)
+                .exists(),
+            )
+            .order_by(User.id)
+            .limit(page_size)
+        )
+        if job.after_user_id is not None:
+            query = query.where(User.id > job.after_user_id)
+        page = [tuple(row) for row in (await db.execute(query)).all()]
+        if not page:
+            break
+
+        delivered: list[uuid.UUID] = []
+        summary = await service.broadcast(
+            _single_page(page), job.title, job.body, data,
+            dedup_key=str(job.id), on_sent=delivered.extend,
+        )
+        if delivered:
+            await db.execute(
+                insert(BroadcastDelivery), [{"job_id": job.id, "user_id": u} for u in delivered]
+            )
+        job.after_user_id = page[-1][0]
+        job.processed_count += len(page)
+        job.sent_count += summary.queued
+        job.failed_count += summary.failed
+        job.updated_at = _now()  # heartbeat
+        await db.commit()
+
+    job.status = JobStatus.COMPLETED
+    job.finished_at = _now()
+    await db.execute(delete(BroadcastDelivery).where(BroadcastDelivery.job_id == job.id))
+    await db.commit()
+
+
+async def _single_page(page: list[tuple[uuid.UUID, str]]):
+    yield page
+
+
+class BroadcastJobRunner:
+    """Polls broadcast_jobs and sends claimed jobs one at a time."""
+
+    def __init__(
+        self,
+        *,
+        page_size: int,
+        poll_interval_seconds: float,
+        stale_after_seconds: float,
+        service: AsyncNotificationService,
+        session_factory: SessionFactory = AsyncSessionLocal,
+    ) -> None:
+        self.page_size = page_size
+        self.poll_interval = poll_interval_seconds
+        self.stale_after = stale_after_seconds
+        self.service = service
+        self._session_factory = session_factory
+        self._wakeup: asyncio.Event | None = None
+        self._task: asyncio.Task | None = None
+        self._stopping = False
+        self.current_job_id: uuid.UUID | None = None
+        # Counters
+        self.completed = 0
+        self.failed = 0
+        self.resumed = 0
+
+    @property
+    def running(self) -> bool:
+        return self._task is not None and not self._task.done()
+
+    # ── Lifecycle ─────────────────────────────────────────────────────────────
+    def start(self) -> None:
+        """Spawn the polling loop on the running event loop."""
+        if self.running:
+            return
+        self._wakeup = asyncio.Event()
+        self._stopping = False
+        self._task = asyncio.create_task(self._run(), name="broadcast-job-runner")
+
+    async def stop(self, timeout: float | None = None) -> None:
+        """
+        Stop claiming jobs and wait for the current job to finish. On
+        timeout the job is abandoned mid-way; another runner resumes it once
+        its heartbeat goes stale.
+        """
+        if not self.running:
+            return
+        self._stopping = True
+        self._wakeup.set()
+        try:
+            await asyncio.wait_for(self._task, timeout)
+        except asyncio.TimeoutError:
+            log.warning("broadcast_job_runner_stop_timeout", job_id=str(self.current_job_id))
+            self._task.cancel()
+        self._task = None
+
+    def notify(self) -> None:
+        """Wake the loop early (a job was just queued by this worker)."""
+        if self.running:
+            self._wakeup.set()
+
+    # ── Loop ──────────────────────────────────────────────────────────────────
+    async def _run(self) -> None:
+        while not self._stopping:
+            try:
+                job_id = await self.claim_next()
+            except Exception as exc:  # noqa: BLE001
+                log.warning("broadcast_job_claim_failed", error=str(exc))
+                job_id = None
+
+            if job_id is not None:
+                await self.run_job(job_id)
+                continue
+
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), self.poll_interval)
+            except asyncio.TimeoutError:
+                pass
+            self._wakeup.clear()
+
+    async def claim_next(self) -> uuid.UUID | None:
+        """Mark the oldest queued (or stale running) job as ours; None if idle."""
+        now = _now()
+        async with self._session_factory() as db:
+            job = await db.scalar(
+                select(BroadcastJob)
+                .where(
+                    or_(
+                        BroadcastJob.status == JobStatus.QUEUED,
+                        and_(
+                            BroadcastJob.status == JobStatus.RUNNING,
+                            BroadcastJob.updated_at < now - timedelta(seconds=self.stale_after),
+                        ),
+                    )
+                )
+                .order_by(BroadcastJob.created_at)
+                .limit(1)
+                .with_for_update(skip_locked=True)
+            )
+            if job is None:
+                return None
+            if job.status == JobStatus.RUNNING:
+                self.resumed += 1
+                log.info("broadcast_job_resumed", job_id=str(job.id), processed=job.processed_count)
+            job.status = JobStatus.RUNNING
+            job.started_at = job.started_at or now
+            job.updated_at = now
+            await db.commit()
+            return job.id
+
+    async def run_job(self, job_id: uuid.UUID) -> None:
+        """Send one claimed job; failures are recorded on the job row."""
+        self.current_job_id = job_id
+        try:
+            async with self._session_factory() as db:
+                job = await db.get(BroadcastJob, job_id)
+                try:
+                    await process_job(db, job, self.page_size, self.service)
+                except Exception as exc:  # noqa: BLE001
+                    await db.rollback()
+                    await db.execute(
+                        update(BroadcastJob)
+                        .where(BroadcastJob.id == job_id)
+                        .values(
+                            status=JobStatus.FAILED,
+                            error=f"{type(exc).__name__}: {exc}",
+                            finished_at=_now(),
+                        )
+                    )
+                    await db.execute(delete(BroadcastDelivery).where(BroadcastDelivery.job_id == job_id))
+                    await db.commit()
+                    self.failed += 1
+                    log.warning("broadcast_job_failed", job_id=str(job_id), error=str(exc))
+                    return
+            self.completed += 1
+            log.info("broadcast_job_completed", job_id=str(job_id))
+        finally:
+            self.current_job_id = None
+
+    def stats(self) -> dict:
+        """Counters for the /admin/metrics endpoint."""
+        return {
+            "running": self.running,
+            "current_job_id": str(self.current_job_id) if self.current_job_id else None,
+            "completed": self.completed,
+            "failed": self.failed,
+            "resumed": self.resumed,
+        }
+
+
+# One runner per worker process
+broadcast_job_runner = BroadcastJobRunner(
+    page_size=settings.NOTIFICATION_BROADCAST_PAGE_SIZE,
+    poll_interval_seconds=settings.NOTIFICATION_BROADCAST_JOB_POLL_SECONDS,
+    stale_after_seconds=settings.NOTIFICATION_BROADCAST_JOB_STALE_SECONDS,
+    service=AsyncNotificationService(
+        concurrency=settings.NOTIFICATION_BROADCAST_CONCURRENCY,
+        max_retries=settings.NOTIFICATION_BROADCAST_MAX_RETRIES,
+    ),
+)
+
+
+async def _main() -> None:
+    broadcast_job_runner.start()
+    try:
+        await asyncio.Event().wait()
+    finally:
+        await broadcast_job_runner.stop(timeout=settings.NOTIFICATION_BROADCAST_JOB_DRAIN_TIMEOUT_SECONDS)
+
+
+if __name__ == "__main__":
+    try:
+        asyncio.run(_main())
+    except KeyboardInterrupt:
+        pass
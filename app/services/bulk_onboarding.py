@@ -0,0 +1,267 @@
+"""
+services/bulk_onboarding.py – Set-based pipeline behind POST /users/onboard/bulk.
+
+The upload is parsed lazily and processed in chunks of
+BULK_ONBOARD_CHUNK_SIZE rows. For each chunk:
+
+  1. Validate rows (full_name + email required) and drop duplicates that
+     appear earlier in the same upload.
+  2. Pre-fetch already registered emails / phones for the whole chunk with
+     three set-based queries (User.email, User.phone, Profile.mobile).
+  3. Hash all temporary passwords concurrently on the password-hasher pool.
+  4. Insert users and profiles with one multi-row INSERT … RETURNING each,
+     inside a savepoint. If a concurrent writer causes an IntegrityError the
+     chunk is replayed row by row so only the offending rows are skipped.
+
+Invite emails are written to the email outbox with one multi-row INSERT
+per chunk, in the same transaction as the users they invite, and delivered
+by EmailOutboxWorker once that transaction commits.
+
+The per-row BulkOnboardRow report is identical to the original row-by-row
+implementation.
+"""
+
+import asyncio
+import codecs
+import csv
+import io
+import secrets
+import uuid
+from typing import IO, Iterator
+
+import structlog
+from sqlalchemy import insert, select
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.auth.passwords import hash_password
+from app.models.email_outbox import EmailOutbox
+from app.models.profile import Gender, Profile, ProfileStatus
+from app.models.user import User, UserRole
+from app.schemas.user import BulkOnboardResponse, BulkOnboardRow
+from app.services.email_outbox import outbox_values, wake_worker_after_commit
+
+log = structlog.get_logger(__name__)
+
+_GENDERS = {g.value for g in Gender}
+
+# (row number, raw CSV record)
+Record = tuple[int, dict]
+
+
+def phone_variants(phone: str) -> list[str]:
+    """Return both +E.164 and bare-digit forms so the DB lookup is format-agnostic.
+
+    Firebase always returns +E.164; admins may have stored numbers without the +.
+    """
+    stripped = phone.lstrip("+")
+    return [phone, stripped] if phone.startswith("+") else [phone, f"+{phone}"]
+
+
+# ── Parsing ────────────────────────────────────────────────────────────────────
+def _detect_encoding(raw: IO[bytes]) -> str:
+    """utf-8 (BOM-tolerant) if the whole stream decodes, else latin-1; rewinds."""
+    decoder = codecs.getincrementaldecoder("utf-8")()
+    encoding = "utf-8-sig"
+    try:
+        for block in iter(lambda: raw.read(64 * 1024), b""):
+            decoder.decode(block)
+        decoder.decode(b"", final=True)
+    except UnicodeDecodeError:
+        encoding = "latin-1"
+    raw.seek(0)
+    return encoding
+
+
+def iter_record_chunks(raw: IO[bytes], chunk_size: int) -> Iterator[list[Record]]:
+    """Stream CSV records from a binary file object, chunk_size rows at a time."""
+    text = io.TextIOWrapper(raw, encoding=_detect_encoding(raw), newline="")
+    try:
+        chunk: list[Record] = []
+        for row_num, record in enumerate(csv.DictReader(text), start=1):
+            chunk.append((row_num, record))
+            if len(chunk) >= chunk_size:
+                yield chunk
+                chunk = []
+        if chunk:
+            yield chunk
+    finally:
+        text.detach()  # leave the underlying upload open for its owner
+
+
+# ── Pipeline ───────────────────────────────────────────────────────────────────
+class BulkOnboardPipeline:
+    """
+    Stateful across chunks of one upload (intra-file duplicate detection,
+    per-row results). Usage:
+
+        pipeline = BulkOnboardPipeline(db, tenant_id)
+        for chunk in iter_record_chunks(file.file, settings.BULK_ONBOARD_CHUNK_SIZE):
+            await pipeline.process_chunk(chunk)
+        return pipeline.response()
+    """
+
+    def __init__(self, db: AsyncSession, tenant_id: uuid.UUID) -> None:
+        self.db = db
+        self.tenant_id = tenant_id
+        self.rows: list[BulkOnboardRow] = []
+        self._seen_emails: set[str] = set()
+        self._seen_phones: set[str] = set()
+
+    def response(self) -> BulkOnboardResponse:
+        statuses = [r.status for r in self.rows]
+        return BulkOnboardResponse(
+            total=len(self.rows),
+            created=statuses.count("created"),
+            skipped=statuses.count("skipped"),
+            errors=statuses.count("error"),
+            rows=self.rows,
+        )
+
+    async def process_chunk(self, records: list[Record]) -> list[BulkOnboardRow]:
+        """Onboard one chunk; returns (and records) its per-row results in row order."""
+        results: dict[int, BulkOnboardRow] = {}
+        candidates: list[dict] = []
+
+        for row_num, record in records:
+            email = (record.get("email") or "").strip().lower()
+            full_name = (record.get("full_name") or "").strip()
+            phone = (record.get("phone") or "").strip() or None
+            gender_raw = (record.get("gender") or "").strip().lower() or None
+            # Ignore unrecognised gender values gracefully
+            gender = Gender(gender_raw) if gender_raw in _GENDERS else None
+
+            if not email or not full_name:
+                results[row_num] = BulkOnboardRow(
+                    row=row_num,
+                    email=email or "—",
+                    status="error",
+                    detail="Missing required field: full_name and/or email",
+                )
+                continue
+            candidates.append(
+                {"row": row_num, "email": email, "full_name": full_name,
+                 "phone": phone, "gender": gender}
+            )
+
+        existing_emails, existing_phones = await self._prefetch_existing(candidates)
+
+        accepted: list[dict] = []
+        for c in candidates:
+            skip_detail = None
+            if c["email"] in existing_emails or c["email"] in self._seen_emails:
+                skip_detail = "Email already registered"
+            elif c["phone"] and any(
+                v in existing_phones or v in self._seen_phones
+                for v in phone_variants(c["phone"])
+            ):
+                skip_detail = "Mobile number already registered"
+
+            if skip_detail:
+                results[c["row"]] = BulkOnboardRow(
+                    row=c["row"], email=c["email"], status="skipped", detail=skip_detail
+                )
+                continue
+            self._seen_emails.add(c["email"])
+            if c["phone"]:
+                self._seen_phones.update(phone_variants(c["phone"]))
+            accepted.append(c)
+
+        if accepted:
+            await self._create_members(accepted, results)
+
+        chunk_rows = [results[row_num] for row_num, _ in records]
+        self.rows.extend(chunk_rows)
+        return chunk_rows
+
+    async def _prefetch_existing(self, candidates: list[dict]) -> tuple[set[str], set[str]]:
+        emails = {c["email"] for c in candidates}
+        phones = {v for c in candidates if c["phone"] for v in phone_variants(c["phone"])}
+
+        existing_emails: set[str] = set()
+        existing_phones: set[str] = set()
+        if emails:
+            existing_emails = set(
+                (await self.db.scalars(select(User.email).where(User.email.in_(emails)))).all()
+            )
+        if phones:
+            existing_phones = set(
+                (await self.db.scalars(select(User.phone).where(User.phone.in_(phones)))).all()
+            )
+            existing_phones |= set(
+                (await self.db.scalars(
+                    select(Profile.mobile).where(Profile.mobile.in_(phones))
+                )).all()
+            )
+        return existing_emails, existing_phones
+
+    async def _create_members(self, accepted: list[dict], results: dict[int, BulkOnboardRow]) -> None:
+        temp_passwords = [secrets.token_urlsafe(12) for _ in accepted]
+        hashes = await asyncio.gather(*(hash_password(pw) for pw in temp_passwords))
+
+        user_values = []
+        profile_values = []
+        for c, hashed in zip(accepted, hashes):
+            user_id = uuid.uuid4()
+            user_values.append({
+                "id": user_id,
+                "tenant_id": self.tenant_id,
+                "email": c["email"],
+                "hashed_password": hashed,
+                "full_name": c["full_name"],
+                "phone": c["phone"],
+                "role": UserRole.MEMBER,
+                "is_active": True,
+            })
+            # Pre-create profile with gender and mobile locked from onboarding
+            profile_values.append({
+                "id": uuid.uuid4(),
+                "user_id": user_id,
+                "tenant_id": self.tenant_id,
+                "gender": c["gender"],
+                "mobile": c["phone"],
+                "status": ProfileStatus.ACTIVE,
+            })
+
+        try:
+            async with self.db.begin_nested():
+                inserted = await self.db.scalars(
+                    insert(User).values(user_values).returning(User.id)
+                )
+                created_ids = set(inserted.all())
+                await self.db.execute(insert(Profile).values(profile_values))
+        except IntegrityError:
+            # A concurrent request registered one of these emails in the
+            # meantime – fall back to per-row savepoints for this chunk.
+            log.info("bulk_onboard_chunk_conflict", rows=len(accepted))
+            created_ids = await self._create_row_by_row(user_values, profile_values)
+
+        invites = []
+        for c, user, pw in zip(accepted, user_values, temp_passwords):
+            if user["id"] in created_ids:
+                results[c["row"]] = BulkOnboardRow(row=c["row"], email=c["email"], status="created")
+                invites.append(outbox_values(
+                    "member_invite", c["email"], self.tenant_id,
+                    temp_password=pw, full_name=c["full_name"],
+                ))
+            else:
+                results[c["row"]] = BulkOnboardRow(
+                    row=c["row"], email=c["email"], status="skipped",
+                    detail="Email already registered",
+                )
+        if invites:
+            await self.db.execute(insert(EmailOutbox), invites)
+            wake_worker_after_commit(self.db)
+
+    async def _create_row_by_row(self, user_values: list[dict], profile_values: list[dict]) -> set[uuid.UUID]:
+        created: set[uuid.UUID] = set()
+        for user, profile in zip(user_values, profile_values):
+            try:
+                async with self.db.begin_nested():
+                    await self.db.execute(insert(User).values(user))
+                    await self.db.execute(insert(Profile).values(profile))
+                created.add(user["id"])
+            except IntegrityError:
+                continue
+        return created
+
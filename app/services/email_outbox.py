@@ -0,0 +1,377 @@
+"""
+services/email_outbox.py – Transactional email outbox and its delivery worker.
+
+Request handlers never talk to SMTP. enqueue_email() adds an EmailOutbox
+row to the caller's session, so the message commits (or rolls back)
+together with the change that triggered it, and the request does not wait
+on the mail server.
+
+EmailOutboxWorker drains the table:
+
+  - Each worker process runs one (started from main.lifespan). It claims up
+    to EMAIL_OUTBOX_BATCH_SIZE due rows with SELECT … FOR UPDATE SKIP
+    LOCKED and marks them 'sending' with a lease of
+    EMAIL_OUTBOX_LEASE_SECONDS in next_attempt_at. A row whose lease ran
+    out (its worker died mid-send) is claimed again, so delivery is
+    at-least-once.
+  - Claimed messages are sent with EMAIL_OUTBOX_CONCURRENCY in flight over
+    the worker's pooled SMTP sessions (services/smtp_pool.py).
+    A failure schedules a retry with exponential backoff
+    (EMAIL_OUTBOX_BACKOFF_BASE_SECONDS doubling up to
+    EMAIL_OUTBOX_BACKOFF_MAX_SECONDS); after EMAIL_OUTBOX_MAX_ATTEMPTS the
+    message is dead-lettered (status 'dead') for an admin to inspect and
+    retry via /admin/email-outbox.
+  - Each tenant may send EMAIL_OUTBOX_TENANT_RATE_PER_MINUTE messages per
+    minute per worker (token bucket). Over-limit messages are put back with
+    a short delay without counting an attempt, so one centre's bulk upload
+    cannot starve everyone else's password resets.
+
+The worker wakes when a session that enqueued mail commits, or every
+EMAIL_OUTBOX_POLL_SECONDS. Deployments without a long-lived app process
+(the Lambda handler runs with lifespan="off") can run it standalone:
+
+    python -m app.services.email_outbox
+"""
+
+import asyncio
+import time
+import uuid
+from datetime import datetime, timedelta, timezone
+from typing import Any, Awaitable, Callable, NamedTuple
+
+import structlog
+from sqlalchemy import and_, event, or_, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.config import get_settings
+from app.database import AsyncSessionLocal
+from app.models.email_outbox import EmailOutbox, OutboxStatus
+from app.services.email import EmailService
+from app.services.smtp_pool import close_smtp_pool
+
+log = structlog.get_logger(__name__)
+settings = get_settings()
+
+SessionFactory = Callable[[], AsyncSession]
+Sender = Callable[[str, str, dict], Awaitable[None]]
+
+# kind → EmailService template; payload keys are the template's kwargs
+TEMPLATES: dict[str, Callable[..., Awaitable[None]]] = {
+    "password_reset": EmailService.send_password_reset,
+    "member_invite": EmailService.send_member_invite,
+    "shortlist_notification": EmailService.send_shortlist_notification,
+    "accept_notification": EmailService.send_accept_notification,
+    "welcome": EmailService.send_welcome,
+    "subscription_expired": EmailService.send_subscription_expired,
+    "subscription_expiry_warning": EmailService.send_subscription_expiry_warning,
+}
+
+
+def _now() -> datetime:
+    return datetime.now(timezone.utc)
+
+
+# ── Enqueue ───────────────────────────────────────────────────────────────────
+def outbox_values(
+    kind: str, to_email: str, tenant_id: uuid.UUID | None = None, **params: Any
+) -> dict:
+    """Column values for one outbox row (for multi-row Core INSERTs)."""
+    if kind not in TEMPLATES:
+        raise ValueError(f"Unknown email kind: {kind}")
+    return {
+        "id": uuid.uuid4(),
+        "tenant_id": tenant_id,
+        "kind": kind,
+        "to_email": to_email,
+        "payload": params,
+        "status": OutboxStatus.PENDING,
+        "attempts": 0,
+    }
+
+
+def enqueue_email(
+    db: AsyncSession, kind: str, to_email: str | None, tenant_id: uuid.UUID | None = None, **params: Any
+) -> None:
+    """
+    Queue an email in the caller's transaction. Recipients without an email
+    address are ignored. Delivery starts once the transaction commits.
+    """
+    if not to_email:
+        return
+    db.add(EmailOutbox(**outbox_values(kind, to_email, tenant_id, **params)))
+    wake_worker_after_commit(db)
+
+
+def wake_worker_after_commit(db: AsyncSession) -> None:
+    """Notify this process's worker when db's current transaction commits."""
+    session = db.sync_session
+    if session.info.get("email_outbox_wake"):
+        return
+    session.info["email_outbox_wake"] = True
+
+    def _wake(sess) -> None:
+        sess.info.pop("email_outbox_wake", None)
+        email_outbox_worker.notify()
+
+    event.listen(session, "after_commit", _wake, once=True)
+
+
+# ── Rate limiting ─────────────────────────────────────────────────────────────
+class TenantRateLimiter:
+    """Per-tenant token bucket; platform mail (tenant_id None) is unlimited."""
+
+    def __init__(self, rate_per_minute: int, clock: Callable[[], float] = time.monotonic) -> None:
+        self.capacity = float(rate_per_minute)
+        self.refill_per_second = rate_per_minute / 60.0
+        self._clock = clock
+        self._buckets: dict[uuid.UUID, tuple[float, float]] = {}   # tenant → (tokens, at)
+
+    def acquire(self, tenant_id: uuid.UUID | None) -> float:
+        """Take one token; returns 0 if allowed, else seconds until one is available."""
+        if tenant_id is None or self.capacity <= 0:
+            return 0.0
+        now = self._clock()
+        tokens, at = self._buckets.get(tenant_id, (self.capacity, now))
+        tokens = min(self.capacity, tokens + (now - at) * self.refill_per_second)
+        if tokens >= 1:
+            self._buckets[tenant_id] = (tokens - 1, now)
+            return 0.0
+        self._buckets[tenant_id] = (tokens, now)
+        return (1 - tokens) / self.refill_per_second
+
+
+# ── Worker ────────────────────────────────────────────────────────────────────
+class ClaimedEmail(NamedTuple):
+    id: uuid.UUID
+    kind: str
+    to_email: str
+    payload: dict
+    attempts: int   # including this one
+
+
+async def _send_template(kind: str, to_email: str, payload: dict) -> None:
+    await TEMPLATES[kind](to_email, **payload)
+
+
+class EmailOutboxWorker:
+    """Claims due outbox rows and delivers them with retries."""
+
+    def __init__(
+        self,
+        *,
+        batch_size: int,
+        concurrency: int,
+        poll_interval_seconds: float,
+        lease_seconds: float,
+        max_attempts: int,
+        backoff_base_seconds: float,
+        backoff_max_seconds: float,
+        tenant_rate_per_minute: int,
+        sender: Sender = _send_template,
+        session_factory: SessionFactory = AsyncSessionLocal,
+    ) -> None:
+        self.batch_size = batch_size
+        self.concurrency = concurrency
+        self.poll_interval = poll_interval_seconds
+        self.lease = timedelta(seconds=lease_seconds)
+        self.max_attempts = max_attempts
+        self.backoff_base = backoff_base_seconds
+        self.backoff_max = backoff_max_seconds
+        self.rate_limiter = TenantRateLimiter(tenant_rate_per_minute)
+        self._sender = sender
+        self._session_factory = session_factory
+        self._wakeup: asyncio.Event | None = None
+        self._task: asyncio.Task | None = None
+        self._stopping = False
+        # Counters
+        self.sent = 0
+        self.retried = 0
+        self.dead = 0
+        self.deferred = 0
+        self.reclaimed = 0
+
+    @property
+    def running(self) -> bool:
+        return self._task is not None and not self._task.done()
+
+    # ── Lifecycle ─────────────────────────────────────────────────────────────
+    def start(self) -> None:
+        """Spawn the polling loop on the running event loop."""
+        if self.running:
+            return
+        self._wakeup = asyncio.Event()
+        self._stopping = False
+        self._task = asyncio.create_task(self._run(), name="email-outbox-worker")
+
+    async def stop(self, timeout: float | None = None) -> None:
+        """
+        Stop claiming and wait for the in-flight batch. On timeout the batch
+        is abandoned; its leases expire and another worker sends it.
+        """
+        if not self.running:
+            return
+        self._stopping = True
+        self._wakeup.set()
+        try:
+            await asyncio.wait_for(self._task, timeout)
+        except asyncio.TimeoutError:
+            log.warning("email_outbox_stop_timeout")
+            self._task.cancel()
+        self._task = None
+
+    def notify(self) -> None:
+        """Wake the loop early (mail was just committed by this worker)."""
+        if self.running:
+            self._wakeup.set()
+
+    # ── Loop ──────────────────────────────────────────────────────────────────
+    async def _run(self) -> None:
+        while not self._stopping:
+            try:
+                claimed = await self.run_once()
+            except Exception as exc:  # noqa: BLE001
+                log.warning("email_outbox_batch_failed", error=str(exc))
+                claimed = 0
+
+            # A full batch means more is probably due – go again at once
+            if claimed >= self.batch_size:
+                continue
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), self.poll_interval)
+            except asyncio.TimeoutError:
+                pass
+            self._wakeup.clear()
+
+    async def run_once(self) -> int:
+        """Claim and deliver one batch; returns the number of rows claimed."""
+        batch, claimed = await self.claim_batch()
+        if batch:
+            results = await self.deliver(batch)
+            await self.record(batch, results)
+        return claimed
+
+    def backoff(self, attempts: int) -> timedelta:
+        """Delay before retry number `attempts` (1 = first retry)."""
+        delay = self.backoff_base * 2 ** (attempts - 1)
+        return timedelta(seconds=min(delay, self.backoff_max))
+
+    async def claim_batch(self) -> tuple[list[ClaimedEmail], int]:
+        """
+        Lease due rows to this worker. Rows over their tenant's rate limit
+        are pushed back instead. Returns (messages to send, rows claimed).
+        """
+        now = _now()
+        async with self._session_factory() as db:
+            rows = (await db.scalars(
+                select(EmailOutbox)
+                .where(
+                    or_(
+                        EmailOutbox.status == OutboxStatus.PENDING,
+                        EmailOutbox.status == OutboxStatus.SENDING,   # lease expired
+                    ),
+                    EmailOutbox.next_attempt_at <= now,
+                )
+                .order_by(EmailOutbox.next_attempt_at)
+                .limit(self.batch_size)
+                .with_for_update(skip_locked=True)
+            )).all()
+
+            batch: list[ClaimedEmail] = []
+            for row in rows:
+                if row.status == OutboxStatus.SENDING:
+                    self.reclaimed += 1
+                    log.info("email_outbox_lease_expired", email_id=str(row.id))
+                wait = self.rate_limiter.acquire(row.tenant_id)
+                if wait:
+                    self.deferred += 1
+                    row.status = OutboxStatus.PENDING
+                    row.next_attempt_at = now + timedelta(seconds=wait)
+                    continue
+                row.status = OutboxStatus.SENDING
+                row.attempts += 1
+                row.next_attempt_at = now + self.lease
+                batch.append(ClaimedEmail(row.id, row.kind, row.to_email, row.payload or {}, row.attempts))
+            await db.commit()
+        return batch, len(rows)
+
+    async def deliver(self, batch: list[ClaimedEmail]) -> list[str | None]:
+        """Send every message; returns None (sent) or an error string per message."""
+        semaphore = asyncio.Semaphore(self.concurrency)
+
+        async def _one(msg: ClaimedEmail) -> str | None:
+            if msg.kind not in TEMPLATES:
+                return f"Unknown email kind: {msg.kind}"
+            async with semaphore:
+                try:
+                    await self._sender(msg.kind, msg.to_email, msg.payload)
+                    return None
+                except Exception as exc:  # noqa: BLE001
+                    return f"{type(exc).__name__}: {exc}"
+
+        return list(await asyncio.gather(*(_one(msg) for msg in batch)))
+
+    async def record(self, batch: list[ClaimedEmail], results: list[str | None]) -> None:
+        """Mark each message sent, scheduled for retry, or dead."""
+        now = _now()
+        async with self._session_factory() as db:
+            for msg, error in zip(batch, results):
+                if error is None:
+                    values = {"status": OutboxStatus.SENT, "sent_at": now,
+                              "payload": None, "last_error": None}
+                    self.sent += 1
+                elif msg.attempts >= self.max_attempts or msg.kind not in TEMPLATES:
+                    values = {"status": OutboxStatus.DEAD, "last_error": error}
+                    self.dead += 1
+                    log.warning("email_outbox_dead", email_id=str(msg.id), kind=msg.kind, error=error)
+                else:
+                    values = {"status": OutboxStatus.PENDING, "last_error": error,
+                              "next_attempt_at": now + self.backoff(msg.attempts)}
+                    self.retried += 1
+                    log.info("email_outbox_retry", email_id=str(msg.id), attempts=msg.attempts, error=error)
+                # Only touch rows we still hold (a lease may have expired meanwhile)
+                await db.execute(
+                    update(EmailOutbox)
+                    .where(and_(EmailOutbox.id == msg.id, EmailOutbox.status == OutboxStatus.SENDING))
+                    .values(**values)
+                )
+            await db.commit()
+
+    def stats(self) -> dict:
+        """Counters for the /admin/metrics endpoint."""
+        return {
+            "running": self.running,
+            "sent": self.sent,
+            "retried": self.retried,
+            "dead": self.dead,
+            "deferred": self.deferred,
+            "reclaimed": self.reclaimed,
+        }
+
+
+# One worker per process
+email_outbox_worker = EmailOutboxWorker(
+    batch_size=settings.EMAIL_OUTBOX_BATCH_SIZE,
+    concurrency=settings.EMAIL_OUTBOX_CONCURRENCY,
+    poll_interval_seconds=settings.EMAIL_OUTBOX_POLL_SECONDS,
+    lease_seconds=settings.EMAIL_OUTBOX_LEASE_SECONDS,
+    max_attempts=settings.EMAIL_OUTBOX_MAX_ATTEMPTS,
+    backoff_base_seconds=settings.EMAIL_OUTBOX_BACKOFF_BASE_SECONDS,
+    backoff_max_seconds=settings.EMAIL_OUTBOX_BACKOFF_MAX_SECONDS,
+    tenant_rate_per_minute=settings.EMAIL_OUTBOX_TENANT_RATE_PER_MINUTE,
+)
+
+
+async def _main() -> None:
+    email_outbox_worker.start()
+    try:
+        await asyncio.Event().wait()
+    finally:
+        await email_outbox_worker.stop(timeout=settings.EMAIL_OUTBOX_DRAIN_TIMEOUT_SECONDS)
+        await close_smtp_pool()
+
+
+if __name__ == "__main__":
+    try:
+        asyncio.run(_main())
+    except KeyboardInterrupt:
+        pass
@@ -0,0 +1,282 @@
+"""
+services/email_templates.py – Precompiled transactional email templates.
+
+The branded shell, buttons and frontend links of every email are identical
+for all recipients, so each template is assembled once per worker (on first
+use) and split into static segments and per-recipient fields. Rendering is
+then a single join: no f-string layout rebuild, no repeated preheader
+padding, no settings lookups.
+
+    template = get_templates()["subscription_expired"]
+    subject, html = template.render(full_name="Asha", plan_name="Bloom")
+    batch = template.render_many(rows)   # one Rendered per recipient dict
+
+Field values are HTML-escaped in the body (names come from user input);
+subjects are plain text and used as-is.
+"""
+
+import html
+import string
+from functools import lru_cache
+from typing import Any, Iterable, Mapping, NamedTuple
+
+from app.config import get_settings
+
+# ── Brand constants ────────────────────────────────────────────────────────────
+_PRIMARY   = "#1E88E5"
+_SECONDARY = "#7B1FA2"
+_BG        = "#F0EEFF"
+_CARD_BG   = "#FFFFFF"
+_TEXT      = "#1a1a2e"
+_MUTED     = "#6b7280"
+_BORDER    = "#e5e7eb"
+
+_PREHEADER_PAD = "&nbsp;&#847;&nbsp;" * 80
+_FORMATTER = string.Formatter()
+
+
+# ── Base layout ────────────────────────────────────────────────────────────────
+def _base(content: str, preview: str = "") -> str:
+    """Wrap content in a responsive branded email shell."""
+    return f"""<!DOCTYPE html>
+<html lang="en">
+<head>
+  <meta charset="UTF-8" />
+  <meta name="viewport" content="width=device-width,initial-scale=1.0" />
+  <meta name="color-scheme" content="light" />
+  <title>Varanbook</title>
+  {'<span style="display:none;max-height:0;overflow:hidden;">' + preview + _PREHEADER_PAD + '</span>' if preview else ''}
+</head>
+<body style="margin:0;padding:0;background-color:{_BG};font-family:'Segoe UI',Roboto,Arial,sans-serif;">
+  <table width="100%" cellpadding="0" cellspacing="0" style="background-color:{_BG};padding:40px 16px;">
+    <tr>
+      <td align="center">
+
+        <!-- Header -->
+        <table width="560" cellpadding="0" cellspacing="0" style="max-width:560px;width:100%;">
+          <tr>
+            <td align="center" style="padding-bottom:24px;">
+              <table cellpadding="0" cellspacing="0">
+                <tr>
+                  <td style="background:linear-gradient(135deg,{_PRIMARY},{_SECONDARY});border-radius:14px;padding:10px 22px;">
+                    <span style="font-size:22px;font-weight:700;color:#fff;letter-spacing:-0.5px;">&#10084; Varanbook</span>
+                  </td>
+                </tr>
+              </table>
+            </td>
+          </tr>
+        </table>
+
+        <!-- Card -->
+        <table width="560" cellpadding="0" cellspacing="0"
+               style="max-width:560px;width:100%;background:{_CARD_BG};border-radius:16px;
+                      border:1px solid {_BORDER};box-shadow:0 4px 24px rgba(30,136,229,0.08);">
+          <tr>
+            <!-- Gradient top bar -->
+            <td style="background:linear-gradient(135deg,{_PRIMARY},{_SECONDARY});
+                       height:5px;border-radius:16px 16px 0 0;font-size:0;">&nbsp;</td>
+          </tr>
+          <tr>
+            <td style="padding:36px 40px 32px;">
+              {content}
+            </td>
+          </tr>
+          <tr>
+            <!-- Footer -->
+            <td style="border-top:1px solid {_BORDER};padding:20px 40px;border-radius:0 0 16px 16px;background:#fafafa;">
+              <p style="margin:0;font-size:12px;color:{_MUTED};text-align:center;line-height:1.6;">
+                © 2026 Varanbook &nbsp;·&nbsp; Matrimonial Centre Management<br/>
+                If you did not expect this email, you can safely ignore it.
+              </p>
+            </td>
+          </tr>
+        </table>
+
+      </td>
+    </tr>
+  </table>
+</body>
+</html>"""
+
+
+def _btn(label: str, url: str, color: str = _PRIMARY) -> str:
+    return f"""
+    <table cellpadding="0" cellspacing="0" style="margin:28px 0;">
+      <tr>
+        <td style="background:{color};border-radius:8px;">
+          <a href="{url}"
+             style="display:inline-block;padding:13px 32px;font-size:15px;font-weight:600;
+                    color:#fff;text-decoration:none;letter-spacing:0.2px;">{label}</a>
+        </td>
+      </tr>
+    </table>"""
+
+
+def _h1(text: str) -> str:
+    return f'<h1 style="margin:0 0 8px;font-size:24px;font-weight:700;color:{_TEXT};">{text}</h1>'
+
+
+def _p(text: str, mt: int = 0) -> str:
+    return f'<p style="margin:{mt}px 0 16px;font-size:15px;line-height:1.7;color:{_TEXT};">{text}</p>'
+
+
+def _muted(text: str) -> str:
+    return f'<p style="margin:20px 0 0;font-size:13px;color:{_MUTED};line-height:1.6;">{text}</p>'
+
+
+def _info_row(label: str, value: str) -> str:
+    return f"""
+    <tr>
+      <td style="padding:10px 16px;font-size:13px;color:{_MUTED};font-weight:600;
+                 white-space:nowrap;border-bottom:1px solid {_BORDER};">{label}</td>
+      <td style="padding:10px 16px;font-size:14px;color:{_TEXT};border-bottom:1px solid {_BORDER};">{value}</td>
+    </tr>"""
+
+
+def _info_table(*rows: str) -> str:
+    inner = "".join(rows)
+    return f"""
+    <table width="100%" cellpadding="0" cellspacing="0"
+           style="border:1px solid {_BORDER};border-radius:10px;border-collapse:collapse;margin:20px 0;">
+      {inner}
+    </table>"""
+
+
+# ── Compiled templates ─────────────────────────────────────────────────────────
+class Rendered(NamedTuple):
+    subject: str
+    html: str
+
+
+# Static text and the field that follows it (None after the last segment)
+Segments = tuple[tuple[str, str | None], ...]
+
+
+def _compile(text: str) -> Segments:
+    return tuple((literal, field) for literal, field, _, _ in _FORMATTER.parse(text))
+
+
+def _fill(segments: Segments, values: Mapping[str, Any], escape: bool) -> str:
+    out = []
+    for literal, field in segments:
+        out.append(literal)
+        if field is not None:
+            value = str(values[field])
+            out.append(html.escape(value) if escape else value)
+    return "".join(out)
+
+
+class EmailTemplate:
+    """
+    subject and content use str.format-style {field} placeholders; the
+    content is wrapped in the branded shell at construction time.
+    """
+
+    def __init__(self, subject: str, content: str, preview: str = "") -> None:
+        self._subject = _compile(subject)
+        self._html = _compile(_base(content, preview))
+        self.fields = frozenset(
+            field for segments in (self._subject, self._html) for _, field in segments if field
+        )
+
+    def render(self, **values: Any) -> Rendered:
+        return Rendered(
+            _fill(self._subject, values, escape=False),
+            _fill(self._html, values, escape=True),
+        )
+
+    def render_many(self, rows: Iterable[Mapping[str, Any]]) -> list[Rendered]:
+        """Render the template for a batch of recipients."""
+        subject, body = self._subject, self._html
+        return [
+            Rendered(_fill(subject, row, escape=False), _fill(body, row, escape=True))
+            for row in rows
+        ]
+
+
+@lru_cache()  # compiled once per worker process
+def get_templates() -> dict[str, EmailTemplate]:
+    url = get_settings().APP_FRONTEND_URL
+    return {
+        "password_reset": EmailTemplate(
+            "Reset your Varanbook password",
+            _h1("Reset your password")
+            + _p("We received a request to reset the password for your Varanbook account. "
+                 "Click the button below to choose a new password.", mt=4)
+            + _btn("Reset Password", url + "/reset-password?token={raw_token}")
+            + _muted("This link expires in <strong>1 hour</strong>. "
+                     "If you did not request a password reset, no action is needed."),
+            preview="Reset your Varanbook password",
+        ),
+        "member_invite": _member_invite(url, "Hello, <strong>{full_name}</strong> 👋"),
+        "member_invite_unnamed": _member_invite(url, "Hello 👋"),
+        "shortlist_notification": EmailTemplate(
+            "{from_name} is interested in your profile!",
+            _h1("Someone is interested in you! ✨")
+            + _p("<strong>{from_name}</strong> has expressed interest in your profile on Varanbook. "
+                 "This could be the beginning of something beautiful.", mt=4)
+            + _btn("View Profile & Respond", url + "/dashboard")
+            + _muted("Log in to see their full profile and send your response."),
+        ),
+        "accept_notification": EmailTemplate(
+            "{from_name} accepted your interest!",
+            _h1("Great news — your interest was accepted! 🎉")
+            + _p("<strong>{from_name}</strong> has accepted your interest on Varanbook. "
+                 "You can now view their contact details and take the next step.", mt=4)
+            + _btn("View Contact Details", url + "/dashboard")
+            + _muted("Log in to Varanbook to continue the conversation."),
+        ),
+        "welcome": EmailTemplate(
+            "Welcome to Varanbook, {full_name}!",
+            _h1("Welcome to Varanbook, {full_name}! 🌸")
+            + _p("We're delighted to have you on board. Varanbook is your trusted platform "
+                 "for finding the perfect life partner through your matrimonial centre.", mt=4)
+            + _p("Here's how to get started:")
+            + """<ul style="margin:0 0 16px;padding-left:20px;font-size:15px;color:#1a1a2e;line-height:1.9;">
+                   <li>Complete your profile with photos and personal details</li>
+                   <li>Browse profiles from your matrimonial centre</li>
+                   <li>Express interest and connect with potential matches</li>
+                 </ul>"""
+            + _btn("Complete My Profile", url + "/dashboard"),
+            preview="Your journey to finding the perfect match begins",
+        ),
+        "subscription_expired": EmailTemplate(
+            "Your {plan_name} membership has expired",
+            _h1("Your membership has expired")
+            + _p("Dear <strong>{full_name}</strong>,", mt=4)
+            + _p("Your <strong>{plan_name}</strong> membership on Varanbook has expired. "
+                 "Renew now to continue browsing profiles and sending interest requests without interruption.")
+            + _btn("Renew Membership", url + "/plans", color=_SECONDARY)
+            + _muted("Questions? Reach out to your matrimonial centre for assistance."),
+        ),
+        "subscription_expiry_warning": EmailTemplate(
+            "Your {plan_name} membership expires in 3 days",
+            _h1("Your membership expires soon ⏳")
+            + _p("Dear <strong>{full_name}</strong>,", mt=4)
+            + _p("Your <strong>{plan_name}</strong> membership will expire on "
+                 "<strong>{expires_on}</strong> — just 3 days away. "
+                 "Renew early to avoid any gap in your access to profiles and matches.")
+            + _btn("Renew Now", url + "/plans", color=_SECONDARY)
+            + _muted("Renewing early ensures uninterrupted access to all features."),
+        ),
+    }
+
+
+def _member_invite(url: str, greeting: str) -> EmailTemplate:
+    return EmailTemplate(
+        "You're invited to Varanbook",
+        _h1("You're invited to Varanbook")
+        + _p(greeting, mt=4)
+        + _p("Your matrimonial centre has created an account for you on "
+             "<strong>Varanbook</strong>. Use the credentials below to sign in "
+             "and complete your profile to start connecting with potential matches.")
+        + _info_table(
+            _info_row("Email", "{to_email}"),
+            _info_row("Temporary Password", "<code style='font-family:monospace;font-size:14px;"
+                      "background:#f3f4f6;padding:2px 6px;border-radius:4px;'>{temp_password}</code>"),
+        )
+        + _btn("Sign In to Varanbook", url + "/login")
+        + _muted("Please change your password after your first login. "
+                 "If you were not expecting this invitation, you can safely ignore this email."),
+        preview="Your Varanbook account is ready",
+    )
@@ -0,0 +1,159 @@
+"""
+services/interest_quota.py – Per-subscription interest-request quota.
+
+Plans may cap the interest requests (shortlists) a member sends during a
+subscription period (MembershipPlanTemplate.max_interests). Instead of
+counting the member's shortlists on every POST /shortlists/, each
+subscription carries an interests_sent counter:
+
+  - reserve_interest() bumps the counter of the member's active
+    subscription with one UPDATE … RETURNING and checks the new value
+    against the plan limit. The row lock taken by the UPDATE serialises
+    concurrent requests, and the caller's transaction rollback undoes the
+    bump if the request fails later.
+  - release_interest() gives the slot back when an interest sent during the
+    current period is withdrawn.
+  - reconcile_interest_counts() recomputes counters from the shortlists
+    table (new or backdated subscriptions, drift repair).
+
+Plan limits rarely change, so they are cached per worker in a TTLCache;
+update_plan_template calls invalidate_plan_limit().
+"""
+
+import uuid
+from datetime import datetime
+from typing import NamedTuple
+
+from sqlalchemy import func, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.cache import MISSING, TTLCache
+from app.config import get_settings
+from app.models.membership_plan import (
+    MemberSubscription,
+    MembershipPlanTemplate,
+    SubscriptionStatus,
+)
+from app.models.profile import Profile
+from app.models.shortlist import Shortlist
+
+settings = get_settings()
+
+
+class PlanLimit(NamedTuple):
+    max_interests: int | None   # None = unlimited
+    plan_name: str
+
+
+class InterestQuotaExceeded(Exception):
+    """Raised by reserve_interest() when the plan's interest limit is reached."""
+
+    def __init__(self, limit: PlanLimit) -> None:
+        super().__init__(f"{limit.plan_name}: {limit.max_interests} interests")
+        self.limit = limit
+
+
+# One cache per worker process, keyed by plan template id
+plan_limit_cache = TTLCache(
+    "plan_limits",
+    max_size=settings.PLAN_LIMIT_CACHE_MAX_SIZE,
+    ttl_seconds=settings.PLAN_LIMIT_CACHE_TTL_SECONDS,
+)
+
+
+async def get_plan_limit(db: AsyncSession, plan_template_id: uuid.UUID) -> PlanLimit:
+    """The plan's interest limit (cached)."""
+    cached = plan_limit_cache.get(plan_template_id)
+    if cached is not MISSING:
+        return cached
+    row = (await db.execute(
+        select(MembershipPlanTemplate.max_interests, MembershipPlanTemplate.name)
+        .where(MembershipPlanTemplate.id == plan_template_id)
+    )).first()
+    limit = PlanLimit(row.max_interests, row.name) if row else PlanLimit(None, "")
+    plan_limit_cache.set(plan_template_id, limit)
+    return limit
+
+
+def invalidate_plan_limit(plan_template_id: uuid.UUID) -> None:
+    plan_limit_cache.invalidate(plan_template_id)
+
+
+def _active_subscription_id(user_id: uuid.UUID, tenant_id: uuid.UUID):
+    """Scalar subquery: the member's most recent active subscription."""
+    return (
+        select(MemberSubscription.id)
+        .where(
+            MemberSubscription.user_id == user_id,
+            MemberSubscription.tenant_id == tenant_id,
+            MemberSubscription.status == SubscriptionStatus.ACTIVE,
+        )
+        .order_by(MemberSubscription.created_at.desc())
+        .limit(1)
+        .scalar_subquery()
+    )
+
+
+async def reserve_interest(db: AsyncSession, user_id: uuid.UUID, tenant_id: uuid.UUID) -> None:
+    """
+    Count one interest against the member's active subscription.
+
+    Members without an active subscription are not limited. Raises
+    InterestQuotaExceeded when the plan limit would be passed; the caller
+    must let the transaction roll back so the bump is undone.
+    """
+    row = (await db.execute(
+        update(MemberSubscription)
+        .where(MemberSubscription.id == _active_subscription_id(user_id, tenant_id))
+        .values(interests_sent=MemberSubscription.interests_sent + 1)
+        .returning(MemberSubscription.interests_sent, MemberSubscription.plan_template_id)
+        .execution_options(synchronize_session=False)
+    )).first()
+    if row is None:
+        return
+    limit = await get_plan_limit(db, row.plan_template_id)
+    if limit.max_interests is not None and row.interests_sent > limit.max_interests:
+        raise InterestQuotaExceeded(limit)
+
+
+async def release_interest(
+    db: AsyncSession, user_id: uuid.UUID, tenant_id: uuid.UUID, sent_at: datetime
+) -> None:
+    """Return the slot of a withdrawn interest if it was sent in the current period."""
+    await db.execute(
+        update(MemberSubscription)
+        .where(
+            MemberSubscription.id == _active_subscription_id(user_id, tenant_id),
+            MemberSubscription.starts_at <= sent_at,
+            MemberSubscription.interests_sent > 0,
+        )
+        .values(interests_sent=MemberSubscription.interests_sent - 1)
+        .execution_options(synchronize_session=False)
+    )
+
+
+async def reconcile_interest_counts(
+    db: AsyncSession, subscription_id: uuid.UUID | None = None
+) -> int:
+    """Recompute interests_sent for one (or every) active subscription; returns rows updated."""
+    sent = (
+        select(func.count())
+        .select_from(Shortlist)
+        .join(Profile, Profile.id == Shortlist.from_profile_id)
+        .where(
+            Profile.user_id == MemberSubscription.user_id,
+            Shortlist.created_at >= MemberSubscription.starts_at,
+        )
+        .correlate(MemberSubscription)
+        .scalar_subquery()
+    )
+    stmt = (
+        update(MemberSubscription)
+        .where(MemberSubscription.status == SubscriptionStatus.ACTIVE)
+        .values(interests_sent=sent)
+        .execution_options(synchronize_session=False)
+    )
+    if subscription_id is not None:
+        stmt = stmt.where(MemberSubscription.id == subscription_id)
+    result = await db.execute(stmt)
+    return result.rowcount
@@ -0,0 +1,194 @@
+"""
+services/match_index.py – Per-tenant in-memory index of match candidates.
+
+GET /profiles/matches used to re-read and re-score every active profile in
+the tenant on each request. The index keeps, per tenant and per worker:
+
+  - Features (see services/matching.py) for every active profile;
+  - each profile's PartnerPreference already compiled to a PreferenceScorer;
+  - id sets partitioned by gender and by (gender, caste), so the browse
+    rules (opposite gender, caste lock) are set lookups, not row scans.
+
+Lifecycle:
+    get_match_index(db, tenant_id) builds a tenant's index with one query on
+    first use and keeps it in a TTLCache for MATCH_INDEX_TTL_SECONDS, which
+    bounds staleness across workers and for writes made outside the API
+    (e.g. the standalone onboarding job runner). Writes made through this
+    worker's API call refresh_profile() / refresh_preferences() /
+    discard_profile(), which patch an already-built index in place; bulk
+    onboarding calls invalidate_tenant_index(). Tenants not currently
+    indexed are left alone and built fresh on next use.
+"""
+
+import uuid
+from datetime import date
+from typing import Any, Iterator
+
+from sqlalchemy import literal_column, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.cache import MISSING, TTLCache
+from app.config import get_settings
+from app.models.partner_preference import PartnerPreference
+from app.models.profile import Gender, Profile, ProfileStatus
+from app.services.matching import (
+    FEATURE_COLUMNS,
+    Features,
+    PreferenceScorer,
+    features_from_row,
+    normalise,
+)
+
+settings = get_settings()
+
+_OPPOSITE = {Gender.MALE.value: Gender.FEMALE.value, Gender.FEMALE.value: Gender.MALE.value}
+
+
+class TenantMatchIndex:
+    """Active profiles of one tenant, partitioned for candidate selection."""
+
+    def __init__(self, tenant_id: uuid.UUID) -> None:
+        self.tenant_id = tenant_id
+        self.features: dict[uuid.UUID, Features] = {}
+        self.scorers: dict[uuid.UUID, PreferenceScorer] = {}
+        self._gender: dict[uuid.UUID, str | None] = {}
+        self._by_gender: dict[str | None, set[uuid.UUID]] = {}
+        self._by_gender_caste: dict[tuple[str | None, str | None], set[uuid.UUID]] = {}
+
+    def __len__(self) -> int:
+        return len(self.features)
+
+    def put(
+        self,
+        features: Features,
+        gender: Any,
+        scorer: PreferenceScorer | None = None,
+    ) -> None:
+        """Insert or replace a profile; keeps its existing scorer unless one is given."""
+        profile_id = features.profile_id
+        self.remove(profile_id)
+        gender = normalise(gender)
+        self.features[profile_id] = features
+        self._gender[profile_id] = gender
+        self._by_gender.setdefault(gender, set()).add(profile_id)
+        self._by_gender_caste.setdefault((gender, features.caste), set()).add(profile_id)
+        if scorer is not None:
+            self.scorers[profile_id] = scorer
+
+    def remove(self, profile_id: uuid.UUID) -> None:
+        """Drop a profile's features and partitions (its scorer is kept for re-insert)."""
+        features = self.features.pop(profile_id, None)
+        if features is None:
+            return
+        gender = self._gender.pop(profile_id)
+        self._by_gender[gender].discard(profile_id)
+        self._by_gender_caste[(gender, features.caste)].discard(profile_id)
+
+    def candidates(
+        self,
+        viewer_profile_id: uuid.UUID,
+        viewer_gender: Any,
+        caste: str | None = None,
+    ) -> Iterator[tuple[Features, PreferenceScorer | None]]:
+        """(Features, scorer) for every profile the viewer may browse."""
+        opposite = _OPPOSITE.get(normalise(viewer_gender))
+        if caste is not None:
+            caste = normalise(caste)
+            genders = [opposite] if opposite is not None else list(self._by_gender)
+            pools = [self._by_gender_caste.get((g, caste), ()) for g in genders]
+        elif opposite is not None:
+            pools = [self._by_gender.get(opposite, ())]
+        else:
+            pools = [self.features.keys()]
+        for pool in pools:
+            for profile_id in pool:
+                if profile_id != viewer_profile_id:
+                    yield self.features[profile_id], self.scorers.get(profile_id)
+
+
+# One index per tenant per worker process
+match_index_cache = TTLCache(
+    "match_index",
+    max_size=settings.MATCH_INDEX_MAX_TENANTS,
+    ttl_seconds=settings.MATCH_INDEX_TTL_SECONDS,
+)
+
+
+def _indexed(tenant_id: uuid.UUID) -> TenantMatchIndex | None:
+    index = match_index_cache.get(tenant_id)
+    return None if index is MISSING else index
+
+
+async def build_match_index(db: AsyncSession, tenant_id: uuid.UUID) -> TenantMatchIndex:
+    """Load every active profile of the tenant (and its preferences) in one query."""
+    result = await db.execute(
+        select(*FEATURE_COLUMNS, Profile.gender, PartnerPreference)
+        .outerjoin(PartnerPreference, PartnerPreference.profile_id == Profile.id)
+        .where(
+            Profile.tenant_id == tenant_id,
+            # Inline literal so the partial browse index (migration 016) applies
+            Profile.status == literal_column(f"'{ProfileStatus.ACTIVE.value}'"),
+        )
+    )
+    index = TenantMatchIndex(tenant_id)
+    today = date.today()
+    for row in result.all():
+        pref = row.PartnerPreference
+        index.put(
+            features_from_row(row, today),
+            row.gender,
+            PreferenceScorer(pref) if pref is not None else None,
+        )
+    return index
+
+
+async def get_match_index(db: AsyncSession, tenant_id: uuid.UUID) -> TenantMatchIndex:
+    """The tenant's index, built on first use and reused until the TTL lapses."""
+    index = _indexed(tenant_id)
+    if index is None:
+        index = await build_match_index(db, tenant_id)
+        match_index_cache.set(tenant_id, index)
+    return index
+
+
+async def refresh_profile(db: AsyncSession, profile: Profile) -> None:
+    """Re-index a profile after a write (drops it when no longer active)."""
+    index = _indexed(profile.tenant_id)
+    if index is None:
+        return
+    # Re-read the flushed row: server-side defaults (created_at) are not
+    # loaded on the instance, and its preferences may not be compiled yet.
+    row = (await db.execute(
+        select(*FEATURE_COLUMNS, Profile.gender, Profile.status, PartnerPreference)
+        .outerjoin(PartnerPreference, PartnerPreference.profile_id == Profile.id)
+        .where(Profile.id == profile.id)
+    )).first()
+    if row is None or row.status != ProfileStatus.ACTIVE:
+        index.remove(profile.id)
+        return
+    pref = row.PartnerPreference
+    index.put(
+        features_from_row(row),
+        row.gender,
+        PreferenceScorer(pref) if pref is not None else None,
+    )
+
+
+def refresh_preferences(pref: PartnerPreference) -> None:
+    """Recompile a profile's preferences after an upsert."""
+    index = _indexed(pref.tenant_id)
+    if index is not None:
+        index.scorers[pref.profile_id] = PreferenceScorer(pref)
+
+
+def discard_profile(tenant_id: uuid.UUID, profile_id: uuid.UUID) -> None:
+    """Forget a deleted profile."""
+    index = _indexed(tenant_id)
+    if index is not None:
+        index.remove(profile_id)
+        index.scorers.pop(profile_id, None)
+
+
+def invalidate_tenant_index(tenant_id: uuid.UUID) -> None:
+    """Drop a tenant's index so the next request rebuilds it (bulk writes)."""
+    match_index_cache.invalidate(tenant_id)
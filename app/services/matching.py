@@ -0,0 +1,259 @@
+"""
+services/matching.py – Score and rank candidates against partner preferences.
+
+GET /profiles/matches uses this to return the top-K candidates for the
+viewer instead of making clients page through GET /profiles/ by date.
+
+How it works:
+  1. The candidates come from the per-tenant match index
+     (services/match_index.py), which holds every active profile's Features
+     and compiled preferences, partitioned by gender and caste.
+  2. PreferenceScorer compiles a PartnerPreference once into a flat list of
+     (criterion, weight, predicate) tuples — only the fields the member
+     actually filled in — and applies it to each candidate's Features.
+     A criterion the candidate has no data for earns half its weight.
+  3. heapq.nlargest keeps the best `limit` without sorting the whole tenant.
+
+Scores are percentages of the achievable weight. With reciprocal=True the
+candidate's preferences are also applied to the viewer and the final score
+is the geometric mean of both directions, so a one-sided fit ranks below a
+mutual one.
+"""
+
+import enum
+import heapq
+import math
+import uuid
+from datetime import date, datetime
+from typing import Any, Callable, Iterable, NamedTuple
+
+from app.models.profile import Profile
+
+# Relative importance of each preference criterion
+WEIGHTS: dict[str, float] = {
+    "age": 3.0,
+    "marital_status": 2.0,
+    "religion": 2.0,
+    "caste": 2.0,
+    "dhosam": 2.0,
+    "height": 1.0,
+    "weight": 1.0,
+    "qualification": 1.0,
+    "income_range": 1.0,
+    "rashi": 1.0,
+    "star": 1.0,
+    "current_location": 1.0,
+    "native_location": 1.0,
+}
+_UNKNOWN_CREDIT = 0.5
+
+
+class Features(NamedTuple):
+    """The profile attributes preferences are matched against."""
+
+    profile_id: uuid.UUID
+    created_at: datetime | None
+    age: int | None
+    height_cm: int | None
+    weight_kg: int | None
+    marital_status: str | None
+    religion: str | None
+    caste: str | None
+    qualification: str | None
+    income_range: str | None
+    rashi: str | None
+    star: str | None
+    dhosam: str | None
+    current_location: str | None   # city and current_location, lower-cased
+    native_place: str | None
+
+
+class Match(NamedTuple):
+    profile_id: uuid.UUID
+    score: float
+    reciprocal_score: float | None
+    matched: list[str]
+
+
+FEATURE_COLUMNS = (
+    Profile.id,
+    Profile.created_at,
+    Profile.date_of_birth,
+    Profile.height_cm,
+    Profile.weight_kg,
+    Profile.marital_status,
+    Profile.religion,
+    Profile.caste,
+    Profile.qualification,
+    Profile.income_range,
+    Profile.rashi,
+    Profile.star,
+    Profile.dhosam,
+    Profile.city,
+    Profile.current_location,
+    Profile.native_place,
+)
+
+
+def normalise(value: Any) -> str | None:
+    if value is None:
+        return None
+    if isinstance(value, enum.Enum):
+        value = value.value
+    value = str(value).strip().lower()
+    return value or None
+
+
+def _age(dob: date | None, today: date) -> int | None:
+    if dob is None:
+        return None
+    return today.year - dob.year - ((today.month, today.day) < (dob.month, dob.day))
+
+
+def features_from_row(row: Any, today: date | None = None) -> Features:
+    """Build Features from a FEATURE_COLUMNS row or a Profile instance."""
+    today = today or date.today()
+    location = " / ".join(
+        v for v in (normalise(row.city), normalise(row.current_location)) if v
+    ) or None
+    return Features(
+        profile_id=row.id,
+        created_at=row.created_at,
+        age=_age(row.date_of_birth, today),
+        height_cm=row.height_cm,
+        weight_kg=row.weight_kg,
+        marital_status=normalise(row.marital_status),
+        religion=normalise(row.religion),
+        caste=normalise(row.caste),
+        qualification=normalise(row.qualification),
+        income_range=normalise(row.income_range),
+        rashi=normalise(row.rashi),
+        star=normalise(row.star),
+        dhosam=normalise(row.dhosam),
+        current_location=location,
+        native_place=normalise(row.native_place),
+    )
+
+
+# ── Scorer ─────────────────────────────────────────────────────────────────────
+Predicate = Callable[[Features], bool | None]  # None = candidate value unknown
+
+
+def _in_range(attr: str, low: int | None, high: int | None) -> Predicate:
+    def check(f: Features) -> bool | None:
+        value = getattr(f, attr)
+        if value is None:
+            return None
+        return (low is None or value >= low) and (high is None or value <= high)
+    return check
+
+
+def _one_of(attr: str, accepted: list[str]) -> Predicate:
+    wanted = frozenset(v for v in map(normalise, accepted) if v)
+
+    def check(f: Features) -> bool | None:
+        value = getattr(f, attr)
+        return None if value is None else value in wanted
+    return check
+
+
+def _mentions(attr: str, places: list[str]) -> Predicate:
+    wanted = tuple(v for v in map(normalise, places) if v)
+
+    def check(f: Features) -> bool | None:
+        value = getattr(f, attr)
+        return None if value is None else any(p in value for p in wanted)
+    return check
+
+
+class PreferenceScorer:
+    """A PartnerPreference compiled into weighted predicates over Features."""
+
+    __slots__ = ("criteria", "total_weight")
+
+    def __init__(self, pref: Any | None) -> None:
+        criteria: list[tuple[str, float, Predicate]] = []
+        if pref is not None:
+            ranges = (
+                ("age", "age", pref.age_min, pref.age_max),
+                ("height", "height_cm", pref.height_min_cm, pref.height_max_cm),
+                ("weight", "weight_kg", pref.weight_min_kg, pref.weight_max_kg),
+            )
+            for name, attr, low, high in ranges:
+                if low is not None or high is not None:
+                    criteria.append((name, WEIGHTS[name], _in_range(attr, low, high)))
+
+            lists = (
+                ("marital_status", "marital_status", pref.marital_statuses),
+                ("religion", "religion", pref.religions),
+                ("caste", "caste", pref.castes),
+                ("qualification", "qualification", pref.qualifications),
+                ("income_range", "income_range", pref.income_ranges),
+                ("rashi", "rashi", pref.rashi),
+                ("star", "star", pref.star),
+                ("dhosam", "dhosam", pref.dhosam),
+            )
+            for name, attr, accepted in lists:
+                if accepted:
+                    criteria.append((name, WEIGHTS[name], _one_of(attr, accepted)))
+
+            if pref.current_locations:
+                criteria.append((
+                    "current_location", WEIGHTS["current_location"],
+                    _mentions("current_location", pref.current_locations),
+                ))
+            if pref.native_locations:
+                criteria.append((
+                    "native_location", WEIGHTS["native_location"],
+                    _mentions("native_place", pref.native_locations),
+                ))
+        self.criteria = criteria
+        self.total_weight = sum(w for _, w, _ in criteria)
+
+    def score(self, features: Features) -> tuple[float, list[str]]:
+        """(0–100 score, names of satisfied criteria). No criteria → 0."""
+        if not self.total_weight:
+            return 0.0, []
+        earned = 0.0
+        matched: list[str] = []
+        for name, weight, predicate in self.criteria:
+            result = predicate(features)
+            if result:
+                earned += weight
+                matched.append(name)
+            elif result is None:
+                earned += weight * _UNKNOWN_CREDIT
+        return round(100 * earned / self.total_weight, 2), matched
+
+
+# ── Ranking ────────────────────────────────────────────────────────────────────
+def rank(
+    candidates: Iterable[tuple[Features, PreferenceScorer | None]],
+    viewer_features: Features,
+    viewer_scorer: PreferenceScorer,
+    limit: int,
+    reciprocal: bool = False,
+    min_score: float = 0.0,
+) -> list[Match]:
+    """Top `limit` matches, best first; ties go to the newest profile."""
+    def _scored():
+        for features, candidate_scorer in candidates:
+            score, matched = viewer_scorer.score(features)
+            back = None
+            if reciprocal:
+                # A candidate who set no preferences accepts anyone
+                back = (
+                    candidate_scorer.score(viewer_features)[0]
+                    if candidate_scorer is not None and candidate_scorer.total_weight
+                    else 100.0
+                )
+                score = round(math.sqrt(score * back), 2)
+            if score >= min_score:
+                yield Match(features.profile_id, score, back, matched), features.created_at
+
+    best = heapq.nlargest(
+        limit,
+        _scored(),
+        key=lambda item: (item[0].score, item[1].timestamp() if item[1] else 0.0),
+    )
+    return [match for match, _ in best]
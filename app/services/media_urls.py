@@ -0,0 +1,85 @@
+"""
+services/media_urls.py – Signed photo URLs embedded in profile responses.
+
+Profile responses carry raw S3 keys, so a list page used to cost one
+request for the page plus one GET /files/presign-get per card. With
+?include_media_urls=true, list_profiles, get_profile and the interest
+lists call attach_photo_urls(), which signs the first photo of every
+profile on the page in one batched pass through the presigned-URL cache
+(services/s3.py) and sets ProfileRead.photo_url.
+
+Where the photo's WebP renditions are ready (services/thumbnails.py) the
+rendition is signed instead of the camera original: "thumb" for list
+pages, "medium" for the profile page. One query on file_records per page
+looks them up.
+
+A photo is signed only if the viewer may see it – the same rule the
+frontend applies:
+
+    admins and super admins – always
+    the profile's owner     – always
+    everyone else           – only when photo_visible is set
+"""
+
+from typing import Literal
+
+import structlog
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.auth.principal import UserPrincipal
+from app.models.file_record import FileRecord, RenditionStatus
+from app.models.user import UserRole
+from app.schemas.profile import ProfileRead
+from app.services.s3 import S3Service
+
+log = structlog.get_logger(__name__)
+_s3 = S3Service()
+
+
+def can_view_photo(item: ProfileRead, viewer: UserPrincipal) -> bool:
+    if viewer.role in (UserRole.ADMIN, UserRole.SUPER_ADMIN):
+        return True
+    return item.user_id == viewer.id or item.photo_visible
+
+
+async def rendition_keys(
+    db: AsyncSession, object_keys: list[str], rendition: Literal["thumb", "medium"]
+) -> dict[str, str]:
+    """original key → rendition key, for the originals whose renditions are ready."""
+    column = FileRecord.thumbnail_key if rendition == "thumb" else FileRecord.medium_key
+    rows = await db.execute(
+        select(FileRecord.object_key, column).where(
+            FileRecord.object_key.in_(object_keys),
+            FileRecord.rendition_status == RenditionStatus.READY,
+        )
+    )
+    return {original: derived for original, derived in rows.all() if derived}
+
+
+async def attach_photo_urls(
+    db: AsyncSession,
+    items: list[ProfileRead],
+    viewer: UserPrincipal,
+    rendition: Literal["thumb", "medium"] = "thumb",
+) -> list[ProfileRead]:
+    """Return items with photo_url set wherever the viewer may see the first photo."""
+    keys = {
+        item.id: item.photo_keys[0]
+        for item in items
+        if item.photo_keys and can_view_photo(item, viewer)
+    }
+    if not keys:
+        return items
+    derived = await rendition_keys(db, list(keys.values()), rendition)
+    keys = {item_id: derived.get(key, key) for item_id, key in keys.items()}
+    try:
+        signed = _s3.presigned_get_many(list(keys.values()))
+    except RuntimeError as exc:
+        # The page still renders; cards fall back to their placeholder
+        log.warning("photo_url_signing_failed", error=str(exc))
+        return items
+    return [
+        item.model_copy(update={"photo_url": signed[keys[item.id]][0]}) if item.id in keys else item
+        for item in items
+    ]
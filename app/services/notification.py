@@ -11,28 +11,56 @@ Benefits:
 
 Environment variables required:
   SQS_NOTIFICATION_QUEUE_URL  – full SQS queue URL
+  SQS_ENDPOINT_URL            – optional; a local SQS stand-in
+                                (ElasticMQ / LocalStack) in dev and tests
+
+NotificationService (boto3) sends single notifications. Tenant broadcasts
+(background jobs, see services/broadcast_jobs.py) go through
+AsyncNotificationService (aiobotocore), which keeps several
+send_message_batch calls in flight without blocking the event loop.
 """
 
+import asyncio
 import json
 import uuid
 from datetime import datetime, timezone
+from typing import Any, AsyncIterable, Callable
 
 import boto3
+import structlog
+from aiobotocore.session import get_session
 from botocore.exceptions import BotoCoreError, ClientError
 
 from app.config import get_settings
 
+log = structlog.get_logger(__name__)
 settings = get_settings()
 
+SQS_BATCH_SIZE = 10   # send_message_batch limit
+
 # SQS client – one per worker
 _sqs = boto3.client(
     "sqs",
     region_name=settings.AWS_REGION,
     aws_access_key_id=settings.AWS_ACCESS_KEY_ID or None,
     aws_secret_access_key=settings.AWS_SECRET_ACCESS_KEY or None,
+    endpoint_url=settings.SQS_ENDPOINT_URL or None,
 )
 
 
+def _message_body(
+    user_id: uuid.UUID, fcm_token: str, title: str, body: str, data: dict | None = None
+) -> str:
+    return json.dumps({
+        "user_id": str(user_id),
+        "fcm_token": fcm_token,
+        "title": title,
+        "body": body,
+        "data": data or {},
+        "enqueued_at": datetime.now(tz=timezone.utc).isoformat(),
+    })
+
+
 class NotificationService:
     """Sends push notification jobs to SQS for async processing."""
 
@@ -66,19 +94,10 @@ class NotificationService:
                 "Set it in .env or environment."
             )
 
-        message_body = {
-            "user_id": str(user_id),
-            "fcm_token": fcm_token,
-            "title": title,
-            "body": body,
-            "data": data or {},
-            "enqueued_at": datetime.now(tz=timezone.utc).isoformat(),
-        }
-
         try:
             response = _sqs.send_message(
                 QueueUrl=settings.SQS_NOTIFICATION_QUEUE_URL,
-                MessageBody=json.dumps(message_body),
+                MessageBody=_message_body(user_id, fcm_token, title, body, data),
                 # MessageGroupId only needed for FIFO queues; set if using .fifo suffix
             )
         except (BotoCoreError, ClientError) as exc:
@@ -102,18 +121,11 @@ class NotificationService:
         entries = [
             {
                 "Id": str(i),
-                "MessageBody": json.dumps(
-                    {
-                        "user_id": str(n["user_id"]),
-                        "fcm_token": n["fcm_token"],
-                        "title": n["title"],
-                        "body": n["body"],
-                        "data": n.get("data", {}),
-                        "enqueued_at": datetime.now(tz=timezone.utc).isoformat(),
-                    }
+                "MessageBody": _message_body(
+                    n["user_id"], n["fcm_token"], n["title"], n["body"], n.get("data")
                 ),
             }
-            for i, n in enumerate(notifications[:10])  # SQS max batch = 10
+            for i, n in enumerate(notifications[:SQS_BATCH_SIZE])
         ]
 
         try:
@@ -125,3 +137,164 @@ class NotificationService:
             raise RuntimeError(f"SQS batch send failed: {exc}") from exc
 
         return [r["MessageId"] for r in response.get("Successful", [])]
+
+
+# ── Async broadcast backend ───────────────────────────────────────────────────
+Recipient = tuple[uuid.UUID, str]   # (user_id, fcm_token)
+
+
+def _sqs_client():
+    """aiobotocore SQS client context manager (honours SQS_ENDPOINT_URL)."""
+    return get_session().create_client(
+        "sqs",
+        region_name=settings.AWS_REGION,
+        aws_access_key_id=settings.AWS_ACCESS_KEY_ID or None,
+        aws_secret_access_key=settings.AWS_SECRET_ACCESS_KEY or None,
+        endpoint_url=settings.SQS_ENDPOINT_URL or None,
+    )
+
+
+class BroadcastSummary:
+    """Outcome of one broadcast; returned instead of every SQS message id."""
+
+    __slots__ = ("recipients", "queued", "failed", "batches", "retried", "errors")
+
+    def __init__(self) -> None:
+        self.recipients = 0
+        self.queued = 0
+        self.failed = 0
+        self.batches = 0
+        self.retried = 0
+        self.errors: dict[str, int] = {}   # SQS error code → entries that finally failed
+
+    def as_dict(self) -> dict:
+        return {name: getattr(self, name) for name in self.__slots__}
+
+
+class AsyncNotificationService:
+    """
+    Concurrent SQS fan-out for broadcasts.
+
+    Recipients arrive as an async stream of chunks of (user_id, fcm_token)
+    tuples. Each chunk is cut into batches of 10; up to ``concurrency``
+    send_message_batch calls are in flight at once, and the stream is not
+    read further while all slots are busy, so memory stays bounded by
+    concurrency × 10 messages plus one chunk.
+
+    Entries SQS reports as Failed are retried with exponential backoff, up
+    to ``max_retries`` times; the rest of their batch is not re-sent.
+    Entries failed through the sender's fault (malformed, too large) are not
+    retried. A call that fails outright (throttling, network) counts as
+    every entry of the batch failing.
+    """
+
+    def __init__(
+        self,
+        *,
+        queue_url: str | None = None,
+        concurrency: int = 8,
+        max_retries: int = 3,
+        retry_backoff_seconds: float = 0.2,
+        client_factory: Callable[[], Any] = _sqs_client,
+    ) -> None:
+        self.queue_url = queue_url if queue_url is not None else settings.SQS_NOTIFICATION_QUEUE_URL
+        self.concurrency = concurrency
+        self.max_retries = max_retries
+        self.retry_backoff = retry_backoff_seconds
+        self._client_factory = client_factory
+
+    async def broadcast(
+        self,
+        recipients: AsyncIterable[list[Recipient]],
+        title: str,
+        body: str,
+        data: dict | None = None,
+        *,
+        dedup_key: str | None = None,
+        on_sent: Callable[[list[uuid.UUID]], None] | None = None,
+    ) -> BroadcastSummary:
+        """
+        Fan ``recipients`` out to SQS. ``on_sent`` is called with the user
+        ids of each batch SQS accepted; on a FIFO queue ``dedup_key`` makes
+        SQS drop a re-send of the same (key, user) pair within its
+        deduplication window.
+        """
+        if not self.queue_url:
+            raise RuntimeError(
+                "SQS_NOTIFICATION_QUEUE_URL is not configured. "
+                "Set it in .env or environment."
+            )
+
+        summary = BroadcastSummary()
+        slots = asyncio.Semaphore(self.concurrency)
+        in_flight: set[asyncio.Task] = set()
+
+        def _done(task: asyncio.Task) -> None:
+            in_flight.discard(task)
+            slots.release()
+
+        async with self._client_factory() as client:
+            try:
+                async for chunk in recipients:
+                    summary.recipients += len(chunk)
+                    for i in range(0, len(chunk), SQS_BATCH_SIZE):
+                        entries = [
+                            self._entry(user_id, token, title, body, data, dedup_key)
+                            for user_id, token in chunk[i : i + SQS_BATCH_SIZE]
+                        ]
+                        await slots.acquire()
+                        task = asyncio.create_task(self._send_batch(client, entries, summary, on_sent))
+                        in_flight.add(task)
+                        task.add_done_callback(_done)
+                        summary.batches += 1
+                await asyncio.gather(*in_flight)
+            except BaseException:
+                for task in in_flight:
+                    task.cancel()
+                raise
+
+        log.info("notification_broadcast_finished", **summary.as_dict())
+        return summary
+
+    def _entry(
+        self, user_id: uuid.UUID, token: str, title: str, body: str,
+        data: dict | None, dedup_key: str | None,
+    ) -> dict:
+        entry = {"Id": str(user_id), "MessageBody": _message_body(user_id, token, title, body, data)}
+        if self.queue_url.endswith(".fifo"):
+            entry["MessageGroupId"] = str(user_id)
+            if dedup_key:
+                entry["MessageDeduplicationId"] = f"{dedup_key}:{user_id}"
+        return entry
+
+    async def _send_batch(
+        self,
+        client: Any,
+        entries: list[dict],
+        summary: BroadcastSummary,
+        on_sent: Callable[[list[uuid.UUID]], None] | None,
+    ) -> None:
+        for attempt in range(self.max_retries + 1):
+            try:
+                response = await client.send_message_batch(QueueUrl=self.queue_url, Entries=entries)
+                failed = response.get("Failed", [])
+                successful = response.get("Successful", [])
+                summary.queued += len(successful)
+                if on_sent and successful:
+                    on_sent([uuid.UUID(s["Id"]) for s in successful])
+            except (BotoCoreError, ClientError, OSError) as exc:
+                code = getattr(exc, "response", {}).get("Error", {}).get("Code") or type(exc).__name__
+                failed = [{"Id": e["Id"], "SenderFault": False, "Code": code} for e in entries]
+
+            retryable = {f["Id"] for f in failed if not f.get("SenderFault")}
+            final = [f for f in failed if f["Id"] not in retryable or attempt == self.max_retries]
+            for f in final:
+                code = f.get("Code", "Unknown")
+                summary.failed += 1
+                summary.errors[code] = summary.errors.get(code, 0) + 1
+            if not retryable or attempt == self.max_retries:
+                return
+
+            entries = [e for e in entries if e["Id"] in retryable]
+            summary.retried += len(entries)
+            await asyncio.sleep(self.retry_backoff * 2 ** attempt)
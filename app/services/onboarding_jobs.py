@@ -0,0 +1,260 @@
+"""
+services/onboarding_jobs.py – DB-backed runner for asynchronous bulk onboarding.
+
+POST /users/onboard/bulk/jobs stores the CSV in a BulkOnboardJob row and
+returns 202 with the job id. No external broker is involved: the job table
+is the queue.
+
+  - Each worker process runs one OnboardingJobRunner (started from
+    main.lifespan). It claims the oldest queued job with
+    SELECT … FOR UPDATE SKIP LOCKED, so several workers never pick the same
+    job, and processes it one BULK_ONBOARD_CHUNK_SIZE chunk at a time with
+    the same BulkOnboardPipeline as the synchronous endpoint.
+  - Every chunk commits its inserted users, the job's counters and row
+    results together. updated_at doubles as a heartbeat: a running job whose
+    heartbeat is older than BULK_ONBOARD_JOB_STALE_SECONDS (its worker died)
+    is reclaimed and resumes after processed_rows.
+  - Invite emails are written to the email outbox in each chunk's
+    transaction, so a chunk's invites are delivered if and only if its
+    users were committed – also across a crash and resume.
+
+The runner wakes on notify() from the upload endpoint or every
+BULK_ONBOARD_JOB_POLL_SECONDS. Deployments without a long-lived app process
+(the Lambda handler runs with lifespan="off") can run a standalone runner:
+
+    python -m app.services.onboarding_jobs
+"""
+
+import asyncio
+import io
+import uuid
+from datetime import datetime, timedelta, timezone
+from typing import Callable
+
+import structlog
+from sqlalchemy import and_, or_, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.config import get_settings
+from app.database import AsyncSessionLocal
+from app.models.bulk_onboard_job import BulkOnboardJob, JobStatus
+from app.services.bulk_onboarding import BulkOnboardPipeline, iter_record_chunks
+from app.services.match_index import invalidate_tenant_index
+
+log = structlog.get_logger(__name__)
+settings = get_settings()
+
+SessionFactory = Callable[[], AsyncSession]
+
+
+def _now() -> datetime:
+    return datetime.now(timezone.utc)
+
+
+def count_records(data: bytes, chunk_size: int) -> int:
+    """Number of CSV data rows in an upload (header excluded)."""
+    return sum(len(chunk) for chunk in iter_record_chunks(io.BytesIO(data), chunk_size))
+
+
+async def process_job(db: AsyncSession, job: BulkOnboardJob, chunk_size: int) -> None:
+    """
+    Run (or resume) one claimed job to completion, committing after every
+    chunk. Rows up to job.processed_rows were handled by an earlier attempt
+    and are skipped.
+    """
+    if job.total_rows is None:
+        job.total_rows = count_records(job.csv_data, chunk_size)
+        await db.commit()
+
+    pipeline = BulkOnboardPipeline(db, job.tenant_id)
+    for chunk in iter_record_chunks(io.BytesIO(job.csv_data), chunk_size):
+        chunk = [record for record in chunk if record[0] > job.processed_rows]
+        if not chunk:
+            continue
+        rows = await pipeline.process_chunk(chunk)
+        statuses = [r.status for r in rows]
+
+        job.results = [*(job.results or []), *(r.model_dump() for r in rows)]
+        job.processed_rows = rows[-1].row
+        job.created_count += statuses.count("created")
+        job.skipped_count += statuses.count("skipped")
+        job.error_count += statuses.count("error")
+        job.updated_at = _now()  # heartbeat
+        await db.commit()
+
+    job.status = JobStatus.COMPLETED
+    job.finished_at = _now()
+    job.csv_data = None
+    await db.commit()
+    invalidate_tenant_index(job.tenant_id)
+
+
+class OnboardingJobRunner:
+    """Polls bulk_onboard_jobs and processes claimed jobs one at a time."""
+
+    def __init__(
+        self,
+        *,
+        chunk_size: int,
+        poll_interval_seconds: float,
+        stale_after_seconds: float,
+        session_factory: SessionFactory = AsyncSessionLocal,
+    ) -> None:
+        self.chunk_size = chunk_size
+        self.poll_interval = poll_interval_seconds
+        self.stale_after = stale_after_seconds
+        self._session_factory = session_factory
+        self._wakeup: asyncio.Event | None = None
+        self._task: asyncio.Task | None = None
+        self._stopping = False
+        self.current_job_id: uuid.UUID | None = None
+        # Counters
+        self.completed = 0
+        self.failed = 0
+        self.resumed = 0
+
+    @property
+    def running(self) -> bool:
+        return self._task is not None and not self._task.done()
+
+    # ── Lifecycle ─────────────────────────────────────────────────────────────
+    def start(self) -> None:
+        """Spawn the polling loop on the running event loop."""
+        if self.running:
+            return
+        self._wakeup = asyncio.Event()
+        self._stopping = False
+        self._task = asyncio.create_task(self._run(), name="onboarding-job-runner")
+
+    async def stop(self, timeout: float | None = None) -> None:
+        """
+        Stop claiming jobs and wait for the current chunk's job to finish.
+        On timeout the job is abandoned mid-way; another runner resumes it
+        once its heartbeat goes stale.
+        """
+        if not self.running:
+            return
+        self._stopping = True
+        self._wakeup.set()
+        try:
+            await asyncio.wait_for(self._task, timeout)
+        except asyncio.TimeoutError:
+            log.warning("onboarding_job_runner_stop_timeout", job_id=str(self.current_job_id))
+            self._task.cancel()
+        self._task = None
+
+    def notify(self) -> None:
+        """Wake the loop early (a job was just queued by this worker)."""
+        if self.running:
+            self._wakeup.set()
+
+    # ── Loop ──────────────────────────────────────────────────────────────────
+    async def _run(self) -> None:
+        while not self._stopping:
+            try:
+                job_id = await self.claim_next()
+            except Exception as exc:  # noqa: BLE001
+                log.warning("onboarding_job_claim_failed", error=str(exc))
+                job_id = None
+
+            if job_id is not None:
+                await self.run_job(job_id)
+                continue
+
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), self.poll_interval)
+            except asyncio.TimeoutError:
+                pass
+            self._wakeup.clear()
+
+    async def claim_next(self) -> uuid.UUID | None:
+        """Mark the oldest queued (or stale running) job as ours; None if idle."""
+        now = _now()
+        async with self._session_factory() as db:
+            job = await db.scalar(
+                select(BulkOnboardJob)
+                .where(
+                    or_(
+                        BulkOnboardJob.status == JobStatus.QUEUED,
+                        and_(
+                            BulkOnboardJob.status == JobStatus.RUNNING,
+                            BulkOnboardJob.updated_at < now - timedelta(seconds=self.stale_after),
+                        ),
+                    )
+                )
+                .order_by(BulkOnboardJob.created_at)
+                .limit(1)
+                .with_for_update(skip_locked=True)
+            )
+            if job is None:
+                return None
+            if job.status == JobStatus.RUNNING:
+                self.resumed += 1
+                log.info("onboarding_job_resumed", job_id=str(job.id), processed=job.processed_rows)
+            job.status = JobStatus.RUNNING
+            job.started_at = job.started_at or now
+            job.updated_at = now
+            await db.commit()
+            return job.id
+
+    async def run_job(self, job_id: uuid.UUID) -> None:
+        """Process one claimed job; failures are recorded on the job row."""
+        self.current_job_id = job_id
+        try:
+            async with self._session_factory() as db:
+                job = await db.get(BulkOnboardJob, job_id)
+                try:
+                    await process_job(db, job, self.chunk_size)
+                except Exception as exc:  # noqa: BLE001
+                    await db.rollback()
+                    await db.execute(
+                        update(BulkOnboardJob)
+                        .where(BulkOnboardJob.id == job_id)
+                        .values(
+                            status=JobStatus.FAILED,
+                            error=f"{type(exc).__name__}: {exc}",
+                            finished_at=_now(),
+                            csv_data=None,
+                        )
+                    )
+                    await db.commit()
+                    self.failed += 1
+                    log.warning("onboarding_job_failed", job_id=str(job_id), error=str(exc))
+                    return
+            self.completed += 1
+            log.info("onboarding_job_completed", job_id=str(job_id))
+        finally:
+            self.current_job_id = None
+
+    def stats(self) -> dict:
+        """Counters for the /admin/metrics endpoint."""
+        return {
+            "running": self.running,
+            "current_job_id": str(self.current_job_id) if self.current_job_id else None,
+            "completed": self.completed,
+            "failed": self.failed,
+            "resumed": self.resumed,
+        }
+
+
+# One runner per worker process
+onboarding_job_runner = OnboardingJobRunner(
+    chunk_size=settings.BULK_ONBOARD_CHUNK_SIZE,
+    poll_interval_seconds=settings.BULK_ONBOARD_JOB_POLL_SECONDS,
+    stale_after_seconds=settings.BULK_ONBOARD_JOB_STALE_SECONDS,
+)
+
+
+async def _main() -> None:
+    onboarding_job_runner.start()
+    try:
+        await asyncio.Event().wait()
+    finally:
+        await onboarding_job_runner.stop(timeout=settings.BULK_ONBOARD_JOB_DRAIN_TIMEOUT_SECONDS)
+
+
+if __name__ == "__main__":
+    try:
+        asyncio.run(_main())
+    except KeyboardInterrupt:
+        pass
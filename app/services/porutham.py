@@ -0,0 +1,231 @@
+"""
+services/porutham.py – Horoscope (porutham) compatibility from star and rashi.
+
+The ten traditional poruthams are split by what they depend on:
+
+  star-based  (7): dinam, ganam, mahendram, stree_deergham, yoni, rajju, vedhai
+  rashi-based (3): rasi, rasi_adhipathi, vasya
+
+Both tables are computed once at import – STAR_MATRIX[bride][groom] and
+RASHI_MATRIX[bride][groom] hold a bitmask of the poruthams satisfied – so
+scoring a pair is two tuple lookups. The score is the number of poruthams
+satisfied (0–10); rajju is reported separately because most families treat a
+rajju mismatch as disqualifying regardless of the total.
+
+When a profile has a star but no rashi, the rashi holding most of that
+star's padas is assumed.
+
+Three entry points:
+  - porutham(bride_star, bride_rashi, groom_star, groom_rashi) for one pair;
+  - score_candidates(subject, candidates) for a page of profiles, using the
+    subject's matrix row fetched once;
+  - score_expression(star, rashi, as_bride) as a SQL CASE expression, so
+    GET /profiles/ can filter and sort by compatibility in the database.
+"""
+
+from typing import Any, Iterable, NamedTuple
+
+from sqlalchemy import ColumnElement, case, func
+
+from app.models.profile import Gender, Profile, Rashi, Star
+from app.services.matching import normalise
+
+STARS: tuple[Star, ...] = tuple(Star)
+RASHIS: tuple[Rashi, ...] = tuple(Rashi)
+_STAR_INDEX = {s.value: i for i, s in enumerate(STARS)}
+_RASHI_INDEX = {r.value: i for i, r in enumerate(RASHIS)}
+
+STAR_PORUTHAMS = ("dinam", "ganam", "mahendram", "stree_deergham", "yoni", "rajju", "vedhai")
+RASHI_PORUTHAMS = ("rasi", "rasi_adhipathi", "vasya")
+PORUTHAMS = STAR_PORUTHAMS + RASHI_PORUTHAMS
+MAX_SCORE = len(PORUTHAMS)
+_RAJJU_BIT = 1 << STAR_PORUTHAMS.index("rajju")
+
+
+# ── Reference data (indexed by position in Star / Rashi) ──────────────────────
+# Gana: 0 = deva, 1 = manushya, 2 = rakshasa
+_GANA = (0, 1, 2, 1, 0, 1, 0, 0, 2, 2, 1, 1, 0, 2, 0, 2, 0, 2, 2, 1, 1, 0, 2, 2, 1, 1, 0)
+
+_YONI = (
+    "horse", "elephant", "goat", "serpent", "serpent", "dog", "cat", "goat", "cat",
+    "rat", "rat", "cow", "buffalo", "tiger", "buffalo", "tiger", "deer", "deer",
+    "dog", "monkey", "mongoose", "monkey", "lion", "horse", "lion", "cow", "elephant",
+)
+_YONI_ENEMIES = {
+    frozenset(pair) for pair in (
+        ("horse", "buffalo"), ("elephant", "lion"), ("goat", "monkey"),
+        ("serpent", "mongoose"), ("dog", "deer"), ("cat", "rat"), ("cow", "tiger"),
+    )
+}
+
+# Rajju: 0 = pada, 1 = kati, 2 = nabhi, 3 = kanta, 4 = siro
+_RAJJU = (0, 1, 2, 3, 4, 3, 2, 1, 0, 0, 1, 2, 3, 4, 3, 2, 1, 0, 0, 1, 2, 3, 4, 3, 2, 1, 0)
+
+_VEDHAI = {
+    frozenset(pair) for pair in (
+        (0, 17), (1, 16), (2, 15), (3, 14), (5, 21), (6, 20), (7, 19), (8, 18),
+        (9, 26), (10, 25), (11, 24), (12, 23), (4, 13), (13, 22), (4, 22),
+    )
+}
+
+# Rashi lords and natural planetary enmity
+_LORD = (
+    "mars", "venus", "mercury", "moon", "sun", "mercury",
+    "venus", "mars", "jupiter", "saturn", "saturn", "jupiter",
+)
+_ENEMIES = {
+    "sun": {"venus", "saturn"},
+    "moon": set(),
+    "mars": {"mercury"},
+    "mercury": {"moon"},
+    "jupiter": {"mercury", "venus"},
+    "venus": {"sun", "moon"},
+    "saturn": {"sun", "moon", "mars"},
+}
+
+_VASYA = {
+    0: {4, 7}, 1: {3, 6}, 2: {5}, 3: {7, 8}, 4: {6}, 5: {2, 11},
+    6: {9, 5}, 7: {3, 5}, 8: {11}, 9: {0, 10}, 10: {0}, 11: {9},
+}
+
+
+def _default_rashi(star_index: int) -> int:
+    """Rashi holding most of the star's four padas (nine padas per rashi)."""
+    return (4 * star_index + 2) // 9
+
+
+# ── Matrices ──────────────────────────────────────────────────────────────────
+def _star_mask(bride: int, groom: int) -> int:
+    count = (groom - bride) % 27 + 1  # counted from the bride's star
+    checks = (
+        count % 9 in (0, 2, 4, 6, 8),                                   # dinam
+        _GANA[bride] == _GANA[groom] or {_GANA[bride], _GANA[groom]} == {0, 1},  # ganam
+        count in (4, 7, 10, 13, 16, 19, 22, 25),                        # mahendram
+        count > 13,                                                     # stree_deergham
+        frozenset((_YONI[bride], _YONI[groom])) not in _YONI_ENEMIES,   # yoni
+        _RAJJU[bride] != _RAJJU[groom],                                 # rajju
+        frozenset((bride, groom)) not in _VEDHAI,                       # vedhai
+    )
+    return sum(1 << i for i, ok in enumerate(checks) if ok)
+
+
+def _rashi_mask(bride: int, groom: int) -> int:
+    count = (groom - bride) % 12 + 1
+    lord_b, lord_g = _LORD[bride], _LORD[groom]
+    checks = (
+        count not in (2, 6, 8, 12),                                     # rasi
+        lord_b == lord_g or (lord_g not in _ENEMIES[lord_b]
+                             and lord_b not in _ENEMIES[lord_g]),      # rasi_adhipathi
+        groom in _VASYA[bride] or bride in _VASYA[groom],               # vasya
+    )
+    return sum(1 << i for i, ok in enumerate(checks) if ok)
+
+
+STAR_MATRIX: tuple[tuple[int, ...], ...] = tuple(
+    tuple(_star_mask(b, g) for g in range(27)) for b in range(27)
+)
+RASHI_MATRIX: tuple[tuple[int, ...], ...] = tuple(
+    tuple(_rashi_mask(b, g) for g in range(12)) for b in range(12)
+)
+
+
+def _bits(mask: int) -> int:
+    return bin(mask).count("1")
+
+
+# ── Scoring ───────────────────────────────────────────────────────────────────
+class Porutham(NamedTuple):
+    score: int                 # poruthams satisfied, 0–MAX_SCORE
+    rajju: bool                # False = rajju dosham (usually disqualifying)
+    matched: list[str]
+
+
+def _indices(star: Any, rashi: Any) -> tuple[int, int] | None:
+    star_index = _STAR_INDEX.get(normalise(star))
+    if star_index is None:
+        return None
+    rashi_index = _RASHI_INDEX.get(normalise(rashi))
+    if rashi_index is None:
+        rashi_index = _default_rashi(star_index)
+    return star_index, rashi_index
+
+
+def _from_masks(star_mask: int, rashi_mask: int) -> Porutham:
+    combined = star_mask | rashi_mask << len(STAR_PORUTHAMS)
+    return Porutham(
+        score=_bits(combined),
+        rajju=bool(star_mask & _RAJJU_BIT),
+        matched=[name for i, name in enumerate(PORUTHAMS) if combined >> i & 1],
+    )
+
+
+def porutham(
+    bride_star: Any, bride_rashi: Any, groom_star: Any, groom_rashi: Any
+) -> Porutham | None:
+    """Compatibility of one couple, or None if either star is unknown."""
+    bride = _indices(bride_star, bride_rashi)
+    groom = _indices(groom_star, groom_rashi)
+    if bride is None or groom is None:
+        return None
+    return _from_masks(STAR_MATRIX[bride[0]][groom[0]], RASHI_MATRIX[bride[1]][groom[1]])
+
+
+def is_bride(gender: Any) -> bool:
+    """Whether a profile takes the bride's side of the count (female profiles)."""
+    return normalise(gender) == Gender.FEMALE.value
+
+
+def score_candidates(subject: Any, candidates: Iterable[Any]) -> dict[Any, Porutham | None]:
+    """
+    Score every candidate (id/star/rashi) against subject (star/rashi/gender)
+    in one pass: the subject's matrix row or column is resolved once and each
+    candidate costs two lookups. Keyed by candidate id.
+    """
+    own = _indices(subject.star, subject.rashi)
+    if own is None:
+        return {c.id: None for c in candidates}
+    star_i, rashi_i = own
+    # Matrix row when the subject is the bride, column when the groom
+    if is_bride(subject.gender):
+        star_row, rashi_row = STAR_MATRIX[star_i], RASHI_MATRIX[rashi_i]
+    else:
+        star_row = tuple(row[star_i] for row in STAR_MATRIX)
+        rashi_row = tuple(row[rashi_i] for row in RASHI_MATRIX)
+
+    scores: dict[Any, Porutham | None] = {}
+    for c in candidates:
+        other = _indices(c.star, c.rashi)
+        scores[c.id] = (
+            None if other is None else _from_masks(star_row[other[0]], rashi_row[other[1]])
+        )
+    return scores
+
+
+def score_expression(star: Any, rashi: Any, as_bride: bool) -> ColumnElement | None:
+    """
+    SQL expression for the porutham score of each Profile row against a fixed
+    (star, rashi), or None if star is unknown. Rows without a star score NULL.
+    """
+    own = _indices(star, rashi)
+    if own is None:
+        return None
+    star_i, rashi_i = own
+    if as_bride:
+        star_scores = [_bits(STAR_MATRIX[star_i][g]) for g in range(27)]
+        rashi_scores = [_bits(RASHI_MATRIX[rashi_i][g]) for g in range(12)]
+    else:
+        star_scores = [_bits(STAR_MATRIX[b][star_i]) for b in range(27)]
+        rashi_scores = [_bits(RASHI_MATRIX[b][rashi_i]) for b in range(12)]
+
+    star_part = case(
+        {s.value: star_scores[i] for i, s in enumerate(STARS)}, value=Profile.star
+    )
+    rashi_part = case(
+        {r.value: rashi_scores[i] for i, r in enumerate(RASHIS)}, value=Profile.rashi
+    )
+    # Missing rashi → the rashi implied by the row's star
+    implied_rashi_part = case(
+        {s.value: rashi_scores[_default_rashi(i)] for i, s in enumerate(STARS)},
+        value=Profile.star,
+    )
+    return star_part + func.coalesce(rashi_part, implied_rashi_part)
@@ -14,9 +14,16 @@ Usage:
         file_name="photo.jpg",
         content_type="image/jpeg",
     )
+
+Presigned GET URLs for display are cached per worker (presigned_get_cache):
+a URL signed for a key is handed out again until
+S3_PRESIGN_CACHE_MARGIN_SECONDS before it expires. Repeat views skip the
+signing, and because the URL is unchanged the browser's image cache keeps
+working across page loads.
 """
 
 import mimetypes
+import time
 import uuid
 from datetime import datetime, timezone
 
@@ -24,6 +31,7 @@ import boto3
 from botocore.config import Config
 from botocore.exceptions import BotoCoreError, ClientError
 
+from app.cache import MISSING, TTLCache
 from app.config import get_settings
 
 settings = get_settings()
@@ -38,6 +46,15 @@ _s3_client = boto3.client(
     config=Config(signature_version="s3v4"),
 )
 
+# object_key → (url, wall-clock expiry). Entries leave the cache a safety
+# margin before the URL itself expires, so a cached URL always has at least
+# that long left when it is handed out.
+presigned_get_cache = TTLCache(
+    "presigned_get",
+    max_size=settings.S3_PRESIGN_CACHE_MAX_SIZE,
+    ttl_seconds=max(0, settings.S3_PRESIGNED_GET_EXPIRY - settings.S3_PRESIGN_CACHE_MARGIN_SECONDS),
+)
+
 
 class S3Service:
     """Handles S3 pre-signed URL generation and object key management."""
@@ -138,8 +155,31 @@ class S3Service:
             raise RuntimeError(f"S3 presigned GET failed: {exc}") from exc
         return url
 
+    def presigned_get(self, object_key: str) -> tuple[str, int]:
+        """
+        Presigned GET URL for display, reused from presigned_get_cache while
+        it is still valid for longer than the safety margin.
+
+        Returns:
+            (url, seconds until the URL expires)
+        """
+        cached = presigned_get_cache.get(object_key)
+        if cached is not MISSING:
+            url, expires_at = cached
+            return url, int(expires_at - time.time())
+
+        expiry = settings.S3_PRESIGNED_GET_EXPIRY
+        url = self.generate_presigned_get(object_key, expiry=expiry)
+        presigned_get_cache.set(object_key, (url, time.time() + expiry))
+        return url, expiry
+
+    def presigned_get_many(self, object_keys: list[str]) -> dict[str, tuple[str, int]]:
+        """presigned_get() for each distinct key, in first-seen order."""
+        return {key: self.presigned_get(key) for key in dict.fromkeys(object_keys)}
+
     def delete_object(self, object_key: str) -> None:
         """Soft-delete: actually removes from S3 (versioning handles recovery)."""
+        presigned_get_cache.invalidate(object_key)
         try:
             _s3_client.delete_object(
                 Bucket=settings.S3_BUCKET_NAME,
@@ -0,0 +1,373 @@
+"""
+services/scheduler.py – Leader-elected runner for periodic jobs.
+
+Every Gunicorn worker starts a Scheduler from main.lifespan, but only one
+of them – the leader – runs jobs:
+
+  - Leadership is a session-level Postgres advisory lock
+    (pg_try_advisory_lock(SCHEDULER_LOCK_KEY)) held on a dedicated
+    connection. Followers retry every SCHEDULER_TICK_SECONDS; if the leader
+    dies its connection closes, the lock is released and another worker
+    takes over within one tick.
+  - Each run is recorded in scheduled_job_runs. A job is due
+    interval_seconds after its latest recorded start (plus up to
+    SCHEDULER_JITTER_SECONDS of random jitter), so cadence survives restarts
+    and leader changes. A job that has never run, or is overdue, runs as soon
+    as a leader is elected when run_on_start is set; otherwise the first
+    run after a leader change waits a full interval.
+  - Jobs are async callables returning the number of rows they affected;
+    failures are logged and recorded, and the job is retried at its next
+    due time.
+
+Per-job counters are exposed on /admin/metrics. The CLI runs a job by
+hand, shows recent history, or runs a standalone scheduler (deployments
+without a long-lived app process, e.g. the Lambda handler):
+
+    python -m app.services.scheduler run subscription_expiry
+    python -m app.services.scheduler history [--limit 20]
+    python -m app.services.scheduler serve
+"""
+
+import argparse
+import asyncio
+import random
+import time
+from datetime import datetime, timedelta, timezone
+from typing import Awaitable, Callable, NamedTuple, Protocol
+
+import structlog
+from sqlalchemy import func, select, text
+from sqlalchemy.ext.asyncio import AsyncConnection, AsyncEngine, AsyncSession
+
+from app.config import get_settings
+from app.database import AsyncSessionLocal, engine
+from app.models.scheduled_job_run import ScheduledJobRun
+from app.services.subscription_sweeps import expire_subscriptions, warn_expiring_subscriptions
+
+log = structlog.get_logger(__name__)
+settings = get_settings()
+
+SessionFactory = Callable[[], AsyncSession]
+
+
+def _now() -> datetime:
+    return datetime.now(timezone.utc)
+
+
+class ScheduledJob(NamedTuple):
+    name: str
+    interval_seconds: float
+    func: Callable[[], Awaitable[int]]
+    run_on_start: bool = True
+
+
+# ── Leader election ───────────────────────────────────────────────────────────
+class LeaderLock(Protocol):
+    async def acquire(self) -> bool: ...   # try (idempotent); True while held
+    async def release(self) -> None: ...
+
+
+class AdvisoryLeaderLock:
+    """Session-level pg advisory lock held on its own connection."""
+
+    def __init__(self, engine: AsyncEngine, key: int) -> None:
+        self._engine = engine
+        self.key = key
+        self._conn: AsyncConnection | None = None
+
+    async def acquire(self) -> bool:
+        try:
+            if self._conn is not None:
+                # Still connected → still held. Commit so the session never
+                # sits idle in a transaction.
+                await self._conn.execute(text("SELECT 1"))
+                await self._conn.commit()
+                return True
+            conn = await self._engine.connect()
+            held = (await conn.execute(
+                text("SELECT pg_try_advisory_lock(:key)"), {"key": self.key}
+            )).scalar()
+            await conn.commit()   # end the implicit transaction; the lock is session-level
+            if held:
+                self._conn = conn
+                return True
+            await conn.close()
+            return False
+        except Exception as exc:  # noqa: BLE001 – lost the DB: step down, retry next tick
+            log.warning("scheduler_lock_error", error=str(exc))
+            await self.release()
+            return False
+
+    async def release(self) -> None:
+        conn, self._conn = self._conn, None
+        if conn is None:
+            return
+        try:
+            await conn.execute(text("SELECT pg_advisory_unlock(:key)"), {"key": self.key})
+            await conn.commit()
+        except Exception:  # noqa: BLE001 – closing the connection releases it anyway
+            pass
+        finally:
+            await conn.close()
+
+
+# ── Scheduler ─────────────────────────────────────────────────────────────────
+class _JobState:
+    __slots__ = ("next_due", "runs", "failures", "last_status", "last_affected",
+                 "last_started_at", "last_duration_ms", "last_error")
+
+    def __init__(self) -> None:
+        self.next_due: datetime | None = None
+        self.runs = 0
+        self.failures = 0
+        self.last_status: str | None = None
+        self.last_affected: int | None = None
+        self.last_started_at: datetime | None = None
+        self.last_duration_ms: float | None = None
+        self.last_error: str | None = None
+
+
+class Scheduler:
+    """Runs registered jobs on their cadence while this worker is leader."""
+
+    def __init__(
+        self,
+        *,
+        tick_seconds: float,
+        jitter_seconds: float,
+        lock: LeaderLock,
+        session_factory: SessionFactory = AsyncSessionLocal,
+    ) -> None:
+        self.tick_seconds = tick_seconds
+        self.jitter_seconds = jitter_seconds
+        self.lock = lock
+        self._session_factory = session_factory
+        self.jobs: dict[str, ScheduledJob] = {}
+        self._state: dict[str, _JobState] = {}
+        self.is_leader = False
+        self._task: asyncio.Task | None = None
+        self._stopping: asyncio.Event | None = None
+        self.elections_won = 0
+
+    def register(self, job: ScheduledJob) -> None:
+        self.jobs[job.name] = job
+        self._state[job.name] = _JobState()
+
+    @property
+    def running(self) -> bool:
+        return self._task is not None and not self._task.done()
+
+    # ── Lifecycle ─────────────────────────────────────────────────────────────
+    def start(self) -> None:
+        """Spawn the tick loop on the running event loop."""
+        if self.running:
+            return
+        self._stopping = asyncio.Event()
+        self._task = asyncio.create_task(self._run(), name="scheduler")
+
+    async def stop(self, timeout: float | None = None) -> None:
+        """Finish the running job (if any), then give up leadership."""
+        if not self.running:
+            return
+        self._stopping.set()
+        try:
+            await asyncio.wait_for(self._task, timeout)
+        except asyncio.TimeoutError:
+            log.warning("scheduler_stop_timeout")
+            self._task.cancel()
+        self._task = None
+        await self.lock.release()
+        self.is_leader = False
+
+    async def _run(self) -> None:
+        while not self._stopping.is_set():
+            try:
+                await self.tick()
+            except Exception as exc:  # noqa: BLE001
+                log.warning("scheduler_tick_failed", error=str(exc))
+            try:
+                await asyncio.wait_for(self._stopping.wait(), self.tick_seconds)
+            except asyncio.TimeoutError:
+                pass
+
+    # ── Scheduling ────────────────────────────────────────────────────────────
+    def _jitter(self) -> timedelta:
+        return timedelta(seconds=random.uniform(0, self.jitter_seconds))
+
+    def plan(self, history: dict[str, datetime], now: datetime) -> None:
+        """Compute each job's next due time from its last recorded start."""
+        for name, job in self.jobs.items():
+            last = history.get(name)
+            interval = timedelta(seconds=job.interval_seconds)
+            if not job.run_on_start:
+                due = now + interval
+            elif last is None:
+                due = now
+            else:
+                due = last + interval   # in the past when overdue → runs this tick
+            self._state[name].next_due = due + self._jitter()
+
+    async def tick(self) -> None:
+        """One scheduling step: (re)check leadership, then run due jobs."""
+        leader = await self.lock.acquire()
+        if leader and not self.is_leader:
+            self.elections_won += 1
+            log.info("scheduler_leader_elected")
+            self.plan(await self.load_history(), _now())
+        elif not leader and self.is_leader:
+            log.warning("scheduler_leadership_lost")
+        self.is_leader = leader
+        if not leader:
+            return
+
+        for name, job in self.jobs.items():
+            if self._stopping is not None and self._stopping.is_set():
+                return
+            state = self._state[name]
+            if state.next_due is not None and state.next_due <= _now():
+                await self.run_job(job)
+                state.next_due = state.last_started_at + timedelta(
+                    seconds=job.interval_seconds
+                ) + self._jitter()
+
+    async def run_job(self, job: ScheduledJob, trigger: str = "schedule") -> ScheduledJobRun:
+        """Run one job now and record the outcome; never raises."""
+        state = self._state.setdefault(job.name, _JobState())
+        started_at = _now()
+        started = time.perf_counter()
+        affected, error = None, None
+        try:
+            affected = await job.func()
+            status = "succeeded"
+        except Exception as exc:  # noqa: BLE001
+            status, error = "failed", f"{type(exc).__name__}: {exc}"
+            state.failures += 1
+            log.warning("scheduled_job_failed", job=job.name, error=error)
+
+        state.runs += 1
+        state.last_status = status
+        state.last_affected = affected
+        state.last_started_at = started_at
+        state.last_duration_ms = round((time.perf_counter() - started) * 1000, 1)
+        state.last_error = error
+        log.info("scheduled_job_finished", job=job.name, trigger=trigger, status=status,
+                 affected=affected, duration_ms=state.last_duration_ms)
+
+        run = ScheduledJobRun(
+            job=job.name, trigger=trigger, status=status, affected=affected,
+            error=error, started_at=started_at, finished_at=_now(),
+        )
+        try:
+            await self.record(run)
+        except Exception as exc:  # noqa: BLE001
+            log.warning("scheduled_job_history_failed", job=job.name, error=str(exc))
+        return run
+
+    # ── History (scheduled_job_runs) ──────────────────────────────────────────
+    async def load_history(self) -> dict[str, datetime]:
+        """Latest recorded start per job."""
+        async with self._session_factory() as db:
+            rows = await db.execute(
+                select(ScheduledJobRun.job, func.max(ScheduledJobRun.started_at))
+                .group_by(ScheduledJobRun.job)
+            )
+            return dict(rows.all())
+
+    async def record(self, run: ScheduledJobRun) -> None:
+        async with self._session_factory() as db:
+            db.add(run)
+            await db.commit()
+
+    def stats(self) -> dict:
+        """Counters for the /admin/metrics endpoint."""
+        return {
+            "running": self.running,
+            "is_leader": self.is_leader,
+            "elections_won": self.elections_won,
+            "jobs": {
+                name: {
+                    "interval_seconds": self.jobs[name].interval_seconds,
+                    "next_due": state.next_due.isoformat() if state.next_due else None,
+                    "runs": state.runs,
+                    "failures": state.failures,
+                    "last_status": state.last_status,
+                    "last_affected": state.last_affected,
+                    "last_duration_ms": state.last_duration_ms,
+                    "last_error": state.last_error,
+                }
+                for name, state in self._state.items()
+            },
+        }
+
+
+# One scheduler per worker process; only the leader runs jobs
+scheduler = Scheduler(
+    tick_seconds=settings.SCHEDULER_TICK_SECONDS,
+    jitter_seconds=settings.SCHEDULER_JITTER_SECONDS,
+    lock=AdvisoryLeaderLock(engine, settings.SCHEDULER_LOCK_KEY),
+)
+scheduler.register(ScheduledJob(
+    "subscription_expiry",
+    settings.SUBSCRIPTION_EXPIRY_INTERVAL_SECONDS,
+    expire_subscriptions,
+    run_on_start=settings.SCHEDULER_RUN_ON_START,
+))
+scheduler.register(ScheduledJob(
+    "subscription_warning",
+    settings.SUBSCRIPTION_WARNING_INTERVAL_SECONDS,
+    warn_expiring_subscriptions,
+    run_on_start=settings.SCHEDULER_RUN_ON_START,
+))
+
+
+# ── CLI ───────────────────────────────────────────────────────────────────────
+async def _run_now(name: str) -> int:
+    run = await scheduler.run_job(scheduler.jobs[name], trigger="manual")
+    print(f"{run.job}: {run.status} affected={run.affected}" + (f" error={run.error}" if run.error else ""))
+    return 0 if run.status == "succeeded" else 1
+
+
+async def _history(limit: int) -> int:
+    async with AsyncSessionLocal() as db:
+        runs = (await db.scalars(
+            select(ScheduledJobRun).order_by(ScheduledJobRun.started_at.desc()).limit(limit)
+        )).all()
+    for run in runs:
+        took = (run.finished_at - run.started_at).total_seconds()
+        print(f"{run.started_at:%Y-%m-%d %H:%M:%S}  {run.job:<24} {run.trigger:<8} "
+              f"{run.status:<9} affected={run.affected} {took:.1f}s {run.error or ''}")
+    return 0
+
+
+async def _serve() -> int:
+    scheduler.start()
+    try:
+        await asyncio.Event().wait()
+    finally:
+        await scheduler.stop(timeout=settings.SCHEDULER_DRAIN_TIMEOUT_SECONDS)
+    return 0
+
+
+async def _main(args: argparse.Namespace) -> int:
+    try:
+        if args.command == "run":
+            return await _run_now(args.job)
+        if args.command == "history":
+            return await _history(args.limit)
+        return await _serve()
+    finally:
+        await engine.dispose()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(prog="python -m app.services.scheduler")
+    commands = parser.add_subparsers(dest="command", required=True)
+    run_cmd = commands.add_parser("run", help="run a job now, regardless of leadership")
+    run_cmd.add_argument("job", choices=sorted(scheduler.jobs))
+    history_cmd = commands.add_parser("history", help="show recent runs")
+    history_cmd.add_argument("--limit", type=int, default=20)
+    commands.add_parser("serve", help="run a standalone scheduler")
+    try:
+        raise SystemExit(asyncio.run(_main(parser.parse_args())))
+    except KeyboardInterrupt:
+        pass
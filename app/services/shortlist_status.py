@@ -0,0 +1,73 @@
+"""
+services/shortlist_status.py – The viewer's shortlist state for a page of profiles.
+
+Browse pages used to carry no shortlist state, so clients cross-referenced
+GET /shortlists/sent themselves. annotate_shortlist_status() resolves the
+state of every profile on a page with one query over both directions:
+
+    accepted  – either side accepted the other's interest
+    sent      – the viewer shortlisted the profile; pending
+    received  – the profile shortlisted the viewer; pending
+    rejected  – an interest between the two was declined
+
+When several rows exist for a pair the first state in that list wins.
+"""
+
+import uuid
+from typing import Iterable
+
+from sqlalchemy import and_, or_, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models.shortlist import Shortlist, ShortlistStatus
+from app.schemas.profile import ProfileRead
+
+_PRECEDENCE = ("accepted", "sent", "received", "rejected")
+
+
+async def shortlist_states(
+    db: AsyncSession,
+    viewer_profile_id: uuid.UUID,
+    profile_ids: Iterable[uuid.UUID],
+) -> dict[uuid.UUID, str]:
+    """Map each profile id that has a shortlist with the viewer to its state."""
+    ids = [pid for pid in profile_ids if pid != viewer_profile_id]
+    if not ids:
+        return {}
+    result = await db.execute(
+        select(Shortlist.from_profile_id, Shortlist.to_profile_id, Shortlist.status).where(
+            or_(
+                and_(Shortlist.from_profile_id == viewer_profile_id, Shortlist.to_profile_id.in_(ids)),
+                and_(Shortlist.to_profile_id == viewer_profile_id, Shortlist.from_profile_id.in_(ids)),
+            )
+        )
+    )
+    states: dict[uuid.UUID, str] = {}
+    for from_id, to_id, status in result.all():
+        sent = from_id == viewer_profile_id
+        other = to_id if sent else from_id
+        if status == ShortlistStatus.ACCEPTED:
+            state = "accepted"
+        elif status == ShortlistStatus.REJECTED:
+            state = "rejected"
+        else:
+            state = "sent" if sent else "received"
+        current = states.get(other)
+        if current is None or _PRECEDENCE.index(state) < _PRECEDENCE.index(current):
+            states[other] = state
+    return states
+
+
+async def annotate_shortlist_status(
+    db: AsyncSession,
+    viewer_profile_id: uuid.UUID | None,
+    items: list[ProfileRead],
+) -> list[ProfileRead]:
+    """Return items with shortlist_status filled in for the viewer (one query)."""
+    if viewer_profile_id is None or not items:
+        return items
+    states = await shortlist_states(db, viewer_profile_id, [item.id for item in items])
+    return [
+        item.model_copy(update={"shortlist_status": states[item.id]}) if item.id in states else item
+        for item in items
+    ]
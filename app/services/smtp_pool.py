@@ -0,0 +1,211 @@
+"""
+services/smtp_pool.py – Pool of persistent, authenticated SMTP sessions.
+
+aiosmtplib.send() opens a TCP connection, negotiates STARTTLS and logs in
+for every message – three round trips plus a TLS handshake before the
+first byte of mail. SMTPPool keeps up to SMTP_POOL_SIZE sessions open and
+sends many messages over each:
+
+  - send() borrows the most recently used idle session (or opens one while
+    fewer than max_size exist; otherwise it waits), so the number of
+    concurrent sends is bounded by the pool size.
+  - Sessions idle for longer than SMTP_POOL_IDLE_SECONDS, or that have
+    carried SMTP_POOL_MAX_MESSAGES_PER_CONNECTION messages (many providers
+    cap this), are closed instead of reused.
+  - If the server has dropped a pooled session the send is retried once
+    on a fresh connection; other errors propagate to the caller (the email
+    outbox worker retries them with backoff).
+
+One pool per worker process, created on first use by get_smtp_pool() and
+closed from main.lifespan.
+"""
+
+import asyncio
+import time
+from email.message import Message
+from typing import Any, Callable
+
+import structlog
+
+try:
+    import aiosmtplib  # type: ignore[import]
+    _DISCONNECTED: tuple[type[Exception], ...] = (
+        aiosmtplib.SMTPServerDisconnected, ConnectionError,
+    )
+except ImportError:  # pragma: no cover – dev mode without SMTP support
+    aiosmtplib = None
+    _DISCONNECTED = (ConnectionError,)
+
+log = structlog.get_logger(__name__)
+
+
+class _Session:
+    __slots__ = ("client", "messages", "last_used")
+
+    def __init__(self, client: Any) -> None:
+        self.client = client
+        self.messages = 0
+        self.last_used = time.monotonic()
+
+
+class SMTPPool:
+    """Bounded pool of logged-in SMTP sessions."""
+
+    def __init__(
+        self,
+        *,
+        hostname: str,
+        port: int,
+        username: str | None = None,
+        password: str | None = None,
+        start_tls: bool = True,
+        max_size: int = 5,
+        idle_timeout_seconds: float = 60,
+        max_messages_per_connection: int = 100,
+        timeout_seconds: float = 30,
+        client_factory: Callable[..., Any] | None = None,
+    ) -> None:
+        self.hostname = hostname
+        self.port = port
+        self.username = username or None
+        self.password = password or None
+        self.start_tls = start_tls
+        self.max_size = max_size
+        self.idle_timeout = idle_timeout_seconds
+        self.max_messages = max_messages_per_connection
+        self.timeout = timeout_seconds
+        self._client_factory = client_factory or aiosmtplib.SMTP
+        self._idle: list[_Session] = []   # most recently used last
+        self._slots: asyncio.Semaphore | None = None
+        self._in_use = 0
+        # Counters
+        self.opened = 0
+        self.closed = 0
+        self.sent = 0
+        self.failed = 0
+        self.reused = 0
+        self.reconnects = 0
+        self._send_seconds = 0.0
+
+    # ── Sessions ──────────────────────────────────────────────────────────────
+    async def _open(self) -> _Session:
+        client = self._client_factory(
+            hostname=self.hostname,
+            port=self.port,
+            username=self.username,
+            password=self.password,
+            start_tls=self.start_tls,
+            timeout=self.timeout,
+        )
+        await client.connect()   # STARTTLS and AUTH happen here
+        self.opened += 1
+        return _Session(client)
+
+    async def _discard(self, session: _Session) -> None:
+        self.closed += 1
+        try:
+            await session.client.quit()
+        except Exception:  # noqa: BLE001 – already gone
+            session.client.close()
+
+    def _reusable(self, session: _Session, now: float) -> bool:
+        return (
+            session.client.is_connected
+            and now - session.last_used < self.idle_timeout
+            and session.messages < self.max_messages
+        )
+
+    async def _acquire(self) -> _Session:
+        now = time.monotonic()
+        while self._idle:
+            session = self._idle.pop()
+            if self._reusable(session, now):
+                self.reused += 1
+                return session
+            await self._discard(session)
+        return await self._open()
+
+    # ── Public API ────────────────────────────────────────────────────────────
+    async def send(self, message: Message) -> None:
+        """Send one message over a pooled session."""
+        if self._slots is None:
+            self._slots = asyncio.Semaphore(self.max_size)
+        async with self._slots:
+            self._in_use += 1
+            started = time.monotonic()
+            session: _Session | None = None
+            try:
+                session = await self._acquire()
+                try:
+                    await session.client.send_message(message)
+                except _DISCONNECTED:
+                    # The server dropped an idle session – retry once on a new one
+                    self.reconnects += 1
+                    session.client.close()
+                    self.closed += 1
+                    session = None
+                    session = await self._open()
+                    await session.client.send_message(message)
+            except Exception:
+                self.failed += 1
+                if session is not None:
+                    await self._discard(session)
+                raise
+            else:
+                self.sent += 1
+                session.messages += 1
+                session.last_used = time.monotonic()
+                self._idle.append(session)
+            finally:
+                self._in_use -= 1
+                self._send_seconds += time.monotonic() - started
+
+    async def close(self) -> None:
+        """Close every idle session (called on shutdown)."""
+        idle, self._idle = self._idle, []
+        for session in idle:
+            await self._discard(session)
+
+    def stats(self) -> dict:
+        """Counters for the /admin/metrics endpoint."""
+        attempts = self.sent + self.failed
+        return {
+            "max_size": self.max_size,
+            "in_use": self._in_use,
+            "idle": len(self._idle),
+            "opened": self.opened,
+            "closed": self.closed,
+            "reused": self.reused,
+            "reconnects": self.reconnects,
+            "sent": self.sent,
+            "failed": self.failed,
+            "avg_send_ms": round(self._send_seconds / attempts * 1000, 1) if attempts else 0.0,
+        }
+
+
+_pool: SMTPPool | None = None
+
+
+def get_smtp_pool() -> SMTPPool:
+    """The worker's pool, built from settings on first use."""
+    global _pool
+    if _pool is None:
+        from app.config import get_settings
+        s = get_settings()
+        _pool = SMTPPool(
+            hostname=s.SMTP_HOST,
+            port=s.SMTP_PORT,
+            username=s.SMTP_USERNAME,
+            password=s.SMTP_PASSWORD,
+            start_tls=s.SMTP_STARTTLS,
+            max_size=s.SMTP_POOL_SIZE,
+            idle_timeout_seconds=s.SMTP_POOL_IDLE_SECONDS,
+            max_messages_per_connection=s.SMTP_POOL_MAX_MESSAGES_PER_CONNECTION,
+            timeout_seconds=s.SMTP_TIMEOUT_SECONDS,
+        )
+    return _pool
+
+
+async def close_smtp_pool() -> None:
+    if _pool is not None:
+        await _pool.close()
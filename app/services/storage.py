@@ -0,0 +1,92 @@
+"""
+services/storage.py – Server-side reads and writes of media objects.
+
+Browsers upload and download through presigned URLs (services/s3.py); the
+application only touches object bytes itself when it derives files from
+an upload, such as the photo renditions in services/thumbnails.py. Those
+code paths go through a MediaStorage backend:
+
+  S3Storage     – the media bucket (production)
+  LocalStorage  – a directory tree under MEDIA_LOCAL_ROOT, keyed by the
+                  same object keys, for development and tests without S3
+
+Methods are blocking; async callers wrap them in asyncio.to_thread.
+"""
+
+from pathlib import Path
+from typing import Protocol
+
+from botocore.exceptions import BotoCoreError, ClientError
+
+from app.config import get_settings
+from app.services import s3
+
+settings = get_settings()
+
+
+class MediaStorage(Protocol):
+    def get(self, object_key: str) -> bytes: ...
+
+    def put(self, object_key: str, data: bytes, content_type: str) -> None: ...
+
+    def delete(self, object_key: str) -> None: ...
+
+
+class S3Storage:
+    """Objects in S3_BUCKET_NAME. Errors surface as RuntimeError, like S3Service."""
+
+    def get(self, object_key: str) -> bytes:
+        try:
+            response = s3._s3_client.get_object(Bucket=settings.S3_BUCKET_NAME, Key=object_key)
+            return response["Body"].read()
+        except (BotoCoreError, ClientError) as exc:
+            raise RuntimeError(f"S3 get failed: {exc}") from exc
+
+    def put(self, object_key: str, data: bytes, content_type: str) -> None:
+        try:
+            s3._s3_client.put_object(
+                Bucket=settings.S3_BUCKET_NAME,
+                Key=object_key,
+                Body=data,
+                ContentType=content_type,
+            )
+        except (BotoCoreError, ClientError) as exc:
+            raise RuntimeError(f"S3 put failed: {exc}") from exc
+
+    def delete(self, object_key: str) -> None:
+        s3.S3Service().delete_object(object_key)
+
+
+class LocalStorage:
+    """Objects as files under root; the object key is the relative path."""
+
+    def __init__(self, root: str | Path) -> None:
+        self.root = Path(root).resolve()
+
+    def _path(self, object_key: str) -> Path:
+        path = (self.root / object_key).resolve()
+        if not path.is_relative_to(self.root):
+            raise ValueError(f"Object key escapes storage root: {object_key}")
+        return path
+
+    def get(self, object_key: str) -> bytes:
+        try:
+            return self._path(object_key).read_bytes()
+        except OSError as exc:
+            raise RuntimeError(f"Local storage get failed: {exc}") from exc
+
+    def put(self, object_key: str, data: bytes, content_type: str) -> None:
+        path = self._path(object_key)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_bytes(data)
+
+    def delete(self, object_key: str) -> None:
+        s3.presigned_get_cache.invalidate(object_key)
+        self._path(object_key).unlink(missing_ok=True)
+
+
+def get_storage() -> MediaStorage:
+    """The backend selected by MEDIA_STORAGE_BACKEND."""
+    if settings.MEDIA_STORAGE_BACKEND == "local":
+        return LocalStorage(settings.MEDIA_LOCAL_ROOT)
+    return S3Storage()
@@ -0,0 +1,248 @@
+"""
+services/subscription_sweeps.py – Periodic membership maintenance jobs.
+
+Registered with the scheduler (services/scheduler.py), which runs each on
+one worker only:
+
+  subscription_expiry   – flip overdue active subscriptions to 'expired'
+                          and queue an expiry email per member
+  subscription_warning  – flag subscriptions expiring within 3 days and
+                          queue a warning email per member
+
+Each sweep walks active subscriptions in (expires_at, id) order in chunks
+of SUBSCRIPTION_SWEEP_CHUNK_SIZE. A chunk is one short transaction:
+
+  1. SELECT … FOR UPDATE SKIP LOCKED the next chunk after the cursor
+     (rows a member or admin is editing right now are left for the next run)
+  2. UPDATE them, RETURNING recipient + plan
+  3. INSERT the outbox rows and advance the sweep_checkpoints cursor
+
+and the email worker is woken after every commit, so delivery starts while
+the sweep is still running. The cutoff (NOW() at the start of the sweep,
+plus the warning horizon) is stored with the cursor: a sweep interrupted
+by a deploy or a leader change resumes from its checkpoint with the same
+cutoff on its next run instead of starting over. Re-running a finished
+chunk finds nothing – the UPDATE removes its rows from the sweep's filter.
+"""
+
+import uuid
+from datetime import datetime, timedelta, timezone
+from typing import Callable, NamedTuple
+
+import structlog
+from sqlalchemy import insert, select, text
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.engine import Row
+from sqlalchemy.ext.asyncio import AsyncConnection, AsyncEngine
+
+from app.config import get_settings
+from app.database import engine
+from app.models.email_outbox import EmailOutbox
+from app.models.sweep_checkpoint import SweepCheckpoint
+from app.services.email_outbox import email_outbox_worker, outbox_values
+
+log = structlog.get_logger(__name__)
+settings = get_settings()
+
+# Shared keyset filter: active rows after the cursor, up to the run's cutoff
+_CHUNK = """
+    SELECT id
+    FROM   member_subscriptions
+    WHERE  status = 'active'
+      AND  {condition}
+      AND  (CAST(:after_expires_at AS timestamptz) IS NULL
+            OR (expires_at, id) > (CAST(:after_expires_at AS timestamptz),
+                                   CAST(:after_id AS uuid)))
+    ORDER  BY expires_at, id
+    LIMIT  :limit
+    FOR UPDATE SKIP LOCKED
+"""
+
+_EXPIRE = text(
+    f"""
+    WITH chunk AS ({_CHUNK.format(condition="expires_at < :cutoff")})
+    UPDATE member_subscriptions ms
+    SET    status = 'expired'
+    FROM   chunk,
+           membership_plan_templates pt,
+           users u
+    WHERE  ms.id               = chunk.id
+      AND  ms.plan_template_id = pt.id
+      AND  ms.user_id          = u.id
+    RETURNING ms.id, ms.expires_at, ms.tenant_id, u.email, u.full_name,
+              pt.name AS plan_name
+    """
+)
+
+_WARN = text(
+    f"""
+    WITH chunk AS ({_CHUNK.format(
+        condition="expiry_warning_sent = FALSE AND expires_at BETWEEN NOW() AND :cutoff"
+    )})
+    UPDATE member_subscriptions ms
+    SET    expiry_warning_sent = TRUE
+    FROM   chunk,
+           membership_plan_templates pt,
+           users u
+    WHERE  ms.id               = chunk.id
+      AND  ms.plan_template_id = pt.id
+      AND  ms.user_id          = u.id
+    RETURNING ms.id, ms.expires_at, ms.tenant_id, u.email, u.full_name,
+              pt.name AS plan_name
+    """
+)
+
+
+def _now() -> datetime:
+    return datetime.now(timezone.utc)
+
+
+class Checkpoint(NamedTuple):
+    cutoff: datetime
+    started_at: datetime
+    after_expires_at: datetime | None = None
+    after_id: uuid.UUID | None = None
+    processed: int = 0
+    chunks: int = 0
+
+
+class ChunkedSweep:
+    """
+    One resumable sweep over active subscriptions.
+
+    ``statement`` updates at most :limit rows after the cursor and returns
+    (id, expires_at, tenant_id, email, full_name, plan_name);
+    ``email_params`` turns a returned row into the template parameters of
+    its ``email_kind`` outbox message.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        statement,
+        email_kind: str,
+        email_params: Callable[[Row], dict],
+        horizon: timedelta = timedelta(0),
+        chunk_size: int = 500,
+        engine: AsyncEngine = engine,
+    ) -> None:
+        self.name = name
+        self.statement = statement
+        self.email_kind = email_kind
+        self.email_params = email_params
+        self.horizon = horizon
+        self.chunk_size = chunk_size
+        self._engine = engine
+
+    async def run(self) -> int:
+        """Process every chunk up to the cutoff; returns rows updated by this run."""
+        checkpoint = await self.load_checkpoint()
+        if checkpoint is None:
+            now = _now()
+            checkpoint = Checkpoint(cutoff=now + self.horizon, started_at=now)
+        else:
+            log.info("sweep_resumed", job=self.name, cutoff=checkpoint.cutoff.isoformat(),
+                     processed=checkpoint.processed, chunks=checkpoint.chunks)
+        resumed_from = checkpoint.processed
+
+        while True:
+            before = checkpoint.processed
+            checkpoint = await self.run_chunk(checkpoint)
+            if checkpoint.processed - before < self.chunk_size:
+                break
+
+        await self.complete(checkpoint)
+        log.info("sweep_completed", job=self.name, processed=checkpoint.processed,
+                 chunks=checkpoint.chunks)
+        return checkpoint.processed - resumed_from
+
+    # ── One chunk = one transaction ───────────────────────────────────────────
+    async def run_chunk(self, checkpoint: Checkpoint) -> Checkpoint:
+        async with self._engine.begin() as conn:
+            rows = (await conn.execute(self.statement, {
+                "cutoff": checkpoint.cutoff,
+                "after_expires_at": checkpoint.after_expires_at,
+                "after_id": checkpoint.after_id,
+                "limit": self.chunk_size,
+            })).fetchall()
+            if not rows:
+                return checkpoint
+
+            emails = [
+                outbox_values(self.email_kind, row.email, row.tenant_id, **self.email_params(row))
+                for row in rows if row.email
+            ]
+            if emails:
+                await conn.execute(insert(EmailOutbox), emails)
+
+            last = max(rows, key=lambda row: (row.expires_at, row.id))
+            checkpoint = checkpoint._replace(
+                after_expires_at=last.expires_at,
+                after_id=last.id,
+                processed=checkpoint.processed + len(rows),
+                chunks=checkpoint.chunks + 1,
+            )
+            await self._save(conn, checkpoint)
+
+        if emails:
+            email_outbox_worker.notify()
+        return checkpoint
+
+    # ── Checkpoint (sweep_checkpoints) ────────────────────────────────────────
+    async def load_checkpoint(self) -> Checkpoint | None:
+        """The unfinished checkpoint of an interrupted run, if any."""
+        async with self._engine.connect() as conn:
+            row = (await conn.execute(
+                select(SweepCheckpoint.__table__)
+                .where(SweepCheckpoint.job == self.name, SweepCheckpoint.completed_at.is_(None))
+            )).first()
+        if row is None:
+            return None
+        return Checkpoint(
+            cutoff=row.cutoff, started_at=row.started_at,
+            after_expires_at=row.after_expires_at, after_id=row.after_id,
+            processed=row.processed, chunks=row.chunks,
+        )
+
+    async def complete(self, checkpoint: Checkpoint) -> None:
+        async with self._engine.begin() as conn:
+            await self._save(conn, checkpoint, completed_at=_now())
+
+    async def _save(
+        self, conn: AsyncConnection, checkpoint: Checkpoint, completed_at: datetime | None = None
+    ) -> None:
+        values = {**checkpoint._asdict(), "completed_at": completed_at, "updated_at": _now()}
+        stmt = pg_insert(SweepCheckpoint).values(job=self.name, **values)
+        await conn.execute(stmt.on_conflict_do_update(index_elements=["job"], set_=values))
+
+
+expiry_sweep = ChunkedSweep(
+    "subscription_expiry",
+    _EXPIRE,
+    "subscription_expired",
+    lambda row: {"full_name": row.full_name, "plan_name": row.plan_name},
+    chunk_size=settings.SUBSCRIPTION_SWEEP_CHUNK_SIZE,
+)
+
+warning_sweep = ChunkedSweep(
+    "subscription_warning",
+    _WARN,
+    "subscription_expiry_warning",
+    lambda row: {
+        "full_name": row.full_name,
+        "plan_name": row.plan_name,
+        "expires_on": row.expires_at.strftime("%d %b %Y"),
+    },
+    horizon=timedelta(days=3),
+    chunk_size=settings.SUBSCRIPTION_SWEEP_CHUNK_SIZE,
+)
+
+
+async def expire_subscriptions() -> int:
+    """Expire overdue subscriptions; returns the number expired."""
+    return await expiry_sweep.run()
+
+
+async def warn_expiring_subscriptions() -> int:
+    """Flag subscriptions expiring within 3 days; returns the number warned."""
+    return await warning_sweep.run()
@@ -0,0 +1,149 @@
+"""
+services/tenant_registry.py – Process-wide cache of tenant records.
+
+Tenants change rarely but are read on almost every request: TenantMiddleware
+resolves one from the X-Tenant-ID header or subdomain, and routers then look
+up the caste list, caste lock or payment details of the caller's tenant. The
+registry keeps an immutable TenantSnapshot keyed by id and by slug so both
+paths share a single lookup.
+
+Negative caching:
+    Unknown ids / slugs are remembered as None for
+    TENANT_CACHE_NEGATIVE_TTL_SECONDS, so a burst of requests for a bogus
+    subdomain does not reach the database each time.
+
+Invalidation:
+    Every write to a tenant row must call invalidate_tenant(tenant.id,
+    tenant.slug) after flushing. Other workers converge within
+    TENANT_CACHE_TTL_SECONDS.
+
+Usage:
+    tenant = await get_tenant(current_user.tenant_id, db)
+    if tenant and tenant.caste_locked:
+        ...
+"""
+
+import uuid
+
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.cache import MISSING, TTLCache
+from app.config import get_settings
+from app.database import AsyncSessionLocal
+from app.models.tenant import Tenant
+
+settings = get_settings()
+
+# Columns copied into the snapshot (timestamps and relationships are omitted)
+_SNAPSHOT_FIELDS = (
+    "id",
+    "name",
+    "slug",
+    "domain",
+    "is_active",
+    "plan",
+    "max_users",
+    "max_admins",
+    "castes",
+    "caste_locked",
+    "can_override_plan_prices",
+    "self_registration_enabled",
+    "logo_key",
+    "upi_id",
+    "upi_name",
+    "upi_qr_key",
+    "payment_whatsapp",
+)
+
+
+class TenantSnapshot:
+    """Read-only copy of a Tenant row, safe to share across sessions and requests."""
+
+    __slots__ = _SNAPSHOT_FIELDS
+
+    def __init__(self, **values) -> None:
+        for field in _SNAPSHOT_FIELDS:
+            object.__setattr__(self, field, values[field])
+
+    def __setattr__(self, name: str, value) -> None:
+        raise AttributeError("TenantSnapshot is read-only; load the Tenant row to modify it.")
+
+    @classmethod
+    def from_tenant(cls, tenant: Tenant) -> "TenantSnapshot":
+        values = {field: getattr(tenant, field) for field in _SNAPSHOT_FIELDS}
+        values["castes"] = tuple(tenant.castes or ())
+        return cls(**values)
+
+    def __repr__(self) -> str:
+        return f"<TenantSnapshot slug={self.slug} plan={self.plan}>"
+
+
+# Keys are ("id", UUID) and ("slug", str); a None value is a negative entry.
+tenant_cache = TTLCache(
+    "tenants",
+    max_size=settings.TENANT_CACHE_MAX_SIZE,
+    ttl_seconds=settings.TENANT_CACHE_TTL_SECONDS,
+)
+
+
+def _remember(key: tuple, tenant: Tenant | None) -> TenantSnapshot | None:
+    if tenant is None:
+        tenant_cache.set(key, None, ttl_seconds=settings.TENANT_CACHE_NEGATIVE_TTL_SECONDS)
+        return None
+    snapshot = TenantSnapshot.from_tenant(tenant)
+    tenant_cache.set(("id", snapshot.id), snapshot)
+    tenant_cache.set(("slug", snapshot.slug), snapshot)
+    return snapshot
+
+
+async def get_tenant(
+    tenant_id: uuid.UUID, db: AsyncSession | None = None
+) -> TenantSnapshot | None:
+    """
+    Return the tenant with this id (active or not), or None if it does not exist.
+
+    On a miss the row is loaded through `db`, or through a short-lived session
+    when called outside a request (e.g. from middleware).
+    """
+    key = ("id", tenant_id)
+    cached = tenant_cache.get(key)
+    if cached is not MISSING:
+        return cached
+
+    if db is not None:
+        return _remember(key, await db.get(Tenant, tenant_id))
+    async with AsyncSessionLocal() as session:
+        return _remember(key, await session.get(Tenant, tenant_id))
+
+
+async def get_tenant_by_slug(
+    slug: str, db: AsyncSession | None = None
+) -> TenantSnapshot | None:
+    """Return the tenant with this slug (case-insensitive), or None."""
+    slug = slug.lower()
+    key = ("slug", slug)
+    cached = tenant_cache.get(key)
+    if cached is not MISSING:
+        return cached
+
+    query = select(Tenant).where(Tenant.slug == slug)
+    if db is not None:
+        result = await db.execute(query)
+        return _remember(key, result.scalar_one_or_none())
+    async with AsyncSessionLocal() as session:
+        result = await session.execute(query)
+        return _remember(key, result.scalar_one_or_none())
+
+
+def invalidate_tenant(tenant_id: uuid.UUID, *slugs: str) -> None:
+    """
+    Forget a tenant after it was written.
+
+    Pass the current slug (and the previous one if it changed) so that
+    negative entries for a newly taken slug are dropped as well.
+    """
+    tenant_cache.invalidate(("id", tenant_id))
+    tenant_cache.invalidate_where(lambda _k, t: t is not None and t.id == tenant_id)
+    for slug in slugs:
+        tenant_cache.invalidate(("slug", slug.lower()))
@@ -0,0 +1,321 @@
+"""
+services/thumbnails.py – WebP renditions of uploaded profile photos.
+
+Members upload photos straight to S3 at camera resolution (often several
+MB), and browse cards used to display that original. When
+PATCH /files/profiles/{id}/media registers a profile photo it also writes a
+FileRecord with rendition_status=pending; ThumbnailRunner then, off the
+request path:
+
+  1. claims pending records with SELECT … FOR UPDATE SKIP LOCKED (several
+     records per claim, one per Pillow process),
+  2. reads the original through the MediaStorage backend
+     (services/storage.py – S3, or a local directory in dev/tests),
+  3. decodes and resizes it in a ProcessPoolExecutor, so image work neither
+     blocks the event loop nor competes for the GIL,
+  4. writes the renditions next to the original under derived keys
+     (rendition_key) and records them on the FileRecord.
+
+    <key stem>.thumb.webp   – MEDIA_THUMBNAIL_PX on the longest edge
+    <key stem>.medium.webp  – MEDIA_MEDIUM_PX on the longest edge
+
+services/media_urls.py signs the thumbnail for list endpoints and the
+medium rendition for the profile page, falling back to the original while
+a photo is pending or if it could not be decoded (rendition_status=failed).
+
+As with the job runners, updated_at is a heartbeat: a record left in
+processing by a dead worker is reclaimed after MEDIA_RENDITION_STALE_SECONDS.
+Deployments without a long-lived app process can run a standalone runner:
+
+    python -m app.services.thumbnails
+"""
+
+import asyncio
+import io
+import multiprocessing
+import uuid
+from concurrent.futures import Executor, ProcessPoolExecutor
+from datetime import datetime, timedelta, timezone
+from typing import Callable
+
+import structlog
+from PIL import Image, ImageOps, UnidentifiedImageError
+from sqlalchemy import and_, or_, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.config import get_settings
+from app.database import AsyncSessionLocal
+from app.models.file_record import FileRecord, RenditionStatus
+from app.services.storage import MediaStorage, get_storage
+
+log = structlog.get_logger(__name__)
+settings = get_settings()
+
+SessionFactory = Callable[[], AsyncSession]
+
+WEBP_CONTENT_TYPE = "image/webp"
+
+
+def _now() -> datetime:
+    return datetime.now(timezone.utc)
+
+
+def rendition_key(object_key: str, name: str) -> str:
+    """profile_photo/<tenant>/2026/<uuid>.jpg → profile_photo/<tenant>/2026/<uuid>.<name>.webp"""
+    stem = object_key.rsplit(".", 1)[0] if "." in object_key.rsplit("/", 1)[-1] else object_key
+    return f"{stem}.{name}.webp"
+
+
+def render_renditions(data: bytes, sizes: dict[str, int], quality: int) -> dict[str, bytes]:
+    """
+    Encode one WebP per entry of sizes (name → longest edge in px).
+
+    Runs in a worker process, so it takes and returns plain bytes. Images
+    are never upscaled. Raises UnidentifiedImageError / OSError for files
+    Pillow cannot decode.
+    """
+    with Image.open(io.BytesIO(data)) as original:
+        # JPEG only: let the decoder scale down by up to 8x while reading
+        largest = max(sizes.values())
+        original.draft("RGB", (largest, largest))
+        image = ImageOps.exif_transpose(original)
+
+    has_alpha = "A" in image.getbands() or "transparency" in image.info
+    image = image.convert("RGBA" if has_alpha else "RGB")
+
+    renditions: dict[str, bytes] = {}
+    # Largest first, so every step shrinks the previous result in place
+    for name, px in sorted(sizes.items(), key=lambda item: -item[1]):
+        image.thumbnail((px, px), Image.Resampling.LANCZOS)
+        out = io.BytesIO()
+        image.save(out, "WEBP", quality=quality, method=4)
+        renditions[name] = out.getvalue()
+    return renditions
+
+
+async def process_record(
+    db: AsyncSession,
+    record: FileRecord,
+    storage: MediaStorage,
+    executor: Executor | None,
+    sizes: dict[str, int],
+    quality: int,
+) -> None:
+    """
+    Generate and store the renditions of one claimed record, then commit.
+    executor=None renders on the loop's default thread pool (tests).
+    """
+    original = await asyncio.to_thread(storage.get, record.object_key)
+    record.size_bytes = len(original)
+
+    loop = asyncio.get_running_loop()
+    try:
+        renditions = await loop.run_in_executor(
+            executor, render_renditions, original, sizes, quality
+        )
+    except (UnidentifiedImageError, OSError, Image.DecompressionBombError) as exc:
+        # Not an image Pillow can read (e.g. HEIC): keep serving the original
+        record.rendition_status = RenditionStatus.FAILED
+        record.rendition_error = f"{type(exc).__name__}: {exc}"
+        record.updated_at = _now()
+        await db.commit()
+        log.info("rendition_skipped", object_key=record.object_key, error=str(exc))
+        return
+
+    keys = {name: rendition_key(record.object_key, name) for name in renditions}
+    for name, data in renditions.items():
+        await asyncio.to_thread(storage.put, keys[name], data, WEBP_CONTENT_TYPE)
+
+    record.thumbnail_key = keys.get("thumb")
+    record.medium_key = keys.get("medium")
+    record.rendition_status = RenditionStatus.READY
+    record.rendition_error = None
+    record.updated_at = _now()
+    await db.commit()
+
+
+class ThumbnailRunner:
+    """Polls file_records for pending photos and renders them in a process pool."""
+
+    def __init__(
+        self,
+        *,
+        processes: int,
+        poll_interval_seconds: float,
+        stale_after_seconds: float,
+        sizes: dict[str, int],
+        quality: int,
+        storage: MediaStorage | None = None,
+        session_factory: SessionFactory = AsyncSessionLocal,
+    ) -> None:
+        self.processes = processes
+        self.poll_interval = poll_interval_seconds
+        self.stale_after = stale_after_seconds
+        self.sizes = sizes
+        self.quality = quality
+        self.storage = storage or get_storage()
+        self._session_factory = session_factory
+        self._executor: ProcessPoolExecutor | None = None
+        self._wakeup: asyncio.Event | None = None
+        self._task: asyncio.Task | None = None
+        self._stopping = False
+        # Counters
+        self.ready = 0
+        self.skipped = 0
+        self.failed = 0
+        self.resumed = 0
+
+    @property
+    def running(self) -> bool:
+        return self._task is not None and not self._task.done()
+
+    # ── Lifecycle ─────────────────────────────────────────────────────────────
+    def start(self) -> None:
+        """Start the process pool and spawn the polling loop."""
+        if self.running:
+            return
+        # spawn, not fork: the parent holds an event loop and DB connections
+        self._executor = ProcessPoolExecutor(
+            max_workers=self.processes, mp_context=multiprocessing.get_context("spawn")
+        )
+        self._wakeup = asyncio.Event()
+        self._stopping = False
+        self._task = asyncio.create_task(self._run(), name="thumbnail-runner")
+
+    async def stop(self, timeout: float | None = None) -> None:
+        """
+        Stop claiming photos and wait for the current batch. On timeout the
+        batch is abandoned; its records are reclaimed once their heartbeat
+        goes stale.
+        """
+        if not self.running:
+            return
+        self._stopping = True
+        self._wakeup.set()
+        try:
+            await asyncio.wait_for(self._task, timeout)
+        except asyncio.TimeoutError:
+            log.warning("thumbnail_runner_stop_timeout")
+            self._task.cancel()
+        self._task = None
+        self._executor.shutdown(wait=False, cancel_futures=True)
+        self._executor = None
+
+    def notify(self) -> None:
+        """Wake the loop early (a photo was just registered by this worker)."""
+        if self.running:
+            self._wakeup.set()
+
+    # ── Loop ──────────────────────────────────────────────────────────────────
+    async def _run(self) -> None:
+        while not self._stopping:
+            try:
+                record_ids = await self.claim_batch()
+            except Exception as exc:  # noqa: BLE001
+                log.warning("thumbnail_claim_failed", error=str(exc))
+                record_ids = []
+
+            if record_ids:
+                await asyncio.gather(*(self.run_record(rid) for rid in record_ids))
+                continue
+
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), self.poll_interval)
+            except asyncio.TimeoutError:
+                pass
+            self._wakeup.clear()
+
+    async def claim_batch(self) -> list[uuid.UUID]:
+        """Mark up to one pending (or stale processing) record per process as ours."""
+        now = _now()
+        async with self._session_factory() as db:
+            records = (await db.scalars(
+                select(FileRecord)
+                .where(
+                    or_(
+                        FileRecord.rendition_status == RenditionStatus.PENDING,
+                        and_(
+                            FileRecord.rendition_status == RenditionStatus.PROCESSING,
+                            FileRecord.updated_at < now - timedelta(seconds=self.stale_after),
+                        ),
+                    )
+                )
+                .order_by(FileRecord.created_at)
+                .limit(self.processes)
+                .with_for_update(skip_locked=True)
+            )).all()
+            for record in records:
+                if record.rendition_status == RenditionStatus.PROCESSING:
+                    self.resumed += 1
+                record.rendition_status = RenditionStatus.PROCESSING
+                record.updated_at = now
+            await db.commit()
+            return [record.id for record in records]
+
+    async def run_record(self, record_id: uuid.UUID) -> None:
+        """Render one claimed record; errors are recorded on the row."""
+        async with self._session_factory() as db:
+            record = await db.get(FileRecord, record_id)
+            if record is None:   # photo deleted since the claim
+                return
+            try:
+                await process_record(db, record, self.storage, self._executor, self.sizes, self.quality)
+            except Exception as exc:  # noqa: BLE001
+                await db.rollback()
+                await db.execute(
+                    update(FileRecord)
+                    .where(FileRecord.id == record_id)
+                    .values(
+                        rendition_status=RenditionStatus.FAILED,
+                        rendition_error=f"{type(exc).__name__}: {exc}",
+                        updated_at=_now(),
+                    )
+                )
+                await db.commit()
+                self.failed += 1
+                log.warning("rendition_failed", record_id=str(record_id), error=str(exc))
+                return
+        if record.rendition_status == RenditionStatus.READY:
+            self.ready += 1
+        else:
+            self.skipped += 1
+
+    def stats(self) -> dict:
+        """Counters for the /admin/metrics endpoint."""
+        return {
+            "running": self.running,
+            "processes": self.processes,
+            "ready": self.ready,
+            "skipped": self.skipped,
+            "failed": self.failed,
+            "resumed": self.resumed,
+        }
+
+
+def rendition_sizes() -> dict[str, int]:
+    return {"thumb": settings.MEDIA_THUMBNAIL_PX, "medium": settings.MEDIA_MEDIUM_PX}
+
+
+# One runner per worker process
+thumbnail_runner = ThumbnailRunner(
+    processes=settings.MEDIA_RENDITION_PROCESSES,
+    poll_interval_seconds=settings.MEDIA_RENDITION_POLL_SECONDS,
+    stale_after_seconds=settings.MEDIA_RENDITION_STALE_SECONDS,
+    sizes=rendition_sizes(),
+    quality=settings.MEDIA_WEBP_QUALITY,
+)
+
+
+async def _main() -> None:
+    thumbnail_runner.start()
+    try:
+        await asyncio.Event().wait()
+    finally:
+        await thumbnail_runner.stop(timeout=settings.MEDIA_RENDITION_DRAIN_TIMEOUT_SECONDS)
+
+
+if __name__ == "__main__":
+    try:
+        asyncio.run(_main())
+    except KeyboardInterrupt:
+        pass
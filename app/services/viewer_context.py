@@ -0,0 +1,139 @@
+"""
+services/viewer_context.py – The browsing member's own profile facts in one query.
+
+Member-facing profile endpoints need the caller's profile id, gender,
+caste and star/rashi plus the tenant's caste_locked flag. These used to be
+three or four sequential queries per request. get_viewer_context loads them with a single
+tenant ⟕ profile query and caches the result:
+
+  - per request: it is a FastAPI dependency, so every use in one request
+    shares the same value;
+  - per user: in a TTLCache for VIEWER_CONTEXT_CACHE_TTL_SECONDS.
+
+Invalidation:
+    Writes to the caller's own profile (gender / caste / star / creation / deletion)
+    must call invalidate_viewer(user_id); toggling a tenant's caste lock must
+    call invalidate_tenant_viewers(tenant_id). Other workers converge within
+    the TTL.
+
+Usage:
+    viewer: Annotated[ViewerContext | None, Depends(get_viewer_context)]
+"""
+
+import uuid
+from typing import Annotated
+
+from fastapi import Depends
+from sqlalchemy import and_, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.auth.dependencies import get_current_principal
+from app.auth.principal import UserPrincipal
+from app.cache import MISSING, TTLCache
+from app.config import get_settings
+from app.database import get_db
+from app.models.profile import Profile
+from app.models.tenant import Tenant
+from app.models.user import UserRole
+
+settings = get_settings()
+
+
+class ViewerContext:
+    """Read-only facts about a browsing member; profile fields are None without a profile."""
+
+    __slots__ = (
+        "user_id", "tenant_id", "caste_locked", "profile_id", "gender", "caste", "star", "rashi",
+    )
+
+    def __init__(
+        self,
+        user_id: uuid.UUID,
+        tenant_id: uuid.UUID,
+        caste_locked: bool,
+        profile_id: uuid.UUID | None,
+        gender: str | None,
+        caste: str | None,
+        star: str | None = None,
+        rashi: str | None = None,
+    ) -> None:
+        object.__setattr__(self, "user_id", user_id)
+        object.__setattr__(self, "tenant_id", tenant_id)
+        object.__setattr__(self, "caste_locked", caste_locked)
+        object.__setattr__(self, "profile_id", profile_id)
+        object.__setattr__(self, "gender", gender)
+        object.__setattr__(self, "caste", caste)
+        object.__setattr__(self, "star", star)
+        object.__setattr__(self, "rashi", rashi)
+
+    def __setattr__(self, name: str, value) -> None:
+        raise AttributeError("ViewerContext is read-only.")
+
+    def __repr__(self) -> str:
+        return f"<ViewerContext user={self.user_id} profile={self.profile_id}>"
+
+
+# One cache per worker process, keyed by user id
+viewer_cache = TTLCache(
+    "viewer_context",
+    max_size=settings.VIEWER_CONTEXT_CACHE_MAX_SIZE,
+    ttl_seconds=settings.VIEWER_CONTEXT_CACHE_TTL_SECONDS,
+)
+
+
+async def load_viewer_context(
+    user_id: uuid.UUID, tenant_id: uuid.UUID, db: AsyncSession
+) -> ViewerContext | None:
+    """Return the viewer context (cached), or None if the tenant does not exist."""
+    cached = viewer_cache.get(user_id)
+    if cached is not MISSING:
+        return cached
+
+    result = await db.execute(
+        select(
+            Tenant.caste_locked,
+            Profile.id,
+            Profile.gender,
+            Profile.caste,
+            Profile.star,
+            Profile.rashi,
+        )
+        .select_from(Tenant)
+        .outerjoin(Profile, and_(Profile.user_id == user_id, Profile.tenant_id == Tenant.id))
+        .where(Tenant.id == tenant_id)
+    )
+    row = result.first()
+    if row is None:
+        return None
+    context = ViewerContext(
+        user_id=user_id,
+        tenant_id=tenant_id,
+        caste_locked=bool(row.caste_locked),
+        profile_id=row.id,
+        gender=row.gender,
+        caste=row.caste,
+        star=row.star,
+        rashi=row.rashi,
+    )
+    viewer_cache.set(user_id, context)
+    return context
+
+
+async def get_viewer_context(
+    db: Annotated[AsyncSession, Depends(get_db)],
+    current_user: Annotated[UserPrincipal, Depends(get_current_principal)],
+) -> ViewerContext | None:
+    """FastAPI dependency: context for MEMBER callers, None for everyone else."""
+    if current_user.role != UserRole.MEMBER or current_user.tenant_id is None:
+        return None
+    return await load_viewer_context(current_user.id, current_user.tenant_id, db)
+
+
+def invalidate_viewer(user_id: uuid.UUID) -> None:
+    """Forget the cached context of one member."""
+    viewer_cache.invalidate(user_id)
+
+
+def invalidate_tenant_viewers(tenant_id: uuid.UUID) -> int:
+    """Forget every cached context in a tenant (e.g. caste lock toggled)."""
+    return viewer_cache.invalidate_where(lambda _k, v: v.tenant_id == tenant_id)
@@ -11,6 +11,8 @@ export interface ProfilesQuery {
   min_age?: number
   max_age?: number
   search?: string
+  /** Embed a signed URL for each visible first photo (photo_url). */
+  include_media_urls?: boolean
 }
 
 export interface PresignRequest {
@@ -92,6 +94,19 @@ export const filesApi = {
     return client.get('/files/presign-get', { params: { key } }).then((r) => r.data)
   },
 
+  /**
+   * Presigned GET URLs for many keys (list pages), keyed by object key.
+   * One request per 100 keys (the server's batch limit).
+   */
+  async presignGetMany(keys: string[]): Promise<Record<string, { url: string; expires_in: number }>> {
+    const batches: string[][] = []
+    for (let i = 0; i < keys.length; i += 100) batches.push(keys.slice(i, i + 100))
+    const results = await Promise.all(
+      batches.map((batch) => client.post('/files/presign-get', { keys: batch }).then((r) => r.data.urls)),
+    )
+    return Object.assign({}, ...results)
+  },
+
   /** Get a presigned PUT URL for an avatar (user profile picture). */
   presignAvatar(data: {
     file_name: string
@@ -35,7 +35,7 @@ export const shortlistApi = {
    */
   sentInterests(page = 1, size = 20): Promise<InterestList> {
     return client
-      .get('/shortlists/sent-interests', { params: { page, size } })
+      .get('/shortlists/sent-interests', { params: { page, size, include_media_urls: true } })
       .then((r) => r.data)
   },
 
@@ -46,7 +46,7 @@ export const shortlistApi = {
   receivedInterests(page = 1, size = 20, status?: string): Promise<InterestList> {
     return client
       .get('/shortlists/received-interests', {
-        params: { page, size, ...(status ? { status } : {}) },
+        params: { page, size, include_media_urls: true, ...(status ? { status } : {}) },
       })
       .then((r) => r.data)
   },
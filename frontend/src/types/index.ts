@@ -96,6 +96,8 @@ export interface Profile {
 
   // Photos
   photo_keys: string[] | null
+  /** Signed URL of the first photo; only when requested with include_media_urls. */
+  photo_url?: string | null
 
   // Privacy
   personal_visible: boolean
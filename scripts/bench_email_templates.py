@@ -0,0 +1,65 @@
+"""
+scripts/bench_email_templates.py – Cost of rendering transactional emails.
+
+Renders the subscription-expired email (the expiry sweep's template) for N
+recipients three ways:
+
+  rebuild      – assemble the branded shell for every message (the
+                 per-call work done before templates were precompiled)
+  render       – precompiled template, one render() per recipient
+  render_many  – precompiled template, the whole batch in one call
+
+Usage:
+    DATABASE_URL=postgresql+asyncpg://u:p@localhost/db \\
+    SECRET_KEY=bench-secret-key-32-chars-minimum!! \\
+    python scripts/bench_email_templates.py [--renders 10000]
+"""
+
+import argparse
+import sys
+import time
+from pathlib import Path
+
+# Allow importing app modules from project root
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from app.services import email_templates as t
+
+
+def _rebuild(row: dict) -> t.Rendered:
+    template = t.EmailTemplate(
+        "Your {plan_name} membership has expired",
+        t._h1("Your membership has expired")
+        + t._p("Dear <strong>{full_name}</strong>,", mt=4)
+        + t._p("Your <strong>{plan_name}</strong> membership on Varanbook has expired. "
+               "Renew now to continue browsing profiles and sending interest requests without interruption.")
+        + t._btn("Renew Membership", "https://varanbook.in/plans", color=t._SECONDARY)
+        + t._muted("Questions? Reach out to your matrimonial centre for assistance."),
+    )
+    return template.render(**row)
+
+
+def _time(label: str, fn, n: int) -> float:
+    start = time.perf_counter()
+    fn()
+    elapsed = time.perf_counter() - start
+    print(f"  {label:<12} {elapsed * 1000:8.1f} ms total   {elapsed / n * 1_000_000:6.2f} µs/render")
+    return elapsed
+
+
+def main(n: int) -> None:
+    rows = [{"full_name": f"Member {i}", "plan_name": "Bloom"} for i in range(n)]
+    template = t.get_templates()["subscription_expired"]
+    template.render(**rows[0])  # warm-up
+
+    print(f"{n} renders\n")
+    rebuild = _time("rebuild", lambda: [_rebuild(row) for row in rows], n)
+    render = _time("render", lambda: [template.render(**row) for row in rows], n)
+    batch = _time("render_many", lambda: template.render_many(rows), n)
+    print(f"\n  speed-up vs rebuild: render {rebuild / render:.1f}x   render_many {rebuild / batch:.1f}x")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--renders", type=int, default=10_000)
+    main(parser.parse_args().renders)
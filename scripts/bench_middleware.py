@@ -0,0 +1,206 @@
+"""
+scripts/bench_middleware.py – Per-request overhead of the app's own middlewares.
+
+Drives the ASGI app directly (no HTTP client or server in the loop) against
+an in-memory SQLite database and times two endpoints:
+
+  GET /health     – trivial handler, isolates middleware cost
+  GET /profiles/  – authenticated list with a DB round-trip
+
+Each endpoint is measured twice: once with the full middleware stack and
+once "bare" (only CORS + SlowAPI kept). The difference is the overhead of
+the tenant / audit / request-context middlewares. Run it on two checkouts
+to compare implementations.
+
+Usage:
+    DATABASE_URL=postgresql+asyncpg://u:p@localhost/db \\
+    SECRET_KEY=bench-secret-key-32-chars-minimum!! \\
+    python scripts/bench_middleware.py [--requests 3000]
+
+The rate limiter is disabled for the run; structlog output is discarded
+(but still rendered, so logging cost is included).
+"""
+
+import argparse
+import asyncio
+import os
+import statistics
+import sys
+import time
+import uuid
+from pathlib import Path
+
+# Allow importing app modules from project root
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+import bcrypt as _bcrypt
+import structlog
+from fastapi.middleware.cors import CORSMiddleware
+from slowapi.middleware import SlowAPIMiddleware
+from sqlalchemy import JSON
+from sqlalchemy.dialects.postgresql import ARRAY, JSONB
+from sqlalchemy.ext.asyncio import (
+    AsyncEngine,
+    AsyncSession,
+    async_sessionmaker,
+    create_async_engine,
+)
+
+from app.auth.jwt import create_access_token
+from app.database import Base, get_db
+from app.main import create_app
+from app.middleware.rate_limit import limiter
+from app.models.profile import Gender, Profile, ProfileStatus
+from app.models.tenant import Tenant
+from app.models.user import User, UserRole
+
+_KEEP_IN_BARE = (CORSMiddleware, SlowAPIMiddleware)
+
+
+async def _setup_db() -> tuple[AsyncEngine, async_sessionmaker, dict]:
+    """Create the schema in SQLite and seed one tenant, an admin and 25 profiles."""
+    engine = create_async_engine("sqlite+aiosqlite:///:memory:")
+    for table in Base.metadata.tables.values():
+        for column in table.columns:
+            if isinstance(column.type, (ARRAY, JSONB)):
+                column.type = JSON()
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+
+    session_factory = async_sessionmaker(bind=engine, class_=AsyncSession, expire_on_commit=False)
+    hashed = _bcrypt.hashpw(b"Bench@1234", _bcrypt.gensalt(4)).decode()
+    async with session_factory() as db:
+        tenant = Tenant(
+            id=uuid.uuid4(),
+            name="Bench Centre",
+            slug="bench",
+            contact_person="Bench",
+            contact_email="bench@example.com",
+            contact_number="+911234567890",
+        )
+        admin = User(
+            tenant_id=tenant.id,
+            email="admin@bench.example.com",
+            hashed_password=hashed,
+            full_name="Bench Admin",
+            role=UserRole.ADMIN,
+        )
+        db.add_all([tenant, admin])
+        for i in range(25):
+            member = User(
+                tenant_id=tenant.id,
+                email=f"member{i}@bench.example.com",
+                hashed_password=hashed,
+                full_name=f"Member {i}",
+            )
+            db.add(member)
+            await db.flush()
+            db.add(
+                Profile(
+                    user_id=member.id,
+                    tenant_id=tenant.id,
+                    gender=Gender.FEMALE if i % 2 else Gender.MALE,
+                    status=ProfileStatus.ACTIVE,
+                    city="Chennai",
+                )
+            )
+        await db.commit()
+        token = create_access_token(admin.id, admin.tenant_id, admin.role.value)
+    return engine, session_factory, {"authorization": f"Bearer {token}"}
+
+
+def _build_app(session_factory: async_sessionmaker, bare: bool):
+    app = create_app()
+
+    async def _override_get_db():
+        async with session_factory() as session:
+            yield session
+            await session.commit()
+
+    app.dependency_overrides[get_db] = _override_get_db
+    if bare:
+        app.user_middleware = [m for m in app.user_middleware if m.cls in _KEEP_IN_BARE]
+    return app
+
+
+async def _call(app, path: str, headers: dict) -> int:
+    """Issue one GET straight through the ASGI interface; returns the status."""
+    scope = {
+        "type": "http",
+        "asgi": {"version": "3.0"},
+        "http_version": "1.1",
+        "method": "GET",
+        "scheme": "http",
+        "path": path,
+        "raw_path": path.encode(),
+        "root_path": "",
+        "query_string": b"",
+        "headers": [(k.encode(), v.encode()) for k, v in headers.items()],
+        "client": ("127.0.0.1", 50000),
+        "server": ("bench", 80),
+    }
+    status = 0
+    body_sent = False
+
+    async def receive() -> dict:
+        # Like a real server: one (empty) body message, then block until
+        # the client "disconnects" – which never happens here.
+        nonlocal body_sent
+        if body_sent:
+            await asyncio.Event().wait()
+        body_sent = True
+        return {"type": "http.request", "body": b"", "more_body": False}
+
+    async def send(message: dict) -> None:
+        nonlocal status
+        if message["type"] == "http.response.start":
+            status = message["status"]
+
+    await app(scope, receive, send)
+    return status
+
+
+async def _measure(app, path: str, headers: dict, n: int) -> list[float]:
+    for _ in range(50):  # warm-up (route compilation, caches, middleware stack build)
+        assert await _call(app, path, headers) == 200, path
+    samples = []
+    for _ in range(n):
+        start = time.perf_counter()
+        await _call(app, path, headers)
+        samples.append((time.perf_counter() - start) * 1_000_000)
+    return samples
+
+
+def _summary(samples: list[float]) -> str:
+    samples = sorted(samples)
+    p95 = samples[int(len(samples) * 0.95) - 1]
+    return f"mean {statistics.fmean(samples):8.1f} µs   p50 {statistics.median(samples):8.1f} µs   p95 {p95:8.1f} µs"
+
+
+async def main(n: int) -> None:
+    structlog.configure(logger_factory=structlog.PrintLoggerFactory(file=open(os.devnull, "w")))
+    limiter.enabled = False
+
+    engine, session_factory, auth = await _setup_db()
+    base_headers = {"host": "bench"}
+    targets = [
+        ("/health", base_headers),
+        ("/profiles/", {**base_headers, **auth}),
+    ]
+
+    print(f"{n} requests per case\n")
+    for path, headers in targets:
+        bare = await _measure(_build_app(session_factory, bare=True), path, headers, n)
+        full = await _measure(_build_app(session_factory, bare=False), path, headers, n)
+        print(f"GET {path}")
+        print(f"  bare   {_summary(bare)}")
+        print(f"  full   {_summary(full)}")
+        print(f"  middleware overhead (mean): {statistics.fmean(full) - statistics.fmean(bare):.1f} µs\n")
+
+    await engine.dispose()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--requests", type=int, default=3000)
+    asyncio.run(main(parser.parse_args().requests))
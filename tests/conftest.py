@@ -26,10 +26,17 @@ from sqlalchemy.ext.asyncio import (
 from sqlalchemy import JSON
 from sqlalchemy.dialects.postgresql import ARRAY, JSONB
 
+from app.auth.principal import principal_cache
 from app.database import Base, get_db
 from app.main import create_app
 from app.models.tenant import Tenant
 from app.models.user import User, UserRole
+from app.pagination import page_total_cache
+from app.services.tenant_registry import tenant_cache
+from app.services.interest_quota import plan_limit_cache
+from app.services.match_index import match_index_cache
+from app.services.s3 import presigned_get_cache
+from app.services.viewer_context import viewer_cache
 
 # ── Test DB – SQLite in-memory ─────────────────────────────────────────────────
 TEST_DATABASE_URL = "sqlite+aiosqlite:///:memory:"
@@ -79,6 +86,20 @@ async def db() -> AsyncGenerator[AsyncSession, None]:
         await session.rollback()
 
 
+# ── Per-process caches (cleared between tests) ───────────────────────────────
+@pytest.fixture(autouse=True)
+def clear_caches() -> Generator[None, None, None]:
+    """Each test rolls its rows back, so cached principals/tenants must go too."""
+    yield
+    principal_cache.clear()
+    tenant_cache.clear()
+    page_total_cache.clear()
+    viewer_cache.clear()
+    match_index_cache.clear()
+    plan_limit_cache.clear()
+    presigned_get_cache.clear()
+
+
 # ── FastAPI app with overridden DB dependency ──────────────────────────────────
 @pytest.fixture
 def app(db: AsyncSession) -> FastAPI:
@@ -0,0 +1,94 @@
+"""
+tests/test_audit_writer.py – Unit tests for the batched audit-log writer.
+
+The writer's sink is replaced with an in-memory collector, so these tests
+exercise batching, overflow policies and shutdown draining without a DB.
+"""
+
+import asyncio
+
+import pytest
+
+from app.services.audit_writer import AuditWriter
+
+
+def _writer(batches: list, **kwargs) -> AuditWriter:
+    async def _sink(rows):
+        batches.append(list(rows))
+
+    defaults = {
+        "batch_size": 10,
+        "flush_interval_ms": 50,
+        "max_queue_size": 100,
+        "overflow_policy": "drop_newest",
+        "block_timeout_ms": 10,
+        "sink": _sink,
+    }
+    defaults.update(kwargs)
+    return AuditWriter(**defaults)
+
+
+@pytest.mark.asyncio
+async def test_rows_are_flushed_in_batches():
+    batches: list = []
+    writer = _writer(batches)
+    writer.start()
+    for i in range(25):
+        await writer.submit({"action": f"post:/{i}"})
+    await asyncio.sleep(0.2)
+    await writer.stop()
+
+    assert sum(len(b) for b in batches) == 25
+    assert all(len(b) <= 10 for b in batches)
+    assert writer.stats()["written"] == 25
+
+
+@pytest.mark.asyncio
+async def test_drop_newest_when_queue_full():
+    batches: list = []
+    # Long interval + large batch size: nothing is flushed while we fill up
+    writer = _writer(batches, max_queue_size=5, batch_size=50, flush_interval_ms=10_000)
+    writer.start()
+    accepted = [await writer.submit({"action": str(i)}) for i in range(8)]
+    await writer.stop()
+
+    assert accepted == [True] * 5 + [False] * 3
+    assert writer.dropped == 3
+    assert [r["action"] for b in batches for r in b] == ["0", "1", "2", "3", "4"]
+
+
+@pytest.mark.asyncio
+async def test_drop_oldest_keeps_latest_rows():
+    batches: list = []
+    writer = _writer(
+        batches, max_queue_size=3, batch_size=50, flush_interval_ms=10_000,
+        overflow_policy="drop_oldest",
+    )
+    writer.start()
+    for i in range(5):
+        await writer.submit({"action": str(i)})
+    await writer.stop()
+
+    assert writer.dropped == 2
+    assert [r["action"] for b in batches for r in b] == ["2", "3", "4"]
+
+
+@pytest.mark.asyncio
+async def test_stop_drains_queue_and_survives_sink_errors():
+    calls = 0
+
+    async def _flaky_sink(rows):
+        nonlocal calls
+        calls += 1
+        if calls == 1:
+            raise RuntimeError("db down")
+
+    writer = _writer([], batch_size=2, flush_interval_ms=10_000, sink=_flaky_sink)
+    writer.start()
+    for i in range(4):
+        await writer.submit({"action": str(i)})
+    await writer.stop()
+
+    assert not writer.running
+    assert writer.failed == 2
+    assert writer.written == 2
@@ -2,7 +2,7 @@
 tests/test_auth.py – Integration tests for auth flows.
 
 Covers:
-  - Login (success + wrong password)
+  - Login (success + wrong password, bcrypt cost upgrade)
   - Refresh token rotation (DB-backed)
   - Logout (revoke refresh token)
   - Forgot password + reset password
@@ -12,6 +12,8 @@ Covers:
 import pytest
 from httpx import AsyncClient
 
+from app.auth.passwords import password_hasher
+
 
 # ── Login ──────────────────────────────────────────────────────────────────────
 @pytest.mark.asyncio
@@ -47,6 +49,22 @@ async def test_login_unknown_user(client: AsyncClient):
     assert resp.status_code == 401
 
 
+
+@pytest.mark.asyncio
+async def test_login_upgrades_outdated_hash_cost(client: AsyncClient, db, make_auth_user):
+    """Hashes made with a different bcrypt cost are replaced on successful login."""
+    user = await make_auth_user(email="rehash@test.com", password="Test@1234")
+    assert password_hasher.needs_rehash(user.hashed_password)  # fixtures hash at cost 4
+
+    resp = await client.post(
+        "/auth/login", json={"email": "rehash@test.com", "password": "Test@1234"}
+    )
+    assert resp.status_code == 200
+
+    await db.refresh(user)
+    assert not password_hasher.needs_rehash(user.hashed_password)
+    assert await password_hasher.verify("Test@1234", user.hashed_password)
+
 # ── Refresh ────────────────────────────────────────────────────────────────────
 @pytest.mark.asyncio
 async def test_refresh_token_rotation(client: AsyncClient, make_auth_user):
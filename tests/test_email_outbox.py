@@ -0,0 +1,125 @@
+"""
+tests/test_email_outbox.py – Transactional email outbox: enqueue, worker policy, admin API.
+"""
+
+import uuid
+
+import pytest
+from httpx import AsyncClient
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.auth.jwt import create_access_token
+from app.models.email_outbox import EmailOutbox, OutboxStatus
+from app.models.user import UserRole
+from app.services.email_outbox import ClaimedEmail, EmailOutboxWorker, TenantRateLimiter
+from tests.conftest import make_tenant, make_user
+
+
+def _auth_header(user) -> dict:
+    token = create_access_token(user.id, user.tenant_id, user.role.value)
+    return {"Authorization": f"Bearer {token}"}
+
+
+def _worker(**kwargs) -> EmailOutboxWorker:
+    defaults = {
+        "batch_size": 10,
+        "concurrency": 2,
+        "poll_interval_seconds": 1,
+        "lease_seconds": 60,
+        "max_attempts": 3,
+        "backoff_base_seconds": 30,
+        "backoff_max_seconds": 600,
+        "tenant_rate_per_minute": 60,
+    }
+    defaults.update(kwargs)
+    return EmailOutboxWorker(**defaults)
+
+
+def test_tenant_rate_limiter_defers_only_the_busy_tenant():
+    now = [0.0]
+    limiter = TenantRateLimiter(rate_per_minute=2, clock=lambda: now[0])
+    busy, quiet = uuid.uuid4(), uuid.uuid4()
+
+    assert [limiter.acquire(busy) for _ in range(2)] == [0.0, 0.0]
+    assert limiter.acquire(busy) == pytest.approx(30.0)
+    assert limiter.acquire(quiet) == 0.0
+    assert limiter.acquire(None) == 0.0   # platform mail is not limited
+
+    now[0] = 30.0                          # one token refilled
+    assert limiter.acquire(busy) == 0.0
+
+
+def test_backoff_doubles_up_to_the_cap():
+    worker = _worker()
+    assert [worker.backoff(n).total_seconds() for n in (1, 2, 3, 5, 10)] == [30, 60, 120, 480, 600]
+
+
+@pytest.mark.asyncio
+async def test_deliver_reports_each_failure():
+    sent: list = []
+
+    async def _sender(kind, to_email, payload):
+        if to_email == "bounce@example.com":
+            raise ConnectionError("refused")
+        sent.append((kind, to_email, payload))
+
+    worker = _worker(sender=_sender)
+    batch = [
+        ClaimedEmail(uuid.uuid4(), "welcome", "ok@example.com", {"full_name": "A"}, 1),
+        ClaimedEmail(uuid.uuid4(), "welcome", "bounce@example.com", {"full_name": "B"}, 1),
+        ClaimedEmail(uuid.uuid4(), "no_such_template", "ok@example.com", {}, 1),
+    ]
+    results = await worker.deliver(batch)
+
+    assert results[0] is None
+    assert results[1] == "ConnectionError: refused"
+    assert results[2].startswith("Unknown email kind")
+    assert sent == [("welcome", "ok@example.com", {"full_name": "A"})]
+
+
+@pytest.mark.asyncio
+async def test_bulk_invites_are_queued_and_listed_per_tenant(client: AsyncClient, db: AsyncSession):
+    tenant = await make_tenant(db, slug="outbox-tenant")
+    admin = await make_user(db, tenant=tenant, role=UserRole.ADMIN)
+    other_admin = await make_user(db, tenant=await make_tenant(db, slug="outbox-other"), role=UserRole.ADMIN)
+
+    csv_body = (
+        "full_name,email\n"
+        "Meena Raj,meena@example.com\n"
+        "Karthik S,karthik@example.com\n"
+    )
+    response = await client.post(
+        "/users/onboard/bulk",
+        files={"file": ("members.csv", csv_body.encode(), "text/csv")},
+        headers=_auth_header(admin),
+    )
+    assert response.status_code == 200
+
+    rows = (await db.scalars(
+        select(EmailOutbox).where(EmailOutbox.tenant_id == tenant.id).order_by(EmailOutbox.to_email)
+    )).all()
+    assert [(r.kind, r.to_email, r.status) for r in rows] == [
+        ("member_invite", "karthik@example.com", OutboxStatus.PENDING),
+        ("member_invite", "meena@example.com", OutboxStatus.PENDING),
+    ]
+    assert rows[1].payload["full_name"] == "Meena Raj" and rows[1].payload["temp_password"]
+
+    body = (await client.get("/admin/email-outbox/", headers=_auth_header(admin))).json()
+    assert body["total"] == 2 and body["counts"] == {"pending": 2}
+    assert "payload" not in body["items"][0]
+
+    body = (await client.get("/admin/email-outbox/", headers=_auth_header(other_admin))).json()
+    assert body["total"] == 0
+
+    # A dead-lettered message can be requeued by its tenant's admin only
+    rows[0].status = OutboxStatus.DEAD
+    rows[0].attempts = 3
+    rows[0].last_error = "SMTPRecipientsRefused"
+    await db.flush()
+
+    resp = await client.post(f"/admin/email-outbox/{rows[0].id}/retry", headers=_auth_header(other_admin))
+    assert resp.status_code == 404
+    resp = await client.post(f"/admin/email-outbox/{rows[0].id}/retry", headers=_auth_header(admin))
+    assert resp.status_code == 200
+    assert (resp.json()["status"], resp.json()["attempts"]) == ("pending", 0)
@@ -0,0 +1,32 @@
+"""
+tests/test_email_templates.py – Precompiled email templates.
+"""
+
+from app.config import get_settings
+from app.services.email_templates import get_templates
+
+
+def test_render_fills_fields_and_escapes_user_input():
+    template = get_templates()["member_invite"]
+    assert template.fields == {"to_email", "temp_password", "full_name"}
+
+    subject, html = template.render(
+        to_email="asha@example.com", temp_password="Tmp-123", full_name="<b>Asha</b> & co"
+    )
+    assert subject == "You're invited to Varanbook"
+    assert "Tmp-123" in html and "asha@example.com" in html
+    assert "&lt;b&gt;Asha&lt;/b&gt; &amp; co" in html and "<b>Asha</b>" not in html
+    assert f"{get_settings().APP_FRONTEND_URL}/login" in html
+    assert "{" not in html   # every placeholder was filled
+
+
+def test_render_many_matches_render():
+    template = get_templates()["subscription_expiry_warning"]
+    rows = [
+        {"full_name": f"Member {i}", "plan_name": "Bloom", "expires_on": "01 Jan 2027"}
+        for i in range(3)
+    ]
+    batch = template.render_many(rows)
+    assert batch == [template.render(**row) for row in rows]
+    assert batch[1].subject == "Your Bloom membership expires in 3 days"
+    assert "Member 1" in batch[1].html
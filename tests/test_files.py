@@ -0,0 +1,107 @@
+"""
+tests/test_files.py – Presigned GET URLs for displaying private S3 objects.
+
+The boto3 client is replaced with a fake signer that counts calls, so the
+tests cover URL reuse without AWS credentials.
+"""
+
+import pytest
+from httpx import AsyncClient
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.auth.jwt import create_access_token
+from tests.conftest import make_tenant, make_user
+
+
+class FakeSigner:
+    def __init__(self) -> None:
+        self.signed: list[str] = []
+
+    def generate_presigned_url(self, method: str, Params: dict, ExpiresIn: int, HttpMethod: str) -> str:
+        self.signed.append(Params["Key"])
+        return f"https://s3.example.com/{Params['Key']}?sig={len(self.signed)}&ttl={ExpiresIn}"
+
+
+def _auth_header(user) -> dict:
+    token = create_access_token(user.id, user.tenant_id, user.role.value)
+    return {"Authorization": f"Bearer {token}"}
+
+
+@pytest.fixture
+def signer(monkeypatch) -> FakeSigner:
+    fake = FakeSigner()
+    monkeypatch.setattr("app.services.s3._s3_client", fake)
+    return fake
+
+
+@pytest.mark.asyncio
+async def test_presigned_get_reuses_url_until_margin(
+    client: AsyncClient, db: AsyncSession, signer: FakeSigner
+):
+    from app.services.s3 import presigned_get_cache
+
+    user = await make_user(db, tenant=await make_tenant(db))
+    first = (await client.get("/files/presign-get?key=a.jpg", headers=_auth_header(user))).json()
+    second = (await client.get("/files/presign-get?key=a.jpg", headers=_auth_header(user))).json()
+
+    assert first["url"] == second["url"]
+    assert first["expires_in"] == 900 and 0 < second["expires_in"] <= 900
+    assert signer.signed == ["a.jpg"]
+
+    # Once inside the safety margin the entry is gone and the key is re-signed
+    for key, (_, value) in presigned_get_cache._data.items():
+        presigned_get_cache._data[key] = (0.0, value)
+    third = (await client.get("/files/presign-get?key=a.jpg", headers=_auth_header(user))).json()
+    assert third["url"] != first["url"]
+    assert signer.signed == ["a.jpg", "a.jpg"]
+
+
+@pytest.mark.asyncio
+async def test_batch_presign_signs_each_distinct_key_once(
+    client: AsyncClient, db: AsyncSession, signer: FakeSigner
+):
+    user = await make_user(db, tenant=await make_tenant(db))
+    await client.get("/files/presign-get?key=b.jpg", headers=_auth_header(user))
+
+    response = await client.post(
+        "/files/presign-get",
+        json={"keys": ["a.jpg", "b.jpg", "c.jpg", "a.jpg"]},
+        headers=_auth_header(user),
+    )
+    assert response.status_code == 200
+    urls = response.json()["urls"]
+    assert list(urls) == ["a.jpg", "b.jpg", "c.jpg"]
+    assert signer.signed == ["b.jpg", "a.jpg", "c.jpg"]
+
+    response = await client.post("/files/presign-get", json={"keys": []}, headers=_auth_header(user))
+    assert response.status_code == 422
+
+
+@pytest.mark.asyncio
+async def test_profile_list_embeds_visible_photo_urls(
+    client: AsyncClient, db: AsyncSession, signer: FakeSigner
+):
+    from app.models.profile import Gender, Profile, ProfileStatus
+
+    tenant = await make_tenant(db, slug="media-urls")
+    viewer = await make_user(db, tenant=tenant)
+    db.add(Profile(user_id=viewer.id, tenant_id=tenant.id, gender=Gender.MALE,
+                   status=ProfileStatus.ACTIVE))
+    for name, visible in (("shown", True), ("hidden", False)):
+        other = await make_user(db, tenant=tenant, full_name=name)
+        db.add(Profile(user_id=other.id, tenant_id=tenant.id, gender=Gender.FEMALE,
+                       status=ProfileStatus.ACTIVE, photo_visible=visible,
+                       photo_keys=[f"{name}-1.jpg", f"{name}-2.jpg"]))
+    await db.flush()
+
+    plain = (await client.get("/profiles/", headers=_auth_header(viewer))).json()
+    assert all(item["photo_url"] is None for item in plain["items"])
+    assert signer.signed == []
+
+    body = (await client.get(
+        "/profiles/?include_media_urls=true", headers=_auth_header(viewer)
+    )).json()
+    urls = {item["full_name"]: item["photo_url"] for item in body["items"]}
+    assert urls["shown"].startswith("https://s3.example.com/shown-1.jpg")
+    assert urls["hidden"] is None
+    assert signer.signed == ["shown-1.jpg"]
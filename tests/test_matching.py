@@ -0,0 +1,159 @@
+"""
+tests/test_matching.py – Partner-preference scoring and the /profiles/matches feed.
+"""
+
+import uuid
+from datetime import date
+from types import SimpleNamespace
+
+import pytest
+from httpx import AsyncClient
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.auth.jwt import create_access_token
+from app.cache import MISSING
+from app.models.partner_preference import PartnerPreference
+from app.models.profile import Gender, Profile, ProfileStatus
+from app.models.user import UserRole
+from app.services.match_index import match_index_cache
+from app.services.matching import PreferenceScorer, features_from_row, rank
+from tests.conftest import make_tenant, make_user
+
+_PREF_FIELDS = (
+    "age_min", "age_max", "height_min_cm", "height_max_cm", "weight_min_kg",
+    "weight_max_kg", "qualifications", "income_ranges", "current_locations",
+    "native_locations", "dhosam", "rashi", "star", "castes", "religions",
+    "marital_statuses",
+)
+
+
+def _pref(**values) -> SimpleNamespace:
+    return SimpleNamespace(**{f: values.get(f) for f in _PREF_FIELDS})
+
+
+def _features(**values):
+    row = {
+        "id": uuid.uuid4(), "created_at": None, "date_of_birth": None,
+        "height_cm": None, "weight_kg": None, "marital_status": None,
+        "religion": None, "caste": None, "qualification": None,
+        "income_range": None, "rashi": None, "star": None, "dhosam": None,
+        "city": None, "current_location": None, "native_place": None,
+    }
+    row.update(values)
+    return features_from_row(SimpleNamespace(**row), today=date(2026, 1, 1))
+
+
+def test_scorer_weights_matches_and_gives_half_credit_for_unknowns():
+    scorer = PreferenceScorer(_pref(age_min=25, age_max=30, castes=["Iyer"]))
+
+    full, matched = scorer.score(_features(date_of_birth=date(1998, 6, 1), caste="iyer"))
+    assert (full, sorted(matched)) == (100.0, ["age", "caste"])
+
+    partial, _ = scorer.score(_features(date_of_birth=date(1998, 6, 1)))
+    # age (3) matched, caste (2) unknown → 3 + 1 of 5
+    assert partial == 80.0
+
+    miss, _ = scorer.score(_features(date_of_birth=date(1980, 1, 1), caste="Nair"))
+    assert miss == 0.0
+
+
+def test_rank_returns_top_k_and_reciprocal_penalises_one_sided_fit():
+    viewer = _features(date_of_birth=date(1994, 1, 1))
+    scorer = PreferenceScorer(_pref(religions=["Hindu"]))
+    likes_viewer = _features(religion="Hindu")
+    dislikes_viewer = _features(religion="Hindu")
+    other = _features()  # religion unknown → half credit
+    candidates = [
+        (likes_viewer, PreferenceScorer(_pref(age_min=25))),
+        (dislikes_viewer, PreferenceScorer(_pref(age_max=25))),
+        (other, None),
+    ]
+
+    top = rank(candidates, viewer, scorer, limit=2)
+    assert {m.profile_id for m in top} == {likes_viewer.profile_id, dislikes_viewer.profile_id}
+
+    top = rank(candidates, viewer, scorer, limit=3, reciprocal=True)
+    assert [m.profile_id for m in top] == [
+        likes_viewer.profile_id, other.profile_id, dislikes_viewer.profile_id,
+    ]
+    assert top[0].score == 100.0 and top[-1].score == 0.0
+
+
+@pytest.mark.asyncio
+async def test_matches_endpoint_ranks_by_preferences(client: AsyncClient, db: AsyncSession):
+    tenant = await make_tenant(db, slug="matches")
+    viewer = await make_user(db, tenant=tenant, email="seeker@example.com")
+    own = Profile(user_id=viewer.id, tenant_id=tenant.id, gender=Gender.MALE,
+                  status=ProfileStatus.ACTIVE)
+    db.add(own)
+    await db.flush()
+    db.add(PartnerPreference(profile_id=own.id, tenant_id=tenant.id, religions=["Hindu"],
+                             castes=["Iyer"]))
+
+    expected = []
+    for i, (religion, caste) in enumerate([("Hindu", "Iyer"), ("Hindu", "Nair"), ("Jain", None)]):
+        user = await make_user(db, tenant=tenant, email=f"cand{i}@example.com")
+        profile = Profile(user_id=user.id, tenant_id=tenant.id, gender=Gender.FEMALE,
+                          religion=religion, caste=caste, status=ProfileStatus.ACTIVE)
+        db.add(profile)
+        await db.flush()
+        expected.append(str(profile.id))
+    # Same gender → never a candidate
+    same = await make_user(db, tenant=tenant, email="same@example.com")
+    db.add(Profile(user_id=same.id, tenant_id=tenant.id, gender=Gender.MALE,
+                   religion="Hindu", caste="Iyer", status=ProfileStatus.ACTIVE))
+    await db.flush()
+
+    token = create_access_token(viewer.id, viewer.tenant_id, viewer.role.value)
+    resp = await client.get(
+        "/profiles/matches", params={"limit": 5}, headers={"Authorization": f"Bearer {token}"}
+    )
+    assert resp.status_code == 200
+    items = resp.json()["items"]
+    assert [i["profile"]["id"] for i in items] == expected
+    assert [i["score"] for i in items] == [100.0, 50.0, 25.0]
+    assert sorted(items[0]["matched"]) == ["caste", "religion"]
+
+
+@pytest.mark.asyncio
+async def test_match_index_is_refreshed_by_profile_and_preference_writes(
+    client: AsyncClient, db: AsyncSession
+):
+    tenant = await make_tenant(db, slug="match-index")
+    admin = await make_user(db, tenant=tenant, role=UserRole.ADMIN, email="mi-admin@example.com")
+    viewer = await make_user(db, tenant=tenant, email="mi-seeker@example.com")
+    own = Profile(user_id=viewer.id, tenant_id=tenant.id, gender=Gender.MALE,
+                  status=ProfileStatus.ACTIVE)
+    cand_user = await make_user(db, tenant=tenant, email="mi-cand@example.com")
+    cand = Profile(user_id=cand_user.id, tenant_id=tenant.id, gender=Gender.FEMALE,
+                   religion="Jain", status=ProfileStatus.ACTIVE)
+    db.add_all([own, cand])
+    await db.flush()
+
+    def _headers(user) -> dict:
+        token = create_access_token(user.id, user.tenant_id, user.role.value)
+        return {"Authorization": f"Bearer {token}"}
+
+    async def _feed(user) -> list:
+        resp = await client.get("/profiles/matches", headers=_headers(user))
+        assert resp.status_code == 200
+        return resp.json()["items"]
+
+    assert [i["score"] for i in await _feed(viewer)] == [0.0]   # index built here
+    assert match_index_cache.get(tenant.id) is not MISSING
+
+    resp = await client.put(
+        f"/profiles/{own.id}/preferences", json={"religions": ["Hindu"]}, headers=_headers(viewer)
+    )
+    assert resp.status_code == 200
+    resp = await client.patch(
+        f"/profiles/{cand.id}", json={"religion": "Hindu"}, headers=_headers(admin)
+    )
+    assert resp.status_code == 200
+    assert [i["score"] for i in await _feed(viewer)] == [100.0]
+
+    resp = await client.patch(
+        f"/profiles/{cand.id}/status", json={"status": "suspended"}, headers=_headers(admin)
+    )
+    assert resp.status_code == 200
+    assert await _feed(viewer) == []
@@ -0,0 +1,155 @@
+"""
+tests/test_notification_broadcast.py – Concurrent SQS fan-out and broadcast jobs.
+
+FakeSQS stands in for the aiobotocore client: it records every accepted
+message, can report entries as Failed, can "crash" mid-broadcast, and
+tracks how many send_message_batch calls overlap.
+"""
+
+import asyncio
+import json
+import uuid
+
+import pytest
+from httpx import AsyncClient
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.auth.jwt import create_access_token
+from app.models.user import UserRole
+from app.services.notification import AsyncNotificationService
+from tests.conftest import make_tenant, make_user
+
+
+class FakeSQS:
+    def __init__(
+        self,
+        fail_once: set[str] = frozenset(),
+        sender_fault: set[str] = frozenset(),
+        crash_after_calls: int | None = None,
+    ) -> None:
+        self.fail_once = set(fail_once)         # fcm tokens rejected on first attempt
+        self.sender_fault = set(sender_fault)   # fcm tokens always rejected
+        self.crash_after_calls = crash_after_calls
+        self.accepted: list[dict] = []
+        self.calls = 0
+        self.in_flight = 0
+        self.max_in_flight = 0
+
+    async def __aenter__(self) -> "FakeSQS":
+        return self
+
+    async def __aexit__(self, *exc) -> None:
+        pass
+
+    async def send_message_batch(self, QueueUrl: str, Entries: list[dict]) -> dict:
+        assert len(Entries) <= 10
+        if self.calls == self.crash_after_calls:
+            raise RuntimeError("worker died")
+        self.calls += 1
+        self.in_flight += 1
+        self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        await asyncio.sleep(0.01)
+        self.in_flight -= 1
+
+        successful, failed = [], []
+        for entry in Entries:
+            token = json.loads(entry["MessageBody"])["fcm_token"]
+            if token in self.sender_fault:
+                failed.append({"Id": entry["Id"], "SenderFault": True, "Code": "InvalidMessageContents"})
+            elif token in self.fail_once:
+                self.fail_once.discard(token)
+                failed.append({"Id": entry["Id"], "SenderFault": False, "Code": "InternalError"})
+            else:
+                self.accepted.append(json.loads(entry["MessageBody"]))
+                successful.append({"Id": entry["Id"], "MessageId": str(uuid.uuid4())})
+        return {"Successful": successful, "Failed": failed}
+
+
+async def _chunks(total: int, size: int):
+    for start in range(0, total, size):
+        yield [(uuid.uuid4(), f"token-{i}") for i in range(start, min(start + size, total))]
+
+
+def _service(sqs: FakeSQS, **kwargs) -> AsyncNotificationService:
+    return AsyncNotificationService(
+        queue_url="http://sqs.local/queue", retry_backoff_seconds=0,
+        client_factory=lambda: sqs, **kwargs,
+    )
+
+
+@pytest.mark.asyncio
+async def test_broadcast_sends_batches_concurrently_within_bound():
+    sqs = FakeSQS()
+    summary = await _service(sqs, concurrency=3).broadcast(_chunks(95, 25), "Hello", "News")
+
+    assert (summary.recipients, summary.queued, summary.failed) == (95, 95, 0)
+    assert summary.batches == sqs.calls == 11          # 25-row chunks → 3 + 3 + 3 + 2 batches
+    assert 1 < sqs.max_in_flight <= 3
+    assert sorted(m["fcm_token"] for m in sqs.accepted) == sorted(f"token-{i}" for i in range(95))
+
+
+@pytest.mark.asyncio
+async def test_only_failed_entries_are_retried():
+    sqs = FakeSQS(fail_once={"token-2", "token-13"}, sender_fault={"token-7"})
+    summary = await _service(sqs).broadcast(_chunks(20, 20), "Hello", "News")
+
+    assert (summary.queued, summary.failed, summary.retried) == (19, 1, 2)
+    assert summary.errors == {"InvalidMessageContents": 1}
+    assert sqs.calls == 4                              # 2 batches + 1 retry each
+    tokens = [m["fcm_token"] for m in sqs.accepted]
+    assert len(tokens) == len(set(tokens)) == 19
+
+
+# ── Broadcast jobs (/notifications/broadcast) ─────────────────────────────────
+def _auth_header(user) -> dict:
+    token = create_access_token(user.id, user.tenant_id, user.role.value)
+    return {"Authorization": f"Bearer {token}"}
+
+
+@pytest.mark.asyncio
+async def test_broadcast_job_resumes_after_crash_without_duplicates(
+    client: AsyncClient, db: AsyncSession, monkeypatch
+):
+    from app.models.broadcast_job import BroadcastJob
+    from app.services.broadcast_jobs import broadcast_job_runner, process_job
+
+    tenant = await make_tenant(db, slug="broadcast-tenant")
+    other = await make_tenant(db, slug="broadcast-other")
+    admin = await make_user(db, tenant=tenant, role=UserRole.ADMIN)
+    other_admin = await make_user(db, tenant=other, role=UserRole.ADMIN)
+    for i in range(5):
+        await make_user(db, tenant=tenant, fcm_token=f"member-{i}")
+    await make_user(db, tenant=tenant, fcm_token="inactive", is_active=False)
+    await make_user(db, tenant=tenant)   # no device registered
+
+    first = FakeSQS(crash_after_calls=1)
+    monkeypatch.setattr(broadcast_job_runner, "service", _service(first))
+    response = await client.post(
+        "/notifications/broadcast?title=Diwali&body=Office%20closed", headers=_auth_header(admin)
+    )
+    assert response.status_code == 202
+    assert response.json()["status"] == "queued"
+    job_id = response.json()["id"]
+
+    # Run the job in the test session; commits become flushes so the
+    # per-test rollback still cleans up. The runner "dies" on page two.
+    monkeypatch.setattr(db, "commit", db.flush)
+    job = await db.get(BroadcastJob, uuid.UUID(job_id))
+    with pytest.raises(RuntimeError):
+        await process_job(db, job, 2, _service(first))
+
+    body = (await client.get(f"/notifications/broadcast/{job_id}", headers=_auth_header(admin))).json()
+    assert (body["total_recipients"], body["processed_count"], body["sent_count"]) == (5, 2, 2)
+
+    second = FakeSQS()
+    await process_job(db, job, 2, _service(second))
+
+    body = (await client.get(f"/notifications/broadcast/{job_id}", headers=_auth_header(admin))).json()
+    assert body["status"] == "completed"
+    assert (body["processed_count"], body["sent_count"], body["failed_count"]) == (5, 5, 0)
+    tokens = [m["fcm_token"] for m in first.accepted + second.accepted]
+    assert sorted(tokens) == [f"member-{i}" for i in range(5)]
+    assert {m["data"]["broadcast_id"] for m in first.accepted + second.accepted} == {job_id}
+
+    response = await client.get(f"/notifications/broadcast/{job_id}", headers=_auth_header(other_admin))
+    assert response.status_code == 404
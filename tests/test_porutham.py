@@ -0,0 +1,113 @@
+"""
+tests/test_porutham.py – Horoscope compatibility tables, bulk scorer and browse filter.
+"""
+
+from types import SimpleNamespace
+
+import pytest
+from httpx import AsyncClient
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.auth.jwt import create_access_token
+from app.models.profile import Gender, Profile, ProfileStatus, Star
+from app.services.porutham import (
+    MAX_SCORE,
+    STAR_MATRIX,
+    porutham,
+    score_candidates,
+)
+from tests.conftest import make_tenant, make_user
+
+
+def _auth_header(user) -> dict:
+    token = create_access_token(user.id, user.tenant_id, user.role.value)
+    return {"Authorization": f"Bearer {token}"}
+
+
+def test_known_pairs_and_rajju_dosham():
+    result = porutham(Star.ASHWINI, None, Star.BHARANI, None)
+    assert result.score == 7 and result.rajju
+    assert "vedhai" in result.matched
+
+    # Ashwini and Jyeshtha are a vedhai pair; both in pada rajju
+    result = porutham("ashwini", None, "jyeshtha", None)
+    assert not result.rajju
+    assert "vedhai" not in result.matched and "rajju" not in result.matched
+
+    assert porutham(None, None, Star.REVATI, None) is None
+
+
+def test_matrix_is_complete_and_direction_matters():
+    assert len(STAR_MATRIX) == 27 and all(len(row) == 27 for row in STAR_MATRIX)
+    assert all(0 <= porutham(b, None, g, None).score <= MAX_SCORE for b in Star for g in Star)
+    # Counted from the bride's star, so swapping sides changes the result
+    assert porutham("ashwini", None, "bharani", None) != porutham("bharani", None, "ashwini", None)
+
+
+def test_score_candidates_matches_pairwise_scores():
+    groom = SimpleNamespace(star="ashwini", rashi=None, gender="male")
+    candidates = [
+        SimpleNamespace(id=i, star=s.value, rashi=None) for i, s in enumerate(Star)
+    ] + [SimpleNamespace(id="no-star", star=None, rashi=None)]
+
+    scores = score_candidates(groom, candidates)
+    for i, star in enumerate(Star):
+        assert scores[i] == porutham(star, None, "ashwini", None)
+    assert scores["no-star"] is None
+
+
+async def _seed(db: AsyncSession):
+    tenant = await make_tenant(db, slug="porutham")
+    bride = await make_user(db, tenant=tenant, email="bride@example.com")
+    own = Profile(user_id=bride.id, tenant_id=tenant.id, gender=Gender.FEMALE,
+                  star=Star.ASHWINI, status=ProfileStatus.ACTIVE)
+    db.add(own)
+    grooms = {}
+    for star in (Star.BHARANI, Star.MAGHA, Star.JYESHTHA, None):
+        user = await make_user(db, tenant=tenant)
+        profile = Profile(user_id=user.id, tenant_id=tenant.id, gender=Gender.MALE,
+                          star=star, status=ProfileStatus.ACTIVE)
+        db.add(profile)
+        grooms[star] = profile
+    await db.flush()
+    return bride, own, grooms
+
+
+@pytest.mark.asyncio
+async def test_porutham_endpoint_scores_candidate_page(client: AsyncClient, db: AsyncSession):
+    bride, own, grooms = await _seed(db)
+    ids = [str(grooms[s].id) for s in (Star.MAGHA, None, Star.BHARANI)]
+
+    resp = await client.get(
+        f"/profiles/{own.id}/porutham",
+        params={"candidate_ids": ids},
+        headers=_auth_header(bride),
+    )
+    assert resp.status_code == 200
+    items = resp.json()["items"]
+    assert [i["profile_id"] for i in items] == ids
+    assert [i["score"] for i in items] == [6, None, 7]
+    assert items[2]["rajju"] is True and items[2]["max_score"] == MAX_SCORE
+
+
+@pytest.mark.asyncio
+async def test_list_profiles_filters_and_sorts_by_porutham(client: AsyncClient, db: AsyncSession):
+    bride, _, grooms = await _seed(db)
+
+    resp = await client.get(
+        "/profiles/",
+        params={"min_porutham": 6, "sort": "porutham"},
+        headers=_auth_header(bride),
+    )
+    assert resp.status_code == 200
+    body = resp.json()
+    assert body["total"] == 2
+    assert [i["id"] for i in body["items"]] == [
+        str(grooms[Star.BHARANI].id), str(grooms[Star.MAGHA].id),
+    ]
+    assert [i["porutham_score"] for i in body["items"]] == [7, 6]
+
+    resp = await client.get(
+        "/profiles/", params={"sort": "porutham", "cursor": ""}, headers=_auth_header(bride)
+    )
+    assert resp.status_code == 400
@@ -408,3 +408,73 @@ async def test_accepted_connection_allows_access_regardless_of_profile_status(
     resp = await client.get(f"/profiles/{profile_b_id}", headers=headers_a)
     assert resp.status_code == 200
     assert resp.json()["connection_status"] == "accepted"
+
+
+# ── Keyset pagination (GET /profiles/?cursor=) ────────────────────────────────
+@pytest.mark.asyncio
+async def test_list_profiles_cursor_mode_walks_every_row_once(
+    client: AsyncClient, db: AsyncSession
+):
+    tenant = await make_tenant(db, slug="cursor-tenant")
+    admin = await make_user(db, tenant=tenant, role=UserRole.ADMIN)
+    expected = set()
+    for i in range(5):
+        member = await make_user(db, tenant=tenant, email=f"cursor{i}@example.com")
+        profile = Profile(user_id=member.id, tenant_id=tenant.id, status=ProfileStatus.ACTIVE)
+        db.add(profile)
+        await db.flush()
+        expected.add(str(profile.id))
+
+    seen: list[str] = []
+    cursor = ""
+    while True:
+        resp = await client.get(
+            "/profiles/", params={"cursor": cursor, "size": 2}, headers=_auth_header(admin)
+        )
+        assert resp.status_code == 200
+        body = resp.json()
+        assert body["total"] is None  # not requested in cursor mode
+        seen += [p["id"] for p in body["items"]]
+        if body["next_cursor"] is None:
+            break
+        cursor = body["next_cursor"]
+
+    assert len(seen) == 5 and set(seen) == expected
+
+    resp = await client.get(
+        "/profiles/", params={"cursor": "", "size": 2, "count": "exact"},
+        headers=_auth_header(admin),
+    )
+    assert resp.json()["total"] == 5
+
+    resp = await client.get("/profiles/", params={"cursor": "not-a-cursor"}, headers=_auth_header(admin))
+    assert resp.status_code == 400
+
+
+# ── Viewer context (caste lock / gender filter) ───────────────────────────────
+@pytest.mark.asyncio
+async def test_member_browse_uses_cached_viewer_context(client: AsyncClient, db: AsyncSession):
+    from app.models.profile import Gender
+    from app.services.viewer_context import viewer_cache
+
+    tenant = await make_tenant(db, slug="viewer-ctx", caste_locked=True)
+    viewer = await make_user(db, tenant=tenant, email="viewer@example.com")
+    db.add(Profile(user_id=viewer.id, tenant_id=tenant.id, gender=Gender.MALE,
+                   caste="Iyer", status=ProfileStatus.ACTIVE))
+    for i, caste in enumerate(["Iyer", "Iyengar"]):
+        other = await make_user(db, tenant=tenant, email=f"ctx{i}@example.com")
+        db.add(Profile(user_id=other.id, tenant_id=tenant.id, gender=Gender.FEMALE,
+                       caste=caste, status=ProfileStatus.ACTIVE))
+    await db.flush()
+
+    resp = await client.get("/profiles/", headers=_auth_header(viewer))
+    assert [p["caste"] for p in resp.json()["items"]] == ["Iyer"]
+    hits = viewer_cache.hits
+    await client.get("/profiles/", headers=_auth_header(viewer))
+    assert viewer_cache.hits == hits + 1
+
+    # Changing one's own caste drops the cached context
+    resp = await client.patch("/profiles/me", json={"caste": "Iyengar"}, headers=_auth_header(viewer))
+    assert resp.status_code == 200
+    resp = await client.get("/profiles/", headers=_auth_header(viewer))
+    assert [p["caste"] for p in resp.json()["items"]] == ["Iyengar"]
@@ -0,0 +1,99 @@
+"""
+tests/test_scheduler.py – Leader election and cadence of the periodic job scheduler.
+
+Leadership and run history are replaced with in-memory fakes, so these
+tests exercise scheduling decisions without Postgres advisory locks.
+"""
+
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+from app.services.scheduler import ScheduledJob, Scheduler
+
+
+class FakeLock:
+    """One lock shared by several schedulers; the first to acquire it leads."""
+
+    def __init__(self, shared: dict) -> None:
+        self.shared = shared
+
+    async def acquire(self) -> bool:
+        if self.shared.get("holder") in (None, self):
+            self.shared["holder"] = self
+            return True
+        return False
+
+    async def release(self) -> None:
+        if self.shared.get("holder") is self:
+            self.shared["holder"] = None
+
+
+class MemoryScheduler(Scheduler):
+    def __init__(self, history: list, **kwargs) -> None:
+        super().__init__(tick_seconds=1, jitter_seconds=0, **kwargs)
+        self.history = history
+
+    async def load_history(self) -> dict:
+        last: dict = {}
+        for run in self.history:
+            last[run.job] = max(last.get(run.job, run.started_at), run.started_at)
+        return last
+
+    async def record(self, run) -> None:
+        self.history.append(run)
+
+
+def _counting_job(name: str, calls: list, interval: float = 3600, **kwargs) -> ScheduledJob:
+    async def _func() -> int:
+        calls.append(name)
+        return 3
+
+    return ScheduledJob(name, interval, _func, **kwargs)
+
+
+@pytest.mark.asyncio
+async def test_only_the_leader_runs_jobs_once_per_interval():
+    shared, history, calls = {}, [], []
+    workers = [MemoryScheduler(history, lock=FakeLock(shared)) for _ in range(4)]
+    for worker in workers:
+        worker.register(_counting_job("sweep", calls))
+
+    for _ in range(3):
+        for worker in workers:
+            await worker.tick()
+
+    assert calls == ["sweep"]
+    assert [w.is_leader for w in workers] == [True, False, False, False]
+    assert [(r.job, r.status, r.affected, r.trigger) for r in history] == [
+        ("sweep", "succeeded", 3, "schedule")
+    ]
+
+    # Leader goes away: the next worker takes over but respects the cadence
+    await workers[0].lock.release()
+    await workers[1].tick()
+    assert workers[1].is_leader and calls == ["sweep"]
+    assert workers[1].stats()["jobs"]["sweep"]["next_due"] is not None
+
+
+@pytest.mark.asyncio
+async def test_overdue_job_runs_on_election_and_failures_are_recorded():
+    history, calls = [], []
+    stale = datetime.now(timezone.utc) - timedelta(hours=2)
+    worker = MemoryScheduler(history, lock=FakeLock({}))
+    worker.register(_counting_job("sweep", calls))
+    worker.register(_counting_job("later", calls, run_on_start=False))
+
+    async def _boom() -> int:
+        raise RuntimeError("db down")
+
+    worker.register(ScheduledJob("broken", 60, _boom))
+    history.append(type("Run", (), {"job": "sweep", "started_at": stale})())
+
+    await worker.tick()
+
+    assert calls == ["sweep"]                 # overdue → ran; run_on_start=False → waits
+    stats = worker.stats()["jobs"]
+    assert stats["broken"]["failures"] == 1
+    assert stats["broken"]["last_error"] == "RuntimeError: db down"
+    assert history[-1].status == "failed"
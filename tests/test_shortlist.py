@@ -8,14 +8,20 @@ Covers:
   - Accept / reject by recipient
   - Withdraw by sender
   - Foreign tenant isolation
+  - Shortlist state on browse pages
+  - Interest quota counter
 """
 
+from datetime import datetime, timedelta, timezone
+
 import pytest
 from httpx import AsyncClient
+from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.auth.jwt import create_access_token
-from app.models.user import UserRole
+from app.models.membership_plan import MemberSubscription, MembershipPlanTemplate
+from app.models.user import User, UserRole
 from tests.conftest import make_tenant, make_user
 
 
@@ -179,3 +185,90 @@ async def test_withdraw_shortlist(client: AsyncClient, db: AsyncSession):
 
     sent = await client.get("/shortlists/sent", headers=headers_a)
     assert all(i["id"] != sl_id for i in sent.json()["items"])
+
+
+@pytest.mark.asyncio
+async def test_received_interests_cursor_pagination(client: AsyncClient, db: AsyncSession):
+    tenant = await make_tenant(db, slug="sl-cursor")
+    headers_b, profile_b_id = await _setup_member_profile(client, db, "bob8@sl.test", tenant, "male")
+    for i in range(3):
+        headers, _ = await _setup_member_profile(client, db, f"alice8-{i}@sl.test", tenant, "female")
+        await client.post("/shortlists/", json={"to_profile_id": profile_b_id}, headers=headers)
+
+    first = (await client.get(
+        "/shortlists/received-interests", params={"cursor": "", "size": 2}, headers=headers_b
+    )).json()
+    assert len(first["items"]) == 2 and first["next_cursor"]
+    assert first["page"] is None and first["total"] is None
+
+    second = (await client.get(
+        "/shortlists/received-interests",
+        params={"cursor": first["next_cursor"], "size": 2, "count": "exact"},
+        headers=headers_b,
+    )).json()
+    assert len(second["items"]) == 1 and second["next_cursor"] is None
+    assert second["total"] == 3
+    ids = {i["shortlist_id"] for i in first["items"] + second["items"]}
+    assert len(ids) == 3
+
+
+@pytest.mark.asyncio
+async def test_browse_pages_carry_shortlist_status(client: AsyncClient, db: AsyncSession):
+    tenant = await make_tenant(db, slug="sl-annotate")
+    headers_a, profile_a_id = await _setup_member_profile(client, db, "alice9@sl.test", tenant, "female")
+    _, profile_b_id = await _setup_member_profile(client, db, "bob9@sl.test", tenant, "male")
+    headers_c, _ = await _setup_member_profile(client, db, "carl9@sl.test", tenant, "male")
+    _, profile_d_id = await _setup_member_profile(client, db, "dan9@sl.test", tenant, "male")
+
+    await client.post("/shortlists/", json={"to_profile_id": profile_b_id}, headers=headers_a)
+    await client.post("/shortlists/", json={"to_profile_id": profile_a_id}, headers=headers_c)
+
+    resp = await client.get("/profiles/", headers=headers_a)
+    assert resp.status_code == 200
+    states = {p["id"]: p["shortlist_status"] for p in resp.json()["items"]}
+    assert len(states) == 3
+    assert states[profile_b_id] == "sent"
+    assert states[profile_d_id] is None
+    assert sorted(s for s in states.values() if s) == ["received", "sent"]
+
+    resp = await client.get("/shortlists/shortlisted-profiles", headers=headers_a)
+    assert [(p["id"], p["shortlist_status"]) for p in resp.json()["items"]] == [
+        (profile_b_id, "sent"),
+    ]
+
+
+@pytest.mark.asyncio
+async def test_interest_quota_counter(client: AsyncClient, db: AsyncSession):
+    tenant = await make_tenant(db, slug="sl-quota")
+    headers_a, _ = await _setup_member_profile(client, db, "alice10@sl.test", tenant, "female")
+    _, profile_b_id = await _setup_member_profile(client, db, "bob10@sl.test", tenant, "male")
+    _, profile_c_id = await _setup_member_profile(client, db, "carl10@sl.test", tenant, "male")
+
+    plan = MembershipPlanTemplate(
+        name="Quota Test", duration_months=1, base_price_inr=100, max_interests=1
+    )
+    db.add(plan)
+    await db.flush()
+    alice = await db.scalar(select(User).where(User.email == "alice10@sl.test"))
+    now = datetime.now(timezone.utc)
+    sub = MemberSubscription(
+        user_id=alice.id, tenant_id=tenant.id, plan_template_id=plan.id, price_paid_inr=100,
+        starts_at=now - timedelta(days=1), expires_at=now + timedelta(days=30),
+    )
+    db.add(sub)
+    await db.flush()
+
+    first = await client.post("/shortlists/", json={"to_profile_id": profile_b_id}, headers=headers_a)
+    assert first.status_code == 201
+    resp = await client.post("/shortlists/", json={"to_profile_id": profile_c_id}, headers=headers_a)
+    assert resp.status_code == 429
+    assert "Quota Test" in resp.json()["detail"]
+
+    # Withdrawing gives the slot back (the test session is never rolled
+    # back, so compare against the counter as left by the 429 request)
+    await db.refresh(sub)
+    before = sub.interests_sent
+    resp = await client.delete(f"/shortlists/{first.json()['id']}", headers=headers_a)
+    assert resp.status_code == 204
+    await db.refresh(sub)
+    assert sub.interests_sent == before - 1
@@ -0,0 +1,111 @@
+"""
+tests/test_smtp_pool.py – Pooled SMTP sessions against a local fake SMTP server.
+
+The fake server speaks just enough SMTP (no TLS, no AUTH) to count the
+connections the pool opens and the messages it delivers.
+"""
+
+import asyncio
+from email.mime.text import MIMEText
+
+import pytest
+
+pytest.importorskip("aiosmtplib")
+
+from app.services.smtp_pool import SMTPPool  # noqa: E402
+
+
+class FakeSMTPServer:
+    def __init__(self, drop_after: int | None = None) -> None:
+        self.drop_after = drop_after   # close the connection after N messages
+        self.connections = 0
+        self.messages: list[bytes] = []
+        self._server: asyncio.base_events.Server | None = None
+
+    async def __aenter__(self) -> "FakeSMTPServer":
+        self._server = await asyncio.start_server(self._handle, "127.0.0.1", 0)
+        self.port = self._server.sockets[0].getsockname()[1]
+        return self
+
+    async def __aexit__(self, *exc) -> None:
+        self._server.close()
+        await self._server.wait_closed()
+
+    async def _handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        self.connections += 1
+        delivered = 0
+        writer.write(b"220 fake ESMTP\r\n")
+        while line := await reader.readline():
+            cmd = line.decode().strip().upper()
+            if cmd.startswith(("EHLO", "HELO")):
+                writer.write(b"250-fake\r\n250 8BITMIME\r\n")
+            elif cmd == "DATA":
+                writer.write(b"354 end with .\r\n")
+                await writer.drain()
+                body = b""
+                while (chunk := await reader.readline()) != b".\r\n":
+                    body += chunk
+                self.messages.append(body)
+                delivered += 1
+                writer.write(b"250 queued\r\n")
+                if self.drop_after and delivered >= self.drop_after:
+                    await writer.drain()
+                    break
+            elif cmd == "QUIT":
+                writer.write(b"221 bye\r\n")
+                await writer.drain()
+                break
+            else:   # MAIL, RCPT, RSET, NOOP
+                writer.write(b"250 ok\r\n")
+            await writer.drain()
+        writer.close()
+
+
+def _pool(server: FakeSMTPServer, **kwargs) -> SMTPPool:
+    return SMTPPool(hostname="127.0.0.1", port=server.port, start_tls=False, **kwargs)
+
+
+def _message(i: int) -> MIMEText:
+    msg = MIMEText(f"message {i}")
+    msg["From"] = "noreply@example.com"
+    msg["To"] = f"member{i}@example.com"
+    msg["Subject"] = f"Test {i}"
+    return msg
+
+
+@pytest.mark.asyncio
+async def test_concurrent_sends_share_pooled_connections():
+    async with FakeSMTPServer() as server:
+        pool = _pool(server, max_size=2)
+        await asyncio.gather(*(pool.send(_message(i)) for i in range(10)))
+        await pool.close()
+
+    assert len(server.messages) == 10
+    assert server.connections == 2
+    stats = pool.stats()
+    assert (stats["opened"], stats["sent"], stats["reused"]) == (2, 10, 8)
+
+
+@pytest.mark.asyncio
+async def test_sessions_are_recycled_after_message_cap():
+    async with FakeSMTPServer() as server:
+        pool = _pool(server, max_size=1, max_messages_per_connection=4)
+        for i in range(10):
+            await pool.send(_message(i))
+        await pool.close()
+
+    assert len(server.messages) == 10
+    assert server.connections == 3
+
+
+@pytest.mark.asyncio
+async def test_dropped_sessions_are_replaced():
+    async with FakeSMTPServer(drop_after=3) as server:
+        pool = _pool(server, max_size=1)
+        for i in range(7):
+            await pool.send(_message(i))
+        await pool.close()
+
+    assert len(server.messages) == 7
+    assert server.connections == 3
+    assert pool.stats()["failed"] == 0
@@ -0,0 +1,91 @@
+"""
+tests/test_subscription_sweeps.py – Chunking and resumption of subscription sweeps.
+
+The chunk statement (FOR UPDATE SKIP LOCKED, UPDATE … FROM) and the
+checkpoint upsert are Postgres-only, so storage is replaced with an
+in-memory table that applies the same keyset filter.
+"""
+
+import uuid
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+from app.services.subscription_sweeps import Checkpoint, ChunkedSweep
+
+NOW = datetime(2026, 10, 16, 12, 0, tzinfo=timezone.utc)
+
+
+class MemorySweep(ChunkedSweep):
+    def __init__(self, subscriptions: list, store: dict, fail_on_chunk: int | None = None) -> None:
+        super().__init__("test_sweep", None, "subscription_expired", lambda row: {}, chunk_size=3)
+        self.subscriptions = subscriptions   # [expires_at, id, expired]
+        self.store = store                   # {"checkpoint": Checkpoint, "completed": bool}
+        self.fail_on_chunk = fail_on_chunk
+        self.cutoffs: list[datetime] = []
+
+    async def load_checkpoint(self):
+        return None if self.store.get("completed", True) else self.store["checkpoint"]
+
+    async def run_chunk(self, checkpoint: Checkpoint) -> Checkpoint:
+        self.cutoffs.append(checkpoint.cutoff)
+        if checkpoint.chunks == self.fail_on_chunk:
+            raise ConnectionError("worker restarted")
+        after = (checkpoint.after_expires_at, checkpoint.after_id)
+        chunk = sorted(
+            sub for sub in self.subscriptions
+            if not sub[2] and sub[0] < checkpoint.cutoff
+            and (after[0] is None or (sub[0], sub[1]) > after)
+        )[: self.chunk_size]
+        if not chunk:
+            return checkpoint
+        for sub in chunk:
+            sub[2] = True
+        checkpoint = checkpoint._replace(
+            after_expires_at=chunk[-1][0], after_id=chunk[-1][1],
+            processed=checkpoint.processed + len(chunk), chunks=checkpoint.chunks + 1,
+        )
+        self.store.update(checkpoint=checkpoint, completed=False)
+        return checkpoint
+
+    async def complete(self, checkpoint: Checkpoint) -> None:
+        self.store.update(checkpoint=checkpoint, completed=True)
+
+
+def _subscriptions(overdue: int, future: int = 0) -> list:
+    return [
+        [NOW - timedelta(days=overdue - i), uuid.uuid4(), False] for i in range(overdue)
+    ] + [
+        [NOW + timedelta(days=i + 1), uuid.uuid4(), False] for i in range(future)
+    ]
+
+
+@pytest.mark.asyncio
+async def test_sweep_processes_in_chunks_up_to_cutoff(monkeypatch):
+    monkeypatch.setattr("app.services.subscription_sweeps._now", lambda: NOW)
+    subs, store = _subscriptions(overdue=7, future=2), {}
+
+    assert await MemorySweep(subs, store).run() == 7
+
+    assert [sub[2] for sub in subs] == [True] * 7 + [False] * 2
+    assert store["completed"] and store["checkpoint"].chunks == 3
+
+
+@pytest.mark.asyncio
+async def test_interrupted_sweep_resumes_from_checkpoint(monkeypatch):
+    monkeypatch.setattr("app.services.subscription_sweeps._now", lambda: NOW)
+    subs, store = _subscriptions(overdue=7), {}
+
+    with pytest.raises(ConnectionError):
+        await MemorySweep(subs, store, fail_on_chunk=1).run()
+    assert not store["completed"] and store["checkpoint"].processed == 3
+
+    # Next run: an hour later, same cutoff, picks up after the cursor
+    monkeypatch.setattr("app.services.subscription_sweeps._now", lambda: NOW + timedelta(hours=1))
+    subs.append([NOW + timedelta(minutes=30), uuid.uuid4(), False])   # expired after the cutoff
+    resumed = MemorySweep(subs, store)
+
+    assert await resumed.run() == 4
+    assert set(resumed.cutoffs) == {NOW}
+    assert subs[-1][2] is False
+    assert store["completed"] and store["checkpoint"].processed == 7
@@ -170,3 +170,19 @@ async def test_invalid_slug_rejected(client: AsyncClient, db: AsyncSession):
         headers=_auth_header(super_admin),
     )
     assert response.status_code == 422  # Pydantic validation error
+
+
+@pytest.mark.asyncio
+async def test_deactivate_tenant_evicts_cached_tenant(client: AsyncClient, db: AsyncSession):
+    """The public join page is served from the tenant cache; deactivation must evict it."""
+    super_admin = await make_user(db, tenant=None, role=UserRole.SUPER_ADMIN, tenant_id=None)
+    tenant = await make_tenant(db, slug="cached-slug")
+
+    assert (await client.get("/public/tenant/cached-slug")).status_code == 200
+
+    response = await client.delete(
+        f"/admin/tenants/{tenant.id}", headers=_auth_header(super_admin)
+    )
+    assert response.status_code == 204
+
+    assert (await client.get("/public/tenant/cached-slug")).status_code == 404
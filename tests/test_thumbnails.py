@@ -0,0 +1,111 @@
+"""
+tests/test_thumbnails.py – WebP renditions of registered profile photos.
+
+Objects live in a LocalStorage under tmp_path instead of S3, and records
+are rendered on the default thread pool rather than the process pool.
+"""
+
+import io
+
+import pytest
+from httpx import AsyncClient
+from PIL import Image
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.auth.jwt import create_access_token
+from app.services.storage import LocalStorage
+from app.services.thumbnails import render_renditions, rendition_key
+from tests.conftest import make_tenant, make_user
+
+SIZES = {"thumb": 320, "medium": 1080}
+
+
+class FakeSigner:
+    def generate_presigned_url(self, method: str, Params: dict, ExpiresIn: int, HttpMethod: str) -> str:
+        return f"https://s3.example.com/{Params['Key']}"
+
+
+def _auth_header(user) -> dict:
+    token = create_access_token(user.id, user.tenant_id, user.role.value)
+    return {"Authorization": f"Bearer {token}"}
+
+
+def _jpeg(width: int, height: int) -> bytes:
+    out = io.BytesIO()
+    Image.new("RGB", (width, height), (200, 120, 80)).save(out, "JPEG", quality=90)
+    return out.getvalue()
+
+
+def test_renditions_are_webp_scaled_to_longest_edge():
+    renditions = render_renditions(_jpeg(4000, 3000), SIZES, quality=80)
+
+    sizes = {}
+    for name, data in renditions.items():
+        with Image.open(io.BytesIO(data)) as image:
+            assert image.format == "WEBP"
+            sizes[name] = image.size
+    assert sizes == {"thumb": (320, 240), "medium": (1080, 810)}
+
+    # Small originals are not upscaled
+    small = render_renditions(_jpeg(200, 100), SIZES, quality=80)
+    assert Image.open(io.BytesIO(small["medium"])).size == (200, 100)
+    assert rendition_key("profile_photo/t/2026/abc.jpg", "thumb") == "profile_photo/t/2026/abc.thumb.webp"
+
+
+@pytest.mark.asyncio
+async def test_registered_photo_is_listed_with_its_thumbnail(
+    client: AsyncClient, db: AsyncSession, monkeypatch, tmp_path
+):
+    from app.models.file_record import FileRecord, RenditionStatus
+    from app.models.profile import Gender, Profile, ProfileStatus
+    from app.services.thumbnails import process_record
+
+    monkeypatch.setattr("app.services.s3._s3_client", FakeSigner())
+    storage = LocalStorage(tmp_path)
+    tenant = await make_tenant(db, slug="thumbnails")
+    viewer = await make_user(db, tenant=tenant)
+    owner = await make_user(db, tenant=tenant, full_name="owner")
+    db.add(Profile(user_id=viewer.id, tenant_id=tenant.id, gender=Gender.MALE,
+                   status=ProfileStatus.ACTIVE))
+    profile = Profile(user_id=owner.id, tenant_id=tenant.id, gender=Gender.FEMALE,
+                      status=ProfileStatus.ACTIVE, photo_visible=True)
+    db.add(profile)
+    await db.flush()
+
+    keys = [f"profile_photo/{tenant.id}/2026/photo.jpg", f"profile_photo/{tenant.id}/2026/scan.heic"]
+    storage.put(keys[0], _jpeg(3000, 2000), "image/jpeg")
+    storage.put(keys[1], b"not an image Pillow can read", "image/heic")
+    for key in keys:
+        response = await client.patch(
+            f"/files/profiles/{profile.id}/media?object_key={key}&purpose=profile_photo",
+            headers=_auth_header(owner),
+        )
+        assert response.status_code == 204
+
+    records = {
+        r.object_key: r for r in (await db.scalars(select(FileRecord))).all()
+        if r.profile_id == profile.id
+    }
+    assert [records[k].rendition_status for k in keys] == [RenditionStatus.PENDING] * 2
+
+    # Until the renditions exist the original is served
+    body = (await client.get("/profiles/?include_media_urls=true", headers=_auth_header(viewer))).json()
+    assert {i["full_name"]: i["photo_url"] for i in body["items"]}["owner"].endswith("photo.jpg")
+
+    monkeypatch.setattr(db, "commit", db.flush)
+    for key in keys:
+        await process_record(db, records[key], storage, None, SIZES, 80)
+
+    photo, scan = records[keys[0]], records[keys[1]]
+    assert photo.rendition_status == RenditionStatus.READY
+    assert photo.size_bytes > 0
+    assert (tmp_path / photo.thumbnail_key).is_file() and (tmp_path / photo.medium_key).is_file()
+    assert scan.rendition_status == RenditionStatus.FAILED and scan.thumbnail_key is None
+
+    body = (await client.get("/profiles/?include_media_urls=true", headers=_auth_header(viewer))).json()
+    assert {i["full_name"]: i["photo_url"] for i in body["items"]}["owner"].endswith(photo.thumbnail_key)
+    detail = (await client.get(
+        f"/profiles/{profile.id}?include_media_urls=true", headers=_auth_header(viewer)
+    )).json()
+    assert detail["photo_url"].endswith(photo.medium_key)
@@ -10,6 +10,8 @@ Tests cover:
   - GET /users/me
 """
 
+import uuid
+
 import pytest
 from httpx import AsyncClient
 from sqlalchemy.ext.asyncio import AsyncSession
@@ -178,3 +180,132 @@ async def test_get_me(client: AsyncClient, db: AsyncSession):
 async def test_get_me_unauthenticated(client: AsyncClient):
     response = await client.get("/users/me")
     assert response.status_code == 403  # HTTPBearer returns 403 when no credentials
+
+
+@pytest.mark.asyncio
+async def test_update_me_deactivation_invalidates_cached_principal(
+    client: AsyncClient, db: AsyncSession
+):
+    """A cached principal must not outlive the user deactivating themselves."""
+    tenant = await make_tenant(db, slug="principal-cache-tenant")
+    user = await make_user(db, tenant=tenant)
+    headers = _auth_header(user)
+
+    # Warm the principal cache
+    assert (await client.get("/castes/", headers=headers)).status_code == 200
+
+    resp = await client.patch("/users/me", json={"is_active": False}, headers=headers)
+    assert resp.status_code == 200
+
+    resp = await client.get("/castes/", headers=headers)
+    assert resp.status_code == 401
+
+
+# ── POST /users/onboard/bulk ───────────────────────────────────────────────────
+@pytest.mark.asyncio
+async def test_bulk_onboard_reports_each_row(client: AsyncClient, db: AsyncSession):
+    tenant = await make_tenant(db, slug="bulk-tenant")
+    admin = await make_user(db, tenant=tenant, role=UserRole.ADMIN)
+    await make_user(db, tenant=tenant, email="taken@example.com")
+
+    csv_body = (
+        "full_name,email,phone,gender\n"
+        "Asha Kumar,asha@example.com,+919800000001,female\n"
+        ",noname@example.com,,\n"
+        "Asha Again,ASHA@example.com,,\n"
+        "Taken User,taken@example.com,,\n"
+        "Same Phone,other@example.com,919800000001,\n"
+        "Ravi Kumar,ravi@example.com,,male\n"
+    )
+    response = await client.post(
+        "/users/onboard/bulk",
+        files={"file": ("members.csv", csv_body.encode(), "text/csv")},
+        headers=_auth_header(admin),
+    )
+    assert response.status_code == 200
+    body = response.json()
+    assert (body["total"], body["created"], body["skipped"], body["errors"]) == (6, 2, 3, 1)
+    assert [r["status"] for r in body["rows"]] == [
+        "created", "error", "skipped", "skipped", "skipped", "created",
+    ]
+    assert body["rows"][4]["detail"] == "Mobile number already registered"
+
+    from sqlalchemy import select
+
+    from app.models.profile import Profile
+    from app.models.user import User
+
+    user = await db.scalar(select(User).where(User.email == "asha@example.com"))
+    assert user.tenant_id == tenant.id
+    profile = await db.scalar(select(Profile).where(Profile.user_id == user.id))
+    assert profile.gender.value == "female"
+    assert profile.mobile == "+919800000001"
+
+
+# ── Bulk onboard jobs (/users/onboard/bulk/jobs) ──────────────────────────────
+@pytest.mark.asyncio
+async def test_bulk_onboard_job_progress_rows_and_report(
+    client: AsyncClient, db: AsyncSession, monkeypatch
+):
+    from app.models.bulk_onboard_job import BulkOnboardJob
+    from app.services.onboarding_jobs import process_job
+
+    tenant = await make_tenant(db, slug="bulk-job-tenant")
+    admin = await make_user(db, tenant=tenant, role=UserRole.ADMIN)
+    csv_body = (
+        "full_name,email\n"
+        "Job One,job1@example.com\n"
+        ",missing@example.com\n"
+        "Job Three,job3@example.com\n"
+    )
+    response = await client.post(
+        "/users/onboard/bulk/jobs",
+        files={"file": ("members.csv", csv_body.encode(), "text/csv")},
+        headers=_auth_header(admin),
+    )
+    assert response.status_code == 202
+    job_id = response.json()["id"]
+    assert response.json()["status"] == "queued"
+
+    # Run the job in the test session; commits become flushes so the
+    # per-test rollback still cleans up.
+    monkeypatch.setattr(db, "commit", db.flush)
+    job = await db.get(BulkOnboardJob, uuid.UUID(job_id))
+    await process_job(db, job, chunk_size=2)
+
+    body = (await client.get(f"/users/onboard/bulk/jobs/{job_id}", headers=_auth_header(admin))).json()
+    assert body["status"] == "completed"
+    assert (body["total_rows"], body["processed_rows"]) == (3, 3)
+    assert (body["created_count"], body["skipped_count"], body["error_count"]) == (2, 0, 1)
+
+    rows = (await client.get(
+        f"/users/onboard/bulk/jobs/{job_id}/rows?offset=1&limit=1", headers=_auth_header(admin)
+    )).json()
+    assert rows["total"] == 3
+    assert rows["rows"] == [
+        {"row": 2, "email": "missing@example.com", "status": "error",
+         "detail": "Missing required field: full_name and/or email"},
+    ]
+
+    report = await client.get(f"/users/onboard/bulk/jobs/{job_id}/report", headers=_auth_header(admin))
+    assert report.headers["content-type"].startswith("text/csv")
+    assert report.text.splitlines()[0] == "row,email,status,detail"
+    assert len(report.text.splitlines()) == 4
+
+
+@pytest.mark.asyncio
+async def test_bulk_onboard_job_hidden_from_other_tenants(client: AsyncClient, db: AsyncSession):
+    tenant = await make_tenant(db, slug="job-owner")
+    other = await make_tenant(db, slug="job-other")
+    admin = await make_user(db, tenant=tenant, role=UserRole.ADMIN)
+    other_admin = await make_user(db, tenant=other, role=UserRole.ADMIN)
+
+    response = await client.post(
+        "/users/onboard/bulk/jobs",
+        files={"file": ("members.csv", b"full_name,email\nA,a@example.com\n", "text/csv")},
+        headers=_auth_header(admin),
+    )
+    job_id = response.json()["id"]
+
+    response = await client.get(f"/users/onboard/bulk/jobs/{job_id}", headers=_auth_header(other_admin))
+    assert response.status_code == 404